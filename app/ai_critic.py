@@ -3,6 +3,8 @@ import logging
 from typing import Optional
 from dotenv import load_dotenv
 
+from . import metrics
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -67,12 +69,13 @@ def _build_user_message(title: str, content: str) -> str:
 def _critique_with_anthropic(title: str, content: str) -> Optional[str]:
     if not anthropic_client:
         return None
-    response = anthropic_client.messages.create(
-        model=PREMIUM_USERS_MODEL,
-        max_tokens=AI_CRITIC_MAX_TOKENS,
-        system=CRITIC_PROMPT,
-        messages=[{"role": "user", "content": _build_user_message(title, content)}],
-    )
+    with metrics.llm_call("ai_critic", "anthropic"):
+        response = anthropic_client.messages.create(
+            model=PREMIUM_USERS_MODEL,
+            max_tokens=AI_CRITIC_MAX_TOKENS,
+            system=CRITIC_PROMPT,
+            messages=[{"role": "user", "content": _build_user_message(title, content)}],
+        )
     parts = [block.text for block in response.content if getattr(block, "type", None) == "text"]
     text = "".join(parts).strip()
     return text or None
@@ -81,15 +84,16 @@ def _critique_with_anthropic(title: str, content: str) -> Optional[str]:
 def _critique_with_mistral(title: str, content: str) -> Optional[str]:
     if not mistral_client:
         return None
-    response = mistral_client.chat.complete(
-        model=FREE_USERS_MODEL,
-        max_tokens=AI_CRITIC_MAX_TOKENS,
-        messages=[
-            {"role": "system", "content": CRITIC_PROMPT},
-            {"role": "user", "content": _build_user_message(title, content)},
-        ],
-        temperature=0.7,
-    )
+    with metrics.llm_call("ai_critic", "mistral"):
+        response = mistral_client.chat.complete(
+            model=FREE_USERS_MODEL,
+            max_tokens=AI_CRITIC_MAX_TOKENS,
+            messages=[
+                {"role": "system", "content": CRITIC_PROMPT},
+                {"role": "user", "content": _build_user_message(title, content)},
+            ],
+            temperature=0.7,
+        )
     text = (response.choices[0].message.content or "").strip()
     return text or None
 
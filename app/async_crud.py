@@ -0,0 +1,61 @@
+"""
+Async data access for the hot read endpoints (landing, blog, post detail,
+category, notifications).
+
+Lookups that decide a 404 and the notification reads are plain `select()`s
+awaited on the AsyncSession. Page payloads reuse the existing crud and
+serializer code through `AsyncSession.run_sync`, where their queries and lazy
+loads still travel over the async driver: the event loop is never blocked and
+there is no second copy of every read to keep in sync.
+"""
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models, statistics
+
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[models.User]:
+    return await db.scalar(select(models.User).where(models.User.username == username).limit(1))
+
+
+async def get_post_by_slug(db: AsyncSession, slug: str) -> Optional[models.Post]:
+    return await db.scalar(select(models.Post).where(models.Post.slug == slug).limit(1))
+
+
+async def get_notifications_for_user(
+    db: AsyncSession, user_id: int, skip: int = 0, limit: int = 20
+) -> List[models.Notification]:
+    result = await db.scalars(
+        select(models.Notification)
+        .where(models.Notification.user_id == user_id)
+        .order_by(models.Notification.created_at.desc(), models.Notification.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(result)
+
+
+async def get_unread_notification_count(db: AsyncSession, user_id: int) -> int:
+    return await db.scalar(
+        select(func.count(models.Notification.id)).where(
+            models.Notification.user_id == user_id,
+            models.Notification.is_read == False,  # noqa: E712
+        )
+    )
+
+
+async def record_view(
+    db: AsyncSession,
+    request: Request,
+    content_type: str,
+    content_id: Optional[int],
+    content_key: Optional[str],
+    content_owner_id: Optional[int],
+    current_user: Optional[models.User],
+) -> Optional[models.PageView]:
+    return await db.run_sync(
+        statistics.record_view, request, content_type, content_id, content_key, content_owner_id, current_user
+    )
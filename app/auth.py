@@ -3,7 +3,7 @@ from typing import Optional
 from pathlib import Path
 from fastapi import Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
-from . import crud, models
+from . import crud, models, user_cache
 from .database import get_db
 
 logger = logging.getLogger(__name__)
@@ -38,12 +38,17 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
         request.session.clear()
         return None
 
+    user = user_cache.get(db, user_id, current_epoch)
+    if user is not None:
+        return user
+
     user = crud.get_user_by_id(db, user_id=user_id)
     if user is None:
         logger.debug(f"User not found for session user_id={user_id}, clearing session.")
         request.session.clear()
         return None
 
+    user_cache.put(user, current_epoch)
     return user
 
 
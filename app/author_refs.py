@@ -0,0 +1,84 @@
+"""
+Compact author references for list/detail payloads.
+
+Most payloads only show who wrote or owns something: id, username, avatar and
+motto. Loading a full `User` for that drags ~30 columns (social links, Stripe
+ids, flags) through the ORM for every owner, member and commenter. Here the
+four columns are fetched with a column-only query into `AuthorRef` objects,
+and a per-session identity map (the session lives for one request) makes sure
+each user is fetched at most once per request.
+
+Typical use in a router: call `load_author_refs(db, ids)` once for the whole
+page, then build payloads with `get_author_ref(db, id)`, which is served from
+the map.
+"""
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from . import models
+
+_IDENTITY_MAP_KEY = "author_refs"
+
+AUTHOR_REF_COLUMNS = (
+    models.User.id,
+    models.User.username,
+    models.User.avatar_seed,
+    models.User.subtitle,
+)
+
+
+class AuthorRef:
+    __slots__ = ("id", "username", "avatar_seed", "subtitle")
+
+    def __init__(self, id: int, username: str, avatar_seed: Optional[str], subtitle: Optional[str]):
+        self.id = id
+        self.username = username
+        self.avatar_seed = avatar_seed
+        self.subtitle = subtitle
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "AuthorRef":
+        return cls(user.id, user.username, user.avatar_seed, user.subtitle)
+
+    def __repr__(self) -> str:
+        return f"AuthorRef(id={self.id!r}, username={self.username!r})"
+
+
+def load_author_refs(db: Session, user_ids: Iterable[Optional[int]]) -> Dict[int, AuthorRef]:
+    """Return {user_id: AuthorRef} for the given ids with at most one query."""
+    identity: Dict[int, AuthorRef] = db.info.setdefault(_IDENTITY_MAP_KEY, {})
+    wanted = {uid for uid in user_ids if uid is not None}
+    missing = wanted - identity.keys()
+    if missing:
+        rows = db.execute(select(*AUTHOR_REF_COLUMNS).where(models.User.id.in_(missing)))
+        for row in rows:
+            identity[row.id] = AuthorRef(*row)
+    return {uid: identity[uid] for uid in wanted if uid in identity}
+
+
+def get_author_ref(db: Session, user_id: Optional[int]) -> Optional[AuthorRef]:
+    if user_id is None:
+        return None
+    return load_author_refs(db, (user_id,)).get(user_id)
+
+
+def author_payload(ref, *, include_subtitle: bool = False) -> Optional[dict]:
+    """Public author payload; accepts an AuthorRef or a full User."""
+    if not ref:
+        return None
+    payload = {
+        "id": ref.id,
+        "username": ref.username,
+        "avatar_seed": ref.avatar_seed or f"{ref.username}-shapes",
+    }
+    if include_subtitle:
+        payload["subtitle"] = ref.subtitle
+    return payload
+
+
+@event.listens_for(Session, "after_commit")
+def _reset_identity_map(session: Session) -> None:
+    # A commit may have renamed someone; refs are cheap to refetch.
+    session.info.pop(_IDENTITY_MAP_KEY, None)
@@ -0,0 +1,52 @@
+"""
+Application cache for read-heavy crud results.
+
+    from .cache import cached
+
+    @cached(ttl=300, tags=("user:{user_id}",))
+    def get_available_months_for_user(db, user_id): ...
+
+Layers:
+  * an in-process LRU + TTL tier per worker (`Cache`);
+  * optionally a shared tier (CACHE_SHARED_BACKEND=database, see
+    `shared.py`) that workers read on a local miss and write after
+    computing, for functions declared `shared=True`. Reads block, so on
+    the event loop (async routes) only the local tier is consulted; writes
+    and invalidations are queued and committed by a background thread.
+
+Entries carry tags (`user:42`, `post:17`, `club:3`, `posts`...). Committing
+a change to a tagged model invalidates its tags in every cache of the
+process and, through the shared tier, in the other workers within
+CACHE_SYNC_INTERVAL_SECONDS (see `invalidation.py` for the tags of each
+model). Until then, and for functions whose inputs are not all tagged, the
+TTL bounds staleness.
+
+On a miss only one caller computes a key while concurrent callers wait for
+its result; an expired entry is served for a further `stale` seconds while
+one caller recomputes it. `calimara_cache_requests{cache="app"}` counts hits
+and misses and `calimara_cache_events` how they were served.
+
+Cached values are shared between callers and must not be mutated. The
+older special-purpose caches (`user_cache`, `club_snapshot`,
+`collection_snapshot`) keep their own invalidation.
+"""
+import os
+
+from . import core
+from .core import Cache, app_cache
+from .decorators import cached
+from .invalidation import invalidate_on_commit, tags_for
+from .shared import DatabaseTier
+
+CACHE_SHARED_BACKEND = os.getenv("CACHE_SHARED_BACKEND", "none").lower()
+
+
+def invalidate(*tags: str) -> None:
+    """Invalidate `tags` in every cache now (outside any transaction)."""
+    for cache in core._instances:
+        cache.invalidate(*tags)
+
+
+def clear() -> None:
+    for cache in core._instances:
+        cache.clear()
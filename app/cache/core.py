@@ -0,0 +1,311 @@
+"""
+The `Cache` class: in-process LRU + TTL tier, tags, coalescing, stale reads.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Set, TypeVar
+
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from .. import metrics
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "True").lower() in ("true", "1", "yes")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "4096"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_STALE_SECONDS = float(os.getenv("CACHE_STALE_SECONDS", "300"))
+CACHE_COALESCE_TIMEOUT_SECONDS = float(os.getenv("CACHE_COALESCE_TIMEOUT_SECONDS", "10"))
+
+T = TypeVar("T")
+
+# Every Cache of this process; commit hooks invalidate tags in all of them.
+_instances: "list[Cache]" = []
+
+
+class _Entry(NamedTuple):
+    value: object
+    fresh_until: float  # time.monotonic()
+    stale_until: float
+    tags: frozenset
+
+
+class _CannotWait(Exception):
+    pass
+
+
+def _on_event_loop() -> bool:
+    """True in the event loop's thread, including AsyncSession.run_sync code."""
+    if in_greenlet():
+        return True
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _wait(future: Future, timeout: float):
+    """Result of another caller's computation, without blocking an event loop."""
+    if in_greenlet():
+        # Sync code run by AsyncSession.run_sync: the loop keeps running
+        # (and the leader with it) while this greenlet waits.
+        return await_only(asyncio.wait_for(asyncio.wrap_future(future), timeout))
+    if not _on_event_loop():
+        return future.result(timeout)
+    raise _CannotWait()  # blocking here could stall the leader itself
+
+
+class Cache:
+    """Values computed by callers, kept per process and optionally shared.
+
+    Entries are fresh for `ttl` seconds and may then be served stale for
+    `stale` more: the first caller to see a stale entry recomputes it while
+    concurrent callers get the stale value. On a miss only one caller per
+    key computes (request coalescing); the others wait for its result.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL_SECONDS,
+        stale: float = CACHE_STALE_SECONDS,
+        shared=None,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale = stale
+        self.shared = None  # a shared tier, see shared.py
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._refreshing: Set[str] = set()
+        # Invalidation clock: a value computed before one of its tags was
+        # invalidated is returned to its caller but never stored. Only
+        # computations still running need the invalidation times, so they
+        # are kept while any is (`_active` counts them by start tick).
+        self._clock = 0
+        self._active: Counter = Counter()
+        self._invalidated_at: Dict[str, int] = {}
+        self._cleared_at = 0
+        _instances.append(self)
+        if shared is not None:
+            self.use_shared(shared)
+
+    def use_shared(self, shared) -> None:
+        """Share values with other workers through `shared` and apply the
+        invalidations it reports from them."""
+        self.shared = shared
+        shared.subscribe(lambda tags: self.invalidate(*tags, broadcast=False))
+
+    # ----- local tier -----
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.stale_until <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def _store(self, key: str, value, fresh_for: float, stale_for: float, tags: frozenset, started: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._cleared_at > started or any(self._invalidated_at.get(tag, 0) > started for tag in tags):
+                return False
+            self._drop(key)
+            self._entries[key] = _Entry(value, now + fresh_for, now + fresh_for + stale_for, tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+        return True
+
+    @contextmanager
+    def _computing(self):
+        """Start tick of a computation, tracked until it ends."""
+        with self._lock:
+            self._clock += 1
+            started = self._clock
+            self._active[started] += 1
+        try:
+            yield started
+        finally:
+            with self._lock:
+                self._active[started] -= 1
+                if not self._active[started]:
+                    del self._active[started]
+                if not self._active:
+                    self._invalidated_at.clear()
+                elif started < min(self._active):
+                    oldest = min(self._active)
+                    self._invalidated_at = {t: at for t, at in self._invalidated_at.items() if at > oldest}
+
+    # ----- reads -----
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], T],
+        *,
+        ttl: Optional[float] = None,
+        stale: Optional[float] = None,
+        tags: Iterable[str] = (),
+        shared: bool = False,
+    ) -> T:
+        """Cached value of `key`, from `compute()` when there is none.
+
+        `shared` also reads and writes the shared tier (the value must then
+        survive a JSON round trip). Callers must not mutate the result.
+        """
+        if not CACHE_ENABLED:
+            return compute()
+        ttl = self.ttl if ttl is None else ttl
+        stale = self.stale if stale is None else stale
+        tags = frozenset(tags)
+
+        entry = self._lookup(key)
+        if entry is not None:
+            if time.monotonic() < entry.fresh_until:
+                metrics.record_cache(self.name, True)
+                return entry.value
+            with self._lock:
+                refresh = key not in self._refreshing
+                if refresh:
+                    self._refreshing.add(key)
+            if not refresh:
+                metrics.record_cache(self.name, True)
+                metrics.record_cache_event(self.name, "stale_served")
+                return entry.value
+            metrics.record_cache(self.name, False)
+            metrics.record_cache_event(self.name, "refreshed")
+            try:
+                return self._compute(key, compute, ttl, stale, tags, shared)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            try:
+                value = _wait(future, CACHE_COALESCE_TIMEOUT_SECONDS)
+            except Exception:
+                # Leader failed, is too slow or cannot be waited for here:
+                # compute like an uncached call.
+                metrics.record_cache(self.name, False)
+                return compute()
+            metrics.record_cache(self.name, True)
+            metrics.record_cache_event(self.name, "coalesced")
+            return value
+
+        try:
+            value = self._shared_get(key) if shared else _MISSING
+            if value is not _MISSING:
+                metrics.record_cache(self.name, True)
+                metrics.record_cache_event(self.name, "shared_hit")
+            else:
+                metrics.record_cache(self.name, False)
+                value = self._compute(key, compute, ttl, stale, tags, shared)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _compute(self, key, compute, ttl, stale, tags, shared):
+        with self._computing() as started:
+            value = compute()
+            stored = self._store(key, value, ttl, stale, tags, started)
+        if stored and shared and self.shared is not None:
+            try:
+                self.shared.set(key, value, ttl, stale, tags)  # queued, written in the background
+            except Exception:
+                logger.warning("Shared cache write failed for %s", key, exc_info=True)
+        return value
+
+    def _shared_get(self, key: str):
+        # Shared reads are blocking I/O: never on the event loop, where the
+        # local tier alone serves (the leader's value is still shared).
+        if self.shared is None or _on_event_loop():
+            return _MISSING
+        with self._computing() as started:
+            try:
+                found = self.shared.get(key)
+            except Exception:
+                logger.warning("Shared cache read failed for %s", key, exc_info=True)
+                return _MISSING
+            if found is None:
+                return _MISSING
+            value, fresh_for, stale_for, tags = found
+            if fresh_for <= 0:
+                return _MISSING  # stale elsewhere: let this worker refresh it
+            self._store(key, value, fresh_for, stale_for, frozenset(tags), started)
+            return value
+
+    # ----- invalidation -----
+
+    def invalidate(self, *tags: str, broadcast: bool = True) -> None:
+        """Drop every entry carrying one of `tags`, here and (with a shared
+        tier) in the shared store and, once it syncs, other workers."""
+        if not tags:
+            return
+        with self._lock:
+            self._clock += 1
+            for tag in tags:
+                if self._active:
+                    self._invalidated_at[tag] = self._clock
+                for key in list(self._by_tag.get(tag, ())):
+                    self._drop(key)
+        if broadcast and self.shared is not None:
+            try:
+                self.shared.invalidate(tags)  # queued, written in the background
+            except Exception:
+                logger.warning("Shared cache invalidation failed for %s", tags, exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self._clock += 1
+            self._invalidated_at.clear()
+            self._cleared_at = self._clock
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_MISSING = object()
+
+app_cache = Cache("app")
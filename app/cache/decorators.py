@@ -0,0 +1,54 @@
+"""
+`@cached` for read-only crud functions of the form `fn(db, *args, **kwargs)`.
+"""
+import functools
+import inspect
+import json
+from typing import Callable, Iterable, Optional, Union
+
+from . import core
+
+
+def cached(
+    *,
+    ttl: Optional[float] = None,
+    stale: Optional[float] = None,
+    tags: Union[Iterable[str], Callable[..., Iterable[str]]] = (),
+    shared: bool = False,
+    cache: Optional["core.Cache"] = None,
+):
+    """Serve `fn(db, ...)` from `cache` (the app cache by default).
+
+    The key is the function's qualified name plus its arguments other than
+    `db`. `tags` are format strings filled from the arguments by name
+    (`"user:{user_id}"`), or a callable taking the same arguments as `fn`
+    minus `db`. `fn.uncached` is the original function.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        db_param = next(iter(signature.parameters))
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(db, *args, **kwargs):
+            bound = signature.bind(db, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = {k: v for k, v in bound.arguments.items() if k != db_param}
+            key = f"{name}:{json.dumps(arguments, sort_keys=True, default=repr)}"
+            if callable(tags):
+                entry_tags = tags(**arguments)
+            else:
+                entry_tags = [tag.format(**arguments) for tag in tags]
+            return (cache or core.app_cache).get_or_compute(
+                key,
+                lambda: fn(db, *args, **kwargs),
+                ttl=ttl,
+                stale=stale,
+                tags=entry_tags,
+                shared=shared,
+            )
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
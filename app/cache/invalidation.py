@@ -0,0 +1,63 @@
+"""
+Tags of ORM objects, and the session hooks that invalidate them on commit.
+
+Any flush that inserts, updates or deletes a tagged model collects its tags
+in `session.info`; they are invalidated in every `Cache` once the
+transaction commits, and forgotten on rollback. Writes that bypass the unit
+of work (Query.update / bulk deletes) call `invalidate_on_commit()`.
+"""
+from typing import Callable, Dict, Iterable, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .. import models
+from . import core
+
+_PENDING_INVALIDATIONS_KEY = "app_cache_invalidations"
+
+_TAGGERS: Dict[type, Callable[[object], Iterable[str]]] = {
+    models.User: lambda o: (f"user:{o.id}",),
+    models.Post: lambda o: (f"post:{o.id}", f"user:{o.user_id}", "posts"),
+    models.Comment: lambda o: (f"post:{o.post_id}", "comments"),
+    models.Like: lambda o: (f"post:{o.post_id}",),
+    models.SuperLike: lambda o: (f"post:{o.post_id}",),
+    models.Club: lambda o: (f"club:{o.id}", "clubs"),
+    models.ClubMember: lambda o: (f"club:{o.club_id}",),
+    models.ClubJoinRequest: lambda o: (f"club:{o.club_id}",),
+    models.ClubBoardMessage: lambda o: (f"club:{o.club_id}",),
+    models.Collection: lambda o: (f"collection:{o.id}", f"user:{o.owner_id}"),
+    models.CollectionPost: lambda o: (f"collection:{o.collection_id}", f"post:{o.post_id}"),
+}
+
+
+def tags_for(obj) -> List[str]:
+    """Tags a change to `obj` invalidates (empty for untagged models)."""
+    tagger = _TAGGERS.get(type(obj))
+    return list(tagger(obj)) if tagger is not None else []
+
+
+def invalidate_on_commit(db: Session, *tags: str) -> None:
+    """Invalidate `tags` once `db` commits (for Query.update() paths)."""
+    db.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tags(session: Session, flush_context) -> None:
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tags = tags_for(obj)
+        if tags:
+            session.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    tags = session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+    if tags:
+        for cache in core._instances:
+            cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
@@ -0,0 +1,249 @@
+"""
+Shared tier of `app.cache`, so workers reuse each other's values and hear
+about each other's invalidations.
+
+A shared tier is any object with these methods (all may raise; `Cache`
+logs the error and carries on with its local tier):
+
+  * `get(key)` -> `(value, fresh_for, stale_for, tags)` or None; blocking,
+    so `Cache` never calls it on the event loop
+  * `set(key, value, ttl, stale, tags)`: must not block
+  * `invalidate(tags)`: drop entries carrying any of `tags` and tell the
+    other workers; must not block, as it runs in after_commit hooks
+  * `subscribe(callback)`: call `callback(tags)` with the tags other
+    workers invalidate
+
+`DatabaseTier` keeps both in the application database, the same way the
+server-side session store does: the stack has no Redis or memcached, and
+the values worth sharing are small aggregates that are far cheaper to read
+back by primary key than to recompute. Writes are queued and a worker
+thread commits them, then polls for other workers' invalidations, every
+CACHE_SYNC_INTERVAL_SECONDS (sooner when there is something to write).
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..week_util import utcnow_naive
+
+logger = logging.getLogger(__name__)
+
+CACHE_SYNC_INTERVAL_SECONDS = float(os.getenv("CACHE_SYNC_INTERVAL_SECONDS", "2"))
+# How far back each poll looks again: invalidation ids are assigned at
+# insert but become visible at commit, so a row may appear behind one
+# already seen. Must exceed the longest transaction plus clock skew.
+CACHE_SYNC_OVERLAP_SECONDS = float(os.getenv("CACHE_SYNC_OVERLAP_SECONDS", "60"))
+
+
+def _hash_key(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class DatabaseTier:
+    """`cache_entries` + `cache_invalidations` tables.
+
+    Expired entries and invalidations older than `retention` seconds are
+    deleted lazily, at most once per `purge_interval` seconds per worker.
+    With `background=False` no thread is started and the owner calls
+    `flush()` itself (tests).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        sync_interval: float = CACHE_SYNC_INTERVAL_SECONDS,
+        overlap: float = CACHE_SYNC_OVERLAP_SECONDS,
+        purge_interval: float = 300,
+        retention: float = 3600,
+        background: bool = True,
+    ):
+        self.session_factory = session_factory
+        self.sync_interval = sync_interval
+        self.overlap = overlap
+        self.purge_interval = purge_interval
+        self.retention = retention
+        self.background = background
+        self._subscribers: List[Callable[[List[str]], None]] = []
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._unwritten: Counter = Counter()  # queued invalidations, by tag
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._polled_at = None  # utcnow_naive() of the last poll
+        self._seen: Dict[int, object] = {}  # id -> created_at, within the overlap
+        self._own: Set[int] = set()
+        self._next_purge = time.monotonic() + purge_interval
+
+    def get(self, key: str):
+        with self.session_factory() as db:
+            row = db.execute(
+                select(models.CacheEntry.value, models.CacheEntry.tags,
+                       models.CacheEntry.fresh_until, models.CacheEntry.expires_at)
+                .where(models.CacheEntry.key == _hash_key(key))
+            ).first()
+        now = utcnow_naive()
+        if row is None or row.expires_at <= now:
+            return None
+        tags = row.tags.split()
+        with self._lock:
+            if any(self._unwritten[tag] for tag in tags):
+                return None  # invalidated here, not yet deleted there
+        return (
+            json.loads(row.value),
+            (row.fresh_until - now).total_seconds(),
+            (row.expires_at - max(row.fresh_until, now)).total_seconds(),
+            tags,
+        )
+
+    def set(self, key: str, value, ttl: float, stale: float, tags: Iterable[str]) -> None:
+        try:
+            payload = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError):
+            logger.debug("Not sharing %s: value is not JSON", key)
+            return
+        now = utcnow_naive()
+        tags = sorted(tags)
+        self._enqueue(("set", models.CacheEntry(
+            key=_hash_key(key),
+            value=payload,
+            tags=f" {' '.join(tags)} " if tags else " ",
+            fresh_until=now + timedelta(seconds=ttl),
+            expires_at=now + timedelta(seconds=ttl + stale),
+        )))
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        with self._lock:
+            self._unwritten.update(tags)
+        self._enqueue(("invalidate", tags))
+
+    def subscribe(self, callback: Callable[[List[str]], None]) -> None:
+        self._subscribers.append(callback)
+        self._start()
+
+    def _enqueue(self, op) -> None:
+        self._queue.put(op)
+        self._start()
+        self._wake.set()
+
+    def _start(self) -> None:
+        with self._lock:
+            if not self.background or self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, name="cache-shared-tier", daemon=True)
+        self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.sync_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.warning("Shared cache sync failed", exc_info=True)
+
+    def flush(self) -> None:
+        """Write the queued changes, then hand other workers' invalidations
+        to the subscribers (one pass of the worker thread)."""
+        ops = []
+        while True:
+            try:
+                ops.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if ops:
+            self._write(ops)
+        tags = self.poll()
+        if tags:
+            for callback in self._subscribers:
+                callback(tags)
+        self.maybe_purge()
+
+    def _write(self, ops) -> None:
+        invalidated = [tag for kind, arg in ops if kind == "invalidate" for tag in arg]
+        try:
+            with self.session_factory() as db:
+                rows = []
+                for kind, arg in ops:  # in order: a value set after an invalidation survives it
+                    if kind == "set":
+                        db.merge(arg)
+                        continue
+                    db.flush()  # the values set before it go too
+                    db.execute(
+                        delete(models.CacheEntry)
+                        .where(or_(*(models.CacheEntry.tags.contains(f" {tag} ", autoescape=True) for tag in arg)))
+                        .execution_options(synchronize_session=False)
+                    )
+                    now = utcnow_naive()
+                    new = [models.CacheInvalidation(tag=tag, created_at=now) for tag in arg]
+                    db.add_all(new)
+                    rows += new
+                db.commit()
+                # This worker already applied them locally; poll() skips them.
+                self._own.update(row.id for row in rows)
+        finally:
+            with self._lock:
+                for tag in invalidated:
+                    self._unwritten[tag] -= 1
+                    if not self._unwritten[tag]:
+                        del self._unwritten[tag]
+
+    def poll(self) -> List[str]:
+        """Tags invalidated by other workers since the last poll."""
+        now = utcnow_naive()
+        since = (self._polled_at or now) - timedelta(seconds=self.overlap)
+        with self.session_factory() as db:
+            rows = db.execute(
+                select(models.CacheInvalidation.id, models.CacheInvalidation.tag,
+                       models.CacheInvalidation.created_at)
+                .where(models.CacheInvalidation.created_at >= since)
+                .order_by(models.CacheInvalidation.id)
+            ).all()
+        first = self._polled_at is None  # nothing cached yet, so nothing said before matters
+        self._polled_at = now
+        tags = []
+        for row in rows:
+            if row.id in self._seen:
+                continue
+            self._seen[row.id] = row.created_at
+            if row.id in self._own:
+                self._own.discard(row.id)
+            elif not first:
+                tags.append(row.tag)
+        horizon = now - timedelta(seconds=self.overlap)
+        self._seen = {id_: at for id_, at in self._seen.items() if at >= horizon}
+        return tags
+
+    def maybe_purge(self) -> int:
+        if time.monotonic() < self._next_purge:
+            return 0
+        self._next_purge = time.monotonic() + self.purge_interval
+        return self.purge()
+
+    def purge(self) -> int:
+        """Delete expired entries and old invalidations; returns rows deleted."""
+        now = utcnow_naive()
+        with self.session_factory() as db:
+            deleted = db.execute(
+                delete(models.CacheEntry).where(models.CacheEntry.expires_at <= now)
+            ).rowcount or 0
+            deleted += db.execute(
+                delete(models.CacheInvalidation)
+                .where(models.CacheInvalidation.created_at <= now - timedelta(seconds=self.retention))
+            ).rowcount or 0
+            db.commit()
+        if deleted:
+            logger.info("Purged %s shared cache rows", deleted)
+        return deleted
@@ -3,6 +3,8 @@ import json
 import logging
 from dotenv import load_dotenv
 
+from . import metrics
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -43,15 +45,16 @@ def classify_post(title: str, content: str) -> str:
 
     try:
         full_text = f"Titlu: {title}\n\nConținut: {content}"
-        response = client.chat.complete(
-            model=CATEGORY_CLASSIFIER_MODEL,
-            messages=[
-                {"role": "system", "content": CLASSIFIER_PROMPT},
-                {"role": "user", "content": full_text},
-            ],
-            temperature=0.0,
-            response_format={"type": "json_object"},
-        )
+        with metrics.llm_call("category_classifier", "classify"):
+            response = client.chat.complete(
+                model=CATEGORY_CLASSIFIER_MODEL,
+                messages=[
+                    {"role": "system", "content": CLASSIFIER_PROMPT},
+                    {"role": "user", "content": full_text},
+                ],
+                temperature=0.0,
+                response_format={"type": "json_object"},
+            )
 
         result = json.loads(response.choices[0].message.content.strip())
         category = result.get("category", "proza_scurta")
@@ -0,0 +1,169 @@
+"""
+Club discovery search.
+
+Every club keeps a `search_text` column: title, theme and description folded
+to lowercase ASCII ("Poezie și Proză" -> "poezie si proza"), title first. The
+folding happens here, in Python, on insert/update of a `Club`, and queries go
+through the same `fold_text`, so matching is accent-insensitive for Romanian
+(ă, â, î, ș/ş, ț/ţ) without needing the `unaccent` extension at query time.
+
+On PostgreSQL `idx_clubs_search_trgm` (pg_trgm GIN over `search_text`) serves
+the `LIKE '%term%'` filters, and relevance adds trigram `word_similarity`.
+Results are ordered by a score mixing relevance with activity (members and
+board posts in the last CLUB_SEARCH_ACTIVITY_DAYS days) and paginated with an
+opaque keyset cursor over (score, id).
+"""
+import os
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Float, and_, case, cast, event, func, inspect, literal, or_, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .pagination import cursor_datetime, cursor_int, decode_cursor, encode_cursor
+from .week_util import utcnow_naive
+
+CLUB_SEARCH_ACTIVITY_DAYS = int(os.getenv("CLUB_SEARCH_ACTIVITY_DAYS", "30"))
+CLUB_SEARCH_MAX_TERMS = 5
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def fold_text(text: Optional[str]) -> str:
+    """Lowercase, strip diacritics and collapse everything else to single spaces."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", stripped).strip()
+
+
+def club_search_text(club: models.Club) -> str:
+    return " ".join(part for part in (fold_text(club.title), fold_text(club.theme), fold_text(club.description)) if part)
+
+
+_SEARCHED_FIELDS = ("title", "theme", "description")
+
+
+@event.listens_for(models.Club, "before_insert")
+def _set_search_text(mapper, connection, club: models.Club) -> None:
+    club.search_text = club_search_text(club)
+
+
+@event.listens_for(models.Club, "before_update")
+def _refresh_search_text(mapper, connection, club: models.Club) -> None:
+    # Counter bumps and featured changes must not reload the text columns.
+    state = inspect(club)
+    if any(state.attrs[field].history.has_changes() for field in _SEARCHED_FIELDS):
+        club.search_text = club_search_text(club)
+
+
+def rebuild_search_text(db: Session, batch_size: int = 500) -> int:
+    """Recompute search_text for every club (after an upgrade or a bulk import)."""
+    updated = 0
+    last_id = 0
+    while True:
+        clubs = (
+            db.query(models.Club)
+            .filter(models.Club.id > last_id)
+            .order_by(models.Club.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not clubs:
+            return updated
+        for club in clubs:
+            club.search_text = club_search_text(club)
+        db.commit()
+        updated += len(clubs)
+        last_id = clubs[-1].id
+
+
+def _decode_search_cursor(cursor: str) -> Tuple[float, int, datetime]:
+    data = decode_cursor(cursor)
+    try:
+        score = float(data["s"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("cursor_invalid") from exc
+    return score, cursor_int(data, "id"), cursor_datetime(data, "t")
+
+
+def search_clubs(
+    db: Session,
+    q: str,
+    *,
+    speciality: Optional[str] = None,
+    theme: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[models.Club], Optional[str]]:
+    """Return (clubs, next_cursor) matching every term of `q`.
+
+    `theme` narrows the results like the `theme` filter of crud.list_clubs.
+
+    Raises ValueError("cursor_invalid") for a malformed cursor.
+    """
+    folded = fold_text(q)
+    terms = folded.split()[:CLUB_SEARCH_MAX_TERMS]
+    if not terms:
+        return [], None
+
+    if cursor:
+        after_score, after_id, since = _decode_search_cursor(cursor)
+    else:
+        after_score, after_id = None, None
+        # Pinned in the cursor so every page ranks with the same window.
+        since = utcnow_naive().replace(microsecond=0) - timedelta(days=CLUB_SEARCH_ACTIVITY_DAYS)
+
+    search_text = models.Club.search_text
+    relevance = case((search_text.like(f"{folded}%"), 1.0), else_=0.5)
+    if db.get_bind().dialect.name == "postgresql":
+        relevance = relevance + func.word_similarity(literal(folded), search_text)
+
+    recent_posts = (
+        select(func.count(models.ClubBoardMessage.id))
+        .where(
+            models.ClubBoardMessage.club_id == models.Club.id,
+            models.ClubBoardMessage.created_at >= since,
+        )
+        .correlate(models.Club)
+        .scalar_subquery()
+    )
+    # Both activity terms saturate towards 1 so a huge club cannot bury a
+    # better textual match.
+    score = cast(
+        2 * relevance
+        + 0.5 * models.Club.member_count / (models.Club.member_count + 10.0)
+        + 0.5 * recent_posts / (recent_posts + 20.0),
+        Float,
+    ).label("score")
+
+    ranked = (
+        select(models.Club.id, score)
+        .where(and_(*(search_text.like(f"%{term}%") for term in terms)))
+    )
+    if speciality:
+        ranked = ranked.where(models.Club.speciality == speciality)
+    if theme and theme.strip():
+        like = f"%{theme.strip()}%"
+        ranked = ranked.where(or_(models.Club.theme.ilike(like), models.Club.title.ilike(like)))
+    ranked = ranked.subquery()
+
+    page = select(models.Club, ranked.c.score).join(ranked, ranked.c.id == models.Club.id)
+    if after_score is not None:
+        page = page.where(
+            or_(
+                ranked.c.score < after_score,
+                and_(ranked.c.score == after_score, ranked.c.id < after_id),
+            )
+        )
+    rows = db.execute(page.order_by(ranked.c.score.desc(), ranked.c.id.desc()).limit(limit + 1)).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    clubs = [club for club, _ in rows]
+    next_cursor = encode_cursor(s=rows[-1].score, id=clubs[-1].id, t=since) if has_more else None
+    return clubs, next_cursor
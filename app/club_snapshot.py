@@ -0,0 +1,116 @@
+"""
+Per-process cache of the viewer-independent part of the club detail page.
+
+`club_routes._build_club_detail` splits the page into a snapshot that is the
+same for every visitor (club fields, members with contribution counts,
+featured post, recent board messages) and a few viewer-specific fields. The
+snapshot is cached here by club id.
+
+Invalidation is automatic: an `after_flush` hook records the club of every
+`Club`, `ClubMember` or `ClubBoardMessage` written in the session, and the
+entries are dropped once the transaction commits. That covers board posts
+and deletions, joins, kicks, role changes, featured updates (including the
+lazy expiry in `crud.get_active_featured`) and club edits. Entries never
+outlive an active featured post, and changes that do not go through the ORM
+here (another worker, a renamed author) show up within
+CLUB_SNAPSHOT_TTL_SECONDS.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import metrics, models
+from .week_util import utcnow_naive
+
+CLUB_SNAPSHOT_TTL_SECONDS = float(os.getenv("CLUB_SNAPSHOT_TTL_SECONDS", "60"))
+CLUB_SNAPSHOT_MAX_ENTRIES = int(os.getenv("CLUB_SNAPSHOT_MAX_ENTRIES", "512"))
+
+_PENDING_KEY = "club_snapshot_dirty"
+
+_lock = threading.Lock()
+# club_id -> (valid_until monotonic, snapshot)
+_entries: "OrderedDict[int, Tuple[float, dict]]" = OrderedDict()
+# Bumped on every invalidation so a snapshot built from data read before a
+# concurrent commit is never stored after that commit dropped the entry.
+_generations: Dict[int, int] = {}
+
+
+def generation(club_id: int) -> int:
+    with _lock:
+        return _generations.get(club_id, 0)
+
+
+def get(club_id: int) -> Optional[dict]:
+    with _lock:
+        entry = _entries.get(club_id)
+        if entry is not None and entry[0] < time.monotonic():
+            del _entries[club_id]
+            entry = None
+        if entry is not None:
+            _entries.move_to_end(club_id)
+    metrics.record_cache("club_snapshot", entry is not None)
+    return entry[1] if entry is not None else None
+
+
+def put(club_id: int, snapshot: dict, built_at_generation: int, *, expires_at: Optional[datetime] = None) -> None:
+    """Store `snapshot` unless the club was invalidated since it was read."""
+    ttl = CLUB_SNAPSHOT_TTL_SECONDS
+    if expires_at is not None:
+        ttl = min(ttl, (expires_at - utcnow_naive()).total_seconds())
+    if ttl <= 0:
+        return
+    with _lock:
+        if _generations.get(club_id, 0) != built_at_generation:
+            return
+        _entries[club_id] = (time.monotonic() + ttl, snapshot)
+        _entries.move_to_end(club_id)
+        while len(_entries) > CLUB_SNAPSHOT_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def invalidate(club_id: int) -> None:
+    with _lock:
+        _entries.pop(club_id, None)
+        _generations[club_id] = _generations.get(club_id, 0) + 1
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+        _generations.clear()
+
+
+def _club_id_of(obj) -> Optional[int]:
+    if isinstance(obj, models.Club):
+        return obj.id
+    if isinstance(obj, (models.ClubMember, models.ClubBoardMessage)):
+        return obj.club_id
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_clubs(session: Session, flush_context) -> None:
+    changed = {
+        club_id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if (club_id := _club_id_of(obj)) is not None
+    }
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for club_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate(club_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
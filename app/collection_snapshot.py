@@ -0,0 +1,103 @@
+"""
+Per-process cache of the public part of a collection page.
+
+Snapshots are keyed by (collection_id, collections.version). The version
+column is bumped in the same transaction as every change that alters the
+page, so a worker that has just loaded the collection row knows exactly
+which snapshot is current, even if the change was made by another worker.
+
+An `after_flush` hook bumps the version for:
+  * any added, changed or removed `CollectionPost` (add / respond / remove,
+    reordering);
+  * title or description edits of the collection;
+  * title, slug, category or moderation changes of a post that belongs to
+    the collection (a rejected post must disappear from the page).
+
+Author renames and super-like counts are not versioned; they show up within
+COLLECTION_SNAPSHOT_TTL_SECONDS.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import event, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from . import metrics, models
+
+COLLECTION_SNAPSHOT_TTL_SECONDS = float(os.getenv("COLLECTION_SNAPSHOT_TTL_SECONDS", "60"))
+COLLECTION_SNAPSHOT_MAX_ENTRIES = int(os.getenv("COLLECTION_SNAPSHOT_MAX_ENTRIES", "512"))
+
+_COLLECTION_FIELDS = ("title", "description")
+_POST_FIELDS = ("title", "slug", "category", "moderation_status")
+
+_lock = threading.Lock()
+# (collection_id, version) -> (valid_until monotonic, snapshot)
+_entries: "OrderedDict[Tuple[int, int], Tuple[float, dict]]" = OrderedDict()
+
+
+def get(collection_id: int, version: int) -> Optional[dict]:
+    key = (collection_id, version)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del _entries[key]
+            entry = None
+        if entry is not None:
+            _entries.move_to_end(key)
+    metrics.record_cache("collection_snapshot", entry is not None)
+    return entry[1] if entry is not None else None
+
+
+def put(collection_id: int, version: int, snapshot: dict) -> None:
+    with _lock:
+        _entries[(collection_id, version)] = (time.monotonic() + COLLECTION_SNAPSHOT_TTL_SECONDS, snapshot)
+        _entries.move_to_end((collection_id, version))
+        while len(_entries) > COLLECTION_SNAPSHOT_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_versions(session: Session, flush_context) -> None:
+    collection_ids = set()
+    post_ids = set()
+    for obj in session.new:
+        if isinstance(obj, models.CollectionPost):
+            collection_ids.add(obj.collection_id)
+    for obj in session.deleted:
+        if isinstance(obj, models.CollectionPost):
+            collection_ids.add(obj.collection_id)
+    for obj in session.dirty:
+        if isinstance(obj, models.CollectionPost):
+            collection_ids.add(obj.collection_id)
+        elif isinstance(obj, models.Collection) and _changed(obj, _COLLECTION_FIELDS):
+            collection_ids.add(obj.id)
+        elif isinstance(obj, models.Post) and _changed(obj, _POST_FIELDS):
+            post_ids.add(obj.id)
+    if not collection_ids and not post_ids:
+        return
+
+    conditions = []
+    if collection_ids:
+        conditions.append(models.Collection.id.in_(collection_ids))
+    if post_ids:
+        conditions.append(models.Collection.id.in_(
+            select(models.CollectionPost.collection_id).where(models.CollectionPost.post_id.in_(post_ids))
+        ))
+    session.connection().execute(
+        update(models.Collection)
+        .where(or_(*conditions))
+        .values(version=models.Collection.version + 1)
+    )
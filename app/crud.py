@@ -2,10 +2,14 @@ import logging
 import os
 import re
 from datetime import datetime, date as date_type, timedelta
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_, and_, desc, extract, case
-from . import models, schemas
+from typing import List, NamedTuple, Optional, Dict, Any
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from sqlalchemy import event, func, insert, select, true, or_, and_, desc, extract, case
+from . import cache, models, platform_stats, schemas, user_cache
+from .cache import cached
+from . import club_search  # noqa: F401  (keeps clubs.search_text current on every Club write)
+from . import collection_snapshot  # noqa: F401  (bumps collections.version on every page change)
+from .pagination import cursor_datetime, cursor_int, decode_cursor, encode_cursor
 from .week_util import utcnow_naive
 
 logger = logging.getLogger(__name__)
@@ -35,6 +39,8 @@ def create_user_from_google(db: Session, user_data: Dict[str, Any]):
 
 def update_user(db: Session, user_id: int, user_update: Dict[str, Any]):
     db.query(models.User).filter(models.User.id == user_id).update(user_update)
+    user_cache.invalidate_on_commit(db, user_id)
+    cache.invalidate_on_commit(db, f"user:{user_id}")
     db.commit()
     return get_user_by_id(db, user_id)
 
@@ -139,11 +145,8 @@ def update_post_theme_analysis(db: Session, post_id: int, themes: list, feelings
         db.commit()
 
 def get_platform_stats(db: Session):
-    total_posts = db.query(models.Post).filter(models.Post.moderation_status == "approved").count()
-    total_authors = db.query(models.Post.user_id).filter(
-        models.Post.moderation_status == "approved"
-    ).distinct().count()
-    return {"total_posts": total_posts, "total_authors": total_authors}
+    # In-memory counters; see platform_stats for how they stay current.
+    return platform_stats.stats(db)
 
 def get_random_posts(db: Session, limit: int = 10):
     return db.query(models.Post).filter(models.Post.moderation_status == "approved").order_by(func.random()).limit(limit).all()
@@ -199,6 +202,7 @@ def get_posts_by_month_year(db: Session, user_id: int, month: int, year: int, li
         extract('year', models.Post.created_at) == year
     ).order_by(models.Post.created_at.desc()).limit(limit).all()
 
+@cached(ttl=300, tags=("user:{user_id}",))
 def get_available_months_for_user(db: Session, user_id: int):
     results = db.query(
         extract('month', models.Post.created_at).label('month'),
@@ -226,6 +230,7 @@ def get_posts_by_category_sorted(db: Session, category: str, sort_by: str = "new
         
     return query.limit(limit).all()
 
+@cached(ttl=300, tags=("posts",))
 def get_distinct_categories_used(db: Session, user_id: Optional[int] = None):
     query = db.query(models.Post.category).filter(models.Post.moderation_status == "approved")
     if user_id:
@@ -233,6 +238,7 @@ def get_distinct_categories_used(db: Session, user_id: Optional[int] = None):
     results = query.distinct().all()
     return [r[0] for r in results if r[0]]
 
+@cached(ttl=300, tags=("user:{user_id}",))
 def get_user_post_counts_by_category(db: Session, user_id: int):
     rows = db.query(
         models.Post.category,
@@ -256,9 +262,12 @@ def _get_distinct_post_terms(db: Session, field_name: str) -> List[str]:
                 terms.add(value.strip().lower())
     return sorted(terms)
 
+# Scans every analysed post: shared between workers.
+@cached(ttl=600, tags=("posts",), shared=True)
 def get_distinct_themes(db: Session):
     return _get_distinct_post_terms(db, "themes")
 
+@cached(ttl=600, tags=("posts",), shared=True)
 def get_distinct_feelings(db: Session):
     return _get_distinct_post_terms(db, "feelings")
 
@@ -339,21 +348,49 @@ def get_comments_for_moderation(db: Session, status_filter: Optional[str] = None
         query = query.filter(models.Comment.moderation_status == status_filter)
     return query.order_by(models.Comment.created_at.desc()).offset(skip).limit(limit).all()
 
-def get_moderation_stats(db: Session):
-    stats = {}
-    stats['posts_pending'] = db.query(models.Post).filter(models.Post.moderation_status == "pending").count()
-    stats['posts_flagged'] = db.query(models.Post).filter(models.Post.moderation_status == "flagged").count()
-    stats['posts_rejected'] = db.query(models.Post).filter(models.Post.moderation_status == "rejected").count()
-    stats['posts_approved'] = db.query(models.Post).filter(models.Post.moderation_status == "approved").count()
-    
-    stats['comments_pending'] = db.query(models.Comment).filter(models.Comment.moderation_status == "pending").count()
-    stats['comments_flagged'] = db.query(models.Comment).filter(models.Comment.moderation_status == "flagged").count()
-    stats['comments_rejected'] = db.query(models.Comment).filter(models.Comment.moderation_status == "rejected").count()
-    stats['comments_approved'] = db.query(models.Comment).filter(models.Comment.moderation_status == "approved").count()
-    
+MODERATION_STATUSES = ("pending", "flagged", "rejected", "approved")
+
+def _end_moderation_claim(db: Session, content_type: str, content_id: int):
+    _end_moderation_claim_bulk(db, content_type, [content_id])
+
+def _end_moderation_claim_bulk(db: Session, content_type: str, content_ids: List[int]):
+    db.query(models.ModerationClaim).filter(
+        models.ModerationClaim.content_type == content_type,
+        models.ModerationClaim.content_id.in_(content_ids),
+    ).delete(synchronize_session=False)
+
+def get_moderation_stats(db: Session, today: Optional[date_type] = None):
+    """Per-status post/comment counts plus the dashboard extras in one query.
+
+    Besides the posts_*/comments_*/total_* keys this also returns
+    `suspended_count` and `today_actions` (posts and comments moderated since
+    local midnight), each computed as a COUNT(*) FILTER (WHERE ...) column.
+    """
+    if today is None:
+        today = datetime.now().date()
+
+    def status_counts(model, prefix):
+        return select(
+            *(func.count().filter(model.moderation_status == status).label(f"{prefix}_{status}")
+              for status in MODERATION_STATUSES),
+            func.count().filter(model.moderated_at >= today).label(f"{prefix}_today"),
+        ).subquery()
+
+    posts = status_counts(models.Post, "posts")
+    comments = status_counts(models.Comment, "comments")
+    users = select(func.count().filter(models.User.is_suspended == True).label("suspended_count")).subquery()
+    row = db.execute(
+        select(posts, comments, users)
+        .select_from(posts.join(comments, true()).join(users, true()))
+    ).one()._mapping
+
+    stats = {f"{prefix}_{status}": row[f"{prefix}_{status}"]
+             for prefix in ("posts", "comments") for status in MODERATION_STATUSES}
     stats['total_pending'] = stats['posts_pending'] + stats['comments_pending']
     stats['total_flagged'] = stats['posts_flagged'] + stats['comments_flagged']
     stats['total_rejected'] = stats['posts_rejected'] + stats['comments_rejected']
+    stats['suspended_count'] = row["suspended_count"]
+    stats['today_actions'] = row["posts_today"] + row["comments_today"]
     return stats
 
 def approve_content(db: Session, content_type: str, content_id: int, moderator_id: int, reason: str = ""):
@@ -370,9 +407,6 @@ def approve_content(db: Session, content_type: str, content_id: int, moderator_i
             content.moderation_reason = reason
         if content_type == "comment":
             content.approved = True
-            
-        db.commit()
-        db.refresh(content)
 
         # Update journal
         log_entry = db.query(models.ModerationLog).filter(
@@ -392,16 +426,18 @@ def approve_content(db: Session, content_type: str, content_id: int, moderator_i
                 moderated_by=moderator_id, moderated_at=func.now()
             )
             db.add(log_entry)
-        db.commit()
+        _end_moderation_claim(db, content_type, content_id)
 
-        # Notify
+        # Notify (written in the same transaction as the status change)
         if content.user_id:
-            create_notification(
+            queue_notification(
                 db=db, user_id=content.user_id, notif_type="moderation_approved",
                 title="Conținut aprobat",
                 message=f"{'Postarea' if content_type == 'post' else 'Comentariul'} tău a fost aprobat și publicat. {reason}",
                 link=f"/piese/{content.slug}" if content_type == "post" else None
             )
+        db.commit()
+        db.refresh(content)
         return content
     return None
 
@@ -419,9 +455,6 @@ def reject_content(db: Session, content_type: str, content_id: int, moderator_id
             content.moderation_reason = reason
         if content_type == "comment":
             content.approved = False
-            
-        db.commit()
-        db.refresh(content)
 
         # Update journal
         log_entry = db.query(models.ModerationLog).filter(
@@ -441,19 +474,155 @@ def reject_content(db: Session, content_type: str, content_id: int, moderator_id
                 moderated_by=moderator_id, moderated_at=func.now()
             )
             db.add(log_entry)
-        db.commit()
+        _end_moderation_claim(db, content_type, content_id)
 
-        # Notify
+        # Notify (written in the same transaction as the status change)
         if content.user_id:
-            create_notification(
+            queue_notification(
                 db=db, user_id=content.user_id, notif_type="moderation_rejected",
                 title="Conținut respins",
                 message=f"{'Postarea' if content_type == 'post' else 'Comentariul'} tău a fost respins. Motiv: {reason}",
                 link=None
             )
+        db.commit()
+        db.refresh(content)
         return content
     return None
 
+_MODERATION_MODELS = {"post": models.Post, "comment": models.Comment}
+_BULK_DECISIONS = {"approve": "approved", "reject": "rejected"}
+_BULK_NOTIFICATIONS = {
+    "approved": ("moderation_approved", "Conținut aprobat", "{count} conținuturi aprobate",
+                 "{count} dintre postările și comentariile tale au fost aprobate și publicate."),
+    "rejected": ("moderation_rejected", "Conținut respins", "{count} conținuturi respinse",
+                 "{count} dintre postările și comentariile tale au fost respinse."),
+}
+
+def bulk_moderate_content(db: Session, items: List[schemas.BulkModerationItem], moderator_id: int) -> List[Dict[str, Any]]:
+    """Apply many approve/reject/delete decisions in one transaction.
+
+    Statuses and moderation logs are written with one UPDATE per
+    (content type, decision) plus one bulk INSERT for items without a log;
+    author notifications go through queue_notification and fold into one
+    digest per author and decision. Returns one outcome per input item, in
+    order: approved/rejected/deleted, not_found, duplicate, invalid_type or
+    invalid_action.
+
+    The UPDATEs bypass the ORM flush, so objects already loaded in `db` are
+    not refreshed.
+    """
+    outcomes = []
+    accepted: Dict[tuple, tuple] = {}
+    for item in items:
+        key = (item.content_type, item.content_id)
+        outcome = {"type": item.content_type, "id": item.content_id, "action": item.action, "status": None}
+        if item.content_type not in _MODERATION_MODELS:
+            outcome["status"] = "invalid_type"
+        elif item.action not in ("approve", "reject", "delete"):
+            outcome["status"] = "invalid_action"
+        elif key in accepted:
+            outcome["status"] = "duplicate"
+        else:
+            accepted[key] = (item.action, item.reason or "")
+        outcomes.append(outcome)
+
+    # (type, id) -> (author id, post slug)
+    found: Dict[tuple, tuple] = {}
+    for content_type, model in _MODERATION_MODELS.items():
+        ids = [content_id for (t, content_id) in accepted if t == content_type]
+        if not ids:
+            continue
+        slug = model.slug if content_type == "post" else None
+        columns = [model.id, model.user_id] + ([slug] if slug is not None else [])
+        for row in db.execute(select(*columns).where(model.id.in_(ids))):
+            found[(content_type, row[0])] = (row[1], row[2] if slug is not None else None)
+
+    decided = {key: accepted[key] for key in found}
+    for content_type, model in _MODERATION_MODELS.items():
+        to_delete = [cid for (t, cid), (action, _) in decided.items() if t == content_type and action == "delete"]
+        if to_delete:
+            # ORM deletes, like the single-item path, so relationship cascades run.
+            for content in db.query(model).filter(model.id.in_(to_delete)):
+                db.delete(content)
+
+        for action, status in _BULK_DECISIONS.items():
+            reasons = {cid: reason for (t, cid), (a, reason) in decided.items() if t == content_type and a == action}
+            if not reasons:
+                continue
+            ids = list(reasons)
+            values = {
+                model.moderation_status: status,
+                model.moderated_by: moderator_id,
+                model.moderated_at: func.now(),
+            }
+            given = {cid: reason for cid, reason in reasons.items() if reason}
+            if given:
+                values[model.moderation_reason] = case(given, value=model.id, else_=model.moderation_reason)
+            if content_type == "comment":
+                values[model.approved] = action == "approve"
+            db.query(model).filter(model.id.in_(ids)).update(values, synchronize_session=False)
+            if content_type == "post":
+                platform_stats.recount_on_commit(db)
+                cache.invalidate_on_commit(
+                    db, "posts", *(f"post:{cid}" for cid in ids),
+                    *(f"user:{found[('post', cid)][0]}" for cid in ids),
+                )
+            else:
+                cache.invalidate_on_commit(db, "comments")
+
+            log = models.ModerationLog
+            db.query(log).filter(log.content_type == content_type, log.content_id.in_(ids)).update({
+                log.human_decision: status,
+                log.human_reason: case(reasons, value=log.content_id),
+                log.moderated_by: moderator_id,
+                log.moderated_at: func.now(),
+            }, synchronize_session=False)
+            logged = set(db.scalars(
+                select(log.content_id).where(log.content_type == content_type, log.content_id.in_(ids))
+            ))
+            new_logs = [
+                {"content_type": content_type, "content_id": cid, "user_id": found[(content_type, cid)][0],
+                 "ai_decision": "approved", "human_decision": status, "human_reason": reason,
+                 "moderated_by": moderator_id}
+                for cid, reason in reasons.items() if cid not in logged
+            ]
+            if new_logs:
+                db.execute(insert(log).values(moderated_at=func.now()), new_logs)
+
+            if content_type == "post":
+                # Collection pages only list approved posts; see collection_snapshot.
+                db.query(models.Collection).filter(models.Collection.id.in_(
+                    select(models.CollectionPost.collection_id).where(models.CollectionPost.post_id.in_(ids))
+                )).update({models.Collection.version: models.Collection.version + 1}, synchronize_session=False)
+
+            notif_type, title, coalesced_title, coalesced_message = _BULK_NOTIFICATIONS[status]
+            for cid, reason in reasons.items():
+                user_id, slug = found[(content_type, cid)]
+                if not user_id:
+                    continue
+                noun = 'Postarea' if content_type == 'post' else 'Comentariul'
+                message = (f"{noun} tău a fost aprobat și publicat. {reason}" if action == "approve"
+                           else f"{noun} tău a fost respins. Motiv: {reason}")
+                queue_notification(
+                    db=db, user_id=user_id, notif_type=notif_type, title=title, message=message,
+                    link=f"/piese/{slug}" if slug and action == "approve" else None,
+                    coalesce_key="bulk_moderation",
+                    coalesced_title=coalesced_title, coalesced_message=coalesced_message,
+                )
+
+    for content_type in _MODERATION_MODELS:
+        ids = [cid for (t, cid) in decided if t == content_type]
+        if ids:
+            _end_moderation_claim_bulk(db, content_type, ids)
+    db.commit()
+
+    statuses = {"delete": "deleted", **_BULK_DECISIONS}
+    for outcome in outcomes:
+        if outcome["status"] is None:
+            key = (outcome["type"], outcome["id"])
+            outcome["status"] = statuses[decided[key][0]] if key in decided else "not_found"
+    return outcomes
+
 # ===================================
 # LIKE CRUD FUNCTIONS
 # ===================================
@@ -662,6 +831,128 @@ def create_notification(db: Session, user_id: int, notif_type: str, title: str,
     db.refresh(notification)
     return notification
 
+# Notifications queued with queue_notification() are buffered on the session
+# and written with one bulk INSERT right before the session commits, so a write
+# that fans out to N recipients costs a single transaction instead of N+1.
+_PENDING_NOTIFICATIONS_KEY = "pending_notifications"
+
+def queue_notification(
+    db: Session,
+    user_id: int,
+    notif_type: str,
+    title: str,
+    message: Optional[str] = None,
+    link: Optional[str] = None,
+    extra_data: Optional[dict] = None,
+    coalesce_key: Optional[str] = None,
+    coalesced_title: Optional[str] = None,
+    coalesced_message: Optional[str] = None,
+) -> None:
+    """Buffer a notification until the current unit of work commits.
+
+    Notifications sharing (user_id, notif_type, coalesce_key) collapse into a
+    single digest row — both within the batch and into an existing unread
+    digest — whose title/message are rendered from the `coalesced_*`
+    templates with `{count}` substituted.
+    """
+    db.info.setdefault(_PENDING_NOTIFICATIONS_KEY, []).append({
+        "user_id": user_id,
+        "type": notif_type,
+        "title": title,
+        "message": message,
+        "link": link,
+        "extra_data": dict(extra_data or {}),
+        "coalesce_key": coalesce_key,
+        "coalesced_title": coalesced_title,
+        "coalesced_message": coalesced_message,
+        "count": 1,
+    })
+
+def _render_coalesced(item: Dict[str, Any], count: int) -> tuple[str, Optional[str]]:
+    if count <= 1:
+        return item["title"], item["message"]
+    # str.replace rather than str.format: templates embed user-provided titles.
+    title = item["coalesced_title"].replace("{count}", str(count)) if item["coalesced_title"] else item["title"]
+    message = item["coalesced_message"].replace("{count}", str(count)) if item["coalesced_message"] else item["message"]
+    return title, message
+
+def _coalesce_pending_notifications(pending: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    rows = []
+    for item in pending:
+        if not item["coalesce_key"]:
+            rows.append(item)
+            continue
+        key = (item["user_id"], item["type"], item["coalesce_key"])
+        if key in merged:
+            # Latest item wins for link/extra_data; counts accumulate.
+            count = merged[key]["count"] + item["count"]
+            merged[key].update({**item, "count": count})
+        else:
+            merged[key] = dict(item)
+            rows.append(merged[key])
+    return rows
+
+def flush_notifications(db: Session) -> int:
+    """Write every queued notification; returns the number of rows touched."""
+    pending = db.info.pop(_PENDING_NOTIFICATIONS_KEY, None)
+    if not pending:
+        return 0
+    items = _coalesce_pending_notifications(pending)
+
+    # Fold coalescible items into unread digests that already exist.
+    coalescible = [i for i in items if i["coalesce_key"]]
+    if coalescible:
+        existing = db.query(models.Notification).filter(
+            models.Notification.user_id.in_({i["user_id"] for i in coalescible}),
+            models.Notification.type.in_({i["type"] for i in coalescible}),
+            models.Notification.is_read == False,
+        ).all()
+        digests = {}
+        for notification in existing:
+            key = (notification.extra_data or {}).get("coalesce_key")
+            if key:
+                digests[(notification.user_id, notification.type, key)] = notification
+        for item in coalescible:
+            digest = digests.get((item["user_id"], item["type"], item["coalesce_key"]))
+            if digest is None:
+                continue
+            item["count"] += int((digest.extra_data or {}).get("count", 1))
+            digest.title, digest.message = _render_coalesced(item, item["count"])
+            digest.link = item["link"]
+            digest.extra_data = {**item["extra_data"], "coalesce_key": item["coalesce_key"], "count": item["count"]}
+            digest.created_at = utcnow_naive()
+            item["merged"] = True
+
+    rows = []
+    for item in items:
+        if item.get("merged"):
+            continue
+        title, message = _render_coalesced(item, item["count"])
+        extra_data = item["extra_data"]
+        if item["coalesce_key"]:
+            extra_data = {**extra_data, "coalesce_key": item["coalesce_key"], "count": item["count"]}
+        rows.append({
+            "user_id": item["user_id"],
+            "type": item["type"],
+            "title": title,
+            "message": message,
+            "link": item["link"],
+            "extra_data": extra_data,
+        })
+    if rows:
+        db.execute(insert(models.Notification), rows)
+    return len(items)
+
+@event.listens_for(Session, "before_commit")
+def _flush_queued_notifications(session: Session) -> None:
+    if session.info.get(_PENDING_NOTIFICATIONS_KEY):
+        flush_notifications(session)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_queued_notifications(session: Session) -> None:
+    session.info.pop(_PENDING_NOTIFICATIONS_KEY, None)
+
 def get_notifications_for_user(db: Session, user_id: int, skip: int = 0, limit: int = 20):
     return db.query(models.Notification).filter(
         models.Notification.user_id == user_id
@@ -758,14 +1049,10 @@ def get_collection(db: Session, collection_id: int):
     return db.query(models.Collection).filter(models.Collection.id == collection_id).first()
 
 def get_collection_by_slug(db: Session, slug: str):
-    return db.query(models.Collection).options(
-        joinedload(models.Collection.owner)
-    ).filter(models.Collection.slug == slug).first()
+    return db.query(models.Collection).filter(models.Collection.slug == slug).first()
 
 def get_collections_by_owner(db: Session, owner_id: int):
-    return db.query(models.Collection).options(
-        joinedload(models.Collection.owner)
-    ).filter(
+    return db.query(models.Collection).filter(
         models.Collection.owner_id == owner_id
     ).order_by(models.Collection.created_at.desc()).all()
 
@@ -811,24 +1098,138 @@ def count_collection_posts(db: Session, collection_id: int, status: str = "accep
         models.CollectionPost.status == status,
     ).count()
 
-def get_collection_entries(
+def count_collection_posts_bulk(db: Session, collection_ids) -> Dict[int, tuple[int, int]]:
+    """{collection_id: (accepted, pending)} for every given id, in one grouped query."""
+    wanted = {cid for cid in collection_ids if cid is not None}
+    if not wanted:
+        return {}
+    counts = {cid: (0, 0) for cid in wanted}
+    rows = db.query(
+        models.CollectionPost.collection_id,
+        func.sum(case((models.CollectionPost.status == "accepted", 1), else_=0)),
+        func.sum(case((models.CollectionPost.status == "pending", 1), else_=0)),
+    ).filter(
+        models.CollectionPost.collection_id.in_(wanted),
+        models.CollectionPost.status.in_(("accepted", "pending")),
+    ).group_by(models.CollectionPost.collection_id)
+    for collection_id, accepted, pending in rows:
+        counts[collection_id] = (int(accepted or 0), int(pending or 0))
+    return counts
+
+def _collection_entries_query(
     db: Session,
     collection_id: int,
-    status: Optional[str] = "accepted",
-    approved_posts_only: bool = True,
+    status: Optional[str],
+    approved_posts_only: bool,
 ):
-    query = db.query(models.CollectionPost).options(
-        joinedload(models.CollectionPost.post).joinedload(models.Post.owner)
-    ).filter(models.CollectionPost.collection_id == collection_id)
+    # Join the post instead of joinedload-then-filter: moderation filtering
+    # happens in SQL and the joined row populates entry.post.
+    query = (
+        db.query(models.CollectionPost)
+        .join(models.CollectionPost.post)
+        .options(contains_eager(models.CollectionPost.post))
+        .filter(models.CollectionPost.collection_id == collection_id)
+    )
     if status:
         query = query.filter(models.CollectionPost.status == status)
-    entries = query.order_by(
+    if approved_posts_only and status == "accepted":
+        query = query.filter(models.Post.moderation_status == "approved")
+    return query.order_by(
         models.CollectionPost.position.asc().nullslast(),
         models.CollectionPost.created_at.desc(),
-    ).all()
-    if approved_posts_only and status == "accepted":
-        entries = [e for e in entries if e.post and e.post.moderation_status == "approved"]
-    return entries
+        models.CollectionPost.id.desc(),
+    )
+
+def get_collection_entries(
+    db: Session,
+    collection_id: int,
+    status: Optional[str] = "accepted",
+    approved_posts_only: bool = True,
+):
+    return _collection_entries_query(db, collection_id, status, approved_posts_only).all()
+
+def _collection_entry_cursor(entry: models.CollectionPost) -> str:
+    return encode_cursor(p=entry.position, c=entry.created_at, id=entry.id)
+
+def _after_collection_entry(cursor: str):
+    """Keyset condition for rows after `cursor` in (position NULLS LAST, created_at DESC, id DESC)."""
+    data = decode_cursor(cursor)
+    position = data.get("p")
+    if position is not None and not isinstance(position, int):
+        raise ValueError("cursor_invalid")
+    created_at, entry_id = cursor_datetime(data, "c"), cursor_int(data, "id")
+    cp = models.CollectionPost
+    later_in_tie = or_(cp.created_at < created_at, and_(cp.created_at == created_at, cp.id < entry_id))
+    if position is None:
+        return and_(cp.position.is_(None), later_in_tie)
+    return or_(
+        cp.position > position,
+        cp.position.is_(None),
+        and_(cp.position == position, later_in_tie),
+    )
+
+def list_collection_entries_page(
+    db: Session,
+    collection_id: int,
+    *,
+    status: Optional[str] = "accepted",
+    approved_posts_only: bool = True,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> tuple[List[models.CollectionPost], Optional[str]]:
+    """One page of get_collection_entries; returns (entries, next_cursor).
+
+    Raises ValueError("cursor_invalid") for a malformed cursor.
+    """
+    query = _collection_entries_query(db, collection_id, status, approved_posts_only)
+    if cursor:
+        query = query.filter(_after_collection_entry(cursor))
+    entries = query.limit(limit + 1).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    return entries, (_collection_entry_cursor(entries[-1]) if has_more else None)
+
+def reorder_collection_entries(
+    db: Session,
+    collection: models.Collection,
+    post_ids: List[int],
+) -> tuple[bool, Optional[str]]:
+    """Give the listed accepted posts positions 1..n in one UPDATE.
+
+    Accepted entries that are not listed lose their position and sort after
+    the ordered ones, newest first.
+    """
+    if len(set(post_ids)) != len(post_ids):
+        return False, "duplicate_posts"
+    if post_ids:
+        accepted = {
+            row[0]
+            for row in db.query(models.CollectionPost.post_id).filter(
+                models.CollectionPost.collection_id == collection.id,
+                models.CollectionPost.status == "accepted",
+                models.CollectionPost.post_id.in_(post_ids),
+            )
+        }
+        if len(accepted) != len(post_ids):
+            return False, "not_in_collection"
+        new_position = case(
+            {post_id: index for index, post_id in enumerate(post_ids, start=1)},
+            value=models.CollectionPost.post_id,
+            else_=None,
+        )
+    else:
+        new_position = None
+    db.query(models.CollectionPost).filter(
+        models.CollectionPost.collection_id == collection.id,
+        models.CollectionPost.status == "accepted",
+    ).update({models.CollectionPost.position: new_position}, synchronize_session=False)
+    # Bulk UPDATEs bypass the flush hook in collection_snapshot.
+    db.query(models.Collection).filter(models.Collection.id == collection.id).update(
+        {models.Collection.version: models.Collection.version + 1}, synchronize_session=False
+    )
+    cache.invalidate_on_commit(db, f"collection:{collection.id}")
+    db.commit()
+    return True, None
 
 def get_collection_entry(db: Session, collection_id: int, post_id: int) -> Optional[models.CollectionPost]:
     return db.query(models.CollectionPost).filter(
@@ -870,9 +1271,9 @@ def add_post_to_collection(
         existing.responded_at = None
         auto_accept = is_owner and is_author
         existing.status = "accepted" if auto_accept else "pending"
+        _notify_collection_counterparty(db, existing, collection, post, action="created")
         db.commit()
         db.refresh(existing)
-        _notify_collection_counterparty(db, existing, collection, post, action="created")
         return existing, None
 
     auto_accept = is_owner and is_author
@@ -884,9 +1285,10 @@ def add_post_to_collection(
         responded_at=(func.now() if auto_accept else None),
     )
     db.add(entry)
+    db.flush()
+    _notify_collection_counterparty(db, entry, collection, post, action="created")
     db.commit()
     db.refresh(entry)
-    _notify_collection_counterparty(db, entry, collection, post, action="created")
     return entry, None
 
 def respond_to_collection_entry(
@@ -919,9 +1321,9 @@ def respond_to_collection_entry(
 
     entry.status = "accepted" if action == "accept" else "rejected"
     entry.responded_at = func.now()
+    _notify_collection_counterparty(db, entry, collection, post, action=entry.status)
     db.commit()
     db.refresh(entry)
-    _notify_collection_counterparty(db, entry, collection, post, action=entry.status)
     return entry, None
 
 def remove_collection_entry(
@@ -947,7 +1349,7 @@ def remove_collection_entry(
 
     # Notify the other party if the accepted association is being torn down by the non-author
     if entry.status == "accepted" and user_id == owner_id and author_id != owner_id:
-        create_notification(
+        queue_notification(
             db=db,
             user_id=author_id,
             notif_type="collection_removed",
@@ -957,7 +1359,7 @@ def remove_collection_entry(
             extra_data={"collection_id": collection.id, "post_id": post.id},
         )
     elif entry.status == "accepted" and user_id == author_id and author_id != owner_id:
-        create_notification(
+        queue_notification(
             db=db,
             user_id=owner_id,
             notif_type="collection_removed",
@@ -987,13 +1389,20 @@ def _notify_collection_counterparty(
 
     if action == "created" and entry.status == "pending":
         counterparty_id = author_id if initiator_id == owner_id else owner_id
+        coalesce = {}
         if initiator_id == owner_id:
             title = "Invitație într-o colecție"
             message = f"Postarea ta \"{post.title}\" a fost propusă pentru colecția \"{collection.title}\". Acceptă sau refuză din panou."
         else:
             title = "Sugestie pentru colecția ta"
             message = f"Un autor a sugerat postarea \"{post.title}\" pentru colecția \"{collection.title}\". Acceptă sau refuză din panou."
-        create_notification(
+            # Owners of popular collections get one digest per collection.
+            coalesce = {
+                "coalesce_key": f"collection:{collection.id}:suggestions",
+                "coalesced_title": "{count} sugestii pentru colecția ta",
+                "coalesced_message": f"Colecția \"{collection.title}\" are {{count}} sugestii noi. Acceptă sau refuză din panou.",
+            }
+        queue_notification(
             db=db,
             user_id=counterparty_id,
             notif_type="collection_pending",
@@ -1001,6 +1410,7 @@ def _notify_collection_counterparty(
             message=message,
             link=f"/panou",
             extra_data={"collection_id": collection.id, "post_id": post.id, "entry_id": entry.id},
+            **coalesce,
         )
         return
 
@@ -1012,7 +1422,7 @@ def _notify_collection_counterparty(
         else:
             title = "Propunere respinsă"
             message = f"Propunerea pentru \"{post.title}\" în colecția \"{collection.title}\" a fost respinsă."
-        create_notification(
+        queue_notification(
             db=db,
             user_id=initiator_id,
             notif_type=f"collection_{action}",
@@ -1030,8 +1440,8 @@ def get_pending_approvals_for_user(db: Session, user_id: int):
       - "suggestion": author initiated, current user is the collection owner.
     """
     entries = db.query(models.CollectionPost).options(
-        joinedload(models.CollectionPost.collection).joinedload(models.Collection.owner),
-        joinedload(models.CollectionPost.post).joinedload(models.Post.owner),
+        joinedload(models.CollectionPost.collection),
+        joinedload(models.CollectionPost.post),
     ).filter(models.CollectionPost.status == "pending").all()
 
     results = []
@@ -1056,7 +1466,7 @@ def get_pending_approvals_for_user(db: Session, user_id: int):
 def get_collections_containing_post(db: Session, post_id: int):
     """Accepted public collections that contain a given post."""
     entries = db.query(models.CollectionPost).options(
-        joinedload(models.CollectionPost.collection).joinedload(models.Collection.owner)
+        joinedload(models.CollectionPost.collection)
     ).filter(
         models.CollectionPost.post_id == post_id,
         models.CollectionPost.status == "accepted",
@@ -1065,39 +1475,37 @@ def get_collections_containing_post(db: Session, post_id: int):
 
 
 def get_moderation_stats_extended(db: Session):
-    total_logs = db.query(models.ModerationLog).count()
-    pending_review_count = db.query(models.ModerationLog).filter(
-        models.ModerationLog.ai_decision == "flagged",
-        or_(
-            models.ModerationLog.human_decision == None,
-            models.ModerationLog.human_decision == "pending",
-        )
-    ).count()
-
-    average_toxicity = db.query(func.avg(models.ModerationLog.toxicity_score)).scalar()
-    max_toxicity = db.query(func.max(models.ModerationLog.toxicity_score)).scalar()
+    log = models.ModerationLog
+    human_pending = or_(log.human_decision == None, log.human_decision == "pending")
+    row = db.execute(select(
+        func.count().label("total_logs"),
+        func.count().filter(and_(log.ai_decision == "flagged", human_pending)).label("pending_review_count"),
+        func.avg(log.toxicity_score).label("average_toxicity"),
+        func.max(log.toxicity_score).label("max_toxicity"),
+        func.count().filter(log.ai_decision == "approved").label("ai_approved"),
+        func.count().filter(log.ai_decision == "flagged").label("ai_flagged"),
+        func.count().filter(log.ai_decision == "rejected").label("ai_rejected"),
+        func.count().filter(log.human_decision == "approved").label("human_approved"),
+        func.count().filter(log.human_decision == "rejected").label("human_rejected"),
+        func.count().filter(human_pending).label("human_pending"),
+    )).one()
 
     return {
-        "total_logs": total_logs,
-        "pending_review_count": pending_review_count,
+        "total_logs": row.total_logs,
+        "pending_review_count": row.pending_review_count,
         "ai_decisions": {
-            "approved": db.query(models.ModerationLog).filter(models.ModerationLog.ai_decision == "approved").count(),
-            "flagged": db.query(models.ModerationLog).filter(models.ModerationLog.ai_decision == "flagged").count(),
-            "rejected": db.query(models.ModerationLog).filter(models.ModerationLog.ai_decision == "rejected").count(),
+            "approved": row.ai_approved,
+            "flagged": row.ai_flagged,
+            "rejected": row.ai_rejected,
         },
         "human_decisions": {
-            "approved": db.query(models.ModerationLog).filter(models.ModerationLog.human_decision == "approved").count(),
-            "rejected": db.query(models.ModerationLog).filter(models.ModerationLog.human_decision == "rejected").count(),
-            "pending": db.query(models.ModerationLog).filter(
-                or_(
-                    models.ModerationLog.human_decision == "pending",
-                    models.ModerationLog.human_decision == None,
-                )
-            ).count(),
+            "approved": row.human_approved,
+            "rejected": row.human_rejected,
+            "pending": row.human_pending,
         },
         "scores": {
-            "average_toxicity": float(average_toxicity or 0),
-            "max_toxicity": float(max_toxicity or 0),
+            "average_toxicity": float(row.average_toxicity or 0),
+            "max_toxicity": float(row.max_toxicity or 0),
         },
     }
 
@@ -1154,6 +1562,19 @@ def get_super_likes_count_for_post(db: Session, post_id: int) -> int:
     return db.query(models.SuperLike).filter(models.SuperLike.post_id == post_id).count()
 
 
+def count_super_likes_bulk(db: Session, post_ids) -> Dict[int, int]:
+    """{post_id: super-like count} with one grouped query; zero counts omitted."""
+    wanted = {pid for pid in post_ids if pid is not None}
+    if not wanted:
+        return {}
+    return dict(
+        db.query(models.SuperLike.post_id, func.count(models.SuperLike.id))
+        .filter(models.SuperLike.post_id.in_(wanted))
+        .group_by(models.SuperLike.post_id)
+        .all()
+    )
+
+
 def user_super_liked_post(db: Session, user_id: int, post_id: int) -> bool:
     return (
         db.query(models.SuperLike.id)
@@ -1207,6 +1628,8 @@ def upsert_stripe_customer_id(db: Session, user_id: int, customer_id: str) -> No
     db.query(models.User).filter(models.User.id == user_id).update(
         {"stripe_customer_id": customer_id}
     )
+    user_cache.invalidate_on_commit(db, user_id)
+    cache.invalidate_on_commit(db, f"user:{user_id}")
     db.commit()
 
 
@@ -1227,6 +1650,8 @@ def set_premium_from_subscription(
             "premium_until": premium_until,
         }
     )
+    user_cache.invalidate_on_commit(db, user_id)
+    cache.invalidate_on_commit(db, f"user:{user_id}")
     db.commit()
 
 
@@ -1234,6 +1659,8 @@ def clear_stripe_subscription(db: Session, user_id: int) -> None:
     db.query(models.User).filter(models.User.id == user_id).update(
         {"stripe_subscription_id": None}
     )
+    user_cache.invalidate_on_commit(db, user_id)
+    cache.invalidate_on_commit(db, f"user:{user_id}")
     db.commit()
 
 
@@ -1253,6 +1680,8 @@ def record_stripe_event(db: Session, event_id: str, event_type: str) -> bool:
 
 CLUB_FEATURED_DURATION = timedelta(days=7)
 CLUB_VALID_SPECIALITIES = ("poezie", "proza_scurta")
+# Replies shown under each board thread before "load more replies".
+BOARD_REPLIES_PER_THREAD = int(os.getenv("BOARD_REPLIES_PER_THREAD", "3"))
 
 
 def _generate_club_slug(title: str) -> str:
@@ -1275,9 +1704,7 @@ def get_club(db: Session, club_id: int) -> Optional[models.Club]:
 
 
 def get_club_by_slug(db: Session, slug: str) -> Optional[models.Club]:
-    return db.query(models.Club).options(
-        joinedload(models.Club.owner)
-    ).filter(models.Club.slug == slug).first()
+    return db.query(models.Club).filter(models.Club.slug == slug).first()
 
 
 def list_clubs(
@@ -1288,7 +1715,7 @@ def list_clubs(
     limit: int = 50,
     offset: int = 0,
 ):
-    query = db.query(models.Club).options(joinedload(models.Club.owner))
+    query = db.query(models.Club)
     if speciality:
         query = query.filter(models.Club.speciality == speciality)
     if theme_query:
@@ -1311,12 +1738,7 @@ def get_random_club(db: Session) -> Optional[models.Club]:
     """Random club that has at least one member (always at minimum the owner)."""
     return (
         db.query(models.Club)
-        .options(joinedload(models.Club.owner))
-        .filter(
-            db.query(models.ClubMember.id)
-            .filter(models.ClubMember.club_id == models.Club.id)
-            .exists()
-        )
+        .filter(models.Club.member_count > 0)
         .order_by(func.random())
         .limit(1)
         .first()
@@ -1328,7 +1750,6 @@ def get_random_collection(db: Session) -> Optional[models.Collection]:
     isn't a dead-end to an empty page)."""
     return (
         db.query(models.Collection)
-        .options(joinedload(models.Collection.owner))
         .filter(
             db.query(models.CollectionPost.id)
             .filter(
@@ -1347,6 +1768,40 @@ def count_club_members(db: Session, club_id: int) -> int:
     return db.query(models.ClubMember).filter(models.ClubMember.club_id == club_id).count()
 
 
+def _adjust_member_count(club: models.Club, delta: int) -> None:
+    # Relative SQL update (member_count = member_count + delta), so two
+    # concurrent joins cannot overwrite each other's increment.
+    club.member_count = models.Club.member_count + delta
+
+
+def reconcile_club_member_counts(db: Session, *, dry_run: bool = False) -> Dict[int, tuple[int, int]]:
+    """Repair clubs whose stored member_count differs from club_members.
+
+    Drift can only come from writes that bypass crud (manual SQL, a user
+    deleted with ON DELETE CASCADE). Returns {club_id: (stored, actual)} for
+    every club that was (or, with dry_run, would be) corrected.
+    """
+    actual = (
+        select(func.count(models.ClubMember.id))
+        .where(models.ClubMember.club_id == models.Club.id)
+        .correlate(models.Club)
+        .scalar_subquery()
+    )
+    drifted = db.execute(
+        select(models.Club.id, models.Club.member_count, actual).where(models.Club.member_count != actual)
+    ).all()
+    fixed = {club_id: (stored, real) for club_id, stored, real in drifted}
+    if fixed and not dry_run:
+        for club_id, (_, real) in fixed.items():
+            db.query(models.Club).filter(models.Club.id == club_id).update(
+                {models.Club.member_count: real}, synchronize_session=False
+            )
+            cache.invalidate_on_commit(db, f"club:{club_id}")
+        db.commit()
+        logger.info("Reconciled member_count for %s clubs", len(fixed))
+    return fixed
+
+
 def get_club_membership(db: Session, club_id: int, user_id: int) -> Optional[models.ClubMember]:
     return db.query(models.ClubMember).filter(
         models.ClubMember.club_id == club_id,
@@ -1362,13 +1817,108 @@ def list_club_members(db: Session, club_id: int) -> List[models.ClubMember]:
     )
     return (
         db.query(models.ClubMember)
-        .options(joinedload(models.ClubMember.user))
         .filter(models.ClubMember.club_id == club_id)
         .order_by(role_priority.asc(), models.ClubMember.joined_at.asc())
         .all()
     )
 
 
+def list_club_members_with_contributions(db: Session, club_id: int) -> List[tuple[models.ClubMember, int]]:
+    """Members in list_club_members order, each with their board message count.
+
+    The counts come from one grouped subquery joined onto the member rows, so
+    the whole list costs a single round-trip.
+    """
+    contributions = (
+        db.query(
+            models.ClubBoardMessage.author_id.label("author_id"),
+            func.count(models.ClubBoardMessage.id).label("message_count"),
+        )
+        .filter(models.ClubBoardMessage.club_id == club_id)
+        .group_by(models.ClubBoardMessage.author_id)
+        .subquery()
+    )
+    role_priority = case(
+        (models.ClubMember.role == "owner", 0),
+        (models.ClubMember.role == "admin", 1),
+        else_=2,
+    )
+    rows = (
+        db.query(models.ClubMember, func.coalesce(contributions.c.message_count, 0))
+        .outerjoin(contributions, contributions.c.author_id == models.ClubMember.user_id)
+        .filter(models.ClubMember.club_id == club_id)
+        .order_by(role_priority.asc(), models.ClubMember.joined_at.asc())
+        .all()
+    )
+    return [(member, int(count)) for member, count in rows]
+
+
+def get_club_viewer_state(
+    db: Session, club_id: int, user_id: int
+) -> tuple[Optional[str], Optional[str], Optional[int]]:
+    """Return (role, pending_request_direction, pending_request_count) in one query.
+
+    The pending direction is only meaningful for non-members and the pending
+    count only for owners/admins; the other values are returned as None.
+    """
+    role = (
+        select(models.ClubMember.role)
+        .where(models.ClubMember.club_id == club_id, models.ClubMember.user_id == user_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    pending_direction = (
+        select(models.ClubJoinRequest.direction)
+        .where(
+            models.ClubJoinRequest.club_id == club_id,
+            models.ClubJoinRequest.user_id == user_id,
+            models.ClubJoinRequest.status == "pending",
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
+    pending_count = (
+        select(func.count(models.ClubJoinRequest.id))
+        .where(
+            models.ClubJoinRequest.club_id == club_id,
+            models.ClubJoinRequest.status == "pending",
+        )
+        .scalar_subquery()
+    )
+    my_role, direction, count = db.execute(select(role, pending_direction, pending_count)).one()
+    return (
+        my_role,
+        direction if my_role is None else None,
+        count if my_role in ("owner", "admin") else None,
+    )
+
+
+def get_club_page_version(db: Session, club_id: int) -> tuple:
+    """Membership and board counters of the club page (see http_cache), in one query.
+
+    Role changes show up in the admin count, ownership moves in clubs.owner_id.
+    """
+    members = (
+        select(
+            func.count(models.ClubMember.id),
+            func.count(models.ClubMember.id).filter(models.ClubMember.role == "admin"),
+            func.max(models.ClubMember.joined_at),
+        )
+        .where(models.ClubMember.club_id == club_id)
+        .subquery()
+    )
+    board = (
+        select(
+            func.count(models.ClubBoardMessage.id),
+            func.max(models.ClubBoardMessage.id),
+            func.max(models.ClubBoardMessage.updated_at),
+        )
+        .where(models.ClubBoardMessage.club_id == club_id)
+        .subquery()
+    )
+    return tuple(db.execute(select(members, board).select_from(members.join(board, true()))).one())
+
+
 def count_member_contributions(db: Session, club_id: int, user_id: int) -> int:
     return (
         db.query(models.ClubBoardMessage)
@@ -1394,6 +1944,7 @@ def create_club(db: Session, owner: models.User, data: schemas.ClubCreate) -> mo
         avatar_seed=(data.avatar_seed or "").strip() or None,
         theme=(data.theme or "").strip() or None,
         speciality=data.speciality,
+        member_count=1,
     )
     db.add(club)
     db.flush()
@@ -1465,9 +2016,10 @@ def apply_to_club(
         initiator_id=applicant.id,
     )
     db.add(request)
+    db.flush()
+    _notify_club_application_to_admins(db, club, applicant, request)
     db.commit()
     db.refresh(request)
-    _notify_club_application_to_admins(db, club, applicant, request)
     return request, None
 
 
@@ -1491,9 +2043,10 @@ def invite_to_club(
         initiator_id=inviter.id,
     )
     db.add(request)
+    db.flush()
+    _notify_club_invitation_to_target(db, club, inviter, target, request)
     db.commit()
     db.refresh(request)
-    _notify_club_invitation_to_target(db, club, inviter, target, request)
     return request, None
 
 
@@ -1530,15 +2083,16 @@ def respond_to_club_request(
                 user_id=request.user_id,
                 role="member",
             ))
+            _adjust_member_count(club, 1)
         request.status = "approved"
     else:
         request.status = "rejected"
 
     request.responded_at = utcnow_naive()
     request.responded_by = responder.id
+    _notify_club_request_outcome(db, request, action, responder)
     db.commit()
     db.refresh(request)
-    _notify_club_request_outcome(db, request, action, responder)
     return request, None
 
 
@@ -1575,9 +2129,9 @@ def kick_member(
             return False, "not_allowed"
 
     db.delete(target_membership)
-    db.commit()
+    _adjust_member_count(club, -1)
     if not is_self:
-        create_notification(
+        queue_notification(
             db=db,
             user_id=target_user_id,
             notif_type="club_kicked",
@@ -1586,6 +2140,7 @@ def kick_member(
             link=f"/cluburi/{club.slug}",
             extra_data={"club_id": club.id, "club_slug": club.slug},
         )
+    db.commit()
     return True, None
 
 
@@ -1610,9 +2165,7 @@ def update_member_role(
     if membership.role == role:
         return membership, None
     membership.role = role
-    db.commit()
-    db.refresh(membership)
-    create_notification(
+    queue_notification(
         db=db,
         user_id=target_user_id,
         notif_type="club_role_changed",
@@ -1625,6 +2178,8 @@ def update_member_role(
         link=f"/cluburi/{club.slug}",
         extra_data={"club_id": club.id, "club_slug": club.slug, "role": role},
     )
+    db.commit()
+    db.refresh(membership)
     return membership, None
 
 
@@ -1633,9 +2188,7 @@ def set_featured_post(
 ) -> tuple[Optional[models.Post], Optional[str]]:
     if club.owner_id != actor.id:
         return None, "not_allowed"
-    post = db.query(models.Post).options(joinedload(models.Post.owner)).filter(
-        models.Post.id == post_id
-    ).first()
+    post = get_post(db, post_id)
     if not post:
         return None, "post_not_found"
     if post.moderation_status != "approved":
@@ -1646,10 +2199,8 @@ def set_featured_post(
         return None, "author_not_member"
     club.featured_post_id = post.id
     club.featured_until = utcnow_naive() + CLUB_FEATURED_DURATION
-    db.commit()
-    db.refresh(club)
     if post.user_id != actor.id:
-        create_notification(
+        queue_notification(
             db=db,
             user_id=post.user_id,
             notif_type="club_featured",
@@ -1661,6 +2212,8 @@ def set_featured_post(
             link=f"/cluburi/{club.slug}",
             extra_data={"club_id": club.id, "club_slug": club.slug, "post_id": post.id},
         )
+    db.commit()
+    db.refresh(club)
     return post, None
 
 
@@ -1690,43 +2243,142 @@ def get_active_featured(db: Session, club: models.Club):
         except Exception:
             db.rollback()
         return None
-    post = db.query(models.Post).options(joinedload(models.Post.owner)).filter(
-        models.Post.id == club.featured_post_id
-    ).first()
+    post = get_post(db, club.featured_post_id)
     if not post:
         return None
     return post, club.featured_until
 
 
-def list_board_messages(
-    db: Session, club_id: int, *, limit: int = 50, offset: int = 0
-) -> List[models.ClubBoardMessage]:
-    """Return top-level messages newest-first; replies eager-loaded per message."""
+class BoardThread(NamedTuple):
+    message: models.ClubBoardMessage
+    replies: List[models.ClubBoardMessage]  # oldest first, at most reply_limit
+    reply_count: int
+    replies_cursor: Optional[str]  # for list_board_replies when more remain
+
+
+def _board_keyset(created_at: datetime, message_id: int, *, descending: bool):
+    m = models.ClubBoardMessage
+    if descending:
+        return or_(m.created_at < created_at, and_(m.created_at == created_at, m.id < message_id))
+    return or_(m.created_at > created_at, and_(m.created_at == created_at, m.id > message_id))
+
+
+def _board_cursor(message: models.ClubBoardMessage) -> str:
+    return encode_cursor(c=message.created_at, id=message.id)
+
+
+def _decode_board_cursor(cursor: str) -> tuple[datetime, int]:
+    data = decode_cursor(cursor)
+    return cursor_datetime(data, "c"), cursor_int(data, "id")
+
+
+def list_board_threads(
+    db: Session,
+    club_id: int,
+    *,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    reply_limit: int = BOARD_REPLIES_PER_THREAD,
+) -> tuple[List[BoardThread], Optional[str]]:
+    """Return (threads, next_cursor): top-level messages newest-first.
+
+    Two phases instead of a joinedload under LIMIT: one keyset query for the
+    page of top-level messages, then one IN query for the first
+    `reply_limit` replies of every thread on the page, already sorted by
+    (created_at, id) and carrying each thread's total reply count.
+    Raises ValueError("cursor_invalid") for a malformed cursor.
+    """
+    query = db.query(models.ClubBoardMessage).filter(
+        models.ClubBoardMessage.club_id == club_id,
+        models.ClubBoardMessage.parent_id.is_(None),
+    )
+    if cursor:
+        query = query.filter(_board_keyset(*_decode_board_cursor(cursor), descending=True))
     top_level = (
-        db.query(models.ClubBoardMessage)
-        .options(
-            joinedload(models.ClubBoardMessage.author),
-            joinedload(models.ClubBoardMessage.replies).joinedload(models.ClubBoardMessage.author),
+        query.order_by(models.ClubBoardMessage.created_at.desc(), models.ClubBoardMessage.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(top_level) > limit
+    top_level = top_level[:limit]
+
+    replies: Dict[int, List[models.ClubBoardMessage]] = {}
+    totals: Dict[int, int] = {}
+    if top_level and reply_limit > 0:
+        position = func.row_number().over(
+            partition_by=models.ClubBoardMessage.parent_id,
+            order_by=(models.ClubBoardMessage.created_at, models.ClubBoardMessage.id),
         )
-        .filter(
-            models.ClubBoardMessage.club_id == club_id,
-            models.ClubBoardMessage.parent_id.is_(None),
+        total = func.count(models.ClubBoardMessage.id).over(partition_by=models.ClubBoardMessage.parent_id)
+        ranked = (
+            select(
+                models.ClubBoardMessage.id,
+                position.label("position"),
+                total.label("total"),
+            )
+            .where(models.ClubBoardMessage.parent_id.in_([m.id for m in top_level]))
+            .subquery()
         )
-        .order_by(models.ClubBoardMessage.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+        rows = (
+            db.query(models.ClubBoardMessage, ranked.c.total)
+            .join(ranked, ranked.c.id == models.ClubBoardMessage.id)
+            .filter(ranked.c.position <= reply_limit)
+            .order_by(ranked.c.position)
+            .all()
+        )
+        for reply, thread_total in rows:
+            replies.setdefault(reply.parent_id, []).append(reply)
+            totals[reply.parent_id] = thread_total
+
+    threads = []
+    for message in top_level:
+        shown = replies.get(message.id, [])
+        reply_count = totals.get(message.id, 0)
+        threads.append(BoardThread(
+            message=message,
+            replies=shown,
+            reply_count=reply_count,
+            replies_cursor=_board_cursor(shown[-1]) if reply_count > len(shown) else None,
+        ))
+    next_cursor = _board_cursor(top_level[-1]) if has_more else None
+    return threads, next_cursor
+
+
+def list_board_replies(
+    db: Session,
+    parent_id: int,
+    *,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> tuple[List[models.ClubBoardMessage], Optional[str]]:
+    """Replies of one thread oldest-first, continuing after `cursor`."""
+    query = db.query(models.ClubBoardMessage).filter(models.ClubBoardMessage.parent_id == parent_id)
+    if cursor:
+        query = query.filter(_board_keyset(*_decode_board_cursor(cursor), descending=False))
+    replies = (
+        query.order_by(models.ClubBoardMessage.created_at, models.ClubBoardMessage.id)
+        .limit(limit + 1)
         .all()
     )
-    return top_level
+    has_more = len(replies) > limit
+    replies = replies[:limit]
+    return replies, (_board_cursor(replies[-1]) if has_more else None)
 
 
-def get_board_message(db: Session, message_id: int) -> Optional[models.ClubBoardMessage]:
-    return (
-        db.query(models.ClubBoardMessage)
-        .options(joinedload(models.ClubBoardMessage.author))
-        .filter(models.ClubBoardMessage.id == message_id)
-        .first()
+def get_member_roles(db: Session, club_id: int, user_ids) -> Dict[int, str]:
+    """{user_id: role} for the given users that are members of the club."""
+    wanted = {uid for uid in user_ids if uid is not None}
+    if not wanted:
+        return {}
+    rows = db.query(models.ClubMember.user_id, models.ClubMember.role).filter(
+        models.ClubMember.club_id == club_id,
+        models.ClubMember.user_id.in_(wanted),
     )
+    return {user_id: role for user_id, role in rows}
+
+
+def get_board_message(db: Session, message_id: int) -> Optional[models.ClubBoardMessage]:
+    return db.query(models.ClubBoardMessage).filter(models.ClubBoardMessage.id == message_id).first()
 
 
 def post_board_message(
@@ -1777,7 +2429,6 @@ def list_user_clubs(db: Session, user_id: int) -> List[models.Club]:
     """All clubs the user belongs to (any role)."""
     return (
         db.query(models.Club)
-        .options(joinedload(models.Club.owner))
         .join(models.ClubMember, models.ClubMember.club_id == models.Club.id)
         .filter(models.ClubMember.user_id == user_id)
         .order_by(models.Club.created_at.desc())
@@ -1788,10 +2439,7 @@ def list_user_clubs(db: Session, user_id: int) -> List[models.Club]:
 def list_user_pending_invitations(db: Session, user_id: int) -> List[models.ClubJoinRequest]:
     return (
         db.query(models.ClubJoinRequest)
-        .options(
-            joinedload(models.ClubJoinRequest.club).joinedload(models.Club.owner),
-            joinedload(models.ClubJoinRequest.user),
-        )
+        .options(joinedload(models.ClubJoinRequest.club))
         .filter(
             models.ClubJoinRequest.user_id == user_id,
             models.ClubJoinRequest.status == "pending",
@@ -1805,10 +2453,6 @@ def list_user_pending_invitations(db: Session, user_id: int) -> List[models.Club
 def list_club_pending_requests(db: Session, club_id: int) -> List[models.ClubJoinRequest]:
     return (
         db.query(models.ClubJoinRequest)
-        .options(
-            joinedload(models.ClubJoinRequest.user),
-            joinedload(models.ClubJoinRequest.initiator),
-        )
         .filter(
             models.ClubJoinRequest.club_id == club_id,
             models.ClubJoinRequest.status == "pending",
@@ -1861,7 +2505,7 @@ def _notify_club_application_to_admins(
     for m in admin_memberships:
         if m.user_id == applicant.id:
             continue
-        create_notification(
+        queue_notification(
             db=db,
             user_id=m.user_id,
             notif_type="club_application_received",
@@ -1874,6 +2518,9 @@ def _notify_club_application_to_admins(
                 "request_id": request.id,
                 "applicant_username": applicant.username,
             },
+            coalesce_key=f"club:{club.id}:applications",
+            coalesced_title="{count} cereri noi de aderare la club",
+            coalesced_message=f"Clubul „{club.title}\" are {{count}} cereri noi de aderare.",
         )
 
 
@@ -1884,7 +2531,7 @@ def _notify_club_invitation_to_target(
     target: models.User,
     request: models.ClubJoinRequest,
 ) -> None:
-    create_notification(
+    queue_notification(
         db=db,
         user_id=target.id,
         notif_type="club_invitation_received",
@@ -1929,7 +2576,7 @@ def _notify_club_request_outcome(
             message = f"{request.user.username} a refuzat invitația în clubul „{club.title}\"."
             notif_type = "club_invitation_declined"
 
-    create_notification(
+    queue_notification(
         db=db,
         user_id=target_user_id,
         notif_type=notif_type,
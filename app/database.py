@@ -1,9 +1,17 @@
 import os
+import time
+from typing import Optional
+
 from dotenv import load_dotenv
 load_dotenv()
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from . import metrics
 from .models import Base
 
 # Database connection details from environment variables (no defaults for credentials)
@@ -21,13 +29,163 @@ if not DB_USER or not DB_PASSWORD:
 
 DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL)
+# Optional read replica. DATABASE_READ_URL takes any SQLAlchemy URL (a second
+# local Postgres works as a stand-in); otherwise DB_READ_HOST/PORT/NAME reuse
+# the primary credentials. With neither set, get_read_db uses the primary.
+DB_READ_HOST = os.getenv("DB_READ_HOST")
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or (
+    f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_READ_HOST}:"
+    f"{os.getenv('DB_READ_PORT', DB_PORT)}/{os.getenv('DB_READ_NAME', DB_NAME)}"
+    if DB_READ_HOST else None
+)
+
+# Pool settings, shared by both engines (each worker process has its own pools).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() in ("true", "1", "yes")
+
+# After a user's own write, their reads stay on the primary this long so they
+# never see the replica lagging behind it.
+DB_READ_AFTER_WRITE_SECONDS = float(os.getenv("DB_READ_AFTER_WRITE_SECONDS", "10"))
+_LAST_WRITE_KEY = "db_last_write"
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def engine_options(url: str, pool_name: Optional[str] = None, is_async: bool = False) -> dict:
+    """Engine kwargs; `pool_name` labels the pool's checkout-wait metric."""
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    if not url.startswith("sqlite"):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+        if pool_name:
+            options["poolclass"] = metrics.timed_pool(AsyncAdaptedQueuePool if is_async else QueuePool, pool_name)
+    return options
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, "primary"))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+read_engine = (
+    create_engine(DATABASE_READ_URL, **engine_options(DATABASE_READ_URL, "replica")) if DATABASE_READ_URL else None
+)
+ReadSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine is not None else None
+)
+
+
+
+def async_url(url: str) -> str:
+    """The same database through its asyncio driver (asyncpg / aiosqlite)."""
+    parsed = make_url(url)
+    driver = "sqlite+aiosqlite" if parsed.get_backend_name() == "sqlite" else "postgresql+asyncpg"
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Async engines for the hot read endpoints: a request awaiting the database
+# frees the event loop instead of holding one of the threadpool workers that
+# sync routes run on. Same pool settings, but the pools are separate.
+async_engine = create_async_engine(
+    async_url(DATABASE_URL), **engine_options(DATABASE_URL, "primary_async", is_async=True)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async_read_engine = (
+    create_async_engine(
+        async_url(DATABASE_READ_URL), **engine_options(DATABASE_READ_URL, "replica_async", is_async=True)
+    )
+    if DATABASE_READ_URL else None
+)
+AsyncReadSessionLocal = (
+    async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+    if async_read_engine is not None else None
+)
+
+
+def _session_of(request: Request):
+    return request.scope.get("session")
+
+
+def recently_wrote(request: Request) -> bool:
+    session = _session_of(request)
+    last_write = session.get(_LAST_WRITE_KEY) if session is not None else None
+    if last_write is None:
+        return False
+    if time.time() - last_write < DB_READ_AFTER_WRITE_SECONDS:
+        return True
+    del session[_LAST_WRITE_KEY]  # expired: stop re-sending it in the cookie
+    return False
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_write(session: Session) -> None:
+    # Only user actions (POST/PUT/DELETE) count; GET-side bookkeeping such as
+    # page views would otherwise pin every visitor to the primary. Without a
+    # replica there is nothing to pin, and anonymous writers (comments,
+    # likes) are not pinned so they keep no session and stay publicly cached.
+    request = session.info.get("request")
+    if request is None or request.method in _SAFE_METHODS:
+        return
+    if ReadSessionLocal is None and AsyncReadSessionLocal is None:
+        return
+    client_session = _session_of(request)
+    if client_session is not None and client_session.get("user_id") is not None:
+        client_session[_LAST_WRITE_KEY] = time.time()
 
-def get_db():
-    db = SessionLocal()
+
+@event.listens_for(Session, "before_flush")
+def _refuse_replica_writes(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Write attempted through get_read_db; use get_db for writes")
+
+
+def get_db(request: Request):
+    db = SessionLocal(info={"request": request})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """Session for read-only routes: the replica, unless there is none or the
+    user wrote within DB_READ_AFTER_WRITE_SECONDS (then the primary)."""
+    factory = ReadSessionLocal
+    if factory is None or recently_wrote(request):
+        factory = SessionLocal
+    db = factory(info={"read_only": True})
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    # `info` lands on the wrapped sync Session, so the hooks above apply as is.
+    async with AsyncSessionLocal(info={"request": request}) as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of get_read_db, with the same replica and
+    read-your-writes rules."""
+    factory = AsyncReadSessionLocal
+    if factory is None or recently_wrote(request):
+        factory = AsyncSessionLocal
+    async with factory(info={"read_only": True, "primary": factory is AsyncSessionLocal}) as db:
+        yield db
+
+
+async def get_async_write_db(request: Request, read_db: AsyncSession = Depends(get_async_read_db)):
+    """Primary session for read routes that also write (page views).
+
+    When the request's reads already go to the primary (no replica, or
+    read-your-writes) this is the read session itself, opened for writes, so
+    the request holds one primary connection instead of two.
+    """
+    if read_db.info.get("primary"):
+        read_db.info.update(read_only=False, request=request)
+        yield read_db
+        return
+    async with AsyncSessionLocal(info={"request": request}) as db:
+        yield db
@@ -0,0 +1,90 @@
+"""
+Conditional GETs for the public pages.
+
+A page's ETag is a weak validator over the version counters of what it
+shows (`updated_at` columns, `collections.version`, row counts), read with
+one cheap query before the page itself is built. When the request's
+If-None-Match names the current tag the route answers 304 and skips the
+heavy queries; otherwise the tag rides on the full response.
+
+Cache-Control follows the viewer:
+  * anonymous requests (no session data) get `public, max-age=N`
+    (HTTP_CACHE_MAX_AGE unless the route passes its own), so a CDN or the
+    browser may reuse the response for N seconds and revalidate after;
+  * logged-in requests get `private, no-cache`: only the browser keeps the
+    response, and it revalidates every time because the page carries
+    viewer-specific fields (super-likes, club role...).
+Routes whose payload depends on the viewer also send `Vary: Cookie`.
+
+Every tag also covers the DB epoch (ids restart after a reinitialization)
+and HTTP_CACHE_ETAG_SALT, to be changed by a deploy that changes the shape
+of a payload.
+"""
+import hashlib
+import os
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+
+from . import auth, metrics
+
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+HTTP_CACHE_ETAG_SALT = os.getenv("HTTP_CACHE_ETAG_SALT", "")
+
+
+def weak_etag(*parts) -> str:
+    """`W/"..."` over `parts`, which must have a stable repr (ids, counts, datetimes)."""
+    digest = hashlib.blake2b(
+        repr((HTTP_CACHE_ETAG_SALT, auth.get_db_epoch(), parts)).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def ttl_epoch(seconds: float) -> int:
+    """Changes every `seconds`: folds a cache TTL into a tag, so a page read
+    from a TTL-bounded snapshot is revalidated at least that often."""
+    return int(time.time() // seconds) if seconds > 0 else time.time_ns()
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2) against the If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def is_anonymous(request: Request, current_user) -> bool:
+    # Session data (even pre-signup OAuth state) means a Set-Cookie may
+    # follow, which must never land in a shared cache.
+    return current_user is None and not request.scope.get("session")
+
+
+def conditional(
+    request: Request,
+    response: Response,
+    etag: str,
+    *,
+    public: bool,
+    max_age: Optional[int] = None,
+    vary_cookie: bool = True,
+) -> Optional[Response]:
+    """Set the validator and caching headers on `response`; returns the 304
+    to send instead when the client already holds `etag`."""
+    if public:
+        age = HTTP_CACHE_MAX_AGE if max_age is None else max_age
+        cache_control = f"public, max-age={age}" if age > 0 else "public, no-cache"
+    else:
+        cache_control = "private, no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary_cookie:
+        headers["Vary"] = "Cookie"
+    response.headers.update(headers)
+
+    matched = if_none_match(request, etag)
+    metrics.record_cache("http_etag", matched)
+    return Response(status_code=304, headers=headers) if matched else None
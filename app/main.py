@@ -1,5 +1,7 @@
 import os
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -14,7 +16,9 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from .utils import MAIN_DOMAIN, SUBDOMAIN_SUFFIX
-from .routers import auth_routes, user_routes, post_routes, message_routes, moderation_routes, api_pages, notification_routes, stats_routes, collection_routes, super_like_routes, premium_routes, club_routes
+from . import cache, metrics, platform_stats, query_stats, session_store
+from .database import AsyncSessionLocal, SessionLocal
+from .routers import auth_routes, user_routes, post_routes, message_routes, moderation_routes, api_pages, notification_routes, stats_routes, collection_routes, super_like_routes, premium_routes, club_routes, metrics_routes
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -42,7 +46,16 @@ HTTPS_ONLY = os.getenv("HTTPS_ONLY", "True").lower() in ("true", "1", "yes")
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Landing-page counters: recounted in the background so requests never pay for it.
+    check = asyncio.create_task(platform_stats.run_periodic_check(AsyncSessionLocal))
+    yield
+    check.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -57,16 +70,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Session Middleware
-app.add_middleware(
-    SessionMiddleware,
-    secret_key=SESSION_SECRET_KEY,
-    session_cookie="calimara_sess",
-    max_age=14 * 24 * 60 * 60,  # 14 days
-    same_site="lax",
-    https_only=HTTPS_ONLY,
-    domain=SUBDOMAIN_SUFFIX
-)
+# Session Middleware — signed-cookie sessions by default; SESSION_BACKEND=server
+# keeps the session in Postgres and only an opaque token in the cookie.
+SESSION_MAX_AGE = 14 * 24 * 60 * 60  # 14 days
+if session_store.SESSION_BACKEND == "server":
+    app.add_middleware(
+        session_store.ServerSessionMiddleware,
+        store=session_store.SessionStore(SessionLocal, max_age=SESSION_MAX_AGE),
+        session_cookie="calimara_sess",
+        max_age=SESSION_MAX_AGE,
+        same_site="lax",
+        https_only=HTTPS_ONLY,
+        domain=SUBDOMAIN_SUFFIX
+    )
+else:
+    app.add_middleware(
+        SessionMiddleware,
+        secret_key=SESSION_SECRET_KEY,
+        session_cookie="calimara_sess",
+        max_age=SESSION_MAX_AGE,
+        same_site="lax",
+        https_only=HTTPS_ONLY,
+        domain=SUBDOMAIN_SUFFIX
+    )
+
+# Application cache — CACHE_SHARED_BACKEND=database shares cached values and
+# invalidations between workers through Postgres.
+if cache.CACHE_SHARED_BACKEND == "database":
+    cache.app_cache.use_shared(cache.DatabaseTier(SessionLocal))
 
 # Mount legacy static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -89,6 +120,10 @@ class SubdomainMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(SubdomainMiddleware)
 
+# Added last so they wrap everything, including session-store queries.
+app.add_middleware(query_stats.QueryStatsMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # API routers
 app.include_router(auth_routes.router)
 app.include_router(user_routes.router)
@@ -102,6 +137,7 @@ app.include_router(collection_routes.router)
 app.include_router(club_routes.router)
 app.include_router(super_like_routes.router)
 app.include_router(premium_routes.router)
+app.include_router(metrics_routes.router)
 
 # React frontend — serve built assets from frontend/dist/
 FRONTEND_DIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend", "dist")
@@ -0,0 +1,181 @@
+"""
+Prometheus metrics and the `/metrics` exposition.
+
+All metrics live here so instrumented modules only call small helpers:
+
+  * `MetricsMiddleware` (installed in `main.py`): request latency histogram
+    per method, route template and status;
+  * `timed_pool()`: pool classes used by `database.py` that time how long a
+    connection checkout waits, per engine (primary, replica, async...);
+  * `llm_call(module, call)`: latency and errors of every Mistral/Anthropic
+    request (moderation, theme_analysis, category_classifier, ai_critic);
+  * `record_page_view()`: page-view ingest rate by outcome and bot-detection
+    reasons, from `statistics.record_view`;
+  * `record_cache()`: hits and misses of the in-process caches, from which
+    the hit ratio is `rate(hits) / rate(hits + misses)`; `record_cache_event()`
+    breaks down how `app.cache` served them (stale, coalesced, shared tier...).
+
+Multi-worker: with several uvicorn/gunicorn workers each process has its own
+counters. Set PROMETHEUS_MULTIPROC_DIR to an empty, writable directory
+(cleared on every deploy, before the workers start); values are then kept in
+memory-mapped files there and `/metrics` on any worker aggregates all of them.
+The variable must be in the environment before this module is imported.
+METRICS_TOKEN, when set, is required as a bearer token on `/metrics`.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from prometheus_client import (  # noqa: E402  (reads PROMETHEUS_MULTIPROC_DIR on import)
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() in ("true", "1", "yes")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+
+REQUEST_DURATION = Histogram(
+    "calimara_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+DB_POOL_CHECKOUT = Histogram(
+    "calimara_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+LLM_CALL_DURATION = Histogram(
+    "calimara_llm_call_duration_seconds",
+    "Latency of LLM / classifier API calls.",
+    ["module", "call"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+LLM_CALL_ERRORS = Counter(
+    "calimara_llm_call_errors",
+    "LLM / classifier API calls that raised.",
+    ["module", "call"],
+)
+PAGE_VIEWS = Counter(
+    "calimara_page_views",
+    "Page views ingested, by outcome (counted, duplicate, bot).",
+    ["content_type", "outcome"],
+)
+BOT_DETECTIONS = Counter(
+    "calimara_bot_detections",
+    "Bot-detection verdicts on page views (human or the detection reason).",
+    ["reason"],
+)
+CACHE_REQUESTS = Counter(
+    "calimara_cache_requests",
+    "In-process cache lookups by cache and result (hit, miss).",
+    ["cache", "result"],
+)
+CACHE_EVENTS = Counter(
+    "calimara_cache_events",
+    "app.cache events by cache (stale_served, refreshed, coalesced, shared_hit, invalidated).",
+    ["cache", "event"],
+)
+
+
+# ===================================
+# HELPERS
+# ===================================
+
+@contextmanager
+def llm_call(module: str, call: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        LLM_CALL_ERRORS.labels(module, call).inc()
+        raise
+    finally:
+        LLM_CALL_DURATION.labels(module, call).observe(time.perf_counter() - started)
+
+
+def record_page_view(content_type: str, is_bot: bool, bot_reason: Optional[str], is_duplicate: bool) -> None:
+    outcome = "bot" if is_bot else ("duplicate" if is_duplicate else "counted")
+    PAGE_VIEWS.labels(content_type, outcome).inc()
+    BOT_DETECTIONS.labels(bot_reason or "human").inc()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_cache_event(cache: str, event: str, count: int = 1) -> None:
+    CACHE_EVENTS.labels(cache, event).inc(count)
+
+
+class _TimedCheckout:
+    metrics_name = "db"
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT.labels(self.metrics_name).observe(time.perf_counter() - started)
+
+
+def timed_pool(pool_class: type, name: str) -> type:
+    """`pool_class` whose checkouts are timed under pool=`name`. Being a class
+    attribute, the name survives `engine.dispose()` recreating the pool."""
+    return type(f"Timed{pool_class.__name__}", (_TimedCheckout, pool_class), {"metrics_name": name})
+
+
+# ===================================
+# EXPOSITION
+# ===================================
+
+def render() -> bytes:
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def route_labels(scope: dict) -> tuple:
+    route = scope.get("route")
+    return scope.get("method", "-"), getattr(route, "path", None) or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware observing REQUEST_DURATION."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method, route = route_labels(scope)
+            REQUEST_DURATION.labels(method, route, str(status)).observe(time.perf_counter() - started)
+
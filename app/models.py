@@ -141,7 +141,9 @@ class Post(Base):
     view_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False) # Track post views
     
     # Moderation fields
-    moderation_status: Mapped[str] = mapped_column(String(20), default="approved", nullable=False)
+    # active_history: the previous status is loaded before a change, so
+    # platform_stats can adjust its counters even on an expired instance.
+    moderation_status: Mapped[str] = mapped_column(String(20), default="approved", nullable=False, active_history=True)
     moderation_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     toxicity_score: Mapped[Optional[float]] = mapped_column(nullable=True)
     moderated_by: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
@@ -294,6 +296,8 @@ class Collection(Base):
     title: Mapped[str] = mapped_column(String(120), nullable=False)
     slug: Mapped[str] = mapped_column(String(140), unique=True, index=True, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Bumped by app.collection_snapshot whenever the public page content changes.
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -333,6 +337,10 @@ class Club(Base):
     speciality: Mapped[str] = mapped_column(String(20), nullable=False)
     featured_post_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("posts.id", ondelete="SET NULL"), nullable=True)
     featured_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Maintained by crud on join/leave/kick; crud.reconcile_club_member_counts repairs drift.
+    member_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Folded title/theme/description for search; maintained by app.club_search.
+    search_text: Mapped[str] = mapped_column(Text, default="", server_default="", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -511,6 +519,21 @@ class ModerationLog(Base):
         return self.ai_decision == "flagged" and (self.human_decision is None or self.human_decision == "pending")
 
 
+class ModerationClaim(Base):
+    """Lease on a queued post/comment held by the moderator reviewing it.
+
+    At most one row per item (the primary key); a row whose `expires_at` has
+    passed no longer counts and is taken over by the next claim.
+    """
+    __tablename__ = "moderation_claims"
+
+    content_type: Mapped[str] = mapped_column(String(20), primary_key=True)  # 'post' or 'comment'
+    content_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    moderator_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    claimed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
 class Notification(Base):
     __tablename__ = "notifications"
 
@@ -527,6 +550,67 @@ class Notification(Base):
     user: Mapped["User"] = relationship("User", back_populates="notifications")
 
 
+class UserSession(Base):
+    """Server-side session row (only used when SESSION_BACKEND=server).
+
+    `id` is the SHA-256 of the opaque cookie value, so a leaked table does not
+    yield usable cookies. `user_id` is copied out of `data` to allow revoking
+    every session of a user.
+    """
+    __tablename__ = "user_sessions"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+    data: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+class CacheEntry(Base):
+    """Shared tier of `app.cache` (CACHE_SHARED_BACKEND=database).
+
+    `key` is the SHA-256 of the cache key; `tags` is the space-delimited tag
+    list with a leading and trailing space, so one tag matches with LIKE.
+    """
+    __tablename__ = "cache_entries"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(Text, nullable=False)  # JSON
+    tags: Mapped[str] = mapped_column(Text, default=" ", nullable=False)
+    fresh_until: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+class CacheInvalidation(Base):
+    """Tags invalidated by any worker; the others poll for new rows."""
+    __tablename__ = "cache_invalidations"
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    tag: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+class NotificationArchive(Base):
+    """Compact copy of read notifications moved out of the hot table.
+
+    Only what the history view needs is kept: no message body, no metadata.
+    Repetitive types are folded into one row per user/type/day with
+    `item_count` > 1.
+    """
+    __tablename__ = "notification_archive"
+
+    # BIGSERIAL in Postgres; SQLite only autoincrements plain INTEGER keys.
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    link: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    item_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    first_created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
 class PageView(Base):
     __tablename__ = "page_views"
 
@@ -6,6 +6,8 @@ from enum import Enum
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
+from . import metrics
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,12 @@ MODERATION_ENABLED = os.getenv("MODERATION_ENABLED", "True").lower() == "true"
 MODERATION_CLASSIFIER_MODEL = os.getenv("MODERATION_CLASSIFIER_MODEL", "mistral-moderation-2603")
 MODERATION_REVIEW_MODEL = os.getenv("MODERATION_REVIEW_MODEL", "mistral-small-latest")
 MODERATION_THRESHOLD = float(os.getenv("MODERATION_THRESHOLD", "0.2"))
+# Pass 1 sends content to Pass 2 when the classifier flags a category
+# ("classifier"), or when the weighted max category score reaches
+# MODERATION_THRESHOLD ("threshold"). Tune the latter with
+# scripts/moderation_replay.py.
+MODERATION_PASS1_RULE = os.getenv("MODERATION_PASS1_RULE", "classifier")
+MODERATION_CATEGORY_WEIGHTS: Dict[str, float] = json.loads(os.getenv("MODERATION_CATEGORY_WEIGHTS") or "{}")
 ROMANIAN_CONTEXT_AWARE = os.getenv("ROMANIAN_CONTEXT_AWARE", "True").lower() == "true"
 
 # Initialize Mistral client
@@ -99,10 +107,11 @@ def classify_content(text: str) -> Dict:
     Pass 1: Run text through Mistral Moderation 2 classifier.
     Returns dict with 'category_scores', 'categories', and 'flagged' keys.
     """
-    response = client.classifiers.moderate(
-        model=MODERATION_CLASSIFIER_MODEL,
-        inputs=[text]
-    )
+    with metrics.llm_call("moderation", "classifier"):
+        response = client.classifiers.moderate(
+            model=MODERATION_CLASSIFIER_MODEL,
+            inputs=[text]
+        )
     result = response.results[0]
 
     # Extract scores and boolean flags
@@ -124,6 +133,27 @@ def classify_content(text: str) -> Dict:
     }
 
 
+def pass1_flagged_categories(
+    classification: Dict,
+    *,
+    threshold: Optional[float] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> Dict[str, float]:
+    """Categories that send the text to Pass 2 under MODERATION_PASS1_RULE.
+
+    `threshold` and `weights` default to MODERATION_THRESHOLD and
+    MODERATION_CATEGORY_WEIGHTS; moderation_replay vectorises this rule.
+    """
+    if MODERATION_PASS1_RULE != "threshold":
+        return classification["flagged_categories"]
+    threshold = MODERATION_THRESHOLD if threshold is None else threshold
+    weights = MODERATION_CATEGORY_WEIGHTS if weights is None else weights
+    return {
+        cat: score for cat, score in classification["category_scores"].items()
+        if weights.get(cat, 1.0) * float(score or 0.0) >= threshold
+    }
+
+
 # --- Pass 2: Mistral Small 4 LLM review ---
 
 ROMANIAN_REVIEW_PROMPT = """Ești un moderator de conținut pentru Calimara, o platformă românească de microblogging pentru scriitori și poeți.
@@ -163,15 +193,16 @@ def review_content_with_llm(text: str, flagged_categories: Dict, romanian_signal
         f"Text de evaluat:\n{text}"
     )
 
-    response = client.chat.complete(
-        model=MODERATION_REVIEW_MODEL,
-        messages=[
-            {"role": "system", "content": ROMANIAN_REVIEW_PROMPT},
-            {"role": "user", "content": user_message},
-        ],
-        temperature=0.0,
-        response_format={"type": "json_object"},
-    )
+    with metrics.llm_call("moderation", "review"):
+        response = client.chat.complete(
+            model=MODERATION_REVIEW_MODEL,
+            messages=[
+                {"role": "system", "content": ROMANIAN_REVIEW_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            temperature=0.0,
+            response_format={"type": "json_object"},
+        )
 
     response_text = response.choices[0].message.content.strip()
     try:
@@ -213,7 +244,8 @@ def _moderate_text(text: str) -> ModerationResult:
         logger.info(f"Pass 1 (classifier): analyzing text ({len(text)} chars)")
         classification = classify_content(text)
 
-        if classification["is_clean"]:
+        flagged = pass1_flagged_categories(classification)
+        if not flagged:
             logger.info(f"Pass 1: CLEAN (max_score={classification['max_score']:.3f})")
             return ModerationResult(
                 status=ModerationStatus.APPROVED,
@@ -232,7 +264,6 @@ def _moderate_text(text: str) -> ModerationResult:
             "hate_speech_score": hate_score,
         }
 
-        flagged = classification["flagged_categories"]
         logger.info(f"Pass 1: FLAGGED categories={list(flagged.keys())}, proceeding to Pass 2")
 
         # --- Pass 2: LLM review ---
@@ -0,0 +1,97 @@
+"""
+Short-lived cache for the moderation dashboard counters.
+
+`crud.get_moderation_stats` and `crud.get_moderation_stats_extended` each
+compute their numbers with a single FILTER-aggregated query. The dashboard
+polls them on every refresh, so the results are additionally kept for
+MODERATION_STATS_TTL_SECONDS per worker.
+
+A commit that changes a post's or comment's moderation fields, a moderation
+log row or a user's suspension drops the cache of the worker that made it,
+so a moderator sees their own decision on the next refresh; other workers
+catch up within the TTL.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from . import crud, metrics, models
+
+MODERATION_STATS_TTL_SECONDS = float(os.getenv("MODERATION_STATS_TTL_SECONDS", "5"))
+
+_PENDING_KEY = "moderation_stats_dirty"
+
+_lock = threading.Lock()
+_entries: Dict[str, Tuple[float, dict]] = {}
+
+
+def _cached(key: str, db: Session, compute: Callable[[Session], dict]) -> dict:
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+    hit = entry is not None and entry[0] > now
+    metrics.record_cache("moderation_stats", hit)
+    if hit:
+        return entry[1]
+    value = compute(db)
+    with _lock:
+        _entries[key] = (now + MODERATION_STATS_TTL_SECONDS, value)
+    return value
+
+
+def dashboard_stats(db: Session) -> dict:
+    """crud.get_moderation_stats, cached; the key rolls over at local midnight."""
+    today = time.strftime("%Y-%m-%d")
+    return _cached(f"dashboard:{today}", db, crud.get_moderation_stats)
+
+
+def extended_stats(db: Session) -> dict:
+    """crud.get_moderation_stats_extended, cached."""
+    return _cached("extended", db, crud.get_moderation_stats_extended)
+
+
+def invalidate() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+def _touches_moderation(session: Session) -> bool:
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, (models.ModerationLog, models.Post, models.Comment)):
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, models.ModerationLog):
+            return True
+        if isinstance(obj, (models.Post, models.Comment)) and _changed(obj, ("moderation_status", "moderated_at")):
+            return True
+        if isinstance(obj, models.User) and _changed(obj, ("is_suspended",)):
+            return True
+    return False
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context) -> None:
+    if session.info.get(_PENDING_KEY):
+        return
+    if _touches_moderation(session):
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,264 @@
+"""
+Unified moderation queue over posts and comments.
+
+The queue is a UNION ALL of the posts and comments in the requested moderation
+statuses, each branch served by `idx_*_moderation_queue`
+(moderation_status, created_at, id). It is paginated with an opaque keyset
+cursor, so moderators can page past any number of items, in one of three
+orders:
+
+  - "oldest":   (created_at, content_type, id) ascending, first in first out
+  - "newest":   the same key descending
+  - "priority": toxicity score descending, then oldest first
+
+`content_type` is part of every key because post and comment ids overlap.
+
+Moderators lease items with `claim_item` / `claim_next` for
+MODERATION_CLAIM_SECONDS. While a lease is live, other moderators do not see
+the item in their queue and cannot claim it; a decision
+(`crud.approve_content` / `crud.reject_content`) or `release_item` ends it.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, literal, or_, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+
+from . import models
+from .pagination import cursor_datetime, cursor_int, decode_cursor, encode_cursor
+from .week_util import utcnow_naive
+
+MODERATION_CLAIM_SECONDS = int(os.getenv("MODERATION_CLAIM_SECONDS", "600"))
+QUEUE_ORDERS = ("oldest", "newest", "priority")
+QUEUE_STATUSES = ("pending", "flagged")
+CONTENT_TYPES = {"post": models.Post, "comment": models.Comment}
+
+
+class _Leased(NamedTuple):
+    content_type: str
+    content_id: int
+    moderator_id: int
+    expires_at: datetime
+
+
+class QueueItem(NamedTuple):
+    content_type: str
+    content: object  # models.Post or models.Comment
+    claimed_by: Optional[int]
+    claim_expires_at: Optional[datetime]
+
+
+def _branch(content_type: str, statuses: Sequence[str]):
+    model = CONTENT_TYPES[content_type]
+    return select(
+        literal(content_type).label("content_type"),
+        model.id.label("content_id"),
+        model.created_at.label("created_at"),
+        func.coalesce(model.toxicity_score, 0.0).label("score"),
+    ).where(model.moderation_status.in_(statuses))
+
+
+def _sort_keys(queue, order: str) -> List[Tuple[object, str, bool]]:
+    """(column, cursor field, descending) in significance order."""
+    newest = order == "newest"
+    keys = [
+        (queue.c.created_at, "t", newest),
+        (queue.c.content_type, "ty", newest),
+        (queue.c.content_id, "id", newest),
+    ]
+    if order == "priority":
+        keys.insert(0, (queue.c.score, "s", True))
+    return keys
+
+
+def _after(keys, values: Dict[str, object]):
+    """Rows strictly after `values` in the (mixed-direction) key order."""
+    clauses = []
+    for i, (column, field, descending) in enumerate(keys):
+        value = values[field]
+        step = column < value if descending else column > value
+        clauses.append(and_(*(col == values[f] for col, f, _ in keys[:i]), step))
+    return or_(*clauses)
+
+
+def _decode_queue_cursor(cursor: str, order: str) -> Dict[str, object]:
+    data = decode_cursor(cursor)
+    if data.get("ty") not in CONTENT_TYPES or data.get("o") != order:
+        raise ValueError("cursor_invalid")
+    values = {"t": cursor_datetime(data, "t"), "ty": data["ty"], "id": cursor_int(data, "id")}
+    if order == "priority":
+        try:
+            values["s"] = float(data["s"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError("cursor_invalid") from exc
+    return values
+
+
+def _queue_rows(
+    db: Session,
+    moderator_id: int,
+    *,
+    statuses: Sequence[str],
+    content_types: Sequence[str],
+    order: str,
+    limit: int,
+    cursor: Optional[str],
+    include_claimed: bool,
+    now: datetime,
+):
+    if order not in QUEUE_ORDERS:
+        raise ValueError("order_invalid")
+    queue = union_all(*(_branch(t, statuses) for t in content_types)).subquery("queue")
+    claim = models.ModerationClaim
+    keys = _sort_keys(queue, order)
+
+    query = (
+        select(queue, claim.moderator_id, claim.expires_at)
+        .outerjoin(claim, and_(
+            claim.content_type == queue.c.content_type,
+            claim.content_id == queue.c.content_id,
+            claim.expires_at > now,
+        ))
+    )
+    if not include_claimed:
+        query = query.where(or_(claim.moderator_id == None, claim.moderator_id == moderator_id))
+    if cursor:
+        query = query.where(_after(keys, _decode_queue_cursor(cursor, order)))
+    query = query.order_by(*(col.desc() if descending else col.asc() for col, _, descending in keys))
+    rows = db.execute(query.limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        fields = {"t": last.created_at, "ty": last.content_type, "id": last.content_id}
+        if order == "priority":
+            fields["s"] = float(last.score)
+        next_cursor = encode_cursor(o=order, **fields)
+    return rows, next_cursor
+
+
+def _hydrate(db: Session, rows) -> List[QueueItem]:
+    ids: Dict[str, List[int]] = {t: [] for t in CONTENT_TYPES}
+    for row in rows:
+        ids[row.content_type].append(row.content_id)
+    loaded = {}
+    if ids["post"]:
+        for post in db.query(models.Post).options(joinedload(models.Post.owner)).filter(models.Post.id.in_(ids["post"])):
+            loaded[("post", post.id)] = post
+    if ids["comment"]:
+        for comment in (
+            db.query(models.Comment)
+            .options(joinedload(models.Comment.commenter))
+            .filter(models.Comment.id.in_(ids["comment"]))
+        ):
+            loaded[("comment", comment.id)] = comment
+    return [
+        QueueItem(row.content_type, loaded[(row.content_type, row.content_id)], row.moderator_id, row.expires_at)
+        for row in rows
+        if (row.content_type, row.content_id) in loaded
+    ]
+
+
+def list_queue(
+    db: Session,
+    moderator_id: int,
+    *,
+    statuses: Sequence[str] = QUEUE_STATUSES,
+    content_types: Sequence[str] = tuple(CONTENT_TYPES),
+    order: str = "oldest",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_claimed: bool = False,
+) -> Tuple[List[QueueItem], Optional[str]]:
+    """Return (items, next_cursor): one page of the queue as seen by `moderator_id`.
+
+    Items leased by other moderators are left out unless `include_claimed`.
+    Raises ValueError("cursor_invalid") / ValueError("order_invalid").
+    """
+    rows, next_cursor = _queue_rows(
+        db, moderator_id, statuses=statuses, content_types=content_types, order=order,
+        limit=limit, cursor=cursor, include_claimed=include_claimed, now=utcnow_naive(),
+    )
+    return _hydrate(db, rows), next_cursor
+
+
+def _take_lease(db: Session, content_type: str, content_id: int, moderator_id: int, now: datetime) -> Optional[datetime]:
+    claim = models.ModerationClaim
+    expires_at = now + timedelta(seconds=MODERATION_CLAIM_SECONDS)
+    # Take over an expired lease or renew our own ...
+    renewed = db.execute(
+        update(claim)
+        .where(
+            claim.content_type == content_type,
+            claim.content_id == content_id,
+            or_(claim.expires_at <= now, claim.moderator_id == moderator_id),
+        )
+        .values(moderator_id=moderator_id, claimed_at=now, expires_at=expires_at)
+    ).rowcount
+    if renewed:
+        return expires_at
+    # ... or create one; the primary key makes concurrent claimers race safely.
+    try:
+        with db.begin_nested():
+            db.add(models.ModerationClaim(
+                content_type=content_type, content_id=content_id,
+                moderator_id=moderator_id, claimed_at=now, expires_at=expires_at,
+            ))
+    except IntegrityError:
+        return None
+    return expires_at
+
+
+def claim_item(db: Session, content_type: str, content_id: int, moderator_id: int) -> Optional[datetime]:
+    """Lease one item; return the lease expiry, or None if another moderator holds it."""
+    expires_at = _take_lease(db, content_type, content_id, moderator_id, utcnow_naive())
+    db.commit()
+    return expires_at
+
+
+def claim_next(
+    db: Session,
+    moderator_id: int,
+    *,
+    count: int = 10,
+    statuses: Sequence[str] = QUEUE_STATUSES,
+    content_types: Sequence[str] = tuple(CONTENT_TYPES),
+    order: str = "oldest",
+) -> List[QueueItem]:
+    """Lease up to `count` items from the head of the queue and return them.
+
+    Leases the moderator already holds are renewed; items another moderator
+    claims in the meantime are skipped.
+    """
+    now = utcnow_naive()
+    claimed = []
+    cursor = None
+    while len(claimed) < count:
+        rows, cursor = _queue_rows(
+            db, moderator_id, statuses=statuses, content_types=content_types, order=order,
+            limit=count - len(claimed), cursor=cursor, include_claimed=False, now=now,
+        )
+        for row in rows:
+            expires_at = _take_lease(db, row.content_type, row.content_id, moderator_id, now)
+            if expires_at is not None:
+                claimed.append(_Leased(row.content_type, row.content_id, moderator_id, expires_at))
+        if cursor is None:
+            break
+    db.commit()
+    return _hydrate(db, claimed)
+
+
+def release_item(db: Session, content_type: str, content_id: int, moderator_id: int) -> bool:
+    claim = models.ModerationClaim
+    released = db.execute(
+        delete(claim).where(
+            claim.content_type == content_type,
+            claim.content_id == content_id,
+            claim.moderator_id == moderator_id,
+        )
+    ).rowcount
+    db.commit()
+    return bool(released)
@@ -0,0 +1,281 @@
+"""
+Offline replay of the moderation pipeline over `moderation_logs`.
+
+Every AI-moderated post or comment leaves a log row whose `ai_details` holds
+the Pass 1 category scores and, when Pass 2 ran, its verdict; moderators'
+decisions land in `human_decision`. This module streams those rows once into
+NumPy arrays and re-scores them under other Pass 1 settings (the
+`MODERATION_PASS1_RULE=threshold` rule in `moderation.py`: weighted max
+category score >= MODERATION_THRESHOLD) without calling any API.
+
+For each setting it reports, against the human labels (rejected = harmful,
+approved = benign; unreviewed rows only count towards volume):
+
+  - Pass 1 precision/recall: what reaches Pass 2 at all. Pass 1 misses are
+    published unreviewed, so recall here is the number to protect.
+  - Final precision/recall: what ends up in the manual queue, replaying the
+    stored Pass 2 verdict. Rows Pass 2 never saw have no verdict and are
+    counted as flagged (`unknown_verdicts` says how many).
+  - Pass 2 call volume (total and per day) and the estimated LLM cost.
+
+`recommend` sweeps a threshold grid and greedily adjusts per-category weights
+to find the cheapest setting whose Pass 1 recall stays above a floor.
+"""
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .moderation import MODERATION_CATEGORIES, ROMANIAN_REVIEW_PROMPT
+
+HARMFUL, BENIGN, UNLABELLED = 1, 0, -1
+VERDICT_SAFE, VERDICT_UNSAFE, VERDICT_NONE = 1, 0, -1
+
+DEFAULT_THRESHOLDS = np.round(np.arange(0.05, 1.0, 0.05), 2)
+DEFAULT_WEIGHT_STEPS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+
+# Pass 2 cost model: system prompt + signals + text in, a short JSON verdict out.
+CHARS_PER_TOKEN = 3.5
+PASS2_OVERHEAD_CHARS = len(ROMANIAN_REVIEW_PROMPT) + 400
+PASS2_OUTPUT_TOKENS = 80
+
+
+class ReplayData(NamedTuple):
+    scores: np.ndarray       # (n, len(MODERATION_CATEGORIES)) Pass 1 category scores
+    labels: np.ndarray       # (n,) HARMFUL / BENIGN / UNLABELLED
+    verdicts: np.ndarray     # (n,) stored Pass 2 verdict, VERDICT_NONE if Pass 2 did not run
+    text_chars: np.ndarray   # (n,) length of the moderated text
+    span_days: float         # first to last log, for per-day volumes
+    skipped: int             # rows without stored category scores
+
+
+class Pricing(NamedTuple):
+    input_per_mtok: float = 0.1    # USD per million input tokens
+    output_per_mtok: float = 0.3   # USD per million output tokens
+
+
+class Evaluation(NamedTuple):
+    """Metrics for one weight vector across a threshold grid (arrays of len(thresholds))."""
+    thresholds: np.ndarray
+    weights: Dict[str, float]
+    pass2_calls: np.ndarray
+    pass2_calls_per_day: np.ndarray
+    cost: np.ndarray
+    pass1_precision: np.ndarray
+    pass1_recall: np.ndarray
+    final_precision: np.ndarray
+    final_recall: np.ndarray
+    queue_size: np.ndarray
+    unknown_verdicts: np.ndarray
+
+    def row(self, i: int) -> dict:
+        return {
+            "threshold": float(self.thresholds[i]),
+            "weights": dict(self.weights),
+            "pass2_calls": int(self.pass2_calls[i]),
+            "pass2_calls_per_day": float(self.pass2_calls_per_day[i]),
+            "cost": float(self.cost[i]),
+            "pass1_precision": float(self.pass1_precision[i]),
+            "pass1_recall": float(self.pass1_recall[i]),
+            "final_precision": float(self.final_precision[i]),
+            "final_recall": float(self.final_recall[i]),
+            "queue_size": int(self.queue_size[i]),
+            "unknown_verdicts": int(self.unknown_verdicts[i]),
+        }
+
+
+def _parse_details(raw) -> dict:
+    # log_moderation_decision stores a JSON-encoded string in the JSON column.
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return {}
+    return raw if isinstance(raw, dict) else {}
+
+
+def _label(human_decision: Optional[str]) -> int:
+    return {"rejected": HARMFUL, "approved": BENIGN}.get(human_decision, UNLABELLED)
+
+
+def _verdict(details: dict) -> int:
+    verdict = details.get("pass2_verdict")
+    if not isinstance(verdict, dict):
+        return VERDICT_NONE
+    return VERDICT_SAFE if verdict.get("safe") else VERDICT_UNSAFE
+
+
+def build_replay_data(rows: Iterable[tuple]) -> ReplayData:
+    """Vectorize (ai_details, human_decision, text_chars, created_at) rows."""
+    scores: List[List[float]] = []
+    labels, verdicts, text_chars = [], [], []
+    first: Optional[datetime] = None
+    last: Optional[datetime] = None
+    skipped = 0
+    for raw_details, human_decision, chars, created_at in rows:
+        details = _parse_details(raw_details)
+        if not any(cat in details for cat in MODERATION_CATEGORIES):
+            skipped += 1  # disabled/errored moderation or a manual log entry
+            continue
+        scores.append([float(details.get(cat) or 0.0) for cat in MODERATION_CATEGORIES])
+        labels.append(_label(human_decision))
+        verdicts.append(_verdict(details))
+        text_chars.append(chars or 0)
+        if created_at is not None:
+            first = created_at if first is None or created_at < first else first
+            last = created_at if last is None or created_at > last else last
+
+    span_days = max((last - first).total_seconds() / 86400, 1.0) if first and last else 1.0
+    return ReplayData(
+        scores=np.asarray(scores, dtype=np.float64).reshape(-1, len(MODERATION_CATEGORIES)),
+        labels=np.asarray(labels, dtype=np.int8),
+        verdicts=np.asarray(verdicts, dtype=np.int8),
+        text_chars=np.asarray(text_chars, dtype=np.float64),
+        span_days=span_days,
+        skipped=skipped,
+    )
+
+
+def load_replay_data(db: Session, *, since: Optional[datetime] = None, batch_size: int = 2000) -> ReplayData:
+    """Stream moderation_logs (server-side cursor) into a ReplayData."""
+    log = models.ModerationLog
+    post_chars = (
+        select(func.length(models.Post.title) + func.length(models.Post.content))
+        .where(models.Post.id == log.content_id)
+        .scalar_subquery()
+    )
+    comment_chars = (
+        select(func.length(models.Comment.content))
+        .where(models.Comment.id == log.content_id)
+        .scalar_subquery()
+    )
+    text_chars = func.coalesce(case((log.content_type == "post", post_chars), else_=comment_chars), literal(0))
+    query = select(log.ai_details, log.human_decision, text_chars, log.created_at).order_by(log.id)
+    if since is not None:
+        query = query.where(log.created_at >= since)
+    result = db.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+    return build_replay_data(result)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / np.maximum(den, 1), 0.0)
+
+
+def call_costs(data: ReplayData, pricing: Pricing = Pricing()) -> np.ndarray:
+    input_tokens = (PASS2_OVERHEAD_CHARS + data.text_chars) / CHARS_PER_TOKEN
+    return (input_tokens * pricing.input_per_mtok + PASS2_OUTPUT_TOKENS * pricing.output_per_mtok) / 1e6
+
+
+def _metrics(data: ReplayData, flagged: np.ndarray, costs: np.ndarray):
+    """flagged: (n, k) boolean, one column per setting."""
+    harmful = (data.labels == HARMFUL)[:, None]
+    benign = (data.labels == BENIGN)[:, None]
+    total_harmful = harmful.sum()
+
+    queued = flagged & (data.verdicts != VERDICT_SAFE)[:, None]
+    tp1, fp1 = (flagged & harmful).sum(0), (flagged & benign).sum(0)
+    tp, fp = (queued & harmful).sum(0), (queued & benign).sum(0)
+    calls = flagged.sum(0)
+    return dict(
+        pass2_calls=calls,
+        pass2_calls_per_day=calls / data.span_days,
+        cost=costs @ flagged,
+        pass1_precision=_ratio(tp1, tp1 + fp1),
+        pass1_recall=_ratio(tp1, np.full_like(tp1, total_harmful)),
+        final_precision=_ratio(tp, tp + fp),
+        final_recall=_ratio(tp, np.full_like(tp, total_harmful)),
+        queue_size=queued.sum(0),
+        unknown_verdicts=(flagged & (data.verdicts == VERDICT_NONE)[:, None]).sum(0),
+    )
+
+
+def _weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    return np.array([weights.get(cat, 1.0) for cat in MODERATION_CATEGORIES])
+
+
+def evaluate(
+    data: ReplayData,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    weights: Optional[Dict[str, float]] = None,
+    pricing: Pricing = Pricing(),
+) -> Evaluation:
+    weights = dict(weights or {})
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    effective = (data.scores * _weight_vector(weights)).max(axis=1, initial=0.0)
+    flagged = effective[:, None] >= thresholds[None, :]
+    return Evaluation(thresholds=thresholds, weights=weights, **_metrics(data, flagged, call_costs(data, pricing)))
+
+
+def evaluate_current(data: ReplayData, pricing: Pricing = Pricing()) -> dict:
+    """Metrics of what the logged pipeline actually did (the baseline)."""
+    flagged = (data.verdicts != VERDICT_NONE)[:, None]
+    metrics = _metrics(data, flagged, call_costs(data, pricing))
+    return {key: float(value[0]) for key, value in metrics.items()}
+
+
+def _best_index(evaluation: Evaluation, min_recall: float) -> int:
+    """Cheapest setting meeting the recall floor (ties: better final precision)."""
+    ok = evaluation.pass1_recall >= min_recall
+    if not ok.any():
+        return int(np.lexsort((-evaluation.pass2_calls, evaluation.pass1_recall))[-1])
+    candidates = np.flatnonzero(ok)
+    order = np.lexsort((-evaluation.final_precision[candidates], evaluation.pass2_calls[candidates]))
+    return int(candidates[order[0]])
+
+
+def recommend(
+    data: ReplayData,
+    *,
+    min_recall: float = 0.95,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    weight_steps: Sequence[float] = DEFAULT_WEIGHT_STEPS,
+    rounds: int = 2,
+    pricing: Pricing = Pricing(),
+) -> dict:
+    """Pick threshold and per-category weights by greedy coordinate search.
+
+    Each candidate weight vector is evaluated over the whole threshold grid at
+    once; a category's weight changes only if that lowers Pass 2 volume while
+    keeping Pass 1 recall >= `min_recall`.
+    """
+    def score(evaluation: Evaluation):
+        i = _best_index(evaluation, min_recall)
+        meets = evaluation.pass1_recall[i] >= min_recall
+        return (meets, evaluation.pass1_recall[i] if not meets else 0.0,
+                -evaluation.pass2_calls[i], evaluation.final_precision[i]), i
+
+    weights = {cat: 1.0 for cat in MODERATION_CATEGORIES}
+    best = evaluate(data, thresholds, weights, pricing)
+    best_key, _ = score(best)
+    for _ in range(rounds):
+        improved = False
+        for cat in MODERATION_CATEGORIES:
+            for step in weight_steps:
+                if step == weights[cat]:
+                    continue
+                trial = evaluate(data, thresholds, {**weights, cat: step}, pricing)
+                key, _ = score(trial)
+                if key > best_key:
+                    best, best_key, weights = trial, key, {**weights, cat: step}
+                    improved = True
+        if not improved:
+            break
+    _, i = score(best)
+    row = best.row(i)
+    row["weights"] = {cat: w for cat, w in weights.items() if w != 1.0}
+    row["meets_min_recall"] = bool(best.pass1_recall[i] >= min_recall)
+    return row
+
+
+def export_config(recommendation: dict) -> Dict[str, str]:
+    """Environment settings that make `moderation.py` apply `recommendation`."""
+    return {
+        "MODERATION_PASS1_RULE": "threshold",
+        "MODERATION_THRESHOLD": f"{recommendation['threshold']:.2f}",
+        "MODERATION_CATEGORY_WEIGHTS": json.dumps(recommendation["weights"], sort_keys=True),
+    }
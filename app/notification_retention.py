@@ -0,0 +1,192 @@
+"""
+Retention job for the `notifications` table.
+
+Read notifications older than the retention window are moved into
+`notification_archive` in small batches: each batch is its own short
+transaction, rows are picked in id order with `FOR UPDATE SKIP LOCKED` so a
+user marking notifications as read is never blocked, and the job sleeps
+between batches to keep replication/IO pressure low. Repetitive types are
+collapsed into one archive row per user/type/day.
+
+Run it from `scripts/archive_notifications.py`.
+"""
+import os
+import json
+import time
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .week_util import utcnow_naive
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.getenv("NOTIFICATION_ARCHIVE_BATCH_SIZE", "500"))
+NOTIFICATION_ARCHIVE_PAUSE_SECONDS = float(os.getenv("NOTIFICATION_ARCHIVE_PAUSE_SECONDS", "0.2"))
+
+# Types that arrive in bursts and carry little information individually.
+DEFAULT_DIGEST_TYPES = frozenset({
+    "club_application_received",
+    "collection_pending",
+    "collection_accepted",
+    "collection_rejected",
+    "moderation_queue",
+})
+
+# Rough per-row overhead (tuple header, item pointer, fixed-width columns and
+# one index entry per index) used to estimate the space a batch frees up.
+_NOTIFICATION_ROW_OVERHEAD = 24 + 4 + 4 + 4 + 1 + 8 + 3 * 16
+_ARCHIVE_ROW_OVERHEAD = 24 + 4 + 8 + 4 + 4 + 3 * 8 + 2 * 16
+
+
+@dataclass
+class ArchiveReport:
+    scanned: int = 0
+    archived_rows: int = 0
+    digest_rows: int = 0
+    batches: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return max(self.bytes_before - self.bytes_after, 0)
+
+    def format(self) -> str:
+        lines = [
+            f"Notifications moved:   {self.scanned}",
+            f"Archive rows written:  {self.archived_rows} ({self.digest_rows} digests)",
+            f"Batches:               {self.batches}",
+            f"Bytes reclaimed (est): {self.bytes_reclaimed}",
+        ]
+        for notif_type, count in sorted(self.by_type.items(), key=lambda kv: (-kv[1], kv[0])):
+            lines.append(f"  {notif_type:<32} {count}")
+        return "\n".join(lines)
+
+
+def _text_bytes(value: Optional[str]) -> int:
+    return len(value.encode("utf-8")) if value else 0
+
+
+def _notification_bytes(notification: models.Notification) -> int:
+    return (
+        _NOTIFICATION_ROW_OVERHEAD
+        + _text_bytes(notification.type)
+        + _text_bytes(notification.title)
+        + _text_bytes(notification.message)
+        + _text_bytes(notification.link)
+        + _text_bytes(json.dumps(notification.extra_data or {}))
+    )
+
+
+def _archive_bytes(row: dict) -> int:
+    return _ARCHIVE_ROW_OVERHEAD + _text_bytes(row["type"]) + _text_bytes(row["title"]) + _text_bytes(row["link"])
+
+
+def _compact(notifications: Iterable[models.Notification], digest_types: frozenset) -> List[dict]:
+    rows: List[dict] = []
+    digests: Dict[tuple, dict] = {}
+    for n in notifications:
+        created_at = n.created_at or utcnow_naive()
+        if n.type in digest_types:
+            key = (n.user_id, n.type, created_at.date())
+            digest = digests.get(key)
+            if digest is not None:
+                digest["item_count"] += int((n.extra_data or {}).get("count", 1))
+                digest["first_created_at"] = min(digest["first_created_at"], created_at)
+                if created_at >= digest["last_created_at"]:
+                    digest["last_created_at"] = created_at
+                    digest["link"] = n.link
+                continue
+        row = {
+            "user_id": n.user_id,
+            "type": n.type,
+            "title": n.title,
+            "link": n.link,
+            "item_count": int((n.extra_data or {}).get("count", 1)),
+            "first_created_at": created_at,
+            "last_created_at": created_at,
+        }
+        if n.type in digest_types:
+            digests[(n.user_id, n.type, created_at.date())] = row
+        rows.append(row)
+    return rows
+
+
+def archive_read_notifications(
+    db: Session,
+    *,
+    older_than_days: int = NOTIFICATION_RETENTION_DAYS,
+    batch_size: int = NOTIFICATION_ARCHIVE_BATCH_SIZE,
+    pause_seconds: float = NOTIFICATION_ARCHIVE_PAUSE_SECONDS,
+    digest_types: Iterable[str] = DEFAULT_DIGEST_TYPES,
+    max_batches: Optional[int] = None,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> ArchiveReport:
+    """Move read notifications older than `older_than_days` into the archive.
+
+    Digests are formed per batch, so a burst split across two batches may
+    produce two archive rows for the same day; that is harmless for display.
+    With `dry_run` every batch is rolled back and the report shows what would
+    have moved.
+    """
+    cutoff = (now or utcnow_naive()) - timedelta(days=older_than_days)
+    digest_types = frozenset(digest_types)
+    report = ArchiveReport()
+    last_id = 0
+
+    while max_batches is None or report.batches < max_batches:
+        batch = db.execute(
+            select(models.Notification)
+            .where(
+                models.Notification.id > last_id,
+                models.Notification.is_read == True,
+                models.Notification.created_at < cutoff,
+            )
+            .order_by(models.Notification.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not batch:
+            db.rollback()
+            break
+
+        last_id = batch[-1].id
+        rows = _compact(batch, digest_types)
+        report.batches += 1
+        report.scanned += len(batch)
+        report.archived_rows += len(rows)
+        report.digest_rows += sum(1 for r in rows if r["item_count"] > 1)
+        report.bytes_before += sum(_notification_bytes(n) for n in batch)
+        report.bytes_after += sum(_archive_bytes(r) for r in rows)
+        for n in batch:
+            report.by_type[n.type] = report.by_type.get(n.type, 0) + 1
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.execute(insert(models.NotificationArchive), rows)
+            db.execute(
+                delete(models.Notification)
+                .where(models.Notification.id.in_([n.id for n in batch]))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        for n in batch:
+            db.expunge(n)
+        logger.info("Archived notification batch %s (%s rows, up to id %s)", report.batches, len(batch), last_id)
+
+        if len(batch) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return report
@@ -0,0 +1,44 @@
+"""
+Opaque keyset cursors.
+
+A cursor is the sort key of the last row of a page, JSON-encoded and
+base64url'd so clients treat it as an opaque string. Decoding errors raise
+ValueError("cursor_invalid"); routers turn that into a 400.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+
+def encode_cursor(**values: Any) -> str:
+    raw = json.dumps(
+        {k: v.isoformat() if isinstance(v, datetime) else v for k, v in values.items()},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError as exc:  # binascii.Error and JSONDecodeError included
+        raise ValueError("cursor_invalid") from exc
+    if not isinstance(data, dict):
+        raise ValueError("cursor_invalid")
+    return data
+
+
+def cursor_datetime(data: Dict[str, Any], key: str) -> datetime:
+    try:
+        return datetime.fromisoformat(data[key])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("cursor_invalid") from exc
+
+
+def cursor_int(data: Dict[str, Any], key: str) -> int:
+    try:
+        return int(data[key])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("cursor_invalid") from exc
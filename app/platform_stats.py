@@ -0,0 +1,179 @@
+"""
+Landing-page platform counters (approved posts, authors), kept in memory.
+
+`stats()` answers without a query. A commit that inserts, approves,
+rejects, reassigns or deletes a post adjusts the counters of the worker
+that made it: deltas are collected on flush and applied on commit. When
+they cannot be told the next read recomputes instead: bulk UPDATEs (those
+of `crud.bulk_moderate_content`) call `recount_on_commit()`, and a flush
+that deletes a user, whose posts may go with it in the database only,
+marks a recount itself.
+
+Other workers never see those deltas, so every PLATFORM_STATS_CHECK_SECONDS
+the counters are recomputed with one grouped query and corrected when they
+drifted. `main.py` runs the check in the background; a process without it
+(scripts, tests) recomputes inline once the last check is twice that old.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from . import metrics, models
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_STATS_CHECK_SECONDS = float(os.getenv("PLATFORM_STATS_CHECK_SECONDS", "300"))
+
+_PENDING_KEY = "platform_stats_deltas"
+_RECOUNT = "recount"
+_UNKNOWN = object()
+
+_lock = threading.Lock()
+_total_posts = 0
+_by_author: Dict[int, int] = {}  # approved posts per author, zeros dropped
+_checked_at: Optional[float] = None  # time.monotonic() of the last recount
+_stale = False
+
+
+def _snapshot() -> dict:
+    return {"total_posts": _total_posts, "total_authors": len(_by_author)}
+
+
+def stats(db: Session) -> dict:
+    """{"total_posts", "total_authors"} over approved posts."""
+    with _lock:
+        fresh = (
+            _checked_at is not None and not _stale
+            and time.monotonic() - _checked_at < 2 * PLATFORM_STATS_CHECK_SECONDS
+        )
+        value = _snapshot() if fresh else None
+    metrics.record_cache("platform_stats", fresh)
+    return value if fresh else recount(db)
+
+
+def recount(db: Session) -> dict:
+    """Recompute the counters from the posts table (the consistency check)."""
+    global _total_posts, _by_author, _checked_at, _stale
+    rows = db.execute(
+        select(models.Post.user_id, func.count())
+        .where(models.Post.moderation_status == "approved")
+        .group_by(models.Post.user_id)
+    ).all()
+    by_author = {user_id: count for user_id, count in rows if user_id is not None}
+    total = sum(count for _, count in rows)
+    with _lock:
+        if _checked_at is not None and not _stale and (_total_posts, _by_author) != (total, by_author):
+            logger.info(
+                "Platform counters drifted: posts %s -> %s, authors %s -> %s",
+                _total_posts, total, len(_by_author), len(by_author),
+            )
+        _total_posts, _by_author = total, by_author
+        _checked_at = time.monotonic()
+        _stale = False
+        return _snapshot()
+
+
+async def run_periodic_check(session_factory) -> None:
+    """Recount every PLATFORM_STATS_CHECK_SECONDS, forever (an asyncio task)."""
+    while True:
+        try:
+            async with session_factory() as db:
+                await db.run_sync(recount)
+        except Exception:
+            logger.warning("Platform counters check failed", exc_info=True)
+        await asyncio.sleep(PLATFORM_STATS_CHECK_SECONDS)
+
+
+def clear() -> None:
+    global _total_posts, _by_author, _checked_at, _stale
+    with _lock:
+        _total_posts, _by_author, _checked_at, _stale = 0, {}, None, False
+
+
+def recount_on_commit(db: Session) -> None:
+    """Recompute on the next read once `db` commits (for Query.update() paths)."""
+    db.info[_PENDING_KEY] = _RECOUNT
+
+
+def _apply(deltas: Counter) -> None:
+    global _total_posts, _stale
+    with _lock:
+        if _checked_at is None:
+            return  # nothing loaded yet
+        for user_id, delta in deltas.items():
+            if not delta:
+                continue
+            _total_posts += delta
+            count = _by_author.get(user_id, 0) + delta
+            if count > 0:
+                _by_author[user_id] = count
+            else:
+                _by_author.pop(user_id, None)
+                if count < 0:
+                    _stale = True
+
+
+def _values(state, key):
+    """(before, after) of a loaded attribute, _UNKNOWN where not loaded."""
+    history = state.attrs[key].history
+    unchanged = history.unchanged[0] if history.unchanged else _UNKNOWN
+    before = history.deleted[0] if history.deleted else unchanged
+    after = history.added[0] if history.added else unchanged
+    return before, after
+
+
+def _post_deltas(session: Session, deltas: Counter) -> bool:
+    """Add the approved-post deltas of this flush; False when they cannot be told."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, models.User) and obj in session.deleted:
+            return False  # its posts go with it, possibly in the database only
+        if not isinstance(obj, models.Post):
+            continue
+        state = inspect(obj)
+        status_before, status_after = _values(state, "moderation_status")
+        user_before, user_after = _values(state, "user_id")
+        if obj in session.new:
+            status_before = user_before = None
+        elif obj in session.deleted:
+            status_after = user_after = None
+        elif status_before == status_after and user_before == user_after:
+            continue
+        if _UNKNOWN in (status_before, status_after, user_before, user_after):
+            return False
+        if status_before == "approved":
+            deltas[user_before] -= 1
+        if status_after == "approved":
+            deltas[user_after] += 1
+    return True
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context) -> None:
+    pending = session.info.get(_PENDING_KEY)
+    if pending is _RECOUNT:
+        return
+    deltas = Counter() if pending is None else pending
+    session.info[_PENDING_KEY] = deltas if _post_deltas(session, deltas) else _RECOUNT
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session) -> None:
+    global _stale
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is _RECOUNT:
+        with _lock:
+            _stale = True
+    elif pending:
+        _apply(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,281 @@
+"""
+Per-request SQL instrumentation.
+
+`QueryStatsMiddleware` (installed outermost in `main.py`) opens a
+`RequestQueries` record for every HTTP request; engine-level cursor hooks,
+which fire for the sync engines and the async ones alike, add each statement
+to it. When the response starts the record is tagged with the matched route
+template (`GET /api/blog/{username}`) and:
+
+  * folded into a bounded per-route sample window served by
+    `/api/stats/queries` (admin) with p50/p95/p99 of statement count, DB time
+    and request time, the worst repeated statements and the slowest ones;
+  * logged as one JSON line on the `app.query_stats` logger: INFO when the
+    request looks like an N+1 (one statement shape repeated at least
+    QUERY_STATS_N_PLUS_ONE times) or issued QUERY_STATS_LOG_MIN_QUERIES
+    statements, DEBUG otherwise; single statements slower than
+    QUERY_STATS_SLOW_MS are logged at WARNING as they finish;
+  * with QUERY_STATS_HEADERS=true (debug only), returned as X-DB-Queries,
+    X-DB-Time-Ms and X-DB-Repeated response headers.
+
+A statement's "shape" is its SQL text with whitespace collapsed and expanded
+IN lists folded, so the same lookup with different ids counts as one shape.
+Samples are per worker process.
+"""
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "True").lower() in ("true", "1", "yes")
+QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", "False").lower() in ("true", "1", "yes")
+QUERY_STATS_SLOW_MS = float(os.getenv("QUERY_STATS_SLOW_MS", "100"))
+QUERY_STATS_N_PLUS_ONE = int(os.getenv("QUERY_STATS_N_PLUS_ONE", "5"))
+QUERY_STATS_LOG_MIN_QUERIES = int(os.getenv("QUERY_STATS_LOG_MIN_QUERIES", "25"))
+QUERY_STATS_SAMPLES = int(os.getenv("QUERY_STATS_SAMPLES", "500"))
+QUERY_STATS_TOP = 5
+
+_START_KEY = "query_stats_start"
+_SHAPE_MAX_CHARS = 500
+_PARAM = r"(?:\?|%\(\w+\)s|\$\d+)"
+_IN_LIST = re.compile(rf"\bIN ?\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_current: ContextVar[Optional["RequestQueries"]] = ContextVar("request_queries", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("IN (?, ...)", shape)[:_SHAPE_MAX_CHARS]
+
+
+class RequestQueries:
+    """Statements issued while handling one request."""
+
+    __slots__ = ("scope", "count", "db_seconds", "shapes", "slowest")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.slowest: List[Tuple[float, str]] = []  # min-heap of the QUERY_STATS_TOP slowest
+
+    def record(self, statement: str, seconds: float) -> None:
+        shape = statement_shape(statement)
+        self.count += 1
+        self.db_seconds += seconds
+        self.shapes[shape] += 1
+        if len(self.slowest) < QUERY_STATS_TOP:
+            heapq.heappush(self.slowest, (seconds, shape))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, shape))
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Shapes issued at least `threshold` times, most repeated first."""
+        threshold = QUERY_STATS_N_PLUS_ONE if threshold is None else threshold
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def slowest_statements(self) -> List[Tuple[str, float]]:
+        return [(shape, seconds * 1000) for seconds, shape in sorted(self.slowest, reverse=True)]
+
+
+def current() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+def route_of(scope: Optional[dict]) -> str:
+    """`METHOD /route/{template}`; unmatched paths share one bucket."""
+    if not scope:
+        return "-"
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope.get('method', '-')} {path}"
+
+
+# ===================================
+# ENGINE HOOKS
+# ===================================
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _finish_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get(_START_KEY)
+    if stats is None or not starts:
+        return
+    seconds = time.perf_counter() - starts.pop()
+    stats.record(statement, seconds)
+    if seconds * 1000 >= QUERY_STATS_SLOW_MS:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "route": route_of(stats.scope),
+            "ms": round(seconds * 1000, 2),
+            "statement": statement_shape(statement),
+        }))
+
+
+@event.listens_for(Engine, "handle_error")
+def _drop_failed_statement(exception_context):
+    conn = exception_context.connection
+    starts = conn.info.get(_START_KEY) if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+# ===================================
+# PER-ROUTE AGGREGATES
+# ===================================
+
+class _RouteStats:
+    __slots__ = ("requests", "samples", "repeated", "slowest")
+
+    def __init__(self):
+        self.requests = 0
+        self.samples: Deque[Tuple[int, float, float]] = deque(maxlen=QUERY_STATS_SAMPLES)
+        self.repeated: Counter = Counter()  # shape -> requests in which it repeated
+        self.slowest: Dict[str, float] = {}  # shape -> worst ms seen
+
+
+_routes: Dict[str, _RouteStats] = {}
+_lock = threading.Lock()
+
+
+def record_request(route: str, stats: RequestQueries, duration_seconds: float) -> None:
+    repeated = stats.repeated()
+    with _lock:
+        entry = _routes.get(route)
+        if entry is None:
+            entry = _routes[route] = _RouteStats()
+        entry.requests += 1
+        entry.samples.append((stats.count, stats.db_seconds * 1000, duration_seconds * 1000))
+        entry.repeated.update(shape for shape, _ in repeated)
+        for shape, ms in stats.slowest_statements():
+            if ms > entry.slowest.get(shape, 0.0):
+                entry.slowest[shape] = ms
+        if len(entry.slowest) > QUERY_STATS_TOP:
+            entry.slowest = dict(heapq.nlargest(QUERY_STATS_TOP, entry.slowest.items(), key=lambda kv: kv[1]))
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    return values[max(1, math.ceil(pct / 100 * len(values))) - 1]
+
+
+def _distribution(values: List[float]) -> dict:
+    ordered = sorted(values)
+    return {
+        "p50": round(_percentile(ordered, 50), 2),
+        "p95": round(_percentile(ordered, 95), 2),
+        "p99": round(_percentile(ordered, 99), 2),
+        "max": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+def summary() -> List[dict]:
+    """Per-route percentiles over the recent sample window, worst DB time first."""
+    with _lock:
+        snapshot = [
+            (route, entry.requests, list(entry.samples), entry.repeated.most_common(QUERY_STATS_TOP),
+             sorted(entry.slowest.items(), key=lambda kv: kv[1], reverse=True))
+            for route, entry in _routes.items()
+        ]
+    rows = []
+    for route, requests, samples, repeated, slowest in snapshot:
+        rows.append({
+            "route": route,
+            "requests": requests,
+            "sampled": len(samples),
+            "queries": _distribution([s[0] for s in samples]),
+            "db_ms": _distribution([s[1] for s in samples]),
+            "duration_ms": _distribution([s[2] for s in samples]),
+            "n_plus_one": [{"statement": shape, "requests": n} for shape, n in repeated],
+            "slowest": [{"statement": shape, "ms": round(ms, 2)} for shape, ms in slowest],
+        })
+    rows.sort(key=lambda row: row["db_ms"]["p95"], reverse=True)
+    return rows
+
+
+def reset() -> None:
+    with _lock:
+        _routes.clear()
+
+
+# ===================================
+# MIDDLEWARE
+# ===================================
+
+def _log_request(route: str, status: Optional[int], stats: RequestQueries, duration_seconds: float) -> None:
+    repeated = stats.repeated()
+    flagged = bool(repeated) or stats.count >= QUERY_STATS_LOG_MIN_QUERIES
+    level = logging.INFO if flagged else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(level, json.dumps({
+        "event": "request_queries",
+        "route": route,
+        "status": status,
+        "queries": stats.count,
+        "db_ms": round(stats.db_seconds * 1000, 2),
+        "duration_ms": round(duration_seconds * 1000, 2),
+        "n_plus_one": [{"statement": shape, "count": n} for shape, n in repeated[:QUERY_STATS_TOP]],
+        "slowest": [{"statement": shape, "ms": round(ms, 2)} for shape, ms in stats.slowest_statements()],
+    }))
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware; see the module docstring."""
+
+    def __init__(self, app, headers: Optional[bool] = None):
+        self.app = app
+        self.headers = QUERY_STATS_HEADERS if headers is None else headers
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueries(scope)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = None
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.count)
+                    headers["X-DB-Time-Ms"] = f"{stats.db_seconds * 1000:.2f}"
+                    headers["X-DB-Repeated"] = str(len(stats.repeated()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            duration = time.perf_counter() - started
+            route = route_of(scope)
+            record_request(route, stats, duration)
+            _log_request(route, status, stats, duration)
@@ -5,13 +5,13 @@ These endpoints power the React frontend.
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Request, Depends, HTTPException
+from fastapi import APIRouter, Request, Response, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from sqlalchemy import func
-
-from .. import models, crud, auth, statistics
-from ..database import get_db
+from .. import models, crud, auth, async_crud, http_cache
+from ..database import get_async_read_db, get_async_write_db, get_read_db
+from ..author_refs import author_payload, load_author_refs
 from ..utils import MAIN_DOMAIN, SUBDOMAIN_SUFFIX, get_avatar_url
 from ..categories import CATEGORIES, get_category_name
 
@@ -38,12 +38,13 @@ def serialize_user(user):
     }
 
 
-def serialize_post(post, include_owner=False, super_likes_count=None, viewer_super_liked=False):
+def serialize_post(post, include_owner=False, super_likes_count=None, viewer_super_liked=False, owner_ref=None):
     """Serialize a post object to dict for JSON response.
 
     super_likes_count/viewer_super_liked are accepted as precomputed values so
     callers handling post lists can avoid N+1 queries. If super_likes_count is
-    None, it falls back to the hybrid property (one query per post).
+    None, it falls back to the hybrid property (one query per post). Likewise
+    owner_ref (an AuthorRef) replaces lazy-loading the full post.owner row.
     """
     if super_likes_count is None:
         super_likes_count = post.super_likes_count
@@ -63,13 +64,10 @@ def serialize_post(post, include_owner=False, super_likes_count=None, viewer_sup
         "created_at": post.created_at.isoformat() if post.created_at else None,
         "updated_at": post.updated_at.isoformat() if post.updated_at else None,
     }
-    if include_owner and post.owner:
-        result["owner"] = {
-            "id": post.owner.id,
-            "username": post.owner.username,
-            "avatar_seed": post.owner.avatar_seed or f"{post.owner.username}-shapes",
-            "subtitle": post.owner.subtitle,
-        }
+    if include_owner:
+        owner = author_payload(owner_ref or post.owner, include_subtitle=True)
+        if owner:
+            result["owner"] = owner
     return result
 
 
@@ -82,12 +80,7 @@ def compute_super_like_fields(db: Session, posts, current_user):
     if not posts:
         return {}, {}
     post_ids = [p.id for p in posts]
-    counts = dict(
-        db.query(models.SuperLike.post_id, func.count(models.SuperLike.id))
-        .filter(models.SuperLike.post_id.in_(post_ids))
-        .group_by(models.SuperLike.post_id)
-        .all()
-    )
+    counts = crud.count_super_likes_bulk(db, post_ids)
     liked = {}
     if current_user:
         liked_ids = {
@@ -106,18 +99,20 @@ def compute_super_like_fields(db: Session, posts, current_user):
 def serialize_posts_with_super_likes(db, posts, current_user, include_owner=False):
     """Serialize a list of posts with efficient bulk super-like lookups."""
     counts, liked = compute_super_like_fields(db, posts, current_user)
+    owners = load_author_refs(db, [p.user_id for p in posts]) if include_owner else {}
     return [
         serialize_post(
             p,
             include_owner=include_owner,
             super_likes_count=counts.get(p.id, 0),
             viewer_super_liked=liked.get(p.id, False),
+            owner_ref=owners.get(p.user_id),
         )
         for p in posts
     ]
 
 
-def serialize_comment(comment):
+def serialize_comment(comment, commenter_ref=None):
     """Serialize a comment for JSON response"""
     result = {
         "id": comment.id,
@@ -132,23 +127,20 @@ def serialize_comment(comment):
         "created_at": comment.created_at.isoformat() if comment.created_at else None,
         "user": None,
     }
-    if comment.commenter:
-        result["user"] = {
-            "username": comment.commenter.username,
-            "avatar_seed": comment.commenter.avatar_seed or f"{comment.commenter.username}-shapes",
-        }
+    if comment.user_id is not None:
+        commenter = author_payload(commenter_ref or comment.commenter)
+        if commenter:
+            result["user"] = {
+                "username": commenter["username"],
+                "avatar_seed": commenter["avatar_seed"],
+            }
     return result
 
 
-@router.get("/api/landing")
-def landing_data(
-    request: Request,
-    category: str = "toate",
-    db: Session = Depends(get_db),
-    current_user: Optional[models.User] = Depends(auth.get_current_user),
-):
-    """Landing page data: one random post for the selected category."""
-    statistics.record_view(db, request, "landing", None, "home", None, current_user)
+# Page payloads are built by sync functions and run on the async session via
+# run_sync (see app/async_crud.py), so the routes below never block a worker.
+
+def _landing_payload(db: Session, category: str, current_user: Optional[models.User]):
     if category == "toate":
         random_posts = crud.get_weighted_random_posts(db, limit=1)
     elif category in CATEGORIES:
@@ -162,22 +154,13 @@ def landing_data(
     }
 
 
-@router.get("/api/blog/{username}")
-def blog_data(
-    request: Request,
-    username: str,
-    month: Optional[int] = None,
-    year: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: Optional[models.User] = Depends(auth.get_current_user),
+def _blog_payload(
+    db: Session,
+    user: models.User,
+    month: Optional[int],
+    year: Optional[int],
+    current_user: Optional[models.User],
 ):
-    """Blog homepage data for a specific user"""
-    user = crud.get_user_by_username(db, username=username)
-    if not user:
-        raise HTTPException(status_code=404, detail="Blogul nu a fost gasit")
-
-    statistics.record_view(db, request, "blog", user.id, username, user.id, current_user)
-
     # Featured posts
     featured_posts_data = crud.get_featured_posts_for_user(db, user.id)
     featured_posts = [fp.post for fp in featured_posts_data]
@@ -244,26 +227,12 @@ def blog_data(
     }
 
 
-@router.get("/api/blog/{username}/post/{slug}")
-def post_detail_data(
-    request: Request,
-    username: str,
-    slug: str,
-    db: Session = Depends(get_db),
-    current_user: Optional[models.User] = Depends(auth.get_current_user),
+def _post_detail_payload(
+    db: Session,
+    user: models.User,
+    post: models.Post,
+    current_user: Optional[models.User],
 ):
-    """Post detail page data"""
-    user = crud.get_user_by_username(db, username=username)
-    if not user:
-        raise HTTPException(status_code=404, detail="Blogul nu a fost gasit")
-
-    post = crud.get_post_by_slug(db, slug)
-    if not post or post.user_id != user.id:
-        raise HTTPException(status_code=404, detail="Postarea nu a fost gasita")
-
-    # Track view with bot detection and deduplication
-    statistics.record_view(db, request, "post", post.id, post.slug, post.user_id, current_user)
-
     # Related posts from same user
     related_posts = crud.get_posts_by_user(db, user.id, limit=5)
     related_posts = [p for p in related_posts if p.id != post.id][:3]
@@ -279,8 +248,10 @@ def post_detail_data(
         super_likes_count=counts.get(post.id, 0),
         viewer_super_liked=liked.get(post.id, False),
     )
+    comments = post.approved_comments or []
+    commenters = load_author_refs(db, [c.user_id for c in comments])
     post_data["approved_comments"] = [
-        serialize_comment(c) for c in (post.approved_comments or [])
+        serialize_comment(c, commenters.get(c.user_id)) for c in comments
     ]
 
     return {
@@ -298,37 +269,105 @@ def post_detail_data(
     }
 
 
+def _category_payload(db: Session, category_key: str, sort_by: str, current_user: Optional[models.User]):
+    posts = crud.get_posts_by_category_sorted(db, category_key, sort_by=sort_by, limit=6)
+    return {
+        "category_key": category_key,
+        "category_name": get_category_name(category_key),
+        "posts": serialize_posts_with_super_likes(db, posts, current_user, include_owner=True),
+        "sort_by": sort_by,
+    }
+
+
+@router.get("/api/landing")
+async def landing_data(
+    request: Request,
+    category: str = "toate",
+    db: AsyncSession = Depends(get_async_read_db),
+    write_db: AsyncSession = Depends(get_async_write_db),
+    current_user: Optional[models.User] = Depends(auth.get_current_user),
+):
+    """Landing page data: one random post for the selected category."""
+    await async_crud.record_view(write_db, request, "landing", None, "home", None, current_user)
+    return await db.run_sync(_landing_payload, category, current_user)
+
+
+@router.get("/api/blog/{username}")
+async def blog_data(
+    request: Request,
+    username: str,
+    month: Optional[int] = None,
+    year: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    write_db: AsyncSession = Depends(get_async_write_db),
+    current_user: Optional[models.User] = Depends(auth.get_current_user),
+):
+    """Blog homepage data for a specific user"""
+    user = await async_crud.get_user_by_username(db, username=username)
+    if not user:
+        raise HTTPException(status_code=404, detail="Blogul nu a fost gasit")
+
+    await async_crud.record_view(write_db, request, "blog", user.id, username, user.id, current_user)
+    return await db.run_sync(_blog_payload, user, month, year, current_user)
+
+
+@router.get("/api/blog/{username}/post/{slug}")
+async def post_detail_data(
+    request: Request,
+    username: str,
+    slug: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    write_db: AsyncSession = Depends(get_async_write_db),
+    current_user: Optional[models.User] = Depends(auth.get_current_user),
+):
+    """Post detail page data"""
+    user = await async_crud.get_user_by_username(db, username=username)
+    if not user:
+        raise HTTPException(status_code=404, detail="Blogul nu a fost gasit")
+
+    post = await async_crud.get_post_by_slug(db, slug)
+    if not post or post.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Postarea nu a fost gasita")
+
+    # Track view with bot detection and deduplication
+    await async_crud.record_view(write_db, request, "post", post.id, post.slug, post.user_id, current_user)
+    return await db.run_sync(_post_detail_payload, user, post, current_user)
+
+
 @router.get("/api/categories/{category_key}")
-def category_page_data(
+async def category_page_data(
     request: Request,
     category_key: str,
     sort_by: str = "newest",
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
+    write_db: AsyncSession = Depends(get_async_write_db),
     current_user: Optional[models.User] = Depends(auth.get_current_user),
 ):
     """Category page data"""
     if category_key not in CATEGORIES:
         raise HTTPException(status_code=404, detail="Categoria nu a fost gasita")
 
-    posts = crud.get_posts_by_category_sorted(db, category_key, sort_by=sort_by, limit=6)
-    statistics.record_view(db, request, "category", None, category_key, None, None)
-
-    return {
-        "category_key": category_key,
-        "category_name": get_category_name(category_key),
-        "posts": serialize_posts_with_super_likes(db, posts, current_user, include_owner=True),
-        "sort_by": sort_by,
-    }
+    await async_crud.record_view(write_db, request, "category", None, category_key, None, None)
+    return await db.run_sync(_category_payload, category_key, sort_by, current_user)
 
 
 @router.get("/api/user/{username}/profile")
 def user_public_profile(
+    request: Request,
+    response: Response,
     username: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Public user profile data"""
     user = crud.get_user_by_username(db, username=username)
     if not user:
         raise HTTPException(status_code=404, detail="Utilizatorul nu a fost gasit")
 
-    return serialize_user(user)
+    payload = serialize_user(user)  # one row, already loaded: tag the payload itself
+    etag = http_cache.weak_etag("profile", payload)
+    not_modified = http_cache.conditional(
+        request, response, etag, public=http_cache.is_anonymous(request, None), vary_cookie=False
+    )
+    if not_modified is not None:
+        return not_modified
+    return payload
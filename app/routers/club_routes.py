@@ -1,11 +1,13 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
 
-from .. import models, schemas, auth, crud
-from ..database import get_db
+from .. import models, schemas, auth, crud, club_search, club_snapshot, http_cache
+from ..author_refs import author_payload, get_author_ref, load_author_refs
+from ..database import get_db, get_read_db
+from ..week_util import utcnow_naive
 
 logger = logging.getLogger(__name__)
 
@@ -14,55 +16,48 @@ router = APIRouter(tags=["clubs"])
 
 # ----- helpers -----
 
-def _owner_payload(user: Optional[models.User]) -> Optional[dict]:
-    if not user:
-        return None
-    return {
-        "id": user.id,
-        "username": user.username,
-        "avatar_seed": user.avatar_seed or f"{user.username}-shapes",
-    }
+def _board_author_payload(db: Session, user_id: int, membership_role: Optional[str] = None) -> Optional[dict]:
+    payload = author_payload(get_author_ref(db, user_id))
+    if payload is not None:
+        payload["role"] = membership_role
+    return payload
 
 
-def _board_author_payload(
-    user: Optional[models.User], membership_role: Optional[str] = None
-) -> Optional[dict]:
-    if not user:
-        return None
-    return {
-        "id": user.id,
-        "username": user.username,
-        "avatar_seed": user.avatar_seed or f"{user.username}-shapes",
-        "role": membership_role,
-    }
+def _board_author_ids(threads: list[crud.BoardThread]) -> list[int]:
+    ids = []
+    for thread in threads:
+        ids.append(thread.message.author_id)
+        ids.extend(r.author_id for r in thread.replies)
+    return ids
 
 
 def _board_message_payload(
+    db: Session,
     msg: models.ClubBoardMessage,
     role_by_user: dict[int, str],
-    include_replies: bool = True,
 ) -> dict:
-    payload = {
+    return {
         "id": msg.id,
         "club_id": msg.club_id,
         "parent_id": msg.parent_id,
         "content": msg.content,
         "created_at": msg.created_at,
         "updated_at": msg.updated_at,
-        "author": _board_author_payload(msg.author, role_by_user.get(msg.author_id)),
+        "author": _board_author_payload(db, msg.author_id, role_by_user.get(msg.author_id)),
         "replies": [],
     }
-    if include_replies and msg.replies:
-        # Replies are already capped at one level by post_board_message
-        ordered_replies = sorted(msg.replies, key=lambda r: (r.created_at, r.id))
-        payload["replies"] = [
-            _board_message_payload(r, role_by_user, include_replies=False)
-            for r in ordered_replies
-        ]
+
+
+def _board_thread_payload(db: Session, thread: crud.BoardThread, role_by_user: dict[int, str]) -> dict:
+    payload = _board_message_payload(db, thread.message, role_by_user)
+    # Replies arrive capped and pre-sorted by (created_at, id) from crud.
+    payload["replies"] = [_board_message_payload(db, r, role_by_user) for r in thread.replies]
+    payload["reply_count"] = thread.reply_count
+    payload["replies_cursor"] = thread.replies_cursor
     return payload
 
 
-def _club_summary_payload(db: Session, club: models.Club) -> dict:
+def _club_summary_payload(db: Session, club: models.Club, member_count: Optional[int] = None) -> dict:
     return {
         "id": club.id,
         "owner_id": club.owner_id,
@@ -73,14 +68,20 @@ def _club_summary_payload(db: Session, club: models.Club) -> dict:
         "avatar_seed": club.avatar_seed,
         "theme": club.theme,
         "speciality": club.speciality,
-        "member_count": crud.count_club_members(db, club.id),
-        "owner": _owner_payload(club.owner),
+        "member_count": club.member_count if member_count is None else member_count,
+        "owner": author_payload(get_author_ref(db, club.owner_id)),
         "created_at": club.created_at,
         "updated_at": club.updated_at,
     }
 
 
-def _featured_payload(featured) -> Optional[dict]:
+def _club_summary_payloads(db: Session, clubs: list[models.Club]) -> list[dict]:
+    """Summaries for a list page: one owners query, no per-club queries."""
+    load_author_refs(db, [c.owner_id for c in clubs])
+    return [_club_summary_payload(db, c) for c in clubs]
+
+
+def _featured_payload(db: Session, featured) -> Optional[dict]:
     if not featured:
         return None
     post, until = featured
@@ -88,16 +89,16 @@ def _featured_payload(featured) -> Optional[dict]:
         "post_id": post.id,
         "post_title": post.title,
         "post_slug": post.slug,
-        "post_author": _owner_payload(post.owner),
+        "post_author": author_payload(get_author_ref(db, post.user_id)),
         "featured_until": until,
     }
 
 
-def _join_request_payload(req: models.ClubJoinRequest) -> dict:
+def _join_request_payload(db: Session, req: models.ClubJoinRequest) -> dict:
     return {
         "id": req.id,
         "club_id": req.club_id,
-        "user": _owner_payload(req.user),
+        "user": author_payload(get_author_ref(db, req.user_id)),
         "direction": req.direction,
         "status": req.status,
         "initiator_id": req.initiator_id,
@@ -106,54 +107,85 @@ def _join_request_payload(req: models.ClubJoinRequest) -> dict:
     }
 
 
-def _build_club_detail(
-    db: Session,
-    club: models.Club,
-    current_user: Optional[models.User],
-) -> dict:
-    members = crud.list_club_members(db, club.id)
-    role_by_user = {m.user_id: m.role for m in members}
+def _club_snapshot(db: Session, club: models.Club) -> dict:
+    """Viewer-independent part of the club page, served from club_snapshot."""
+    cached = club_snapshot.get(club.id)
+    if cached is not None:
+        return cached
+    built_at = club_snapshot.generation(club.id)
+
+    members = crud.list_club_members_with_contributions(db, club.id)
+    featured = crud.get_active_featured(db, club)
+    threads, _ = crud.list_board_threads(db, club.id, limit=20)
+
+    # One column-only users query for every name shown on the page.
+    refs = load_author_refs(
+        db,
+        [club.owner_id]
+        + [m.user_id for m, _ in members]
+        + _board_author_ids(threads)
+        + ([featured[0].user_id] if featured else []),
+    )
+
+    role_by_user = {m.user_id: m.role for m, _ in members}
     member_payloads = []
-    for m in members:
+    for m, contribution_count in members:
+        ref = refs.get(m.user_id)
         member_payloads.append({
             "id": m.id,
             "user_id": m.user_id,
-            "username": m.user.username if m.user else "",
-            "avatar_seed": (m.user.avatar_seed if m.user else None)
-                            or (f"{m.user.username}-shapes" if m.user else None),
+            "username": ref.username if ref else "",
+            "avatar_seed": (ref.avatar_seed or f"{ref.username}-shapes") if ref else None,
             "role": m.role,
             "joined_at": m.joined_at,
-            "contribution_count": crud.count_member_contributions(db, club.id, m.user_id),
+            "contribution_count": contribution_count,
         })
 
-    featured = crud.get_active_featured(db, club)
-    messages = crud.list_board_messages(db, club.id, limit=20)
-    recent_messages = [_board_message_payload(m, role_by_user) for m in messages]
-
-    my_role = None
-    my_pending_request_status = None
-    pending_request_count = None
-    if current_user is not None:
-        membership = crud.get_club_membership(db, club.id, current_user.id)
-        my_role = membership.role if membership else None
-        if membership is None:
-            pending = crud.get_user_pending_request(db, club.id, current_user.id)
-            my_pending_request_status = pending.direction if pending else None
-        if my_role in ("owner", "admin"):
-            pending_request_count = crud.count_pending_requests_for_club(db, club.id)
-
-    summary = _club_summary_payload(db, club)
-    return {
-        **summary,
+    snapshot = {
+        **_club_summary_payload(db, club, member_count=len(members)),
         "members": member_payloads,
-        "featured": _featured_payload(featured),
-        "recent_messages": recent_messages,
+        "featured": _featured_payload(db, featured),
+        "recent_messages": [_board_thread_payload(db, t, role_by_user) for t in threads],
+    }
+    club_snapshot.put(club.id, snapshot, built_at, expires_at=featured[1] if featured else None)
+    return snapshot
+
+
+def _club_viewer_state(db: Session, club: models.Club, current_user: Optional[models.User]) -> tuple:
+    if current_user is None:
+        return None, None, None
+    return crud.get_club_viewer_state(db, club.id, current_user.id)
+
+
+def _build_club_detail(
+    db: Session,
+    club: models.Club,
+    current_user: Optional[models.User],
+    viewer_state: Optional[tuple] = None,
+) -> dict:
+    my_role, my_pending_request_status, pending_request_count = (
+        viewer_state or _club_viewer_state(db, club, current_user)
+    )
+    return {
+        **_club_snapshot(db, club),
         "my_role": my_role,
         "my_pending_request_status": my_pending_request_status,
         "pending_request_count": pending_request_count,
     }
 
 
+def _club_etag(db: Session, club: models.Club, current_user: Optional[models.User], viewer_state: tuple) -> str:
+    # Contribution counts and author renames are not versioned; like the
+    # snapshot, the tag lets them lag by at most CLUB_SNAPSHOT_TTL_SECONDS.
+    featured = club.featured_post_id if club.featured_until and club.featured_until > utcnow_naive() else None
+    return http_cache.weak_etag(
+        "club", club.id, club.updated_at, club.owner_id, club.member_count, featured,
+        crud.get_club_page_version(db, club.id),
+        http_cache.ttl_epoch(club_snapshot.CLUB_SNAPSHOT_TTL_SECONDS),
+        current_user.id if current_user else None, viewer_state,
+    )
+
+
 # ----- club CRUD endpoints -----
 
 @router.post("/api/clubs/", status_code=status.HTTP_201_CREATED)
@@ -174,12 +206,27 @@ def create_club_api(
 def list_clubs_api(
     speciality: Optional[str] = None,
     theme: Optional[str] = None,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     if speciality and speciality not in crud.CLUB_VALID_SPECIALITIES:
         raise HTTPException(status_code=400, detail="Specialitate invalidă")
+    if q and q.strip():
+        try:
+            clubs, next_cursor = club_search.search_clubs(
+                db,
+                q,
+                speciality=speciality,
+                theme=theme,
+                limit=max(1, min(limit, 100)),
+                cursor=cursor,
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor invalid")
+        return {"clubs": _club_summary_payloads(db, clubs), "next_cursor": next_cursor}
     clubs = crud.list_clubs(
         db,
         speciality=speciality,
@@ -187,11 +234,11 @@ def list_clubs_api(
         limit=max(1, min(limit, 100)),
         offset=max(0, offset),
     )
-    return {"clubs": [_club_summary_payload(db, c) for c in clubs]}
+    return {"clubs": _club_summary_payloads(db, clubs)}
 
 
 @router.get("/api/clubs/random")
-def random_club_api(db: Session = Depends(get_db)):
+def random_club_api(db: Session = Depends(get_read_db)):
     club = crud.get_random_club(db)
     if not club:
         raise HTTPException(status_code=404, detail="Niciun club disponibil")
@@ -199,7 +246,7 @@ def random_club_api(db: Session = Depends(get_db)):
 
 
 @router.get("/api/collections/random")
-def random_collection_api(db: Session = Depends(get_db)):
+def random_collection_api(db: Session = Depends(get_read_db)):
     """Random collection — added here for proximity to /api/clubs/random."""
     collection = crud.get_random_collection(db)
     if not collection:
@@ -209,12 +256,14 @@ def random_collection_api(db: Session = Depends(get_db)):
         "title": collection.title,
         "slug": collection.slug,
         "description": collection.description,
-        "owner": _owner_payload(collection.owner),
+        "owner": author_payload(get_author_ref(db, collection.owner_id)),
     }
 
 
 @router.get("/api/clubs/{slug}")
 def get_club_api(
+    request: Request,
+    response: Response,
     slug: str,
     db: Session = Depends(get_db),
     current_user: Optional[models.User] = Depends(auth.get_current_user),
@@ -222,7 +271,14 @@ def get_club_api(
     club = crud.get_club_by_slug(db, slug)
     if not club:
         raise HTTPException(status_code=404, detail="Clubul nu a fost găsit")
-    return _build_club_detail(db, club, current_user)
+    viewer_state = _club_viewer_state(db, club, current_user)
+    etag = _club_etag(db, club, current_user, viewer_state)
+    not_modified = http_cache.conditional(
+        request, response, etag, public=http_cache.is_anonymous(request, current_user)
+    )
+    if not_modified is not None:
+        return not_modified
+    return _build_club_detail(db, club, current_user, viewer_state)
 
 
 @router.put("/api/clubs/{club_id}")
@@ -274,7 +330,7 @@ def apply_to_club_api(
         raise HTTPException(status_code=409, detail="Ești deja membru al acestui club")
     if error == "already_pending":
         raise HTTPException(status_code=409, detail="Ai deja o cerere în așteptare")
-    return _join_request_payload(request)
+    return _join_request_payload(db, request)
 
 
 @router.post("/api/clubs/{club_id}/invite")
@@ -299,7 +355,7 @@ def invite_to_club_api(
         raise HTTPException(status_code=409, detail="Utilizatorul este deja membru")
     if error == "already_pending":
         raise HTTPException(status_code=409, detail="Există deja o invitație sau cerere în așteptare pentru acest utilizator")
-    return _join_request_payload(request)
+    return _join_request_payload(db, request)
 
 
 @router.get("/api/clubs/{club_id}/requests")
@@ -315,7 +371,8 @@ def list_club_requests_api(
     if not membership or membership.role not in ("owner", "admin"):
         raise HTTPException(status_code=403, detail="Acces interzis")
     requests = crud.list_club_pending_requests(db, club.id)
-    return {"requests": [_join_request_payload(r) for r in requests]}
+    load_author_refs(db, [r.user_id for r in requests])
+    return {"requests": [_join_request_payload(db, r) for r in requests]}
 
 
 @router.post("/api/clubs/{club_id}/requests/{request_id}/respond")
@@ -338,7 +395,7 @@ def respond_club_request_api(
         raise HTTPException(status_code=403, detail="Nu poți răspunde la această cerere")
     if error == "inconsistent_direction":
         raise HTTPException(status_code=500, detail="Cerere inconsistentă")
-    return _join_request_payload(updated)
+    return _join_request_payload(db, updated)
 
 
 @router.delete("/api/clubs/{club_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -404,7 +461,7 @@ def list_my_clubs_api(
     current_user: models.User = Depends(auth.get_required_user),
 ):
     clubs = crud.list_user_clubs(db, current_user.id)
-    return {"clubs": [_club_summary_payload(db, c) for c in clubs]}
+    return {"clubs": _club_summary_payloads(db, clubs)}
 
 
 @router.get("/api/user/clubs/pending")
@@ -412,17 +469,19 @@ def list_my_club_invitations_api(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_required_user),
 ):
-    invitations = crud.list_user_pending_invitations(db, current_user.id)
-    items = []
-    for inv in invitations:
-        if not inv.club:
-            continue
-        items.append({
-            "request": _join_request_payload(inv),
-            "club": _club_summary_payload(db, inv.club),
-            "direction": inv.direction,
-        })
-    return {"items": items}
+    invitations = [inv for inv in crud.list_user_pending_invitations(db, current_user.id) if inv.club]
+    load_author_refs(db, [inv.user_id for inv in invitations] + [inv.club.owner_id for inv in invitations])
+    club_payloads = _club_summary_payloads(db, [inv.club for inv in invitations])
+    return {
+        "items": [
+            {
+                "request": _join_request_payload(db, inv),
+                "club": club_payload,
+                "direction": inv.direction,
+            }
+            for inv, club_payload in zip(invitations, club_payloads)
+        ]
+    }
 
 
 # ----- board messages -----
@@ -431,18 +490,47 @@ def list_my_club_invitations_api(
 def list_club_board_api(
     club_id: int,
     limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     club = crud.get_club(db, club_id)
     if not club:
         raise HTTPException(status_code=404, detail="Clubul nu a fost găsit")
-    messages = crud.list_board_messages(
-        db, club_id, limit=max(1, min(limit, 100)), offset=max(0, offset)
-    )
-    members = crud.list_club_members(db, club_id)
-    role_by_user = {m.user_id: m.role for m in members}
-    return {"messages": [_board_message_payload(m, role_by_user) for m in messages]}
+    try:
+        threads, next_cursor = crud.list_board_threads(db, club_id, limit=max(1, min(limit, 100)), cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor invalid")
+    author_ids = _board_author_ids(threads)
+    load_author_refs(db, author_ids)
+    role_by_user = crud.get_member_roles(db, club_id, author_ids)
+    return {
+        "messages": [_board_thread_payload(db, t, role_by_user) for t in threads],
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/api/clubs/{club_id}/board/{message_id}/replies")
+def list_club_board_replies_api(
+    club_id: int,
+    message_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    parent = crud.get_board_message(db, message_id)
+    if not parent or parent.club_id != club_id or parent.parent_id is not None:
+        raise HTTPException(status_code=404, detail="Mesaj inexistent")
+    try:
+        replies, next_cursor = crud.list_board_replies(db, message_id, limit=max(1, min(limit, 100)), cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor invalid")
+    author_ids = [r.author_id for r in replies]
+    load_author_refs(db, author_ids)
+    role_by_user = crud.get_member_roles(db, club_id, author_ids)
+    return {
+        "replies": [_board_message_payload(db, r, role_by_user) for r in replies],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("/api/clubs/{club_id}/board", status_code=status.HTTP_201_CREATED)
@@ -462,9 +550,8 @@ def post_club_board_message_api(
         raise HTTPException(status_code=403, detail="Trebuie să fii membru ca să postezi")
     if error == "bad_parent":
         raise HTTPException(status_code=400, detail="Mesaj părinte invalid")
-    members = crud.list_club_members(db, club.id)
-    role_by_user = {m.user_id: m.role for m in members}
-    return _board_message_payload(msg, role_by_user, include_replies=False)
+    role_by_user = crud.get_member_roles(db, club.id, [msg.author_id])
+    return _board_message_payload(db, msg, role_by_user)
 
 
 @router.delete(
@@ -512,7 +599,7 @@ def set_club_featured_api(
         )
     if error == "author_not_member":
         raise HTTPException(status_code=400, detail="Autorul postării nu este membru al clubului")
-    return _featured_payload((post, club.featured_until))
+    return _featured_payload(db, (post, club.featured_until))
 
 
 @router.delete("/api/clubs/{club_id}/featured", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,30 +1,24 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session, joinedload
 
-from .. import models, schemas, auth, crud
-from ..database import get_db
+from .. import models, schemas, auth, crud, collection_snapshot, http_cache
+from ..author_refs import author_payload, get_author_ref, load_author_refs
+from ..database import get_db, get_read_db
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["collections"])
 
+# Entries on the first page of a collection; the rest via /posts?cursor=.
+COLLECTION_PAGE_SIZE = 50
 
-# ----- helpers -----
-
-def _author_payload(user: Optional[models.User]) -> Optional[dict]:
-    if not user:
-        return None
-    return {
-        "id": user.id,
-        "username": user.username,
-        "avatar_seed": user.avatar_seed or f"{user.username}-shapes",
-    }
 
+# ----- helpers -----
 
-def _post_ref_payload(post: Optional[models.Post]) -> Optional[dict]:
+def _post_ref_payload(db: Session, post: Optional[models.Post], super_likes_count: int = 0) -> Optional[dict]:
     if not post:
         return None
     return {
@@ -32,8 +26,8 @@ def _post_ref_payload(post: Optional[models.Post]) -> Optional[dict]:
         "title": post.title,
         "slug": post.slug,
         "category": post.category,
-        "super_likes_count": post.super_likes_count,
-        "owner": _author_payload(post.owner),
+        "super_likes_count": super_likes_count,
+        "owner": author_payload(get_author_ref(db, post.user_id)),
     }
 
 
@@ -41,26 +35,40 @@ def _collection_summary_payload(
     collection: models.Collection,
     db: Session,
     include_pending: bool = False,
+    counts: Optional[tuple[int, int]] = None,
 ) -> dict:
-    post_count = crud.count_collection_posts(db, collection.id, status="accepted")
-    payload = {
+    if counts is None:
+        counts = crud.count_collection_posts_bulk(db, [collection.id])[collection.id]
+    post_count, pending_count = counts
+    return {
         "id": collection.id,
         "owner_id": collection.owner_id,
         "title": collection.title,
         "slug": collection.slug,
         "description": collection.description,
-        "owner": _author_payload(collection.owner),
+        "owner": author_payload(get_author_ref(db, collection.owner_id)),
         "post_count": post_count,
-        "pending_count": 0,
+        "pending_count": pending_count if include_pending else 0,
         "created_at": collection.created_at,
         "updated_at": collection.updated_at,
     }
-    if include_pending:
-        payload["pending_count"] = crud.count_collection_posts(db, collection.id, status="pending")
-    return payload
 
 
-def _entry_payload(entry: models.CollectionPost) -> dict:
+def _collection_summary_payloads(
+    db: Session,
+    collections: list[models.Collection],
+    include_pending: bool = False,
+) -> list[dict]:
+    """Summaries for a list page: one grouped counts query plus one owners query."""
+    counts = crud.count_collection_posts_bulk(db, [c.id for c in collections])
+    load_author_refs(db, [c.owner_id for c in collections])
+    return [
+        _collection_summary_payload(c, db, include_pending=include_pending, counts=counts[c.id])
+        for c in collections
+    ]
+
+
+def _entry_payload(db: Session, entry: models.CollectionPost, super_likes_count: int = 0) -> dict:
     return {
         "id": entry.id,
         "collection_id": entry.collection_id,
@@ -70,10 +78,31 @@ def _entry_payload(entry: models.CollectionPost) -> dict:
         "position": entry.position,
         "created_at": entry.created_at,
         "responded_at": entry.responded_at,
-        "post": _post_ref_payload(entry.post),
+        "post": _post_ref_payload(db, entry.post, super_likes_count),
     }
 
 
+def _entry_payloads(db: Session, entries: list[models.CollectionPost]) -> list[dict]:
+    """Entry payloads with post authors and super-like counts fetched in bulk."""
+    load_author_refs(db, [e.post.user_id for e in entries if e.post])
+    super_likes = crud.count_super_likes_bulk(db, [e.post_id for e in entries])
+    return [_entry_payload(db, e, super_likes.get(e.post_id, 0)) for e in entries]
+
+
+def _collection_snapshot(db: Session, collection: models.Collection) -> dict:
+    """Public collection page without viewer-specific fields."""
+    snapshot = collection_snapshot.get(collection.id, collection.version)
+    if snapshot is None:
+        entries, next_cursor = crud.list_collection_entries_page(db, collection.id, limit=COLLECTION_PAGE_SIZE)
+        snapshot = {
+            **_collection_summary_payload(collection, db),
+            "posts": _entry_payloads(db, entries),
+            "next_cursor": next_cursor,
+        }
+        collection_snapshot.put(collection.id, collection.version, snapshot)
+    return snapshot
+
+
 # ----- endpoints -----
 
 @router.post("/api/collections/", status_code=status.HTTP_201_CREATED)
@@ -89,8 +118,10 @@ def create_collection_api(
 
 @router.get("/api/collections/{slug}")
 def get_collection_by_slug_api(
+    request: Request,
+    response: Response,
     slug: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Optional[models.User] = Depends(auth.get_current_user),
 ):
     collection = crud.get_collection_by_slug(db, slug)
@@ -98,24 +129,72 @@ def get_collection_by_slug_api(
         raise HTTPException(status_code=404, detail="Colecția nu a fost găsită")
     is_owner = current_user is not None and current_user.id == collection.owner_id
 
-    summary = _collection_summary_payload(collection, db, include_pending=is_owner)
-    entries = crud.get_collection_entries(db, collection.id, status="accepted")
-    posts_payload = [_entry_payload(e) for e in entries]
-    return {**summary, "posts": posts_payload}
+    # collections.version covers every entry change (pending ones included);
+    # what it leaves out lags by at most the snapshot TTL, as in the cache.
+    etag = http_cache.weak_etag(
+        "collection", collection.id, collection.version, is_owner,
+        http_cache.ttl_epoch(collection_snapshot.COLLECTION_SNAPSHOT_TTL_SECONDS),
+    )
+    not_modified = http_cache.conditional(
+        request, response, etag, public=http_cache.is_anonymous(request, current_user)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    snapshot = _collection_snapshot(db, collection)
+    if not is_owner:
+        return snapshot
+    return {**snapshot, "pending_count": crud.count_collection_posts(db, collection.id, status="pending")}
+
+
+@router.get("/api/collections/{collection_id}/posts")
+def list_collection_posts_api(
+    collection_id: int,
+    cursor: Optional[str] = None,
+    limit: int = COLLECTION_PAGE_SIZE,
+    db: Session = Depends(get_read_db),
+):
+    """Accepted, approved entries after `cursor` (the page's next_cursor)."""
+    collection = crud.get_collection(db, collection_id)
+    if not collection:
+        raise HTTPException(status_code=404, detail="Colecția nu a fost găsită")
+    try:
+        entries, next_cursor = crud.list_collection_entries_page(
+            db, collection_id, limit=max(1, min(limit, 100)), cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor invalid")
+    return {"posts": _entry_payloads(db, entries), "next_cursor": next_cursor}
+
+
+@router.put("/api/collections/{collection_id}/order")
+def reorder_collection_api(
+    collection_id: int,
+    body: schemas.CollectionReorderRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_required_user),
+):
+    collection = crud.get_collection(db, collection_id)
+    if not collection or collection.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Colecția nu a fost găsită")
+    ok, error = crud.reorder_collection_entries(db, collection, body.post_ids)
+    if error == "duplicate_posts":
+        raise HTTPException(status_code=400, detail="Aceeași postare apare de mai multe ori")
+    if error == "not_in_collection":
+        raise HTTPException(status_code=400, detail="Unele postări nu fac parte din colecție")
+    return {"post_ids": body.post_ids}
 
 
 @router.get("/api/users/{username}/collections")
 def list_user_collections_public(
     username: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     user = crud.get_user_by_username(db, username)
     if not user:
         raise HTTPException(status_code=404, detail="Utilizatorul nu a fost găsit")
     collections = crud.get_collections_by_owner(db, user.id)
-    return {
-        "collections": [_collection_summary_payload(c, db, include_pending=False) for c in collections]
-    }
+    return {"collections": _collection_summary_payloads(db, collections)}
 
 
 @router.put("/api/collections/{collection_id}")
@@ -153,14 +232,10 @@ def add_post_to_collection_api(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_required_user),
 ):
-    collection = db.query(models.Collection).options(
-        joinedload(models.Collection.owner)
-    ).filter(models.Collection.id == collection_id).first()
+    collection = crud.get_collection(db, collection_id)
     if not collection:
         raise HTTPException(status_code=404, detail="Colecția nu a fost găsită")
-    post = db.query(models.Post).options(joinedload(models.Post.owner)).filter(
-        models.Post.id == body.post_id
-    ).first()
+    post = crud.get_post(db, body.post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Postarea nu a fost găsită")
     if post.moderation_status != "approved":
@@ -175,7 +250,7 @@ def add_post_to_collection_api(
         raise HTTPException(status_code=409, detail="Există deja o propunere în așteptare pentru această postare")
     if entry is None:
         raise HTTPException(status_code=400, detail="Acțiune invalidă")
-    return _entry_payload(entry)
+    return _entry_payloads(db, [entry])[0]
 
 
 @router.post("/api/collections/{collection_id}/posts/{post_id}/respond")
@@ -187,8 +262,8 @@ def respond_collection_entry_api(
     current_user: models.User = Depends(auth.get_required_user),
 ):
     entry = db.query(models.CollectionPost).options(
-        joinedload(models.CollectionPost.collection).joinedload(models.Collection.owner),
-        joinedload(models.CollectionPost.post).joinedload(models.Post.owner),
+        joinedload(models.CollectionPost.collection),
+        joinedload(models.CollectionPost.post),
     ).filter(
         models.CollectionPost.collection_id == collection_id,
         models.CollectionPost.post_id == post_id,
@@ -205,7 +280,7 @@ def respond_collection_entry_api(
         raise HTTPException(status_code=403, detail="Nu poți răspunde la această propunere")
     if error == "inconsistent_initiator":
         raise HTTPException(status_code=500, detail="Propunere inconsistentă")
-    return _entry_payload(updated)
+    return _entry_payloads(db, [updated])[0]
 
 
 @router.delete("/api/collections/{collection_id}/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -236,9 +311,7 @@ def list_my_collections(
     current_user: models.User = Depends(auth.get_required_user),
 ):
     collections = crud.get_collections_by_owner(db, current_user.id)
-    return {
-        "collections": [_collection_summary_payload(c, db, include_pending=True) for c in collections]
-    }
+    return {"collections": _collection_summary_payloads(db, collections, include_pending=True)}
 
 
 @router.get("/api/user/collections/{collection_id}/manage")
@@ -247,20 +320,19 @@ def manage_my_collection(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_required_user),
 ):
-    collection = db.query(models.Collection).options(
-        joinedload(models.Collection.owner)
-    ).filter(models.Collection.id == collection_id).first()
+    collection = crud.get_collection(db, collection_id)
     if not collection or collection.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Colecția nu a fost găsită")
 
     accepted = crud.get_collection_entries(db, collection.id, status="accepted")
     pending = crud.get_collection_entries(db, collection.id, status="pending", approved_posts_only=False)
+    payloads = _entry_payloads(db, accepted + pending)
 
     summary = _collection_summary_payload(collection, db, include_pending=True)
     return {
         **summary,
-        "accepted": [_entry_payload(e) for e in accepted],
-        "pending": [_entry_payload(e) for e in pending],
+        "accepted": payloads[:len(accepted)],
+        "pending": payloads[len(accepted):],
     }
 
 
@@ -270,15 +342,21 @@ def my_pending_approvals(
     current_user: models.User = Depends(auth.get_required_user),
 ):
     pairs = crud.get_pending_approvals_for_user(db, current_user.id)
-    items = []
-    for entry, direction in pairs:
-        items.append({
-            "entry": _entry_payload(entry),
-            "direction": direction,
-            "collection": _collection_summary_payload(entry.collection, db, include_pending=False),
-            "post": _post_ref_payload(entry.post),
-        })
-    return {"items": items}
+    entries = [entry for entry, _ in pairs]
+    load_author_refs(db, [e.post.user_id for e in entries] + [e.collection.owner_id for e in entries])
+    entry_payloads = _entry_payloads(db, entries)
+    collection_payloads = _collection_summary_payloads(db, [entry.collection for entry in entries])
+    return {
+        "items": [
+            {
+                "entry": entry_payload,
+                "direction": direction,
+                "collection": collection_payload,
+                "post": entry_payload["post"],
+            }
+            for (_, direction), entry_payload, collection_payload in zip(pairs, entry_payloads, collection_payloads)
+        ]
+    }
 
 
 @router.get("/api/posts/{post_id}/collections")
@@ -290,13 +368,14 @@ def get_post_collections(
     if not post:
         raise HTTPException(status_code=404, detail="Postarea nu a fost găsită")
     collections = crud.get_collections_containing_post(db, post_id)
+    load_author_refs(db, [c.owner_id for c in collections])
     return {
         "collections": [
             {
                 "id": c.id,
                 "title": c.title,
                 "slug": c.slug,
-                "owner": _author_payload(c.owner),
+                "owner": author_payload(get_author_ref(db, c.owner_id)),
             }
             for c in collections
         ]
@@ -0,0 +1,20 @@
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from .. import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics(request: Request):
+    """Prometheus exposition; aggregated over all workers in multiprocess mode."""
+    if not metrics.METRICS_ENABLED:
+        raise HTTPException(status_code=404)
+    if metrics.METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "")
+        if not hmac.compare_digest(supplied, f"Bearer {metrics.METRICS_TOKEN}"):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
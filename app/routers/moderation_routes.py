@@ -2,11 +2,11 @@ import logging
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Request, Depends, HTTPException, Response
+from fastapi import APIRouter, Request, Depends, HTTPException, Query, Response
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
-from .. import models, schemas, crud, admin, moderation
+from .. import models, schemas, crud, admin, moderation, moderation_metrics, moderation_queue, session_store
 from ..database import get_db
 
 logger = logging.getLogger(__name__)
@@ -27,25 +27,12 @@ def get_moderation_stats(
     response.headers["Expires"] = "0"
 
     try:
-        # Use the new CRUD function to get comprehensive stats
-        stats = crud.get_moderation_stats(db)
-
-        suspended_users = db.query(models.User).filter(
-            models.User.is_suspended == True
-        ).count()
-
-        today = datetime.now().date()
-        today_actions = db.query(models.Post).filter(
-            models.Post.moderated_at >= today
-        ).count() + db.query(models.Comment).filter(
-            models.Comment.moderated_at >= today
-        ).count()
-
+        stats = moderation_metrics.dashboard_stats(db)
         return {
             "pending_count": stats['total_pending'],
             "flagged_count": stats['total_flagged'],
-            "suspended_count": suspended_users,
-            "today_actions": today_actions,
+            "suspended_count": stats['suspended_count'],
+            "today_actions": stats['today_actions'],
             "posts_pending": stats['posts_pending'],
             "posts_flagged": stats['posts_flagged'],
             "comments_pending": stats['comments_pending'],
@@ -57,120 +44,171 @@ def get_moderation_stats(
         raise HTTPException(status_code=500, detail="Failed to get moderation stats")
 
 
+_QUEUE_STATUSES = {"all": moderation_queue.QUEUE_STATUSES, "pending": ("pending",), "flagged": ("flagged",)}
+_QUEUE_CONTENT_TYPES = {"all": ("post", "comment"), "posts": ("post",), "comments": ("comment",)}
+
+
+def _queue_item_payload(item: moderation_queue.QueueItem) -> dict:
+    content = item.content
+    if item.content_type == "post":
+        title, author = content.title, content.owner.username
+    else:
+        title, author = None, content.commenter.username if content.commenter else content.author_name
+    return {
+        "id": content.id,
+        "type": item.content_type,
+        "title": title,
+        "content": content.content,
+        "author": author,
+        "toxicity_score": content.toxicity_score,
+        "moderation_status": content.moderation_status,
+        "moderation_reason": content.moderation_reason or '',
+        "created_at": content.created_at.isoformat(),
+        "claimed_by": item.claimed_by,
+        "claim_expires_at": item.claim_expires_at.isoformat() if item.claim_expires_at else None,
+    }
+
+
+def _queue_filters(status: str, content_type: str, order: str):
+    if status not in _QUEUE_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    if content_type not in _QUEUE_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid content type")
+    if order not in moderation_queue.QUEUE_ORDERS:
+        raise HTTPException(status_code=400, detail="Invalid order")
+    return _QUEUE_STATUSES[status], _QUEUE_CONTENT_TYPES[content_type]
+
+
+def _queue_page(db, current_user, *, status, content_type, order, cursor, limit, include_claimed):
+    statuses, content_types = _queue_filters(status, content_type, order)
+    try:
+        items, next_cursor = moderation_queue.list_queue(
+            db, current_user.id, statuses=statuses, content_types=content_types,
+            order=order, limit=limit, cursor=cursor, include_claimed=include_claimed,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor invalid")
+    return {"content": [_queue_item_payload(item) for item in items], "next_cursor": next_cursor}
+
+
+@router.get("/api/moderation/content/queue")
+def get_content_queue(
+    status: str = "all",
+    content_type: str = "all",
+    order: str = "oldest",
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
+    include_claimed: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(admin.require_moderator)
+):
+    """Pending and flagged posts and comments in one keyset-paginated queue.
+
+    Items leased by other moderators are hidden unless include_claimed=true.
+    """
+    return _queue_page(db, current_user, status=status, content_type=content_type, order=order,
+                       cursor=cursor, limit=limit, include_claimed=include_claimed)
+
+
 @router.get("/api/moderation/content/pending")
 def get_pending_content(
     request: Request,
     content_type: str = "all",
+    order: str = "newest",
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(admin.require_moderator)
 ):
     """Get content pending moderation - visible only to moderators"""
-    try:
-        if not current_user.is_moderator and not current_user.is_admin:
-            raise HTTPException(status_code=403, detail="Moderation access required")
-
-        content = []
-
-        if content_type in ["all", "posts"]:
-            posts = crud.get_posts_for_moderation(db, status_filter="pending", limit=50)
-
-            for post in posts:
-                content.append({
-                    "id": post.id,
-                    "type": "post",
-                    "title": post.title,
-                    "content": post.content,
-                    "author": post.owner.username,
-                    "toxicity_score": getattr(post, 'toxicity_score', 0.0),
-                    "moderation_status": post.moderation_status,
-                    "moderation_reason": getattr(post, 'moderation_reason', ''),
-                    "created_at": post.created_at.isoformat()
-                })
-
-        if content_type in ["all", "comments"]:
-            comments = crud.get_comments_for_moderation(db, status_filter="pending", limit=50)
-
-            for comment in comments:
-                author = comment.commenter.username if comment.commenter else comment.author_name
-                content.append({
-                    "id": comment.id,
-                    "type": "comment",
-                    "title": None,
-                    "content": comment.content,
-                    "author": author,
-                    "toxicity_score": getattr(comment, 'toxicity_score', 0.0),
-                    "moderation_status": comment.moderation_status,
-                    "moderation_reason": getattr(comment, 'moderation_reason', ''),
-                    "created_at": comment.created_at.isoformat()
-                })
-
-        # Sort by creation date
-        content.sort(key=lambda x: x["created_at"], reverse=True)
-
-        return {"content": content}
-
-    except Exception as e:
-        logger.error(f"Error getting pending content: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get pending content")
+    return _queue_page(db, current_user, status="pending", content_type=content_type, order=order,
+                       cursor=cursor, limit=50, include_claimed=True)
 
 
 @router.get("/api/moderation/content/flagged")
 def get_flagged_content(
     request: Request,
+    order: str = "priority",
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(admin.require_moderator)
 ):
-    """Get flagged content (high toxicity) - visible only to moderators"""
-    try:
-        if not current_user.is_moderator and not current_user.is_admin:
-            raise HTTPException(status_code=403, detail="Moderation access required")
+    """Get flagged content (high toxicity first) - visible only to moderators"""
+    return _queue_page(db, current_user, status="flagged", content_type="all", order=order,
+                       cursor=cursor, limit=50, include_claimed=True)
 
-        content = []
-
-        # Get flagged posts
-        posts = crud.get_posts_for_moderation(db, status_filter="flagged", limit=50)
-        logger.info(f"Found {len(posts)} flagged posts")
-
-        for post in posts:
-            content.append({
-                "id": post.id,
-                "type": "post",
-                "title": post.title,
-                "content": post.content,
-                "author": post.owner.username,
-                "toxicity_score": getattr(post, 'toxicity_score', 0.0),
-                "moderation_status": getattr(post, 'moderation_status', 'flagged'),
-                "moderation_reason": getattr(post, 'moderation_reason', ''),
-                "created_at": post.created_at.isoformat()
-            })
 
-        # Get flagged comments
-        comments = crud.get_comments_for_moderation(db, status_filter="flagged", limit=50)
-        logger.info(f"Found {len(comments)} flagged comments")
-
-        for comment in comments:
-            author = comment.commenter.username if comment.commenter else comment.author_name
-            content.append({
-                "id": comment.id,
-                "type": "comment",
-                "title": None,
-                "content": comment.content,
-                "author": author,
-                "toxicity_score": getattr(comment, 'toxicity_score', 0.0),
-                "moderation_status": getattr(comment, 'moderation_status', 'flagged'),
-                "moderation_reason": getattr(comment, 'moderation_reason', ''),
-                "created_at": comment.created_at.isoformat()
-            })
+@router.post("/api/moderation/content/claim")
+def claim_queue_items(
+    claim_data: schemas.ModerationClaimRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(admin.require_moderator)
+):
+    """Lease the next `count` unclaimed items of the queue to the current moderator"""
+    statuses, content_types = _queue_filters(claim_data.status, claim_data.content_type, claim_data.order)
+    items = moderation_queue.claim_next(
+        db, current_user.id, count=claim_data.count, statuses=statuses,
+        content_types=content_types, order=claim_data.order,
+    )
+    return {"content": [_queue_item_payload(item) for item in items]}
+
+
+def _queued_content(db, content_type: str, content_id: int):
+    model = moderation_queue.CONTENT_TYPES.get(content_type)
+    if model is None:
+        raise HTTPException(status_code=400, detail="Invalid content type")
+    content = db.get(model, content_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Content not found")
+    return content
+
+
+@router.post("/api/moderation/content/{content_type}/{content_id}/claim")
+def claim_queue_item(
+    content_type: str,
+    content_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(admin.require_moderator)
+):
+    """Lease one item (or renew the current moderator's lease on it)"""
+    _queued_content(db, content_type, content_id)
+    expires_at = moderation_queue.claim_item(db, content_type, content_id, current_user.id)
+    if expires_at is None:
+        raise HTTPException(status_code=409, detail="Content is being reviewed by another moderator")
+    return {"success": True, "claim_expires_at": expires_at.isoformat()}
 
-        # Sort by toxicity score
-        content.sort(key=lambda x: x.get("toxicity_score", 0), reverse=True)
 
-        logger.info(f"Returning {len(content)} flagged content items")
-        return {"content": content}
+@router.delete("/api/moderation/content/{content_type}/{content_id}/claim")
+def release_queue_item(
+    content_type: str,
+    content_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(admin.require_moderator)
+):
+    """Give back a lease held by the current moderator"""
+    _queued_content(db, content_type, content_id)
+    released = moderation_queue.release_item(db, content_type, content_id, current_user.id)
+    return {"success": released}
+
 
+@router.post("/api/moderation/moderate/bulk")
+def moderate_content_bulk(
+    bulk_data: schemas.BulkModerationRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(admin.require_moderator)
+):
+    """Approve, reject or delete many posts/comments in one transaction"""
+    try:
+        results = crud.bulk_moderate_content(db, bulk_data.items, current_user.id)
     except Exception as e:
-        logger.error(f"Error getting flagged content: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get flagged content")
+        db.rollback()
+        logger.error(f"Error in bulk moderation: {e}")
+        raise HTTPException(status_code=500, detail="Failed to moderate content")
+    # The bulk UPDATEs do not go through the ORM flush hooks.
+    moderation_metrics.invalidate()
+
+    applied = sum(1 for r in results if r["status"] in ("approved", "rejected", "deleted"))
+    logger.info(f"Bulk moderation by {current_user.username}: {applied}/{len(results)} items applied")
+    return {"success": True, "applied": applied, "results": results}
 
 
 @router.post("/api/moderation/moderate/{content_type}/{content_id}")
@@ -295,6 +333,7 @@ def suspend_user(
             logger.warning(f"Suspension fields not available in User model for user {user_id}")
             return {"success": False, "message": "Suspension functionality not available"}
 
+        session_store.revoke_user_sessions(db, user.id)
         db.commit()
         logger.info(f"User {user.username} suspended by {current_user.username}: {suspension_data.reason}")
 
@@ -520,8 +559,7 @@ def get_extended_moderation_stats(
 ):
     """Get extended moderation statistics including AI logs"""
     try:
-        stats = crud.get_moderation_stats_extended(db)
-        return stats
+        return moderation_metrics.extended_stats(db)
 
     except Exception as e:
         logger.error(f"Error getting extended moderation stats: {e}")
@@ -1,10 +1,11 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .. import models, crud, auth
-from ..database import get_db
+from .. import models, crud, auth, async_crud
+from ..database import get_async_read_db, get_db
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +13,13 @@ router = APIRouter(tags=["notifications"])
 
 
 @router.get("/api/notifications")
-def get_notifications(
+async def get_notifications(
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(auth.get_required_user)
 ):
-    notifications = crud.get_notifications_for_user(db, current_user.id, skip, limit)
+    notifications = await async_crud.get_notifications_for_user(db, current_user.id, skip, limit)
     return {
         "notifications": [
             {
@@ -37,11 +38,11 @@ def get_notifications(
 
 
 @router.get("/api/notifications/unread-count")
-def get_unread_count(
-    db: Session = Depends(get_db),
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(auth.get_required_user)
 ):
-    count = crud.get_unread_notification_count(db, current_user.id)
+    count = await async_crud.get_unread_notification_count(db, current_user.id)
     return {"unread_count": count}
 
 
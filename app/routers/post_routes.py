@@ -8,6 +8,7 @@ from slowapi.util import get_remote_address
 
 from .. import models, schemas, crud, auth, moderation, theme_analysis, category_classifier, ai_critic
 from ..database import get_db
+from ..author_refs import author_payload, load_author_refs
 from ..utils import get_client_ip, SUBDOMAIN_SUFFIX
 from ..categories import CATEGORIES
 
@@ -333,8 +334,10 @@ def get_random_posts_api(
                 random_posts = []
 
         # Format posts for frontend
+        owners = load_author_refs(db, [p.user_id for p in random_posts])
         formatted_posts = []
         for post in random_posts:
+            owner = author_payload(owners.get(post.user_id)) or {}
             category_name = CATEGORIES.get(post.category, "") if post.category else ""
 
             formatted_posts.append({
@@ -347,8 +350,8 @@ def get_random_posts_api(
                 "category": post.category,
                 "category_name": category_name,
                 "owner": {
-                    "username": post.owner.username,
-                    "avatar_seed": post.owner.avatar_seed or f"{post.owner.username}-shapes"
+                    "username": owner.get("username"),
+                    "avatar_seed": owner.get("avatar_seed"),
                 }
             })
 
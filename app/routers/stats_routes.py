@@ -5,8 +5,8 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from .. import models, crud, auth, admin, statistics
-from ..database import get_db
+from .. import models, crud, auth, admin, query_stats, statistics
+from ..database import get_read_db
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,7 @@ def _parse_date(value: Optional[str]) -> Optional[date]:
 @router.get("/api/stats/post/{post_id}")
 def post_stats(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     from_date: Optional[str] = Query(None, alias="from"),
     to_date: Optional[str] = Query(None, alias="to"),
 ):
@@ -40,7 +40,7 @@ def post_stats(
 @router.get("/api/stats/author/{username}")
 def author_stats(
     username: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     from_date: Optional[str] = Query(None, alias="from"),
     to_date: Optional[str] = Query(None, alias="to"),
 ):
@@ -55,7 +55,7 @@ def author_stats(
 @router.get("/api/stats/category/{category_key}")
 def category_stats(
     category_key: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     from_date: Optional[str] = Query(None, alias="from"),
     to_date: Optional[str] = Query(None, alias="to"),
 ):
@@ -65,7 +65,7 @@ def category_stats(
 
 @router.get("/api/stats/overview")
 def overview_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(admin.require_admin),
     from_date: Optional[str] = Query(None, alias="from"),
     to_date: Optional[str] = Query(None, alias="to"),
@@ -74,9 +74,21 @@ def overview_stats(
     return statistics.get_overview_stats(db, _parse_date(from_date), _parse_date(to_date))
 
 
+@router.get("/api/stats/queries")
+def query_stats_by_route(
+    current_user: models.User = Depends(admin.require_admin),
+):
+    """Per-route SQL statement counts, DB time and N+1 suspects for this worker (admin only)."""
+    return {
+        "routes": query_stats.summary(),
+        "n_plus_one_threshold": query_stats.QUERY_STATS_N_PLUS_ONE,
+        "slow_query_ms": query_stats.QUERY_STATS_SLOW_MS,
+    }
+
+
 @router.get("/api/stats/my")
 def my_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: models.User = Depends(auth.get_required_user),
     from_date: Optional[str] = Query(None, alias="from"),
     to_date: Optional[str] = Query(None, alias="to"),
@@ -170,6 +170,21 @@ class ModerationActionRequest(BaseModel):
 class SuspendUserRequest(BaseModel):
     reason: str
 
+class BulkModerationItem(BaseModel):
+    content_type: str
+    content_id: int
+    action: str
+    reason: str = ""
+
+class BulkModerationRequest(BaseModel):
+    items: List[BulkModerationItem] = Field(..., min_length=1, max_length=500)
+
+class ModerationClaimRequest(BaseModel):
+    count: int = Field(default=10, ge=1, le=50)
+    status: str = "all"
+    content_type: str = "all"
+    order: str = "oldest"
+
 # ===================================
 # NOTIFICATION SCHEMAS
 # ===================================
@@ -247,6 +262,9 @@ class CollectionAddPostRequest(BaseModel):
 class CollectionRespondRequest(BaseModel):
     action: str  # "accept" | "reject"
 
+class CollectionReorderRequest(BaseModel):
+    post_ids: List[int] = Field(..., max_length=1000)  # accepted posts, first to last
+
 class PendingApprovalItem(BaseModel):
     entry: CollectionPostEntry
     direction: str  # "invitation" (owner invited author) | "suggestion" (author suggested to owner)
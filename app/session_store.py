@@ -0,0 +1,290 @@
+"""
+Optional server-side session backend.
+
+With SESSION_BACKEND=server, `main.py` installs `ServerSessionMiddleware`
+instead of Starlette's signed-cookie `SessionMiddleware`. The cookie then
+only carries an opaque random token; the session dict lives in the
+`user_sessions` table with an in-process LRU in front of it, so most
+requests neither decode/verify a cookie payload nor touch the database.
+
+Properties:
+  * `request.session` behaves exactly as before (same dict API).
+  * Rows are written only when the session changed, or to slide the expiry
+    forward (at most once per SESSION_TOUCH_INTERVAL_SECONDS).
+  * The token is rotated whenever `user_id` changes (login/logout), which
+    prevents session fixation.
+  * `revoke_user_sessions()` deletes every session of a user, e.g. on
+    suspension. Other workers drop their cached copy within
+    SESSION_CACHE_TTL_SECONDS.
+  * Expired rows are deleted lazily, in bounded batches, at most once per
+    SESSION_PURGE_INTERVAL_SECONDS per worker.
+"""
+import hashlib
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from . import metrics, models
+from .week_util import utcnow_naive
+
+logger = logging.getLogger(__name__)
+
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "cookie").lower()
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "30"))
+SESSION_TOUCH_INTERVAL_SECONDS = int(os.getenv("SESSION_TOUCH_INTERVAL_SECONDS", "3600"))
+SESSION_PURGE_INTERVAL_SECONDS = float(os.getenv("SESSION_PURGE_INTERVAL_SECONDS", "300"))
+SESSION_PURGE_BATCH_SIZE = int(os.getenv("SESSION_PURGE_BATCH_SIZE", "1000"))
+
+# Stores created in this process; revoke_user_sessions() clears their caches.
+_stores: "list[SessionStore]" = []
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def dump_session(data: dict) -> str:
+    # Canonical form: equal sessions always produce equal strings.
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+class SessionStore:
+    """`user_sessions` table with a small LRU cache in front of it."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_age: int,
+        cache_size: int = SESSION_CACHE_SIZE,
+        cache_ttl: float = SESSION_CACHE_TTL_SECONDS,
+        touch_interval: int = SESSION_TOUCH_INTERVAL_SECONDS,
+        purge_interval: float = SESSION_PURGE_INTERVAL_SECONDS,
+        purge_batch_size: int = SESSION_PURGE_BATCH_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.max_age = max_age
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.touch_interval = touch_interval
+        self.purge_interval = purge_interval
+        self.purge_batch_size = purge_batch_size
+        # key -> (valid_until, touch_at, user_id, data_json); both deadlines
+        # are time.monotonic() values so a cache hit never builds a datetime.
+        self._cache: "OrderedDict[str, Tuple[float, float, Optional[int], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_purge = time.monotonic() + purge_interval
+        _stores.append(self)
+
+    # ----- cache -----
+
+    def _cache_get(self, key: str):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry
+
+    def _cache_put(self, key: str, expires_at: datetime, user_id: Optional[int], data_json: str) -> float:
+        now = time.monotonic()
+        remaining = (expires_at - utcnow_naive()).total_seconds()
+        touch_at = now + remaining - (self.max_age - self.touch_interval)
+        with self._lock:
+            self._cache[key] = (now + min(self.cache_ttl, remaining), touch_at, user_id, data_json)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return touch_at
+
+    def _cache_drop(self, key: str) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def forget_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in [k for k, v in self._cache.items() if v[2] == user_id]:
+                del self._cache[key]
+
+    # ----- storage -----
+
+    def new_token(self) -> str:
+        return secrets.token_urlsafe(32)
+
+    def load_cached(self, token: str) -> Optional[Tuple[str, float]]:
+        entry = self._cache_get(_hash_token(token))
+        if entry is None:
+            return None
+        return entry[3], entry[1]
+
+    def load(self, token: str) -> Optional[Tuple[str, float]]:
+        """Return (data_json, touch_at) for a live session, else None.
+
+        `touch_at` is the monotonic time after which the expiry should be
+        slid forward even if the data did not change.
+        """
+        cached = self.load_cached(token)
+        if cached is not None:
+            return cached
+        key = _hash_token(token)
+        with self.session_factory() as db:
+            row = db.execute(
+                select(models.UserSession.expires_at, models.UserSession.user_id, models.UserSession.data)
+                .where(models.UserSession.id == key)
+            ).first()
+        if row is None or row.expires_at <= utcnow_naive():
+            return None
+        data_json = dump_session(row.data or {})
+        return data_json, self._cache_put(key, row.expires_at, row.user_id, data_json)
+
+    def save(self, token: str, data_json: str, *, replaces: Optional[str] = None) -> None:
+        key = _hash_token(token)
+        data = json.loads(data_json)
+        expires_at = utcnow_naive() + timedelta(seconds=self.max_age)
+        user_id = data.get("user_id")
+        with self.session_factory() as db:
+            if replaces is not None:
+                db.execute(delete(models.UserSession).where(models.UserSession.id == _hash_token(replaces)))
+            db.merge(models.UserSession(id=key, user_id=user_id, data=data, expires_at=expires_at))
+            db.commit()
+        if replaces is not None:
+            self._cache_drop(_hash_token(replaces))
+        self._cache_put(key, expires_at, user_id, data_json)
+        self.maybe_purge()
+
+    def delete(self, token: str) -> None:
+        key = _hash_token(token)
+        self._cache_drop(key)
+        with self.session_factory() as db:
+            db.execute(delete(models.UserSession).where(models.UserSession.id == key))
+            db.commit()
+
+    def maybe_purge(self) -> int:
+        if time.monotonic() < self._next_purge:
+            return 0
+        self._next_purge = time.monotonic() + self.purge_interval
+        return self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete one bounded batch of expired rows; returns rows deleted."""
+        with self.session_factory() as db:
+            expired_ids = select(models.UserSession.id).where(
+                models.UserSession.expires_at <= utcnow_naive()
+            ).limit(self.purge_batch_size)
+            deleted = db.execute(
+                delete(models.UserSession)
+                .where(models.UserSession.id.in_(expired_ids))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        if deleted:
+            logger.info("Purged %s expired sessions", deleted)
+        return deleted or 0
+
+
+def revoke_user_sessions(db: Session, user_id: int) -> int:
+    """Delete every server-side session of `user_id` (caller commits).
+
+    Has no effect on signed-cookie sessions, which cannot be revoked
+    server-side.
+    """
+    deleted = db.execute(
+        delete(models.UserSession)
+        .where(models.UserSession.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    for store in _stores:
+        store.forget_user(user_id)
+    return deleted or 0
+
+
+class ServerSessionMiddleware:
+    """Drop-in replacement for starlette's SessionMiddleware."""
+
+    def __init__(
+        self,
+        app,
+        store: SessionStore,
+        session_cookie: str = "session",
+        max_age: Optional[int] = 14 * 24 * 60 * 60,
+        path: str = "/",
+        same_site: str = "lax",
+        https_only: bool = False,
+        domain: Optional[str] = None,
+    ):
+        self.app = app
+        self.store = store
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.path = path
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:
+            self.security_flags += "; secure"
+        if domain is not None:
+            self.security_flags += f"; domain={domain}"
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        token = connection.cookies.get(self.session_cookie)
+        loaded = None
+        if token:
+            # Cache hits stay on the event loop; only misses go to a thread.
+            loaded = self.store.load_cached(token)
+            metrics.record_cache("session", loaded is not None)
+            if loaded is None:
+                loaded = await run_in_threadpool(self.store.load, token)
+        initial_json = loaded[0] if loaded else "{}"
+        # Decoding the canonical JSON gives every request its own copy, so
+        # in-place edits of nested values (OAuth state) are detected too.
+        initial: Dict = json.loads(initial_json)
+        scope["session"] = json.loads(initial_json)
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                session = scope["session"]
+                headers = MutableHeaders(scope=message)
+                if session:
+                    session_json = dump_session(session)
+                    rotate = loaded is None or session.get("user_id") != initial.get("user_id")
+                    if rotate or session_json != initial_json or time.monotonic() >= loaded[1]:
+                        new_token = self.store.new_token() if rotate else token
+                        await run_in_threadpool(
+                            self.store.save, new_token, session_json, replaces=token if rotate and loaded else None
+                        )
+                        headers.append("Set-Cookie", self._cookie(new_token, self.max_age))
+                elif loaded is not None:
+                    await run_in_threadpool(self.store.delete, token)
+                    headers.append("Set-Cookie", self._cookie("null", 0, expired=True))
+                elif token:
+                    # Unknown, expired or revoked token: stop the browser sending it.
+                    headers.append("Set-Cookie", self._cookie("null", 0, expired=True))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _cookie(self, value: str, max_age: Optional[int], expired: bool = False) -> str:
+        cookie = f"{self.session_cookie}={value}; path={self.path}; "
+        if expired:
+            cookie += "expires=Thu, 01 Jan 1970 00:00:00 GMT; "
+        elif max_age:
+            cookie += f"Max-Age={max_age}; "
+        return cookie + self.security_flags
@@ -11,7 +11,7 @@ from fastapi import Request
 from sqlalchemy import func, case, distinct, and_, cast, Date as SQLDate
 from sqlalchemy.orm import Session
 
-from . import models, crud
+from . import models, crud, metrics
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +155,7 @@ def record_view(
         content_owner_id=content_owner_id,
     )
     db.add(page_view)
+    metrics.record_page_view(content_type, is_bot, bot_reason, is_duplicate)
 
     # Only increment denormalized view_count for real, unique views
     if not is_bot and not is_duplicate:
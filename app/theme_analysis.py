@@ -5,6 +5,8 @@ from typing import Optional, List
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
+from . import metrics
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -79,15 +81,16 @@ def extract_themes_from_text(text: str, existing_themes: List[str], existing_fee
     existing_terms_section = _build_existing_terms_section(existing_themes, existing_feelings)
     system_prompt = THEME_EXTRACTION_PROMPT.format(existing_terms_section=existing_terms_section)
 
-    response = client.chat.complete(
-        model=THEME_ANALYSIS_MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": text},
-        ],
-        temperature=0.0,
-        response_format={"type": "json_object"},
-    )
+    with metrics.llm_call("theme_analysis", "extract"):
+        response = client.chat.complete(
+            model=THEME_ANALYSIS_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text},
+            ],
+            temperature=0.0,
+            response_format={"type": "json_object"},
+        )
 
     response_text = response.choices[0].message.content.strip()
     try:
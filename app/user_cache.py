@@ -0,0 +1,106 @@
+"""
+Short-lived, size-bounded cache of the logged-in user's row.
+
+`auth.get_current_user` runs on nearly every request; with this cache most of
+them skip the `users` lookup. Entries are keyed by `(user_id, db_epoch)` and
+hold a plain dict of column values, which is turned back into a `User`
+attached to the request's session without a query.
+
+Invalidation is local to the process: any ORM flush that touches a `User`
+and the bulk-update helpers in `crud` drop the entry once the transaction
+commits. Other workers see changes after at most USER_CACHE_TTL_SECONDS,
+which is why the TTL is kept short. Set it to 0 to disable the cache.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from . import metrics, models
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "15"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "4096"))
+
+_PENDING_INVALIDATIONS_KEY = "user_cache_invalidations"
+
+_entries: "OrderedDict[tuple, tuple[float, Dict[str, Any]]]" = OrderedDict()
+_lock = threading.Lock()
+_column_keys = tuple(attr.key for attr in inspect(models.User).column_attrs)
+
+
+def snapshot(user: models.User) -> Dict[str, Any]:
+    return {key: getattr(user, key) for key in _column_keys}
+
+
+def get(db: Session, user_id: int, epoch: Hashable) -> Optional[models.User]:
+    """Return a session-bound User rebuilt from the cache, or None on a miss."""
+    if USER_CACHE_TTL_SECONDS <= 0:
+        return None
+    key = (user_id, epoch)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del _entries[key]
+            entry = None
+        if entry is not None:
+            _entries.move_to_end(key)
+    metrics.record_cache("user", entry is not None)
+    if entry is None:
+        return None
+    values = entry[1]
+    user = models.User()
+    for attr, value in values.items():
+        setattr(user, attr, value)
+    # Pretend the row was just loaded so that later changes flush as a
+    # normal UPDATE of the modified columns only.
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def put(user: models.User, epoch: Hashable) -> None:
+    if USER_CACHE_TTL_SECONDS <= 0:
+        return
+    values = snapshot(user)
+    with _lock:
+        _entries[(user.id, epoch)] = (time.monotonic() + USER_CACHE_TTL_SECONDS, values)
+        _entries.move_to_end((user.id, epoch))
+        while len(_entries) > USER_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def invalidate(user_id: int) -> None:
+    with _lock:
+        for key in [k for k in _entries if k[0] == user_id]:
+            del _entries[key]
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def invalidate_on_commit(db: Session, user_id: int) -> None:
+    """Drop the cached user once `db` commits (for Query.update() paths)."""
+    db.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session: Session, flush_context) -> None:
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.User) and obj.id is not None:
+            session.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS_KEY, ()):
+        invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
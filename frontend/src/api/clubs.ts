@@ -43,6 +43,9 @@ export interface ClubBoardMessage {
   updated_at: string;
   author: ClubBoardAuthor | null;
   replies: ClubBoardMessage[];
+  // Threads only: replies are capped; follow replies_cursor for the rest.
+  reply_count?: number;
+  replies_cursor?: string | null;
 }
 
 export interface ClubSummary {
@@ -103,12 +106,16 @@ export type ClubUpdateData = Partial<ClubCreateData>;
 export function fetchClubs(params?: {
   speciality?: ClubSpeciality;
   theme?: string;
+  search?: string;
+  cursor?: string;
   limit?: number;
   offset?: number;
-}): Promise<{ clubs: ClubSummary[] }> {
+}): Promise<{ clubs: ClubSummary[]; next_cursor?: string | null }> {
   const q = new URLSearchParams();
   if (params?.speciality) q.set("speciality", params.speciality);
   if (params?.theme) q.set("theme", params.theme);
+  if (params?.search) q.set("q", params.search);
+  if (params?.cursor) q.set("cursor", params.cursor);
   if (params?.limit !== undefined) q.set("limit", String(params.limit));
   if (params?.offset !== undefined) q.set("offset", String(params.offset));
   const qs = q.toString();
@@ -125,15 +132,27 @@ export function fetchClubBySlug(slug: string): Promise<ClubDetail> {
 
 export function fetchClubBoard(
   clubId: number,
-  params?: { limit?: number; offset?: number },
-): Promise<{ messages: ClubBoardMessage[] }> {
+  params?: { limit?: number; cursor?: string },
+): Promise<{ messages: ClubBoardMessage[]; next_cursor: string | null }> {
   const q = new URLSearchParams();
   if (params?.limit !== undefined) q.set("limit", String(params.limit));
-  if (params?.offset !== undefined) q.set("offset", String(params.offset));
+  if (params?.cursor) q.set("cursor", params.cursor);
   const qs = q.toString();
   return api.get(`/api/clubs/${clubId}/board${qs ? `?${qs}` : ""}`);
 }
 
+export function fetchClubBoardReplies(
+  clubId: number,
+  messageId: number,
+  params?: { limit?: number; cursor?: string },
+): Promise<{ replies: ClubBoardMessage[]; next_cursor: string | null }> {
+  const q = new URLSearchParams();
+  if (params?.limit !== undefined) q.set("limit", String(params.limit));
+  if (params?.cursor) q.set("cursor", params.cursor);
+  const qs = q.toString();
+  return api.get(`/api/clubs/${clubId}/board/${messageId}/replies${qs ? `?${qs}` : ""}`);
+}
+
 // ----- authenticated reads -----
 
 export function fetchUserClubs(): Promise<{ clubs: ClubSummary[] }> {
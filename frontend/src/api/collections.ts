@@ -40,10 +40,13 @@ export interface CollectionEntry {
   post: CollectionPostRef | null;
 }
 
-export interface CollectionDetail extends CollectionSummary {
+export interface CollectionPostsPage {
   posts: CollectionEntry[];
+  next_cursor: string | null;
 }
 
+export interface CollectionDetail extends CollectionSummary, CollectionPostsPage {}
+
 export interface CollectionManageView extends CollectionSummary {
   accepted: CollectionEntry[];
   pending: CollectionEntry[];
@@ -78,6 +81,13 @@ export function fetchCollectionBySlug(slug: string): Promise<CollectionDetail> {
   return api.get(`/api/collections/${encodeURIComponent(slug)}`);
 }
 
+export function fetchCollectionPosts(
+  collectionId: number,
+  cursor: string,
+): Promise<CollectionPostsPage> {
+  return api.get(`/api/collections/${collectionId}/posts?cursor=${encodeURIComponent(cursor)}`);
+}
+
 export function fetchUserCollections(username: string): Promise<{ collections: CollectionSummary[] }> {
   return api.get(`/api/users/${encodeURIComponent(username)}/collections`);
 }
@@ -127,6 +137,10 @@ export function removeCollectionEntry(collectionId: number, postId: number): Pro
   return api.delete(`/api/collections/${collectionId}/posts/${postId}`);
 }
 
+export function reorderCollection(collectionId: number, postIds: number[]): Promise<{ post_ids: number[] }> {
+  return api.put(`/api/collections/${collectionId}/order`, { post_ids: postIds });
+}
+
 export interface RandomCollection {
   id: number;
   title: string;
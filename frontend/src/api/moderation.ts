@@ -22,6 +22,13 @@ export interface ModerationItem {
   toxicity_score: number;
   moderation_status: string;
   created_at: string;
+  claimed_by?: number | null;
+  claim_expires_at?: string | null;
+}
+
+export interface ModerationContentPage {
+  content: ModerationItem[];
+  next_cursor: string | null;
 }
 
 export interface ModerationQueueItem {
@@ -77,18 +84,68 @@ export function fetchModerationStats(): Promise<ModerationStats> {
   return api.get("/api/moderation/stats");
 }
 
-export function fetchPendingContent(): Promise<{ content: ModerationItem[] }> {
-  return api.get("/api/moderation/content/pending");
+function cursorQuery(cursor?: string | null): string {
+  return cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+}
+
+export function fetchPendingContent(cursor?: string | null): Promise<ModerationContentPage> {
+  return api.get(`/api/moderation/content/pending${cursorQuery(cursor)}`);
+}
+
+export function fetchFlaggedContent(cursor?: string | null): Promise<ModerationContentPage> {
+  return api.get(`/api/moderation/content/flagged${cursorQuery(cursor)}`);
+}
+
+export function fetchContentQueue(
+  params: { status?: string; content_type?: string; order?: string; cursor?: string | null } = {},
+): Promise<ModerationContentPage> {
+  const search = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    if (value) search.set(key, value);
+  }
+  const qs = search.toString();
+  return api.get(`/api/moderation/content/queue${qs ? `?${qs}` : ""}`);
+}
+
+export function claimNextContent(
+  count = 10,
+  params: { status?: string; content_type?: string; order?: string } = {},
+): Promise<{ content: ModerationItem[] }> {
+  return api.post("/api/moderation/content/claim", { count, ...params });
+}
+
+export function claimContent(type: string, id: number): Promise<{ claim_expires_at: string }> {
+  return api.post(`/api/moderation/content/${type}/${id}/claim`);
 }
 
-export function fetchFlaggedContent(): Promise<{ content: ModerationItem[] }> {
-  return api.get("/api/moderation/content/flagged");
+export function releaseContent(type: string, id: number): Promise<{ success: boolean }> {
+  return api.delete(`/api/moderation/content/${type}/${id}/claim`);
 }
 
 export function moderateContent(type: string, id: number, action: string, reason?: string): Promise<{ message: string }> {
   return api.post(`/api/moderation/moderate/${type}/${id}`, { action, reason });
 }
 
+export interface BulkModerationItem {
+  content_type: string;
+  content_id: number;
+  action: "approve" | "reject" | "delete";
+  reason?: string;
+}
+
+export interface BulkModerationResult {
+  type: string;
+  id: number;
+  action: string;
+  status: string;
+}
+
+export function moderateContentBulk(
+  items: BulkModerationItem[],
+): Promise<{ applied: number; results: BulkModerationResult[] }> {
+  return api.post("/api/moderation/moderate/bulk", { items });
+}
+
 export function fetchModerationQueue(): Promise<{ queue: ModerationQueueItem[] }> {
   return api.get("/api/moderation/queue");
 }
@@ -3,6 +3,7 @@ import { useMutation, useQueryClient } from "@tanstack/react-query";
 import {
   postClubBoardMessage,
   deleteClubBoardMessage,
+  fetchClubBoardReplies,
   type ClubBoardMessage,
   type ClubMemberRole,
 } from "@/api/clubs";
@@ -27,8 +28,29 @@ export function ClubBoard({ clubId, clubSlug, messages, myRole }: Props) {
   const [composerContent, setComposerContent] = useState("");
   const [replyTo, setReplyTo] = useState<number | null>(null);
   const [replyContent, setReplyContent] = useState("");
+  // Replies fetched past the per-thread cap, keyed by thread id.
+  const [moreReplies, setMoreReplies] = useState<
+    Record<number, { replies: ClubBoardMessage[]; cursor: string | null }>
+  >({});
 
-  const invalidate = () => qc.invalidateQueries({ queryKey: ["clubs", "bySlug", clubSlug] });
+  const invalidate = () => {
+    setMoreReplies({});
+    return qc.invalidateQueries({ queryKey: ["clubs", "bySlug", clubSlug] });
+  };
+
+  const loadMoreMutation = useMutation({
+    mutationFn: (vars: { threadId: number; cursor: string }) =>
+      fetchClubBoardReplies(clubId, vars.threadId, { cursor: vars.cursor }),
+    onSuccess: (data, vars) =>
+      setMoreReplies((prev) => ({
+        ...prev,
+        [vars.threadId]: {
+          replies: [...(prev[vars.threadId]?.replies ?? []), ...data.replies],
+          cursor: data.next_cursor,
+        },
+      })),
+    onError: (e: Error) => showToast(e.message || "Răspunsurile nu au putut fi încărcate", "danger"),
+  });
 
   const postMutation = useMutation({
     mutationFn: (vars: { content: string; parent_id?: number | null }) =>
@@ -208,6 +230,25 @@ export function ClubBoard({ clubId, clubSlug, messages, myRole }: Props) {
           {!isReply && msg.replies.length > 0 ? (
             <div style={{ marginTop: 6 }}>
               {msg.replies.map((r) => renderMessage(r, true))}
+              {(moreReplies[msg.id]?.replies ?? []).map((r) => renderMessage(r, true))}
+              {(() => {
+                const extra = moreReplies[msg.id];
+                const cursor = extra ? extra.cursor : msg.replies_cursor;
+                if (!cursor) return null;
+                const shown = msg.replies.length + (extra?.replies.length ?? 0);
+                const remaining = (msg.reply_count ?? shown) - shown;
+                return (
+                  <button
+                    type="button"
+                    onClick={() => loadMoreMutation.mutate({ threadId: msg.id, cursor })}
+                    disabled={loadMoreMutation.isPending}
+                    className="cal-btn"
+                    style={{ marginLeft: 36, marginTop: 4 }}
+                  >
+                    {remaining > 0 ? `Vezi încă ${remaining} răspunsuri` : "Vezi mai multe răspunsuri"}
+                  </button>
+                );
+              })()}
             </div>
           ) : null}
         </div>
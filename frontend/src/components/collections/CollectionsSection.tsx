@@ -8,6 +8,7 @@ import {
   fetchMyCollections,
   fetchMyPendingApprovals,
   removeCollectionEntry,
+  reorderCollection,
   respondCollectionEntry,
   updateCollection,
   type CollectionSummary,
@@ -490,6 +491,23 @@ function ManageCollectionDialog({
     onError: (err: Error) => showToast(err.message, "danger"),
   });
 
+  const reorderMutation = useMutation({
+    mutationFn: (postIds: number[]) => reorderCollection(collectionId, postIds),
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ["collections", "manage", collectionId] });
+      queryClient.invalidateQueries({ queryKey: ["collections", "bySlug"] });
+    },
+    onError: (err: Error) => showToast(err.message, "danger"),
+  });
+
+  const move = (index: number, delta: number) => {
+    if (!data) return;
+    const postIds = data.accepted.map((entry) => entry.post_id);
+    const [postId] = postIds.splice(index, 1);
+    postIds.splice(index + delta, 0, postId);
+    reorderMutation.mutate(postIds);
+  };
+
   return (
     <Dialog open={true} onOpenChange={(v) => !v && onClose()}>
       <DialogContent className="max-w-[640px]">
@@ -519,7 +537,7 @@ function ManageCollectionDialog({
                 </p>
               ) : (
                 <ul className="flex flex-col gap-2">
-                  {data.accepted.map((entry) => (
+                  {data.accepted.map((entry, index) => (
                     <li
                       key={entry.id}
                       style={{
@@ -553,14 +571,34 @@ function ManageCollectionDialog({
                           {entry.post?.category ? ` · ${entry.post.category}` : ""}
                         </div>
                       </div>
-                      <Button
-                        size="sm"
-                        variant="danger"
-                        disabled={removeMutation.isPending}
-                        onClick={() => entry.post && removeMutation.mutate(entry.post.id)}
-                      >
-                        scoate
-                      </Button>
+                      <div className="flex gap-2">
+                        <Button
+                          size="sm"
+                          variant="outline"
+                          aria-label="mută mai sus"
+                          disabled={index === 0 || reorderMutation.isPending}
+                          onClick={() => move(index, -1)}
+                        >
+                          ↑
+                        </Button>
+                        <Button
+                          size="sm"
+                          variant="outline"
+                          aria-label="mută mai jos"
+                          disabled={index === data.accepted.length - 1 || reorderMutation.isPending}
+                          onClick={() => move(index, 1)}
+                        >
+                          ↓
+                        </Button>
+                        <Button
+                          size="sm"
+                          variant="danger"
+                          disabled={removeMutation.isPending}
+                          onClick={() => entry.post && removeMutation.mutate(entry.post.id)}
+                        >
+                          scoate
+                        </Button>
+                      </div>
                     </li>
                   ))}
                 </ul>
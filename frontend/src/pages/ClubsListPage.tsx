@@ -1,6 +1,6 @@
 import { useState } from "react";
 import { Link } from "react-router-dom";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { Helmet } from "react-helmet-async";
 import { fetchClubs, type ClubSpeciality } from "@/api/clubs";
 import { useAuth } from "@/hooks/useAuth";
@@ -17,18 +17,25 @@ export default function ClubsListPage() {
   const [filter, setFilter] = useState<Filter>("toate");
   const [themeQuery, setThemeQuery] = useState("");
   const [appliedTheme, setAppliedTheme] = useState("");
+  const [searchQuery, setSearchQuery] = useState("");
+  const [appliedSearch, setAppliedSearch] = useState("");
 
-  const { data, isLoading } = useQuery({
-    queryKey: ["clubs", "list", filter, appliedTheme],
-    queryFn: () =>
+  // Only search results are cursor-paginated; the plain list has one page.
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
+    queryKey: ["clubs", "list", filter, appliedTheme, appliedSearch],
+    queryFn: ({ pageParam }) =>
       fetchClubs({
         speciality: filter === "toate" ? undefined : filter,
         theme: appliedTheme || undefined,
+        search: appliedSearch || undefined,
+        cursor: pageParam,
       }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (last) => last.next_cursor ?? undefined,
   });
 
   if (isLoading) return <PageLoader />;
-  const clubs = data?.clubs ?? [];
+  const clubs = data?.pages.flatMap((page) => page.clubs) ?? [];
 
   return (
     <>
@@ -67,9 +74,25 @@ export default function ClubsListPage() {
             <form
               onSubmit={(e) => {
                 e.preventDefault();
-                setAppliedTheme(themeQuery.trim());
+                setAppliedSearch(searchQuery.trim());
               }}
               style={{ marginTop: 12 }}
+            >
+              <input
+                type="text"
+                value={searchQuery}
+                onChange={(e) => setSearchQuery(e.target.value)}
+                placeholder="caută cluburi..."
+                className="cal-input"
+                style={{ width: "100%" }}
+              />
+            </form>
+            <form
+              onSubmit={(e) => {
+                e.preventDefault();
+                setAppliedTheme(themeQuery.trim());
+              }}
+              style={{ marginTop: 8 }}
             >
               <input
                 type="text"
@@ -120,6 +143,18 @@ export default function ClubsListPage() {
               ))}
             </div>
           )}
+          {hasNextPage && (
+            <div style={{ marginTop: 16 }}>
+              <button
+                type="button"
+                className="cal-btn"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+              >
+                {isFetchingNextPage ? "Se încarcă..." : "Vezi mai multe cluburi"}
+              </button>
+            </div>
+          )}
         </PieceCol>
       </Stage>
     </>
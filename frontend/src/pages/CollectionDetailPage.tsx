@@ -1,7 +1,12 @@
 import { Link, useParams } from "react-router-dom";
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import { Helmet } from "react-helmet-async";
-import { fetchCollectionBySlug } from "@/api/collections";
+import {
+  fetchCollectionBySlug,
+  fetchCollectionPosts,
+  type CollectionDetail,
+  type CollectionPostsPage,
+} from "@/api/collections";
 import { PageLoader } from "@/components/layout/LoadingSpinner";
 import { Stage, LeftCol, PieceCol } from "@/components/ui/stage";
 import { KindBadge } from "@/components/ui/kind-badge";
@@ -10,13 +15,19 @@ import { formatDate, getBlogUrl } from "@/lib/utils";
 
 export default function CollectionDetailPage() {
   const { slug } = useParams<{ slug: string }>();
-  const { data, isLoading, error } = useQuery({
+  // The first page comes with the collection; the rest follow next_cursor.
+  const { data: pages, isLoading, error, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ["collections", "bySlug", slug],
-    queryFn: () => fetchCollectionBySlug(slug!),
+    queryFn: ({ pageParam }): Promise<CollectionPostsPage> =>
+      pageParam ? fetchCollectionPosts(pageParam.id, pageParam.cursor) : fetchCollectionBySlug(slug!),
+    initialPageParam: null as { id: number; cursor: string } | null,
+    getNextPageParam: (last, all) =>
+      last.next_cursor ? { id: (all[0] as CollectionDetail).id, cursor: last.next_cursor } : undefined,
     enabled: !!slug,
   });
 
   if (isLoading) return <PageLoader />;
+  const data = pages?.pages[0] as CollectionDetail | undefined;
   if (error || !data) {
     return (
       <Stage variant="centered">
@@ -29,6 +40,7 @@ export default function CollectionDetailPage() {
   }
 
   const ownerUrl = data.owner ? getBlogUrl(data.owner.username) : "/";
+  const posts = pages!.pages.flatMap((page) => page.posts);
 
   return (
     <>
@@ -85,7 +97,7 @@ export default function CollectionDetailPage() {
             </p>
           ) : null}
 
-          {data.posts.length === 0 ? (
+          {posts.length === 0 ? (
             <p
               style={{
                 color: "var(--color-ink-faint)",
@@ -97,7 +109,7 @@ export default function CollectionDetailPage() {
             </p>
           ) : (
             <ul className="flex flex-col gap-3">
-              {data.posts.map((entry, idx) => {
+              {posts.map((entry, idx) => {
                 if (!entry.post) return null;
                 const p = entry.post;
                 const postUrl = p.owner ? `${getBlogUrl(p.owner.username)}/${p.slug}` : `/${p.slug}`;
@@ -159,6 +171,18 @@ export default function CollectionDetailPage() {
               })}
             </ul>
           )}
+          {hasNextPage && (
+            <div style={{ marginTop: 16 }}>
+              <button
+                type="button"
+                className="cal-btn"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+              >
+                {isFetchingNextPage ? "Se încarcă..." : "Vezi mai multe texte"}
+              </button>
+            </div>
+          )}
           <div style={{ marginTop: 24 }}>
             <Link
               to="/"
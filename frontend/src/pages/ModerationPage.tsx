@@ -61,12 +61,12 @@ export default function ModerationPage() {
   });
   const { data: pendingData } = useQuery({
     queryKey: ["moderation", "pending"],
-    queryFn: fetchPendingContent,
+    queryFn: () => fetchPendingContent(),
     enabled: tab === "pending",
   });
   const { data: flaggedData } = useQuery({
     queryKey: ["moderation", "flagged"],
-    queryFn: fetchFlaggedContent,
+    queryFn: () => fetchFlaggedContent(),
     enabled: tab === "flagged",
   });
   const { data: queueData } = useQuery({
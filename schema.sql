@@ -3,10 +3,18 @@
 -- Romanian Writers Microblogging Platform
 -- ===================================
 
+-- Trigram indexes (club search)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Drop tables in reverse order of dependency
 DROP TABLE IF EXISTS stripe_events CASCADE;
 DROP TABLE IF EXISTS super_likes CASCADE;
+DROP TABLE IF EXISTS cache_invalidations CASCADE;
+DROP TABLE IF EXISTS cache_entries CASCADE;
+DROP TABLE IF EXISTS user_sessions CASCADE;
+DROP TABLE IF EXISTS notification_archive CASCADE;
 DROP TABLE IF EXISTS notifications CASCADE;
+DROP TABLE IF EXISTS moderation_claims CASCADE;
 DROP TABLE IF EXISTS moderation_logs CASCADE;
 DROP TABLE IF EXISTS messages CASCADE;
 DROP TABLE IF EXISTS conversations CASCADE;
@@ -101,7 +109,7 @@ CREATE INDEX idx_posts_genre ON posts(genre);
 CREATE INDEX idx_posts_view_count ON posts(view_count);
 CREATE INDEX idx_posts_created_at ON posts(created_at);
 CREATE INDEX idx_posts_category_genre_views ON posts(category, genre, view_count);
-CREATE INDEX idx_posts_moderation_status ON posts(moderation_status);
+CREATE INDEX idx_posts_moderation_queue ON posts(moderation_status, created_at, id);
 CREATE INDEX idx_posts_toxicity_score ON posts(toxicity_score);
 CREATE INDEX idx_posts_themes ON posts USING GIN (themes);
 CREATE INDEX idx_posts_feelings ON posts USING GIN (feelings);
@@ -136,7 +144,7 @@ CREATE INDEX idx_comments_post_id ON comments(post_id);
 CREATE INDEX idx_comments_user_id ON comments(user_id);
 CREATE INDEX idx_comments_approved ON comments(approved);
 CREATE INDEX idx_comments_post_approved ON comments(post_id, approved);
-CREATE INDEX idx_comments_moderation_status ON comments(moderation_status);
+CREATE INDEX idx_comments_moderation_queue ON comments(moderation_status, created_at, id);
 CREATE INDEX idx_comments_toxicity_score ON comments(toxicity_score);
 CREATE INDEX idx_comments_is_robot ON comments(post_id, is_robot);
 
@@ -214,6 +222,7 @@ CREATE TABLE collections (
     title VARCHAR(120) NOT NULL,
     slug VARCHAR(140) UNIQUE NOT NULL,
     description TEXT,
+    version INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
@@ -244,7 +253,9 @@ CREATE TABLE collection_posts (
     CONSTRAINT fk_cp_initiator FOREIGN KEY (initiator_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
-CREATE INDEX idx_cp_collection_status ON collection_posts(collection_id, status);
+-- Serves both the (collection_id, status) counts and the ordered, keyset
+-- paginated entry listing.
+CREATE INDEX idx_cp_collection_order ON collection_posts(collection_id, status, position NULLS LAST, created_at DESC, id DESC);
 CREATE INDEX idx_cp_post_status ON collection_posts(post_id, status);
 CREATE INDEX idx_cp_initiator ON collection_posts(initiator_id);
 
@@ -264,6 +275,8 @@ CREATE TABLE clubs (
         CHECK (speciality IN ('poezie', 'proza_scurta')),
     featured_post_id INT,
     featured_until TIMESTAMP,
+    member_count INT NOT NULL DEFAULT 0,
+    search_text TEXT NOT NULL DEFAULT '',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
@@ -275,6 +288,9 @@ CREATE INDEX idx_clubs_owner_id ON clubs(owner_id);
 CREATE INDEX idx_clubs_slug ON clubs(slug);
 CREATE INDEX idx_clubs_speciality ON clubs(speciality);
 CREATE INDEX idx_clubs_created_at ON clubs(created_at);
+-- Club search: app.club_search folds accents into search_text, pg_trgm
+-- serves the LIKE '%term%' filters and word_similarity ranking.
+CREATE INDEX idx_clubs_search_trgm ON clubs USING gin (search_text gin_trgm_ops);
 
 -- ===================================
 -- CLUB MEMBERS TABLE
@@ -343,6 +359,7 @@ CREATE TABLE club_board_messages (
 
 CREATE INDEX idx_cbm_club_created ON club_board_messages(club_id, created_at DESC);
 CREATE INDEX idx_cbm_parent ON club_board_messages(parent_id);
+CREATE INDEX idx_cbm_club_author ON club_board_messages(club_id, author_id);
 
 -- ===================================
 -- USER AWARDS TABLE
@@ -443,6 +460,20 @@ CREATE INDEX idx_modlog_created_at ON moderation_logs(created_at);
 CREATE INDEX idx_modlog_pending_review ON moderation_logs(ai_decision, human_decision);
 CREATE INDEX idx_modlog_moderator ON moderation_logs(moderated_by);
 
+-- Moderator leases on queued posts/comments (see app/moderation_queue.py)
+CREATE TABLE moderation_claims (
+    content_type VARCHAR(20) NOT NULL CHECK (content_type IN ('post', 'comment')),
+    content_id INT NOT NULL,
+    moderator_id INT NOT NULL,
+    claimed_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+
+    PRIMARY KEY (content_type, content_id),
+    CONSTRAINT fk_modclaim_moderator FOREIGN KEY (moderator_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_modclaim_moderator ON moderation_claims(moderator_id);
+
 -- ===================================
 -- NOTIFICATIONS TABLE
 -- ===================================
@@ -463,6 +494,67 @@ CREATE TABLE notifications (
 CREATE INDEX idx_notif_user_read_created ON notifications(user_id, is_read, created_at);
 CREATE INDEX idx_notif_user_id ON notifications(user_id);
 
+-- Read notifications older than the retention window are moved here by
+-- scripts/archive_notifications.py. Repetitive types are folded into one row
+-- per user/type/day (item_count > 1); message bodies and metadata are dropped.
+CREATE TABLE notification_archive (
+    id BIGSERIAL PRIMARY KEY,
+    user_id INT NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    link VARCHAR(500),
+    item_count INT NOT NULL DEFAULT 1,
+    first_created_at TIMESTAMP NOT NULL,
+    last_created_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT fk_notif_archive_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_notif_archive_user_created ON notification_archive(user_id, last_created_at);
+
+-- ===================================
+-- USER SESSIONS TABLE
+-- ===================================
+-- Server-side sessions (SESSION_BACKEND=server). The cookie carries an opaque
+-- token; id is its SHA-256. Expired rows are purged lazily in batches.
+CREATE TABLE user_sessions (
+    id VARCHAR(64) PRIMARY KEY,
+    user_id INT,
+    data JSONB NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+
+    CONSTRAINT fk_user_sessions_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_user_sessions_user_id ON user_sessions(user_id);
+CREATE INDEX idx_user_sessions_expires_at ON user_sessions(expires_at);
+
+-- ===================================
+-- SHARED CACHE TABLES
+-- ===================================
+-- Shared tier of app.cache (CACHE_SHARED_BACKEND=database). key is the
+-- SHA-256 of the cache key; tags is " tag1 tag2 " so one tag matches with
+-- LIKE. Workers poll cache_invalidations for tags dropped elsewhere.
+CREATE TABLE cache_entries (
+    key VARCHAR(64) PRIMARY KEY,
+    value TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT ' ',
+    fresh_until TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX idx_cache_entries_expires_at ON cache_entries(expires_at);
+
+CREATE TABLE cache_invalidations (
+    id BIGSERIAL PRIMARY KEY,
+    tag VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX idx_cache_invalidations_created_at ON cache_invalidations(created_at);
+
 -- ===================================
 -- PAGE VIEWS TABLE (Analytics)
 -- ===================================
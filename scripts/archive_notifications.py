@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Move old read notifications into `notification_archive`.
+
+Meant to run from cron (e.g. nightly). Work happens in short, throttled
+batches so it is safe to run while the site is live; see
+`app/notification_retention.py` for the details.
+
+Invocation:
+    python scripts/archive_notifications.py [--days 90] [--batch-size 500]
+        [--pause 0.2] [--max-batches N] [--dry-run] [--vacuum]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+load_dotenv(PROJECT_ROOT / ".env")
+
+from app import notification_retention  # noqa: E402
+
+
+def _build_db_url() -> str:
+    user = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    host = os.getenv("DB_HOST", "localhost")
+    port = os.getenv("DB_PORT", "5432")
+    name = os.getenv("DB_NAME", "calimara_db")
+    if not user or not password:
+        raise SystemExit("DB_USER / DB_PASSWORD missing from env — cannot archive.")
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{name}"
+
+
+def _relation_size(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT pg_total_relation_size('notifications')")).scalar() or 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=notification_retention.NOTIFICATION_RETENTION_DAYS,
+                        help="archive read notifications older than this many days")
+    parser.add_argument("--batch-size", type=int, default=notification_retention.NOTIFICATION_ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=notification_retention.NOTIFICATION_ARCHIVE_PAUSE_SECONDS,
+                        help="seconds to sleep between batches")
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="report what would move, change nothing")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="VACUUM ANALYZE notifications afterwards so freed pages are reusable")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(_build_db_url())
+    try:
+        size_before = _relation_size(engine)
+        with Session(engine) as session:
+            report = notification_retention.archive_read_notifications(
+                session,
+                older_than_days=args.days,
+                batch_size=args.batch_size,
+                pause_seconds=args.pause,
+                max_batches=args.max_batches,
+                dry_run=args.dry_run,
+            )
+        if args.vacuum and not args.dry_run and report.scanned:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text("VACUUM ANALYZE notifications"))
+        size_after = _relation_size(engine)
+
+        print(report.format())
+        print(f"notifications on disk:  {size_before} -> {size_after} bytes")
+        if args.dry_run:
+            print("(dry run — nothing was changed)")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
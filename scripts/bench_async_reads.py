@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Compare sync and async database access for the hot read endpoints.
+
+Builds two minimal FastAPI apps around the same payload builders from
+`app/routers/api_pages.py`: one with `def` routes on a sync Session (each
+request holds a threadpool worker while it waits on the database), one with
+`async def` routes on an AsyncSession (the wait is awaited on the event
+loop). Both are driven in-process over ASGI by --concurrency clients and the
+script prints requests/sec and p50/p99 latency per endpoint.
+
+By default the apps share a temporary SQLite file filled by `scripts/seed.py`.
+That only checks the plumbing: aiosqlite runs every connection on a thread of
+its own, so there the async side mostly shows its overhead. Point
+--database-url at a seeded Postgres (postgresql+psycopg2://...) for numbers
+that mean something; the async app reads the same database through asyncpg.
+The gap shows once --concurrency exceeds --threadpool (Starlette's default is
+40 workers) or the database is slow to answer.
+
+Invocation:
+    python scripts/bench_async_reads.py [--requests 2000] [--concurrency 100]
+        [--threadpool 40] [--endpoint post] [--database-url URL]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+
+from app import async_crud, crud, models  # noqa: E402
+from app.database import async_url  # noqa: E402
+from app.routers import api_pages  # noqa: E402
+
+ENDPOINTS = ("landing", "post", "category")
+
+
+def _build_sync_app(factory: sessionmaker) -> FastAPI:
+    def get_db():
+        with factory() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/landing")
+    def landing(db: Session = Depends(get_db)):
+        return api_pages._landing_payload(db, "toate", None)
+
+    @app.get("/post/{username}/{slug}")
+    def post(username: str, slug: str, db: Session = Depends(get_db)):
+        user = crud.get_user_by_username(db, username)
+        post = crud.get_post_by_slug(db, slug)
+        if not user or not post:
+            raise HTTPException(status_code=404)
+        return api_pages._post_detail_payload(db, user, post, None)
+
+    @app.get("/category/{key}")
+    def category(key: str, db: Session = Depends(get_db)):
+        return api_pages._category_payload(db, key, "newest", None)
+
+    return app
+
+
+def _build_async_app(factory: async_sessionmaker) -> FastAPI:
+    async def get_db():
+        async with factory() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/landing")
+    async def landing(db: AsyncSession = Depends(get_db)):
+        return await db.run_sync(api_pages._landing_payload, "toate", None)
+
+    @app.get("/post/{username}/{slug}")
+    async def post(username: str, slug: str, db: AsyncSession = Depends(get_db)):
+        user = await async_crud.get_user_by_username(db, username)
+        post = await async_crud.get_post_by_slug(db, slug)
+        if not user or not post:
+            raise HTTPException(status_code=404)
+        return await db.run_sync(api_pages._post_detail_payload, user, post, None)
+
+    @app.get("/category/{key}")
+    async def category(key: str, db: AsyncSession = Depends(get_db)):
+        return await db.run_sync(api_pages._category_payload, key, "newest", None)
+
+    return app
+
+
+async def _measure(app: FastAPI, path: str, requests: int, concurrency: int, threadpool: int) -> tuple[float, float, float]:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://calimara.test") as client:
+        for _ in range(20):  # warm-up: pools, statement caches
+            (await client.get(path)).raise_for_status()
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                (await client.get(path)).raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    return requests / elapsed, p50, p99
+
+
+def _target_paths(factory: sessionmaker) -> dict[str, str]:
+    with factory() as db:
+        row = db.execute(
+            select(models.User.username, models.Post.slug, models.Post.category)
+            .join(models.Post, models.Post.user_id == models.User.id)
+            .where(models.Post.moderation_status == "approved", models.Post.category.is_not(None))
+            .limit(1)
+        ).first()
+    if row is None:
+        raise SystemExit("No approved posts to read; seed the database first (scripts/seed.py).")
+    return {
+        "landing": "/landing",
+        "post": f"/post/{row.username}/{row.slug}",
+        "category": f"/category/{row.category}",
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--threadpool", type=int, default=40, help="worker threads available to sync routes")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, action="append", help="repeatable; default: all")
+    parser.add_argument("--database-url", default=None, help="sync SQLAlchemy URL of a seeded database")
+    args = parser.parse_args(argv)
+
+    tmpdir = None
+    database_url = args.database_url
+    if database_url is None:
+        from scripts.seed import seed
+
+        tmpdir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{tmpdir.name}/bench.db"
+        seed_engine = create_engine(database_url)
+        models.Base.metadata.create_all(seed_engine)
+        with Session(seed_engine) as db:
+            seed(db, quiet=True)
+        seed_engine.dispose()
+
+    # Same pool size on both sides so only the execution model differs.
+    pool = {} if database_url.startswith("sqlite") else {"pool_size": args.concurrency, "max_overflow": 0}
+    sync_engine = create_engine(database_url, **pool)
+    async_engine = create_async_engine(async_url(database_url), **pool)
+    sync_factory = sessionmaker(bind=sync_engine, autoflush=False)
+    async_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    paths = _target_paths(sync_factory)
+
+    variants = [("sync", _build_sync_app(sync_factory)), ("async", _build_async_app(async_factory))]
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients, {args.threadpool} worker threads")
+    print(f"{'endpoint':<10} {'variant':<7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+
+    async def run():
+        for endpoint in args.endpoint or ENDPOINTS:
+            for name, app in variants:
+                rps, p50, p99 = await _measure(app, paths[endpoint], args.requests, args.concurrency, args.threadpool)
+                print(f"{endpoint:<10} {name:<7} {rps:>9.1f} {p50:>9.2f} {p99:>9.2f}")
+        await async_engine.dispose()
+
+    asyncio.run(run())
+    sync_engine.dispose()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
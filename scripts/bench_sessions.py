@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Measure per-request overhead of the session middlewares.
+
+Drives a bare Starlette app directly over ASGI (no sockets, no HTTP client)
+so the numbers isolate the middleware: baseline without sessions, Starlette's
+signed-cookie SessionMiddleware, and ServerSessionMiddleware from
+`app/session_store.py` both with a warm LRU and with the cache disabled
+(every request reads the table). The server store runs against in-memory
+SQLite unless --database-url points at a real database.
+
+Invocation:
+    python scripts/bench_sessions.py [--requests 20000] [--database-url URL]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.applications import Starlette
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+
+from app import models  # noqa: E402
+from app.session_store import ServerSessionMiddleware, SessionStore  # noqa: E402
+
+MAX_AGE = 14 * 24 * 60 * 60
+# A realistic logged-in session: user id, db epoch and leftover OAuth state.
+SESSION_PAYLOAD = {
+    "user_id": 1,
+    "db_epoch": "2026-01-01T00:00:00",
+    "oauth_csrf": "x" * 43,
+    "oauth_timestamp": 1767225600.0,
+}
+
+
+def _build_app(with_session: bool) -> Starlette:
+    async def login(request: Request):
+        request.session.update(SESSION_PAYLOAD)
+        return PlainTextResponse("ok")
+
+    async def page(request: Request):
+        user_id = request.session.get("user_id") if with_session else None
+        return PlainTextResponse(str(user_id))
+
+    return Starlette(routes=[Route("/login", login), Route("/", page)])
+
+
+async def _call(app, path: str, cookie: str | None = None):
+    headers = [(b"host", b"calimara.test")]
+    if cookie:
+        headers.append((b"cookie", cookie.encode()))
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": headers,
+        "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 80),
+    }
+    set_cookie = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal set_cookie
+        if message["type"] == "http.response.start":
+            for name, value in message["headers"]:
+                if name == b"set-cookie":
+                    set_cookie = value.decode().split(";", 1)[0]
+
+    await app(scope, receive, send)
+    return set_cookie
+
+
+async def _measure(app, requests: int, login: bool) -> tuple[float, int]:
+    cookie = await _call(app, "/login") if login else None
+    for _ in range(200):  # warm-up
+        await _call(app, "/", cookie)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await _call(app, "/", cookie)
+    return (time.perf_counter() - start) / requests * 1e6, len(cookie or "")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(engine, tables=[models.User.__table__, models.UserSession.__table__])
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    variants = [
+        ("no sessions", _build_app(False), False),
+        ("signed cookie", SessionMiddleware(_build_app(True), secret_key="bench-secret", max_age=MAX_AGE), True),
+        ("server, warm LRU", ServerSessionMiddleware(
+            _build_app(True), SessionStore(factory, max_age=MAX_AGE), max_age=MAX_AGE), True),
+        ("server, no cache", ServerSessionMiddleware(
+            _build_app(True), SessionStore(factory, max_age=MAX_AGE, cache_ttl=0), max_age=MAX_AGE), True),
+    ]
+
+    results = []
+    for name, app, login in variants:
+        results.append((name, *asyncio.run(_measure(app, args.requests, login))))
+
+    baseline = results[0][1]
+    print(f"{'variant':<20} {'us/request':>12} {'overhead':>10} {'cookie bytes':>13}")
+    for name, micros, cookie_bytes in results:
+        print(f"{name:<20} {micros:>12.1f} {micros - baseline:>+10.1f} {cookie_bytes:>13}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Generate a large synthetic dataset for performance testing.
+
+`scripts/seed.py` builds a few dozen ORM objects for clicking around locally;
+this writes millions of rows in streaming batches, appended after whatever the
+database already holds. One unit of --scale is:
+
+    1,000 users · 5,000 posts · 10,000 comments · 30,000 likes
+    100,000 page views · 20 clubs (+ members) · 500 conversations · 5,000 messages
+
+so --scale 100 gives 10M page views. The dataset is a function of --seed and
+--until only:
+
+  * text is Romanian-like: common Romanian words drawn with Zipf frequencies;
+  * post popularity is Zipfian (--zipf), and page views, likes and comments
+    all follow it, so a few posts take most of the traffic;
+  * page views spread over the --days before --until, denser towards the end
+    and in the evening, with ~7% bots and ~10% duplicates like the live
+    ingest marks them; posts.view_count counts the real, unique ones;
+  * author activity and club sizes are heavy-tailed as well.
+
+On Postgres rows go through `COPY ... FROM STDIN`; elsewhere (SQLite in the
+tests) through batched INSERTs. Secondary indexes of the loaded tables are
+dropped first and rebuilt at the end (--keep-indexes to skip), then the id
+sequences are moved past the new rows and the tables analysed. Everything
+runs in one transaction: a failed load leaves the database as it was.
+Foreign keys stay enforced.
+
+Invocation:
+    python scripts/bulk_seed.py [--scale 100] [--seed 42] [--days 365]
+        [--until 2026-01-01] [--zipf 1.1] [--batch-size 50000] [--keep-indexes]
+        [--database-url URL]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+load_dotenv(PROJECT_ROOT / ".env")
+
+from app.categories import CATEGORIES  # noqa: E402
+from app.club_search import fold_text  # noqa: E402
+
+# Rows per unit of --scale.
+SIZES = {
+    "users": 1_000,
+    "posts": 5_000,
+    "comments": 10_000,
+    "likes": 30_000,
+    "page_views": 100_000,
+    "clubs": 20,
+    "conversations": 500,
+    "messages": 5_000,
+}
+
+# Load order: parents before children. page_views has no foreign keys and
+# goes before posts, so view counts are known when posts are written.
+TABLES = (
+    "users", "page_views", "posts", "comments", "likes", "clubs", "club_members", "conversations", "messages",
+)
+
+# Most frequent first; drawn with Zipf weights over the rank.
+WORDS = (
+    "şi în de la nu cu o un mai ce că se pe din ca mi te ne mă ai am e era sunt fi "
+    "tot doar încă acum apoi când unde cum dacă dar iar nici fără spre lângă peste sub "
+    "noapte zi lumină umbră vânt ploaie zăpadă mare cer pământ casă drum fereastră ușă "
+    "inimă suflet gând vis dor amintire cuvânt tăcere glas privire mână ochi lacrimă "
+    "oraș tramvai stradă gară câmp pădure râu munte lună soare stea toamnă iarnă primăvară "
+    "vară dimineață seară timp clipă veșnicie tinerețe copilărie mamă tată frate prieten "
+    "iubire dragoste bucurie tristețe frică speranță liniște rugăciune carte pagină scrisoare "
+    "cântec poveste versuri rană sânge pâine vin cafea floare frunză iarbă piatră foc apă "
+    "alb negru roșu albastru verde cald rece tânăr bătrân singur trist frumos departe aproape "
+    "merge vine plânge cântă scrie citește tace doarme visează iubește uită așteaptă rămâne "
+    "pleacă întoarce privește ascultă cade arde curge trece"
+).split()
+ADJECTIVES = "stinsă târzie albastră singură veche nescrisă tăcută pierdută ultimă adâncă".split()
+LINK_WORDS = frozenset("şi în de la nu cu o un mai ce că se pe din ca mi te ne mă ai am e".split())
+
+USER_AGENTS = (
+    ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+     "desktop", 34),
+    ("Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15",
+     "desktop", 12),
+    ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148",
+     "mobile", 24),
+    ("Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Mobile Safari/537.36",
+     "mobile", 23),
+    ("Mozilla/5.0 (iPad; CPU OS 17_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148",
+     "tablet", 7),
+)
+BOT_AGENTS = (
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+    "Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)",
+    "facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)",
+)
+REFERRERS = (None, None, None, "https://www.google.com/", "https://www.facebook.com/", "https://calimara.ro/")
+BOT_SHARE = 0.07
+DUPLICATE_SHARE = 0.10
+LOGGED_IN_SHARE = 0.2
+# Page views drawn per numpy call; fixed so --batch-size leaves the data unchanged.
+GENERATION_CHUNK = 100_000
+# Relative page-view volume per hour of day (quiet nights, evening peak).
+HOURLY = np.array([3, 2, 1, 1, 1, 1, 2, 4, 6, 7, 7, 7, 8, 8, 7, 7, 8, 9, 10, 12, 13, 12, 9, 5], dtype=float)
+# (content_type, share) of page views.
+VIEW_TYPES = (("post", 0.70), ("blog", 0.18), ("landing", 0.08), ("category", 0.04))
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _build_db_url() -> str:
+    user = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    host = os.getenv("DB_HOST", "localhost")
+    port = os.getenv("DB_PORT", "5432")
+    name = os.getenv("DB_NAME", "calimara_db")
+    if not user or not password:
+        raise SystemExit("DB_USER / DB_PASSWORD missing from env — cannot seed.")
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{name}"
+
+
+def zipf_weights(n: int, exponent: float, rng: np.random.Generator) -> np.ndarray:
+    """Probabilities of n items with Zipf-distributed popularity, ranks shuffled."""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return rng.permutation(weights / weights.sum())
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Text
+# ──────────────────────────────────────────────────────────────────────
+
+class TextGenerator:
+    """Romanian-like words, titles and verses."""
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+        self.words = np.array(WORDS, dtype=object)
+        weights = 1.0 / np.arange(1, len(WORDS) + 1)  # WORDS is in frequency order
+        self.cdf = np.cumsum(weights / weights.sum())
+
+    def _draw(self, size: int) -> np.ndarray:
+        return self.words[np.minimum(np.searchsorted(self.cdf, self.rng.random(size)), len(WORDS) - 1)]
+
+    def line(self, n_words: int) -> str:
+        return " ".join(self._draw(n_words))
+
+    def verses(self, lines: int) -> str:
+        lengths = self.rng.integers(3, 9, size=lines)
+        words = self._draw(int(lengths.sum()))
+        ends = np.cumsum(lengths)
+        return "\n".join(" ".join(words[end - n:end]).capitalize() for n, end in zip(lengths, ends))
+
+    def title(self) -> str:
+        noun = self.rng.choice(self.words[40:])  # skip the short link words
+        parts = [noun, self.rng.choice(ADJECTIVES)] if self.rng.random() < 0.5 else [
+            noun, "de", self.rng.choice(self.words[40:])
+        ]
+        return " ".join(parts).capitalize()
+
+    def handle(self) -> str:
+        return fold_text("".join(self.rng.choice(self.words[40:], size=2))).replace(" ", "")
+
+
+def _slug(title: str, row_id: int) -> str:
+    return f"{fold_text(title).replace(' ', '-')}-{row_id}"
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Writers
+# ──────────────────────────────────────────────────────────────────────
+
+def _copy_field(value) -> str:
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    batch: list[tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load_rows(connection: Connection, table: str, columns: tuple[str, ...], rows: Iterable[tuple],
+              batch_size: int) -> int:
+    """Stream `rows` into `table`: COPY on Postgres, executemany elsewhere."""
+    count = 0
+    if connection.dialect.name == "postgresql":
+        cursor = connection.connection.dbapi_connection.cursor()
+        statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        for batch in _batches(rows, batch_size):
+            buffer = io.StringIO()
+            buffer.writelines("\t".join(_copy_field(v) for v in row) + "\n" for row in batch)
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            count += len(batch)
+        cursor.close()
+        return count
+    marker = "?" if connection.dialect.paramstyle == "qmark" else "%s"
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})"
+    for batch in _batches(rows, batch_size):
+        connection.exec_driver_sql(statement, batch)
+        count += len(batch)
+    return count
+
+
+def secondary_indexes(connection: Connection, tables: Iterable[str]) -> list[tuple[str, str]]:
+    """(name, CREATE statement) of the indexes on `tables` that no constraint owns."""
+    tables = list(tables)
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = ANY(:tables) "
+            "AND indexname NOT IN (SELECT conname FROM pg_constraint)"
+        ), {"tables": tables})
+    elif connection.dialect.name == "sqlite":
+        rows = connection.execute(text(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({', '.join(f':t{i}' for i in range(len(tables)))})"
+        ), {f"t{i}": t for i, t in enumerate(tables)})
+    else:
+        return []
+    return [(name, ddl) for name, ddl in rows]
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Generation
+# ──────────────────────────────────────────────────────────────────────
+
+class _Plan:
+    """Sizes, id ranges and the shared random draws (popularity, owners)."""
+
+    def __init__(self, connection: Connection, scale: float, seed: int, days: int, until: datetime, zipf: float):
+        self.rng = np.random.default_rng(seed)
+        self.text = TextGenerator(self.rng)
+        self.days = days
+        self.until = until
+        self.n = {table: max(1, int(round(size * scale))) for table, size in SIZES.items()}
+        self.base = {
+            table: connection.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar_one()
+            for table in TABLES
+        }
+        n_users, n_posts = self.n["users"], self.n["posts"]
+        self.user_ids = self.base["users"] + 1 + np.arange(n_users)
+        self.post_ids = self.base["posts"] + 1 + np.arange(n_posts)
+        self.usernames = [f"{self.text.handle()}{uid}" for uid in self.user_ids]
+        self.post_popularity = zipf_weights(n_posts, zipf, self.rng)
+        self.post_owner = self.rng.choice(n_users, size=n_posts, p=zipf_weights(n_users, 1.0, self.rng))
+        self.post_titles = [self.text.title() for _ in range(n_posts)]
+        self.post_slugs = [_slug(title, pid) for title, pid in zip(self.post_titles, self.post_ids)]
+        self.post_views = np.zeros(n_posts, dtype=np.int64)
+
+    def timestamps(self, size: int, recent: bool = False) -> list[datetime]:
+        """`size` instants within the window; `recent` favours its end and the evening."""
+        if recent:
+            days_ago = np.floor(self.days * (1 - np.sqrt(self.rng.random(size)))).astype(int)
+            hours = self.rng.choice(24, size=size, p=HOURLY / HOURLY.sum())
+        else:
+            days_ago = self.rng.integers(0, self.days, size=size)
+            hours = self.rng.integers(0, 24, size=size)
+        seconds = self.rng.integers(0, 3600, size=size)
+        start = self.until.replace(hour=0, minute=0, second=0, microsecond=0)
+        return [
+            start - timedelta(days=int(d)) + timedelta(hours=int(h), seconds=int(s))
+            for d, h, s in zip(days_ago, hours, seconds)
+        ]
+
+
+def _users(plan: _Plan):
+    created = plan.timestamps(plan.n["users"])
+    for i, uid in enumerate(plan.user_ids):
+        username = plan.usernames[i]
+        yield (int(uid), username, f"{username}@bulk.example.com", f"bulk-{uid}", plan.text.line(6),
+               f"bulk-{uid}", False, False, False, created[i], created[i])
+
+
+USER_COLUMNS = ("id", "username", "email", "google_id", "subtitle", "avatar_seed",
+                "is_admin", "is_moderator", "is_suspended", "created_at", "updated_at")
+
+
+def _page_views(plan: _Plan):
+    total = plan.n["page_views"]
+    kinds = [kind for kind, _ in VIEW_TYPES]
+    shares = np.array([share for _, share in VIEW_TYPES])
+    agents = [agent for agent, _, _ in USER_AGENTS]
+    devices = [device for _, device, _ in USER_AGENTS]
+    agent_p = np.array([w for _, _, w in USER_AGENTS], dtype=float)
+    agent_p /= agent_p.sum()
+    categories = list(CATEGORIES)
+    visitors = max(100, plan.n["users"] * 20)
+    next_id = plan.base["page_views"] + 1
+    rng = plan.rng
+    for start in range(0, total, GENERATION_CHUNK):
+        size = min(GENERATION_CHUNK, total - start)
+        kind = rng.choice(len(kinds), size=size, p=shares)
+        post = rng.choice(len(plan.post_ids), size=size, p=plan.post_popularity)
+        visitor = rng.integers(0, visitors, size=size)
+        bot = rng.random(size) < BOT_SHARE
+        duplicate = ~bot & (rng.random(size) < DUPLICATE_SHARE)
+        logged_in = ~bot & (rng.random(size) < LOGGED_IN_SHARE)
+        viewer = rng.integers(0, plan.n["users"], size=size)
+        agent = rng.choice(len(agents), size=size, p=agent_p)
+        bot_agent = rng.integers(0, len(BOT_AGENTS), size=size)
+        referrer = rng.integers(0, len(REFERRERS), size=size)
+        created = plan.timestamps(size, recent=True)
+        counted = (kind == 0) & ~bot & ~duplicate
+        np.add.at(plan.post_views, post[counted], 1)
+        for j in range(size):
+            k, p = kinds[kind[j]], post[j]
+            owner = int(plan.user_ids[plan.post_owner[p]])
+            if k == "post":
+                content_id, content_key, content_owner = int(plan.post_ids[p]), plan.post_slugs[p], owner
+            elif k == "blog":
+                content_id, content_key, content_owner = owner, plan.usernames[plan.post_owner[p]], owner
+            elif k == "landing":
+                content_id, content_key, content_owner = None, "home", None
+            else:
+                content_id, content_key, content_owner = None, categories[p % len(categories)], None
+            v = int(visitor[j])
+            if bot[j]:
+                agent_string, device, reason = BOT_AGENTS[bot_agent[j]], "unknown", "known_crawler"
+            else:
+                agent_string, device, reason = agents[agent[j]], devices[agent[j]], None
+            yield (
+                next_id + start + j, k, content_id, content_key,
+                int(plan.user_ids[viewer[j]]) if logged_in[j] else None,
+                f"10.{v >> 16 & 255}.{v >> 8 & 255}.{v & 255}", f"s{v}", agent_string,
+                bool(bot[j]), reason, device, REFERRERS[referrer[j]], bool(duplicate[j]), content_owner, created[j],
+            )
+
+
+PAGE_VIEW_COLUMNS = ("id", "content_type", "content_id", "content_key", "user_id", "ip_address", "session_id",
+                     "user_agent", "is_bot", "bot_reason", "device_type", "referrer_url", "is_duplicate",
+                     "content_owner_id", "created_at")
+
+
+def _posts(plan: _Plan):
+    n = plan.n["posts"]
+    created = plan.timestamps(n)
+    categories = list(CATEGORIES)
+    category = plan.rng.integers(0, len(categories), size=n)
+    status = plan.rng.choice(["approved", "pending", "flagged"], size=n, p=[0.97, 0.02, 0.01])
+    lines = plan.rng.integers(4, 17, size=n)
+    for i, pid in enumerate(plan.post_ids):
+        toxicity = None if status[i] == "approved" else round(float(plan.rng.uniform(0.3, 0.95)), 2)
+        yield (int(pid), int(plan.user_ids[plan.post_owner[i]]), plan.post_titles[i], plan.post_slugs[i],
+               plan.text.verses(int(lines[i])), categories[category[i]], int(plan.post_views[i]), str(status[i]),
+               toxicity, "completed", created[i], created[i])
+
+
+POST_COLUMNS = ("id", "user_id", "title", "slug", "content", "category", "view_count", "moderation_status",
+                "toxicity_score", "theme_analysis_status", "created_at", "updated_at")
+
+
+def _comments(plan: _Plan):
+    n = plan.n["comments"]
+    post = plan.rng.choice(len(plan.post_ids), size=n, p=plan.post_popularity)
+    author = plan.rng.integers(0, plan.n["users"], size=n)
+    anonymous = plan.rng.random(n) < 0.1
+    created = plan.timestamps(n, recent=True)
+    for i in range(n):
+        cid = plan.base["comments"] + 1 + i
+        if anonymous[i]:
+            user_id, name, email = None, f"cititor{cid}", f"cititor{cid}@bulk.example.com"
+        else:
+            user_id, name, email = int(plan.user_ids[author[i]]), None, None
+        yield (cid, int(plan.post_ids[post[i]]), user_id, name, email, plan.text.verses(1 + i % 3),
+               True, False, "approved", created[i])
+
+
+COMMENT_COLUMNS = ("id", "post_id", "user_id", "author_name", "author_email", "content", "approved", "is_robot",
+                   "moderation_status", "created_at")
+
+
+def _likes(plan: _Plan):
+    n_users = plan.n["users"]
+    post = plan.rng.choice(len(plan.post_ids), size=plan.n["likes"], p=plan.post_popularity)
+    user = plan.rng.integers(0, n_users, size=plan.n["likes"])
+    pairs = np.unique(post.astype(np.int64) * n_users + user)  # one like per (post, user)
+    created = plan.timestamps(len(pairs), recent=True)
+    for i, pair in enumerate(pairs):
+        yield (plan.base["likes"] + 1 + i, int(plan.post_ids[pair // n_users]),
+               int(plan.user_ids[pair % n_users]), None, created[i])
+
+
+LIKE_COLUMNS = ("id", "post_id", "user_id", "ip_address", "created_at")
+
+
+def _clubs_and_members(plan: _Plan) -> tuple[list[tuple], list[tuple]]:
+    n_users = plan.n["users"]
+    clubs, members = [], []
+    created = plan.timestamps(plan.n["clubs"])
+    member_id = plan.base["club_members"] + 1
+    for i in range(plan.n["clubs"]):
+        club_id = plan.base["clubs"] + 1 + i
+        owner = int(plan.rng.integers(0, n_users))
+        size = min(n_users - 1, int(plan.rng.zipf(1.6)) * 5)
+        others = plan.rng.choice(n_users, size=min(n_users, size + 1), replace=False)
+        others = [int(u) for u in others if u != owner][:size]
+        title = plan.text.title()
+        theme, description = plan.text.line(4), plan.text.line(14)
+        search_text = " ".join(part for part in (fold_text(title), fold_text(theme), fold_text(description)) if part)
+        clubs.append((club_id, int(plan.user_ids[owner]), title, _slug(title, club_id), description,
+                      plan.text.line(5), f"club-{club_id}", theme, "poezie" if i % 2 else "proza_scurta",
+                      len(others) + 1, search_text, created[i], created[i]))
+        for user, role in [(owner, "owner")] + [(u, "admin" if j == 0 else "member") for j, u in enumerate(others)]:
+            members.append((member_id, club_id, int(plan.user_ids[user]), role, created[i]))
+            member_id += 1
+    return clubs, members
+
+
+CLUB_COLUMNS = ("id", "owner_id", "title", "slug", "description", "motto", "avatar_seed", "theme", "speciality",
+                "member_count", "search_text", "created_at", "updated_at")
+MEMBER_COLUMNS = ("id", "club_id", "user_id", "role", "joined_at")
+
+
+def _conversations(plan: _Plan) -> list[tuple]:
+    n_users = plan.n["users"]
+    if n_users < 2:
+        return []
+    a = plan.rng.integers(0, n_users, size=plan.n["conversations"])
+    b = plan.rng.integers(0, n_users, size=plan.n["conversations"])
+    keep = a != b
+    low, high = np.minimum(a, b)[keep], np.maximum(a, b)[keep]
+    pairs = np.unique(low.astype(np.int64) * n_users + high)
+    created = plan.timestamps(len(pairs))
+    return [
+        (plan.base["conversations"] + 1 + i, int(plan.user_ids[pair // n_users]),
+         int(plan.user_ids[pair % n_users]), created[i], plan.until)
+        for i, pair in enumerate(pairs)
+    ]
+
+
+CONVERSATION_COLUMNS = ("id", "user1_id", "user2_id", "created_at", "updated_at")
+
+
+def _messages(plan: _Plan, conversations: list[tuple]):
+    if not conversations:
+        return
+    n = plan.n["messages"]
+    conversation = plan.rng.choice(len(conversations), size=n, p=zipf_weights(len(conversations), 1.0, plan.rng))
+    from_first = plan.rng.random(n) < 0.5
+    read = plan.rng.random(n) < 0.9
+    created = plan.timestamps(n, recent=True)
+    for i in range(n):
+        conv = conversations[conversation[i]]
+        yield (plan.base["messages"] + 1 + i, conv[0], conv[1] if from_first[i] else conv[2],
+               plan.text.line(int(4 + i % 12)), bool(read[i]), created[i])
+
+
+MESSAGE_COLUMNS = ("id", "conversation_id", "sender_id", "content", "is_read", "created_at")
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Driver
+# ──────────────────────────────────────────────────────────────────────
+
+def bulk_seed(
+    engine: Engine,
+    *,
+    scale: float = 1.0,
+    seed: int = 42,
+    days: int = 365,
+    until: Optional[date] = None,
+    zipf: float = 1.1,
+    batch_size: int = 50_000,
+    defer_indexes: bool = True,
+    log: Callable[..., None] = print,
+) -> dict[str, int]:
+    """Append a synthetic dataset of `scale` units; returns rows per table."""
+    until = datetime.combine(until or date.today(), datetime.min.time())
+    counts: dict[str, int] = {}
+    with engine.begin() as connection:
+        postgres = connection.dialect.name == "postgresql"
+        if postgres:
+            connection.exec_driver_sql("SET LOCAL synchronous_commit = off")
+        plan = _Plan(connection, scale, seed, days, until, zipf)
+        indexes = secondary_indexes(connection, TABLES) if defer_indexes else []
+        for name, _ in indexes:
+            connection.exec_driver_sql(f'DROP INDEX "{name}"')
+        if indexes:
+            log(f"  Bulk seed: dropped {len(indexes)} secondary indexes")
+
+        def load(table, columns, rows):
+            started = time.perf_counter()
+            counts[table] = load_rows(connection, table, columns, rows, batch_size)
+            elapsed = time.perf_counter() - started
+            log(f"  Bulk seed: {counts[table]:>10,} {table} ({counts[table] / max(elapsed, 1e-9):,.0f} rows/s)")
+
+        load("users", USER_COLUMNS, _users(plan))
+        load("page_views", PAGE_VIEW_COLUMNS, _page_views(plan))
+        load("posts", POST_COLUMNS, _posts(plan))
+        load("comments", COMMENT_COLUMNS, _comments(plan))
+        load("likes", LIKE_COLUMNS, _likes(plan))
+        clubs, members = _clubs_and_members(plan)
+        load("clubs", CLUB_COLUMNS, clubs)
+        load("club_members", MEMBER_COLUMNS, members)
+        conversations = _conversations(plan)
+        load("conversations", CONVERSATION_COLUMNS, conversations)
+        load("messages", MESSAGE_COLUMNS, _messages(plan, conversations))
+
+        started = time.perf_counter()
+        for _, ddl in indexes:
+            connection.exec_driver_sql(ddl)
+        if indexes:
+            log(f"  Bulk seed: rebuilt {len(indexes)} indexes in {time.perf_counter() - started:.1f}s")
+        if postgres:
+            for table in TABLES:
+                connection.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                )
+    if postgres:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql(f"ANALYZE {', '.join(TABLES)}")
+    return counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="units of data (1 = 100k page views)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=365, help="history covered by timestamps")
+    parser.add_argument("--until", type=date.fromisoformat, default=None, help="end of that history (default today)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="exponent of post popularity")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--keep-indexes", action="store_true", help="load with the indexes in place")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url or _build_db_url())
+    started = time.perf_counter()
+    try:
+        counts = bulk_seed(
+            engine, scale=args.scale, seed=args.seed, days=args.days, until=args.until, zipf=args.zipf,
+            batch_size=args.batch_size, defer_indexes=not args.keep_indexes,
+        )
+    finally:
+        engine.dispose()
+    print(f"  Bulk seed: {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
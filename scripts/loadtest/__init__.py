@@ -0,0 +1,32 @@
+"""
+Repeatable load test for the API.
+
+Drives the real application (`app.main.app`, every middleware included) with
+a weighted mix of requests and reports throughput and latency per route:
+
+  * `corpus.py`: the database to test against. By default a temporary
+    SQLite file filled by `scripts/seed.py` at --scale, plus the synthetic
+    rows of `scripts/bulk_seed.py` at --bulk-scale; --database-url points
+    at an existing seeded database instead (use Postgres for real numbers).
+    Also picks the names the traffic asks for and mints session cookies for
+    the logged-in profiles.
+  * `profiles.py`: the traffic mixes (landing-heavy, blog-heavy, authoring,
+    moderation) as weighted request builders.
+  * `serve.py`: the app as the load test runs it: bound to the corpus
+    database, rate limits off, X-DB-Queries headers on. Imported in-process
+    (--target inprocess, over httpx's ASGI transport) or served by uvicorn
+    (--target uvicorn spawns `uvicorn scripts.loadtest.serve:app`).
+  * `runner.py`: closed-loop virtual users, per-route aggregation, baseline
+    save/compare.
+
+Reported per route: requests, unexpected statuses, requests/sec, p50/p95/p99
+latency and DB statements per request (from QueryStatsMiddleware). With
+--baseline, routes whose p95 or statement count grew, or whose throughput
+fell, by more than --tolerance are listed and the exit status is 1.
+
+Invocation:
+    python -m scripts.loadtest [--profile landing-heavy] [--target inprocess]
+        [--requests 2000 | --duration 30] [--concurrency 20] [--scale 3]
+        [--bulk-scale 0] [--database-url URL] [--base-url URL] [--workers 2]
+        [--save-baseline base.json] [--baseline base.json] [--tolerance 0.15]
+"""
@@ -0,0 +1,146 @@
+"""Command line entry point; see the package docstring."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import anyio.to_thread
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import loadtest  # noqa: E402
+from scripts.loadtest import corpus, runner  # noqa: E402
+from scripts.loadtest.profiles import AUTHOR, MODERATOR, PROFILES  # noqa: E402
+
+BASE_URL = "http://calimara.test"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _spawn_uvicorn(database_url: str, workers: int) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(os.environ, LOADTEST_DATABASE_URL=database_url)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "scripts.loadtest.serve:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {process.returncode}")
+        try:
+            httpx.get(f"{base_url}/api/clubs", timeout=1)
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("uvicorn did not start within 60s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m scripts.loadtest", description=loadtest.__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="landing-heavy")
+    parser.add_argument("--target", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--base-url", default=None, help="load an already running server instead")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn worker processes (--target uvicorn)")
+    parser.add_argument("--threadpool", type=int, default=40, help="worker threads for sync routes (in-process)")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    stop = parser.add_mutually_exclusive_group()
+    stop.add_argument("--requests", type=int, default=None, help="stop after this many requests (default 2000)")
+    stop.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the traffic draws")
+    parser.add_argument("--scale", type=int, default=3, help="copies of the seed dataset in a built corpus")
+    parser.add_argument("--bulk-scale", type=float, default=0,
+                        help="scripts/bulk_seed.py units added to a built corpus (1 = 100k page views)")
+    parser.add_argument("--database-url", default=None, help="sync SQLAlchemy URL of a seeded database")
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed regression vs the baseline")
+    args = parser.parse_args(argv)
+    if args.requests is None and args.duration is None:
+        args.requests = 2000
+
+    tmpdir = None
+    database_url = args.database_url
+    if database_url is None:
+        if args.base_url:
+            parser.error("--base-url needs --database-url: the traffic is built from that database")
+        bulk = f" + {args.bulk_scale:g} bulk units" if args.bulk_scale else ""
+        print(f"Building a corpus: seed dataset x{args.scale}{bulk} ...")
+        database_url, tmpdir = corpus.build(args.scale, bulk_scale=args.bulk_scale, seed=args.seed)
+    os.environ["LOADTEST_DATABASE_URL"] = database_url
+    # Also fills the environment defaults the cookies below and a spawned
+    # uvicorn rely on (SESSION_SECRET_KEY, QUERY_STATS_HEADERS...).
+    from scripts.loadtest import serve
+
+    targets = corpus.discover(database_url)
+    cookies = {AUTHOR: corpus.session_cookie(targets.author_id, database_url)}
+    if targets.moderator_id is not None:
+        cookies[MODERATOR] = corpus.session_cookie(targets.moderator_id, database_url)
+
+    process = None
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    elif args.target == "uvicorn":
+        process, base_url = _spawn_uvicorn(database_url, args.workers)
+        transport = None
+    else:
+        transport, base_url = httpx.ASGITransport(app=serve.app, raise_app_exceptions=False), BASE_URL
+
+    async def run():
+        if transport is not None:
+            anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=60) as client:
+            return await runner.drive(
+                client, PROFILES[args.profile], targets, cookies, concurrency=args.concurrency,
+                requests=args.requests, duration=args.duration, warmup=args.warmup, seed=args.seed,
+            )
+
+    try:
+        samples, elapsed = asyncio.run(run())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    result = runner.summarize(samples, elapsed)
+    result.update(profile=args.profile, target=args.base_url or args.target, concurrency=args.concurrency)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print(f"profile {args.profile}, target {result['target']}, {args.concurrency} virtual users")
+    if baseline and (baseline.get("profile"), baseline.get("target")) != (result["profile"], result["target"]):
+        print(f"note: the baseline ran profile {baseline.get('profile')} against {baseline.get('target')}")
+    runner.print_report(result, baseline)
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"Baseline written to {args.save_baseline}")
+    if baseline is None:
+        return 0
+    regressions = runner.compare(result, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
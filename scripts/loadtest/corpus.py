@@ -0,0 +1,115 @@
+"""
+The database a load test runs against and the names its traffic uses.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+from itsdangerous import TimestampSigner
+from sqlalchemy import create_engine, func, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models
+
+# Seed author promoted to moderator in a corpus built here.
+MODERATOR = "mireasufletului"
+MAX_TARGETS = 5000
+
+
+@dataclass
+class Targets:
+    authors: list[str]
+    posts: list[tuple[str, str, int]]  # (username, slug, id), most viewed first
+    categories: list[str]
+    clubs: list[tuple[str, int]]  # (slug, id)
+    author_id: int  # the writer behind the authoring profile: most posts
+    author_posts: list[int]
+    moderator_id: Optional[int]
+
+
+def build(scale: int, bulk_scale: float = 0, seed: int = 0) -> tuple[str, tempfile.TemporaryDirectory]:
+    """A temporary SQLite database with the seed dataset inserted `scale` times,
+    then `bulk_scale` units of `scripts/bulk_seed.py` rows drawn from `seed`."""
+    from scripts.bulk_seed import bulk_seed
+    from scripts.seed import seed as seed_demo
+
+    tmpdir = tempfile.TemporaryDirectory(prefix="calimara-loadtest-")
+    url = f"sqlite:///{tmpdir.name}/loadtest.db"
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        # Persistent; lets readers run alongside the one writer SQLite allows.
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        seed_demo(db, quiet=True, scale=scale)
+        moderator = db.scalars(select(models.User).where(models.User.username == MODERATOR)).one()
+        moderator.is_moderator = True
+        moderator.is_admin = True
+        db.commit()
+    if bulk_scale:
+        bulk_seed(engine, scale=bulk_scale, seed=seed, log=lambda *args: None)
+    engine.dispose()
+    return url, tmpdir
+
+
+def discover(url: str) -> Targets:
+    engine = create_engine(url)
+    try:
+        with Session(engine) as db:
+            posts = db.execute(
+                select(models.User.username, models.Post.slug, models.Post.id)
+                .join(models.Post, models.Post.user_id == models.User.id)
+                .where(models.Post.moderation_status == "approved")
+                .order_by(models.Post.view_count.desc(), models.Post.id)
+                .limit(MAX_TARGETS)
+            ).all()
+            if not posts:
+                raise SystemExit("No approved posts to request; seed the database first (scripts/seed.py).")
+            author_id = db.execute(
+                select(models.Post.user_id).group_by(models.Post.user_id)
+                .order_by(func.count(models.Post.id).desc(), models.Post.user_id).limit(1)
+            ).scalar_one()
+            return Targets(
+                authors=list(dict.fromkeys(row.username for row in posts)),
+                posts=[tuple(row) for row in posts],
+                categories=db.scalars(
+                    select(models.Post.category).where(models.Post.category.is_not(None)).distinct()
+                ).all(),
+                clubs=[tuple(row) for row in db.execute(
+                    select(models.Club.slug, models.Club.id).order_by(models.Club.id).limit(MAX_TARGETS)
+                ).all()],
+                author_id=author_id,
+                author_posts=db.scalars(
+                    select(models.Post.id).where(models.Post.user_id == author_id).limit(MAX_TARGETS)
+                ).all(),
+                moderator_id=db.scalars(
+                    select(models.User.id)
+                    .where(or_(models.User.is_moderator.is_(True), models.User.is_admin.is_(True)))
+                    .order_by(models.User.id).limit(1)
+                ).first(),
+            )
+    finally:
+        engine.dispose()
+
+
+def session_cookie(user_id: int, url: str) -> str:
+    """Value of the `calimara_sess` cookie for a logged-in `user_id`, in the
+    format of whichever session backend the app runs with (SESSION_BACKEND)."""
+    from app import auth, session_store
+
+    data = {"user_id": user_id, "db_epoch": auth.get_db_epoch()}
+    if session_store.SESSION_BACKEND == "server":
+        engine = create_engine(url)
+        store = session_store.SessionStore(sessionmaker(bind=engine), max_age=24 * 60 * 60)
+        token = store.new_token()
+        store.save(token, session_store.dump_session(data))
+        engine.dispose()
+        return token
+    # Starlette's SessionMiddleware: signed base64 JSON.
+    payload = base64.b64encode(json.dumps(data).encode())
+    return TimestampSigner(os.environ["SESSION_SECRET_KEY"]).sign(payload).decode()
@@ -0,0 +1,182 @@
+"""
+Traffic mixes. Each profile is a list of (weight, builder); a virtual user
+draws a builder by weight and the builder turns the corpus into one request.
+Popular content is drawn from a heavy-tailed distribution, so a few posts
+take most of the reads as on the live site.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .corpus import Targets
+
+AUTHOR = "author"
+MODERATOR = "moderator"
+
+LINES = (
+    "Lumina stinsă în fereastră nu ne mai cheamă acasă.",
+    "Rămâne doar conturul unui gest care n-a fost făcut.",
+    "Dimineţile mele miros a cafea şi a pagini nescrise.",
+    "Tramvaiul trece prin ploaie ca un gând neterminat.",
+    "Am păstrat un cuvânt pentru altă iarnă.",
+)
+
+
+@dataclass(frozen=True)
+class Call:
+    label: str  # route template; the report's key
+    method: str
+    path: str
+    json: Optional[dict] = None
+    login: Optional[str] = None  # AUTHOR / MODERATOR
+    ok: tuple[int, ...] = (200,)
+
+
+Builder = Callable[[Targets, random.Random], Call]
+
+
+def _popular(rng: random.Random, items: list):
+    return items[min(int(rng.paretovariate(1.2)) - 1, len(items) - 1)]
+
+
+def _text(rng: random.Random, lines: int) -> str:
+    return "\n".join(rng.choice(LINES) for _ in range(lines))
+
+
+# ── public reads ──────────────────────────────────────────
+
+def landing(t, rng):
+    return Call("/api/landing", "GET", "/api/landing")
+
+
+def landing_category(t, rng):
+    return Call("/api/landing?category={category}", "GET", f"/api/landing?category={rng.choice(t.categories)}")
+
+
+def category(t, rng):
+    return Call("/api/categories/{category_key}", "GET", f"/api/categories/{rng.choice(t.categories)}")
+
+
+def blog(t, rng):
+    return Call("/api/blog/{username}", "GET", f"/api/blog/{_popular(rng, t.posts)[0]}")
+
+
+def post(t, rng):
+    username, slug, _ = _popular(rng, t.posts)
+    return Call("/api/blog/{username}/post/{slug}", "GET", f"/api/blog/{username}/post/{slug}")
+
+
+def profile(t, rng):
+    return Call("/api/user/{username}/profile", "GET", f"/api/user/{_popular(rng, t.authors)}/profile")
+
+
+def likes_count(t, rng):
+    return Call("/api/posts/{post_id}/likes/count", "GET", f"/api/posts/{_popular(rng, t.posts)[2]}/likes/count")
+
+
+def random_posts(t, rng):
+    return Call("/api/posts/random", "GET", "/api/posts/random")
+
+
+def clubs(t, rng):
+    return Call("/api/clubs", "GET", "/api/clubs")
+
+
+def club(t, rng):
+    return Call("/api/clubs/{slug}", "GET", f"/api/clubs/{_popular(rng, t.clubs)[0]}")
+
+
+# ── authoring (logged in as the corpus' busiest author) ───
+
+def create_post(t, rng):
+    title = f"Încercare {rng.randrange(10**9)}"
+    return Call("/api/posts/", "POST", "/api/posts/", {"title": title, "content": _text(rng, 6)}, AUTHOR)
+
+
+def edit_post(t, rng):
+    body = {"title": f"Revizuire {rng.randrange(10**6)}", "content": _text(rng, 6)}
+    return Call("/api/posts/{post_id}", "PUT", f"/api/posts/{rng.choice(t.author_posts)}", body, AUTHOR)
+
+
+def comment(t, rng):
+    path = f"/api/posts/{_popular(rng, t.posts)[2]}/comments"
+    return Call("/api/posts/{post_id}/comments", "POST", path, {"content": _text(rng, 1)}, AUTHOR)
+
+
+def like(t, rng):
+    path = f"/api/posts/{_popular(rng, t.posts)[2]}/likes"
+    return Call("/api/posts/{post_id}/likes", "POST", path, login=AUTHOR, ok=(200, 409))
+
+
+def archive(t, rng):
+    return Call("/api/posts/archive", "GET", "/api/posts/archive", login=AUTHOR)
+
+
+def months(t, rng):
+    return Call("/api/posts/months", "GET", "/api/posts/months", login=AUTHOR)
+
+
+def notifications(t, rng):
+    return Call("/api/notifications", "GET", "/api/notifications", login=AUTHOR)
+
+
+def unread_notifications(t, rng):
+    return Call("/api/notifications/unread-count", "GET", "/api/notifications/unread-count", login=AUTHOR)
+
+
+def conversations(t, rng):
+    return Call("/api/messages/conversations", "GET", "/api/messages/conversations", login=AUTHOR)
+
+
+def me(t, rng):
+    return Call("/api/user/me", "GET", "/api/user/me", login=AUTHOR)
+
+
+# ── moderation (logged in as a moderator/admin) ───────────
+
+def moderation_stats(t, rng):
+    return Call("/api/moderation/stats", "GET", "/api/moderation/stats", login=MODERATOR)
+
+
+def moderation_content_queue(t, rng):
+    return Call("/api/moderation/content/queue", "GET", "/api/moderation/content/queue", login=MODERATOR)
+
+
+def moderation_queue(t, rng):
+    return Call("/api/moderation/queue", "GET", "/api/moderation/queue", login=MODERATOR)
+
+
+def moderation_logs(t, rng):
+    return Call("/api/moderation/logs", "GET", "/api/moderation/logs", login=MODERATOR)
+
+
+def moderation_user_search(t, rng):
+    query = rng.choice(t.authors)[:3]
+    return Call("/api/moderation/users/search", "GET", f"/api/moderation/users/search?q={query}", login=MODERATOR)
+
+
+def approve(t, rng):
+    path = f"/api/moderation/moderate/post/{rng.choice(t.posts)[2]}"
+    return Call("/api/moderation/moderate/{content_type}/{content_id}", "POST", path, {"action": "approve"}, MODERATOR)
+
+
+PROFILES: dict[str, list[tuple[int, Builder]]] = {
+    "landing-heavy": [
+        (45, landing), (15, landing_category), (10, category), (15, post), (5, blog),
+        (5, random_posts), (5, clubs),
+    ],
+    "blog-heavy": [
+        (40, post), (30, blog), (10, profile), (5, likes_count), (10, landing), (5, club),
+    ],
+    "authoring": [
+        (10, create_post), (5, edit_post), (15, comment), (10, like), (15, archive), (5, months),
+        (10, notifications), (15, unread_notifications), (10, conversations), (5, me),
+    ],
+    "moderation": [
+        (25, moderation_content_queue), (15, moderation_queue), (20, moderation_stats),
+        (15, moderation_logs), (10, moderation_user_search), (10, approve), (5, landing),
+    ],
+}
+
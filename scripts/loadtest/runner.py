@@ -0,0 +1,155 @@
+"""
+Closed-loop virtual users, per-route aggregation and baseline comparison.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from .corpus import Targets
+from .profiles import Builder
+
+
+@dataclass
+class Sample:
+    route: str  # "METHOD /template"
+    status: int
+    ok: bool
+    seconds: float
+    queries: Optional[int]  # X-DB-Queries; None when the server does not send it
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    profile: list[tuple[int, Builder]],
+    targets: Targets,
+    cookies: dict[str, str],
+    *,
+    concurrency: int,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+    warmup: int = 0,
+    seed: int = 0,
+) -> tuple[list[Sample], float]:
+    """Run `concurrency` users, each sending its next request as soon as the
+    previous one answers, until `requests` were sent or `duration` seconds
+    passed. Returns the samples and the wall-clock time of the measured part."""
+    weights = [weight for weight, _ in profile]
+    builders = [builder for _, builder in profile]
+    samples: list[Sample] = []
+
+    async def send(rng: random.Random) -> Sample:
+        call = rng.choices(builders, weights)[0](targets, rng)
+        headers = {}
+        if call.login is not None:
+            if call.login not in cookies:
+                raise SystemExit(f"The profile needs a logged-in {call.login} and the corpus has none.")
+            headers["cookie"] = f"calimara_sess={cookies[call.login]}"
+        started = time.perf_counter()
+        response = await client.request(call.method, call.path, json=call.json, headers=headers)
+        seconds = time.perf_counter() - started
+        queries = response.headers.get("x-db-queries")
+        return Sample(
+            f"{call.method} {call.label}", response.status_code, response.status_code in call.ok, seconds,
+            int(queries) if queries is not None else None,
+        )
+
+    warm_rng = random.Random(f"{seed}-warmup")
+    for _ in range(warmup):  # pools, statement caches, in-process caches
+        await send(warm_rng)
+
+    remaining = iter(range(requests)) if requests is not None else None
+    deadline = time.perf_counter() + duration if duration is not None else math.inf
+
+    async def user(index: int) -> None:
+        rng = random.Random(f"{seed}-{index}")
+        while time.perf_counter() < deadline:
+            if remaining is not None and next(remaining, None) is None:
+                return
+            samples.append(await send(rng))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1] if ordered else 0.0
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    by_route: dict[str, list[Sample]] = {}
+    for sample in samples:
+        by_route.setdefault(sample.route, []).append(sample)
+    routes = {}
+    for route, group in sorted(by_route.items()):
+        latencies = sorted(s.seconds * 1000 for s in group)
+        queries = [s.queries for s in group if s.queries is not None]
+        routes[route] = {
+            "requests": len(group),
+            "errors": sum(not s.ok for s in group),
+            "statuses": {str(code): sum(s.status == code for s in group) for code in sorted({s.status for s in group})},
+            "rps": round(len(group) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(_percentile(latencies, 50), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+            "p99_ms": round(_percentile(latencies, 99), 2),
+            "db_queries": round(sum(queries) / len(queries), 2) if queries else None,
+        }
+    return {
+        "requests": len(samples),
+        "errors": sum(not s.ok for s in samples),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of `result` against `baseline` beyond `tolerance` (0.15 = 15%).
+    Statement counts are compared with half a statement of slack, since the
+    heavy-tailed draws make per-route averages move slightly between runs."""
+    regressions = []
+    if result["rps"] < baseline["rps"] * (1 - tolerance):
+        regressions.append(f"overall: {result['rps']:.1f} req/s, baseline {baseline['rps']:.1f}")
+    for route, now in result["routes"].items():
+        before = baseline["routes"].get(route)
+        if before is None:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {now['p95_ms']:.2f} ms, baseline {before['p95_ms']:.2f} ms")
+        if now["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{route}: {now['rps']:.1f} req/s, baseline {before['rps']:.1f}")
+        if now["db_queries"] is not None and before["db_queries"] is not None \
+                and now["db_queries"] > before["db_queries"] + 0.5:
+            regressions.append(
+                f"{route}: {now['db_queries']:.1f} statements/request, baseline {before['db_queries']:.1f}"
+            )
+        if before["errors"] == 0 and now["errors"]:
+            regressions.append(f"{route}: {now['errors']} unexpected statuses {now['statuses']}")
+    return regressions
+
+
+def print_report(result: dict, baseline: Optional[dict] = None) -> None:
+    print(f"{result['requests']} requests in {result['elapsed_s']:.1f}s: {result['rps']:.1f} req/s, "
+          f"{result['errors']} unexpected statuses")
+    delta_header = f" {'p95 vs base':>11}" if baseline else ""
+    print(f"{'route':<58} {'n':>6} {'err':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'db/req':>6}{delta_header}")
+    for route, row in result["routes"].items():
+        queries = f"{row['db_queries']:.1f}" if row["db_queries"] is not None else "-"
+        line = (f"{route[:58]:<58} {row['requests']:>6} {row['errors']:>4} {row['rps']:>8.1f} "
+                f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {queries:>6}")
+        if baseline:
+            before = baseline["routes"].get(route)
+            if before and before["p95_ms"]:
+                line += f" {(row['p95_ms'] / before['p95_ms'] - 1) * 100:>+10.1f}%"
+            else:
+                line += f" {'new':>11}"
+        print(line)
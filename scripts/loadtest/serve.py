@@ -0,0 +1,61 @@
+"""
+`app.main.app` as the load test runs it:
+
+  * bound to LOADTEST_DATABASE_URL when set (otherwise the usual DB_* env),
+    replica routing off so every read hits that database;
+  * slowapi rate limits disabled, since all traffic comes from one address;
+  * X-DB-Queries response headers on (QUERY_STATS_HEADERS);
+  * page-view recording off on SQLite, where the BIGINT key of page_views
+    does not autoincrement.
+
+Serve it with `uvicorn scripts.loadtest.serve:app` or import it in-process.
+Environment set here only fills gaps: an explicit value always wins.
+"""
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+load_dotenv(PROJECT_ROOT / ".env")
+
+DATABASE_URL = os.getenv("LOADTEST_DATABASE_URL") or None
+
+os.environ.setdefault("QUERY_STATS_HEADERS", "true")
+os.environ.setdefault("SESSION_SECRET_KEY", "loadtest")
+os.environ.setdefault("HTTPS_ONLY", "false")
+os.environ.setdefault("DB_USER", "loadtest")
+os.environ.setdefault("DB_PASSWORD", "loadtest")
+if DATABASE_URL and DATABASE_URL.startswith("sqlite"):
+    os.environ.setdefault("STATS_ENABLED", "false")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app import database, main  # noqa: E402
+from app.routers import auth_routes, message_routes, post_routes  # noqa: E402
+
+if DATABASE_URL:
+    # SQLite: writers queue on the file lock instead of failing after 5s.
+    sqlite = {"timeout": 30} if DATABASE_URL.startswith("sqlite") else {}
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args=dict(sqlite, check_same_thread=False) if sqlite else {},
+        **database.engine_options(DATABASE_URL, "primary"),
+    )
+    async_engine = create_async_engine(
+        database.async_url(DATABASE_URL),
+        connect_args=sqlite,
+        **database.engine_options(DATABASE_URL, "primary_async", is_async=True),
+    )
+    database.SessionLocal.configure(bind=engine)
+    database.AsyncSessionLocal.configure(bind=async_engine)
+database.ReadSessionLocal = None
+database.AsyncReadSessionLocal = None
+
+for limiter in (main.limiter, auth_routes.limiter, message_routes.limiter, post_routes.limiter):
+    limiter.enabled = False
+
+app = main.app
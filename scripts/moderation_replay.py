@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Replay moderation_logs offline to tune the Pass 1 threshold and weights.
+
+Reads the stored classifier scores, Pass 2 verdicts and moderator decisions
+(see `app/moderation_replay.py`), prints precision/recall, Pass 2 volume and
+estimated LLM cost per threshold next to what the pipeline actually did, and
+recommends the cheapest setting that keeps Pass 1 recall above --min-recall.
+No moderation API is called.
+
+Invocation:
+    python scripts/moderation_replay.py [--since 2026-01-01] [--min-recall 0.95]
+        [--input-price 0.1] [--output-price 0.3] [--export recommended.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+load_dotenv(PROJECT_ROOT / ".env")
+
+from app import moderation_replay  # noqa: E402
+
+
+def _build_db_url() -> str:
+    user = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    host = os.getenv("DB_HOST", "localhost")
+    port = os.getenv("DB_PORT", "5432")
+    name = os.getenv("DB_NAME", "calimara_db")
+    if not user or not password:
+        raise SystemExit("DB_USER / DB_PASSWORD missing from env — cannot read moderation_logs.")
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{name}"
+
+
+def _print_table(rows: list[dict]) -> None:
+    print(f"{'thr':>5} {'p2 calls':>9} {'/day':>7} {'cost $':>9} "
+          f"{'p1 prec':>8} {'p1 rec':>7} {'fin prec':>8} {'fin rec':>7} {'queue':>6} {'no verd':>7}")
+    for r in rows:
+        print(f"{r['threshold']:>5.2f} {r['pass2_calls']:>9} {r['pass2_calls_per_day']:>7.1f} {r['cost']:>9.4f} "
+              f"{r['pass1_precision']:>8.3f} {r['pass1_recall']:>7.3f} {r['final_precision']:>8.3f} "
+              f"{r['final_recall']:>7.3f} {r['queue_size']:>6} {r['unknown_verdicts']:>7}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--since", type=datetime.fromisoformat, help="only logs created at/after this date")
+    parser.add_argument("--min-recall", type=float, default=0.95, help="Pass 1 recall floor on moderator-rejected content")
+    parser.add_argument("--input-price", type=float, default=0.1, help="USD per million Pass 2 input tokens")
+    parser.add_argument("--output-price", type=float, default=0.3, help="USD per million Pass 2 output tokens")
+    parser.add_argument("--export", type=Path, help="write the recommendation and env settings as JSON")
+    args = parser.parse_args(argv)
+    pricing = moderation_replay.Pricing(args.input_price, args.output_price)
+
+    engine = create_engine(_build_db_url())
+    with Session(engine) as db:
+        data = moderation_replay.load_replay_data(db, since=args.since)
+    engine.dispose()
+
+    labelled = int((data.labels != moderation_replay.UNLABELLED).sum())
+    harmful = int((data.labels == moderation_replay.HARMFUL).sum())
+    print(f"{len(data.labels)} scored logs over {data.span_days:.1f} days "
+          f"({labelled} reviewed, {harmful} rejected; {data.skipped} without scores skipped)")
+    if not len(data.labels):
+        return
+
+    baseline = moderation_replay.evaluate_current(data, pricing)
+    print(f"current pipeline: {baseline['pass2_calls']:.0f} Pass 2 calls ({baseline['pass2_calls_per_day']:.1f}/day, "
+          f"${baseline['cost']:.4f}), Pass 1 recall {baseline['pass1_recall']:.3f}, "
+          f"final precision {baseline['final_precision']:.3f}\n")
+
+    uniform = moderation_replay.evaluate(data, pricing=pricing)
+    print("uniform weights:")
+    _print_table([uniform.row(i) for i in range(len(uniform.thresholds))])
+
+    recommendation = moderation_replay.recommend(data, min_recall=args.min_recall, pricing=pricing)
+    print("\nrecommended:")
+    _print_table([recommendation])
+    if not recommendation["meets_min_recall"]:
+        print(f"(no setting reaches Pass 1 recall {args.min_recall}; showing the highest-recall one)")
+    env = moderation_replay.export_config(recommendation)
+    for key, value in env.items():
+        print(f"{key}={value}")
+
+    if args.export:
+        args.export.write_text(json.dumps(
+            {"recommendation": recommendation, "baseline": baseline, "env": env}, indent=2, ensure_ascii=False
+        ))
+        print(f"\nwritten to {args.export}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Repair drift in the maintained `clubs.member_count` column.
+
+The counter is kept up to date by crud on join, leave and kick; this script
+only matters after writes that bypass it (manual SQL, users deleted with
+ON DELETE CASCADE). Safe to run from cron.
+
+Invocation:
+    python scripts/reconcile_club_counts.py [--dry-run]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+load_dotenv(PROJECT_ROOT / ".env")
+
+from app import crud  # noqa: E402
+
+
+def _build_db_url() -> str:
+    user = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    host = os.getenv("DB_HOST", "localhost")
+    port = os.getenv("DB_PORT", "5432")
+    name = os.getenv("DB_NAME", "calimara_db")
+    if not user or not password:
+        raise SystemExit("DB_USER / DB_PASSWORD missing from env — cannot reconcile.")
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{name}"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report drift, change nothing")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(_build_db_url())
+    with Session(engine) as db:
+        fixed = crud.reconcile_club_member_counts(db, dry_run=args.dry_run)
+    engine.dispose()
+
+    verb = "would fix" if args.dry_run else "fixed"
+    for club_id, (stored, actual) in sorted(fixed.items()):
+        print(f"club {club_id}: {stored} -> {actual}")
+    print(f"{verb} {len(fixed)} clubs")
+
+
+if __name__ == "__main__":
+    main()
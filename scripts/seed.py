@@ -10,7 +10,8 @@ enough to make every page of the app feel alive when the user clicks around.
 Invocation:
     python scripts/seed.py
 
-Or called automatically at the end of `run.py`'s init step.
+Or called automatically at the end of `run.py`'s init step. For datasets
+sized like production (millions of rows) use `scripts/bulk_seed.py`.
 """
 from __future__ import annotations
 
@@ -29,6 +30,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 load_dotenv(PROJECT_ROOT / ".env")
 
 from app import models  # noqa: E402
+from app import club_search  # noqa: E402,F401  (fills clubs.search_text on insert)
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -520,8 +522,24 @@ def _ts(days_ago: int) -> datetime:
     return datetime.now() - timedelta(days=days_ago, hours=days_ago % 4)
 
 
-def seed(session: Session, *, quiet: bool = False) -> None:
+def seed(session: Session, *, quiet: bool = False, scale: int = 1) -> None:
+    """Insert the sample dataset. `scale` > 1 inserts that many copies of it;
+    copies after the first get numbered usernames, emails and slugs."""
     log = (lambda *_a, **_k: None) if quiet else print
+    silent = lambda *_a, **_k: None  # noqa: E731
+    for copy in range(scale):
+        _seed_copy(session, "" if copy == 0 else str(copy + 1), log if copy == 0 else silent)
+    if scale > 1:
+        log(f"  Seed: dataset inserted {scale} times")
+    session.commit()
+
+
+def _seed_copy(session: Session, suffix: str, log) -> None:
+    def numbered(name: str) -> str:
+        return f"{name}{suffix}"
+
+    def numbered_slug(value: str) -> str:
+        return f"{value}-{suffix}" if suffix else value
 
     # ── Users ──────────────────────────────────────────────
     # `mireasufletului` is seeded with active premium so club ownership
@@ -529,10 +547,11 @@ def seed(session: Session, *, quiet: bool = False) -> None:
     premium_until = datetime.now(tz=timezone.utc).replace(tzinfo=None) + timedelta(days=365)
     users_by_username: dict[str, models.User] = {}
     for row in AUTHORS:
+        local, domain = row["email"].split("@")
         u = models.User(
-            username=row["username"],
-            email=row["email"],
-            google_id=row["google_id"],
+            username=numbered(row["username"]),
+            email=f"{local}{suffix}@{domain}",
+            google_id=numbered_slug(row["google_id"]),
             subtitle=row["subtitle"],
             avatar_seed=row["avatar_seed"],
             premium_until=premium_until if row["username"] == "mireasufletului" else None,
@@ -550,7 +569,7 @@ def seed(session: Session, *, quiet: bool = False) -> None:
         p = models.Post(
             user_id=author.id,
             title=row["title"],
-            slug=row["slug"],
+            slug=numbered_slug(row["slug"]),
             content=row["content"],
             category=row["category"],
             view_count=10 + (row["days_ago"] * 7) % 137,
@@ -626,7 +645,7 @@ def seed(session: Session, *, quiet: bool = False) -> None:
         club = models.Club(
             owner_id=owner.id,
             title=row["title"],
-            slug=row["slug"],
+            slug=numbered_slug(row["slug"]),
             description=row["description"],
             motto=row["motto"],
             avatar_seed=row["avatar_seed"],
@@ -634,6 +653,7 @@ def seed(session: Session, *, quiet: bool = False) -> None:
             speciality=row["speciality"],
             featured_post_id=featured_post.id if featured_post else None,
             featured_until=(featured_until if featured_post else None),
+            member_count=1 + len(row.get("members", [])),
         )
         session.add(club)
         clubs_by_slug[row["slug"]] = club
@@ -685,8 +705,6 @@ def seed(session: Session, *, quiet: bool = False) -> None:
         )
     log(f"  Seed: {len(AWARDS)} awards")
 
-    session.commit()
-
 
 def main(quiet: bool = False) -> None:
     engine = create_engine(_build_db_url())
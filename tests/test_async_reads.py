@@ -0,0 +1,89 @@
+import importlib.util
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import async_crud, models, statistics
+from app.routers import api_pages, notification_routes
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite is not installed")
+class AsyncReadPathTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        self.SessionLocal = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+        # Page views use a BIGINT key that SQLite cannot autoincrement.
+        stats_off = mock.patch.object(statistics, "STATS_ENABLED", False)
+        stats_off.start()
+        self.addCleanup(stats_off.stop)
+
+        now = datetime(2026, 5, 1, 12, 0)
+        async with self.SessionLocal() as db:
+            self.author = models.User(username="ana", email="ana@x.test", google_id="g-ana")
+            self.reader = models.User(username="ion", email="ion@x.test", google_id="g-ion")
+            db.add_all([self.author, self.reader])
+            await db.flush()
+            self.post = models.Post(
+                user_id=self.author.id, title="Toamna", slug="toamna", content="...", category="poezie"
+            )
+            db.add(self.post)
+            await db.flush()
+            db.add_all([
+                models.Comment(post_id=self.post.id, user_id=self.reader.id, content="Frumos", approved=True),
+                models.Like(post_id=self.post.id, user_id=self.reader.id),
+            ])
+            for i in range(3):
+                db.add(models.Notification(
+                    user_id=self.author.id, type="like", title=f"n{i}", message="m",
+                    is_read=(i == 0), created_at=now + timedelta(minutes=i),
+                ))
+            await db.commit()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_notification_reads(self):
+        async with self.SessionLocal() as db:
+            first = await async_crud.get_notifications_for_user(db, self.author.id, skip=0, limit=2)
+            rest = await async_crud.get_notifications_for_user(db, self.author.id, skip=2, limit=2)
+            self.assertEqual([n.title for n in first + rest], ["n2", "n1", "n0"])
+            self.assertEqual(await async_crud.get_unread_notification_count(db, self.author.id), 2)
+
+            payload = await notification_routes.get_unread_count(db=db, current_user=self.author)
+            self.assertEqual(payload, {"unread_count": 2})
+
+    async def test_post_detail_runs_sync_payload_over_async_session(self):
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+        async with self.SessionLocal() as db, self.SessionLocal() as write_db:
+            payload = await api_pages.post_detail_data(
+                request, "ana", "toamna", db=db, write_db=write_db, current_user=None
+            )
+        # Lazy loads (likes, comments) ran inside run_sync without MissingGreenlet.
+        self.assertEqual(payload["post"]["likes_count"], 1)
+        self.assertEqual([c["content"] for c in payload["post"]["approved_comments"]], ["Frumos"])
+        self.assertEqual(payload["post"]["approved_comments"][0]["user"]["username"], "ion")
+        self.assertEqual([u["username"] for u in payload["other_authors"]], ["ion"])
+
+    async def test_missing_post_is_404(self):
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+        async with self.SessionLocal() as db, self.SessionLocal() as write_db:
+            with self.assertRaises(HTTPException) as raised:
+                await api_pages.post_detail_data(
+                    request, "ana", "nu-exista", db=db, write_db=write_db, current_user=None
+                )
+        self.assertEqual(raised.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
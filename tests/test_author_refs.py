@@ -0,0 +1,91 @@
+import os
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import club_snapshot, crud, models, schemas
+from app.author_refs import AuthorRef, author_payload, load_author_refs
+from app.routers import club_routes
+
+
+class AuthorRefTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.statements = []
+        club_snapshot.clear()
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _make_user(self, username, **fields):
+        u = models.User(username=username, email=f"{username}@x.test", google_id=f"g-{username}", **fields)
+        self.db.add(u)
+        self.db.commit()
+        self.db.refresh(u)
+        return u
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def test_refs_are_loaded_once_per_session(self):
+        ana = self._make_user("ana", avatar_seed="seed-ana", subtitle="poezie")
+        ion = self._make_user("ion")
+        ana_id, ion_id = ana.id, ion.id
+        self.db.close()
+        self.db = self.SessionLocal()
+
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        refs = load_author_refs(self.db, [ana_id, ion_id, ion_id, None])
+        again = load_author_refs(self.db, [ion_id])
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+        self.assertEqual(len(self.statements), 1)
+        self.assertNotIn("stripe_customer_id", self.statements[0])
+        self.assertIsInstance(refs[ana_id], AuthorRef)
+        self.assertIs(again[ion_id], refs[ion_id])
+        self.assertEqual(
+            author_payload(refs[ana_id], include_subtitle=True),
+            {"id": ana_id, "username": "ana", "avatar_seed": "seed-ana", "subtitle": "poezie"},
+        )
+        self.assertEqual(author_payload(refs[ion_id])["avatar_seed"], "ion-shapes")
+
+    def test_club_detail_loads_all_names_with_one_users_query(self):
+        owner = self._make_user("owner")
+        club = crud.create_club(self.db, owner, schemas.ClubCreate(title="Cenaclul", speciality="poezie"))
+        for name in ("ana", "ion", "maria"):
+            member = self._make_user(name)
+            self.db.add(models.ClubMember(club_id=club.id, user_id=member.id, role="member"))
+            self.db.add(models.ClubBoardMessage(club_id=club.id, author_id=member.id, content=f"salut de la {name}"))
+        self.db.commit()
+        slug = club.slug
+        self.db.close()
+        self.db = self.SessionLocal()
+
+        club = crud.get_club_by_slug(self.db, slug)
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        detail = club_routes._build_club_detail(self.db, club, None)
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+        user_queries = [s for s in self.statements if "FROM users" in s]
+        self.assertEqual(len(user_queries), 1)
+        self.assertEqual(detail["owner"]["username"], "owner")
+        self.assertEqual({m["username"] for m in detail["members"]}, {"owner", "ana", "ion", "maria"})
+        self.assertEqual({m["author"]["username"] for m in detail["recent_messages"]}, {"ana", "ion", "maria"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import crud, models, moderation_queue, schemas
+from app.routers import moderation_routes
+
+
+def _item(content_type, content_id, action, reason=""):
+    return schemas.BulkModerationItem(content_type=content_type, content_id=content_id, action=action, reason=reason)
+
+
+class BulkModerationTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.statements = []
+
+        self.spammer = models.User(username="spammer", email="spam@x.test", google_id="g-spam")
+        self.writer = models.User(username="writer", email="writer@x.test", google_id="g-writer")
+        self.mod = models.User(username="mod", email="mod@x.test", google_id="g-mod", is_moderator=True)
+        self.db.add_all([self.spammer, self.writer, self.mod])
+        self.db.commit()
+
+        self.good = models.Post(user_id=self.writer.id, title="Bun", slug="bun", content="...",
+                                moderation_status="pending")
+        self.db.add(self.good)
+        self.db.flush()
+        self.spam = []
+        for i in range(20):
+            comment = models.Comment(post_id=self.good.id, user_id=self.spammer.id, content=f"spam {i}",
+                                     moderation_status="flagged")
+            self.db.add(comment)
+            self.spam.append(comment)
+        self.db.flush()
+        # Half of the spam already has an AI log entry.
+        for comment in self.spam[:10]:
+            self.db.add(models.ModerationLog(content_type="comment", content_id=comment.id,
+                                             user_id=self.spammer.id, ai_decision="flagged"))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def _count_queries(self, fn):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        try:
+            return fn()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def test_spam_wave_is_rejected_in_one_transaction(self):
+        spam_ids = [c.id for c in self.spam]
+        moderation_queue.claim_item(self.db, "comment", spam_ids[0], self.mod.id)
+        items = [_item("comment", cid, "reject", "spam" if i % 2 else "") for i, cid in enumerate(spam_ids)]
+        items.append(_item("post", self.good.id, "approve", "Frumos"))
+
+        results = crud.bulk_moderate_content(self.db, items, self.mod.id)
+        self.assertEqual([r["status"] for r in results], ["rejected"] * 20 + ["approved"])
+
+        self.db.expire_all()
+        comments = self.db.query(models.Comment).filter(models.Comment.id.in_(spam_ids)).all()
+        self.assertTrue(all(c.moderation_status == "rejected" and c.approved is False for c in comments))
+        self.assertTrue(all(c.moderated_by == self.mod.id and c.moderated_at is not None for c in comments))
+        self.assertEqual({c.moderation_reason for c in comments}, {None, "spam"})
+        self.assertEqual(self.db.get(models.Post, self.good.id).moderation_status, "approved")
+
+        logs = self.db.query(models.ModerationLog).filter(models.ModerationLog.content_type == "comment").all()
+        self.assertEqual(len(logs), 20)  # 10 updated, 10 inserted
+        self.assertTrue(all(log.human_decision == "rejected" and log.moderated_at is not None for log in logs))
+        self.assertEqual(self.db.query(models.ModerationClaim).count(), 0)
+
+        # One digest for the spammer, one plain notification for the writer.
+        notifications = self.db.query(models.Notification).order_by(models.Notification.user_id).all()
+        self.assertEqual([(n.user_id, n.type) for n in notifications],
+                         sorted([(self.spammer.id, "moderation_rejected"), (self.writer.id, "moderation_approved")]))
+        digest = next(n for n in notifications if n.user_id == self.spammer.id)
+        self.assertEqual(digest.extra_data["count"], 20)
+        self.assertEqual(digest.title, "20 conținuturi respinse")
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        spam_ids = [c.id for c in self.spam]
+        mod_id = self.mod.id
+
+        def run(ids):
+            items = [_item("comment", cid, "approve") for cid in ids]
+            return self._count_queries(lambda: crud.bulk_moderate_content(self.db, items, mod_id))
+
+        # Both batches mix logged and unlogged comments.
+        run(spam_ids[:2] + spam_ids[10:12])
+        small = len(self.statements)
+        run(spam_ids[2:10] + spam_ids[12:])
+        self.assertEqual(len(self.statements), small)
+
+    def test_per_item_outcomes(self):
+        cid = self.spam[0].id
+        results = crud.bulk_moderate_content(self.db, [
+            _item("comment", cid, "approve"),
+            _item("comment", cid, "reject"),
+            _item("comment", 999999, "approve"),
+            _item("video", 1, "approve"),
+            _item("post", self.good.id, "ban"),
+            _item("comment", self.spam[1].id, "delete"),
+        ], self.mod.id)
+        self.assertEqual([r["status"] for r in results],
+                         ["approved", "duplicate", "not_found", "invalid_type", "invalid_action", "deleted"])
+        self.assertIsNone(self.db.get(models.Comment, self.spam[1].id))
+
+    def test_rejecting_a_collected_post_bumps_collection_version(self):
+        collection = models.Collection(owner_id=self.writer.id, title="Colecție", slug="colectie")
+        self.db.add(collection)
+        self.db.flush()
+        self.db.add(models.CollectionPost(collection_id=collection.id, post_id=self.good.id,
+                                          initiator_id=self.writer.id, status="accepted"))
+        self.db.commit()
+        version = collection.version
+
+        crud.bulk_moderate_content(self.db, [_item("post", self.good.id, "reject")], self.mod.id)
+        self.db.refresh(collection)
+        self.assertEqual(collection.version, version + 1)
+
+    def test_route_reports_applied_count(self):
+        response = moderation_routes.moderate_content_bulk(
+            schemas.BulkModerationRequest(items=[_item("comment", self.spam[0].id, "approve"),
+                                                 _item("comment", 999999, "approve")]),
+            db=self.db, current_user=self.mod,
+        )
+        self.assertEqual(response["applied"], 1)
+        self.assertEqual([r["status"] for r in response["results"]], ["approved", "not_found"])
+
+
+if __name__ == "__main__":
+    unittest.main()
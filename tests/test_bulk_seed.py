@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import models
+from scripts import bulk_seed
+
+
+def _seeded(path, **kwargs):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    counts = bulk_seed.bulk_seed(engine, until=date(2026, 1, 1), log=lambda *a: None, **kwargs)
+    return engine, counts
+
+
+class BulkSeedTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine, self.counts = _seeded(Path(self.tmp.name) / "a.db", scale=0.05, seed=7, batch_size=997)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def _scalar(self, sql):
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql(sql).scalar()
+
+    def test_sizes_follow_the_scale(self):
+        self.assertEqual(self.counts["users"], 50)
+        self.assertEqual(self.counts["posts"], 250)
+        self.assertEqual(self._scalar("SELECT COUNT(*) FROM page_views"), 5000)
+        self.assertEqual(self._scalar("SELECT COUNT(*) FROM club_members"), self.counts["club_members"])
+
+    def test_same_seed_gives_the_same_dataset(self):
+        engine, _ = _seeded(Path(self.tmp.name) / "b.db", scale=0.05, seed=7, batch_size=5000)
+        query = "SELECT id, slug, content, view_count, created_at FROM posts ORDER BY id"
+        try:
+            with self.engine.connect() as a, engine.connect() as b:
+                self.assertEqual(a.exec_driver_sql(query).all(), b.exec_driver_sql(query).all())
+        finally:
+            engine.dispose()
+
+    def test_counters_match_the_rows_behind_them(self):
+        self.assertEqual(
+            self._scalar("SELECT SUM(view_count) FROM posts"),
+            self._scalar("SELECT COUNT(*) FROM page_views WHERE content_type = 'post' AND NOT is_bot AND NOT is_duplicate"),
+        )
+        self.assertEqual(
+            self._scalar("SELECT SUM(member_count) FROM clubs"), self._scalar("SELECT COUNT(*) FROM club_members")
+        )
+        self.assertEqual(self._scalar(
+            "SELECT COUNT(*) FROM (SELECT post_id, user_id FROM likes GROUP BY post_id, user_id HAVING COUNT(*) > 1)"
+        ), 0)
+
+    def test_views_are_skewed_towards_few_posts(self):
+        top = self._scalar("SELECT SUM(view_count) FROM (SELECT view_count FROM posts ORDER BY view_count DESC LIMIT 25)")
+        self.assertGreater(top / self._scalar("SELECT SUM(view_count) FROM posts"), 0.5)
+
+    def test_appends_after_existing_rows_and_restores_indexes(self):
+        indexes = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'"
+        before = self._scalar(indexes)
+        bulk_seed.bulk_seed(self.engine, scale=0.01, seed=8, until=date(2026, 1, 1), log=lambda *a: None)
+        self.assertEqual(self._scalar(indexes), before)
+        self.assertEqual(self._scalar("SELECT COUNT(*) FROM users"), 60)
+        self.assertEqual(self._scalar("SELECT COUNT(DISTINCT username) FROM users"), 60)
+
+    def test_copy_fields_are_escaped(self):
+        self.assertEqual(
+            [bulk_seed._copy_field(v) for v in (None, True, False, "a\tb\nc\\", 3, datetime(2026, 1, 2, 3, 4))],
+            ["\\N", "t", "f", "a\\tb\\nc\\\\", "3", "2026-01-02 03:04:00"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import cache, crud, models, schemas
+from app.cache import core
+from app.week_util import utcnow_naive
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch.object(core, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.caches = []
+
+    def tearDown(self):
+        for c in self.caches:
+            core._instances.remove(c)
+
+    def _cache(self, **kwargs):
+        c = cache.Cache("test", **kwargs)
+        self.caches.append(c)
+        return c
+
+
+class LocalTierTests(CacheTestCase):
+    def test_entries_expire_and_the_least_recently_used_is_evicted(self):
+        c = self._cache(max_entries=2, ttl=10, stale=0)
+        c.get_or_compute("a", lambda: 1)
+        c.get_or_compute("b", lambda: 2)
+        self.assertEqual(c.get_or_compute("a", lambda: "recomputed"), 1)
+        c.get_or_compute("c", lambda: 3)
+        self.assertEqual(c.get_or_compute("b", lambda: "recomputed"), "recomputed")
+
+        self.clock.now += 11
+        self.assertEqual(c.get_or_compute("a", lambda: "expired"), "expired")
+
+    def test_tags_invalidate_every_entry_carrying_them(self):
+        c = self._cache()
+        c.get_or_compute("months:1", lambda: "m1", tags=["user:1"])
+        c.get_or_compute("months:2", lambda: "m2", tags=["user:2"])
+        c.get_or_compute("themes", lambda: "t", tags=["posts"])
+        c.invalidate("user:1", "posts")
+        self.assertEqual(len(c), 1)
+        self.assertEqual(c.get_or_compute("months:2", lambda: "again"), "m2")
+
+    def test_value_computed_across_an_invalidation_is_not_stored(self):
+        c = self._cache()
+
+        def compute():
+            c.invalidate("user:1")
+            return "old"
+
+        self.assertEqual(c.get_or_compute("k", compute, tags=["user:1"]), "old")
+        self.assertEqual(c.get_or_compute("k", lambda: "new", tags=["user:1"]), "new")
+
+    def test_invalidation_times_are_kept_only_while_computations_run(self):
+        c = self._cache()
+        c.invalidate("user:1")
+        self.assertEqual(c._invalidated_at, {})
+        c.get_or_compute("k", lambda: c.invalidate("user:1", "user:2"), tags=["user:1"])
+        self.assertEqual(c._invalidated_at, {})
+        self.assertEqual(c._active, {})
+
+    def test_stale_value_is_served_while_one_caller_refreshes(self):
+        c = self._cache(ttl=10, stale=60)
+        c.get_or_compute("k", lambda: "v1")
+        self.clock.now += 20
+        started, release = threading.Event(), threading.Event()
+
+        def slow_refresh():
+            started.set()
+            release.wait(5)
+            return "v2"
+
+        refresher = threading.Thread(target=lambda: c.get_or_compute("k", slow_refresh))
+        refresher.start()
+        started.wait(5)
+        self.assertEqual(c.get_or_compute("k", lambda: "unexpected"), "v1")
+        release.set()
+        refresher.join(5)
+        self.assertEqual(c.get_or_compute("k", lambda: "unexpected"), "v2")
+
+    def test_concurrent_misses_compute_once(self):
+        c = self._cache()
+        calls, results = [], []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "v"
+
+        threads = [threading.Thread(target=lambda: results.append(c.get_or_compute("k", compute)))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        while not c._inflight:
+            pass
+        release.set()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(results, ["v"] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_leader_failure_is_not_cached(self):
+        c = self._cache()
+        with self.assertRaises(ZeroDivisionError):
+            c.get_or_compute("k", lambda: 1 / 0)
+        self.assertEqual(c.get_or_compute("k", lambda: "ok"), "ok")
+
+
+class CommitInvalidationTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine, autoflush=False)()
+        self.user = models.User(username="ana", email="ana@x.test", google_id="g-ana")
+        self.db.add(self.user)
+        self.db.commit()
+        self.app = self._cache()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+        super().tearDown()
+
+    def _post(self, slug, status="approved", category="poezie"):
+        return models.Post(user_id=self.user.id, title=slug, slug=slug, content="...",
+                           category=category, moderation_status=status)
+
+    def test_decorated_function_is_keyed_by_arguments_and_dropped_on_commit(self):
+        calls = []
+
+        @cache.cached(tags=("user:{user_id}",), cache=self.app)
+        def post_count(db, user_id, status="approved"):
+            calls.append(user_id)
+            return db.query(models.Post).filter_by(user_id=user_id, moderation_status=status).count()
+
+        self.assertEqual(post_count(self.db, self.user.id), 0)
+        self.assertEqual(post_count(self.db, user_id=self.user.id), 0)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(post_count(self.db, self.user.id, status="pending"), 0)
+        self.assertEqual(len(calls), 2)
+
+        self.db.add(self._post("a"))
+        self.db.flush()
+        self.db.rollback()
+        self.assertEqual(post_count(self.db, self.user.id), 0)
+        self.assertEqual(len(calls), 2)
+
+        self.db.add(self._post("b"))
+        self.db.commit()
+        self.assertEqual(post_count(self.db, self.user.id), 1)
+        self.assertEqual(post_count.uncached(self.db, self.user.id), 1)
+
+    def test_bulk_moderation_invalidates_author_aggregates(self):
+        post = self._post("a", status="pending")
+        self.db.add(post)
+        self.db.commit()
+        with patch.object(core, "app_cache", self.app):
+            self.assertEqual(crud.get_user_post_counts_by_category(self.db, self.user.id), {})
+            crud.bulk_moderate_content(
+                self.db, [schemas.BulkModerationItem(content_type="post", content_id=post.id, action="approve")],
+                moderator_id=self.user.id,
+            )
+            self.db.commit()
+            self.assertEqual(crud.get_user_post_counts_by_category(self.db, self.user.id), {"poezie": 1})
+
+
+class SharedTierTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{self.tmp.name}/cache.db")
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.a = self._cache(shared=cache.DatabaseTier(self.SessionLocal, background=False))
+        self.b = self._cache(shared=cache.DatabaseTier(self.SessionLocal, background=False))
+        self.sync()
+
+    def sync(self):
+        self.a.shared.flush()
+        self.b.shared.flush()
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def test_workers_share_values_and_invalidations(self):
+        self.assertEqual(self.b.get_or_compute("themes", lambda: "never"), "never")  # local only
+        self.assertEqual(self.a.get_or_compute("feelings", lambda: ["dor"], tags=["posts"], shared=True), ["dor"])
+        self.sync()
+        self.assertEqual(
+            self.b.get_or_compute("feelings", lambda: self.fail("recomputed"), tags=["posts"], shared=True), ["dor"]
+        )
+
+        self.a.invalidate("posts")
+        self.sync()
+        self.assertEqual(len(self.b), 1)  # "themes" only
+        self.assertEqual(self.b.get_or_compute("feelings", lambda: ["timp"], shared=True), ["timp"])
+        self.sync()
+        self.assertEqual(self.a.get_or_compute("feelings", lambda: self.fail("not shared"), shared=True), ["timp"])
+
+    def test_values_that_are_not_json_stay_local(self):
+        value = {1, 2}
+        self.assertIs(self.a.get_or_compute("k", lambda: value, shared=True), value)
+        self.sync()
+        self.assertEqual(self.b.get_or_compute("k", lambda: "own", shared=True), "own")
+
+    def test_commit_queues_the_broadcast_and_the_event_loop_reads_locally(self):
+        self.a.get_or_compute("feelings", lambda: ["dor"], tags=["posts"], shared=True)
+        self.sync()
+        with self.SessionLocal() as db, patch.object(core, "_instances", [self.a]):
+            cache.invalidate_on_commit(db, "posts")
+            db.commit()
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("SELECT count(*) FROM cache_invalidations").scalar(), 0)
+        # Queued, not yet written: the stale shared entry is not served.
+        self.assertEqual(self.a.get_or_compute("feelings", lambda: ["timp"], shared=True), ["timp"])
+
+        async def on_loop():
+            return self.b.get_or_compute("feelings", lambda: "local", shared=True)
+
+        self.sync()
+        self.assertEqual(asyncio.run(on_loop()), "local")
+
+    def test_invalidations_committed_out_of_id_order_are_seen(self):
+        self.b.get_or_compute("feelings", lambda: ["dor"], tags=["posts"])
+        with self.SessionLocal() as db:
+            db.add(models.CacheInvalidation(id=10, tag="users", created_at=utcnow_naive()))
+            db.commit()
+        self.sync()
+        self.assertEqual(len(self.b), 1)
+        with self.SessionLocal() as db:  # a transaction that took id 5 commits late
+            db.add(models.CacheInvalidation(id=5, tag="posts", created_at=utcnow_naive() - timedelta(seconds=5)))
+            db.commit()
+        self.sync()
+        self.assertEqual(len(self.b), 0)
+        self.assertEqual(self.b.shared.poll(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
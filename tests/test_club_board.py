@@ -0,0 +1,111 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import crud, models, schemas
+from app.routers import club_routes
+
+BASE = datetime(2026, 3, 1, 12, 0, 0)
+
+
+class ClubBoardTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.statements = []
+
+        self.owner = models.User(username="owner", email="owner@x.test", google_id="g-owner")
+        self.db.add(self.owner)
+        self.db.commit()
+        self.club = crud.create_club(self.db, self.owner, schemas.ClubCreate(title="Cenaclul", speciality="poezie"))
+        self.club_id = self.club.id
+        self.owner_id = self.owner.id
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _message(self, minutes, parent=None):
+        # Same timestamp for several messages on purpose: the keyset must
+        # break ties by id.
+        msg = models.ClubBoardMessage(
+            club_id=self.club_id,
+            author_id=self.owner_id,
+            parent_id=parent.id if parent else None,
+            content=f"t+{minutes}",
+            created_at=BASE + timedelta(minutes=minutes),
+        )
+        self.db.add(msg)
+        self.db.flush()
+        return msg
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def test_threads_page_by_keyset_with_capped_sorted_replies(self):
+        threads = [self._message(m) for m in (0, 1, 1, 2, 3)]
+        replies = [self._message(10 + m // 2, parent=threads[0]) for m in range(5)]
+        self._message(20, parent=threads[3])
+        self.db.commit()
+
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        page, cursor = crud.list_board_threads(self.db, self.club_id, limit=3, reply_limit=2)
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+        self.assertEqual(len(self.statements), 2)  # top-level page + one IN query for replies
+        self.assertEqual([t.message.id for t in page], [threads[4].id, threads[3].id, threads[2].id])
+        self.assertEqual(page[1].reply_count, 1)
+        self.assertIsNone(page[1].replies_cursor)
+
+        rest, end = crud.list_board_threads(self.db, self.club_id, limit=3, cursor=cursor, reply_limit=2)
+        self.assertIsNone(end)
+        self.assertEqual([t.message.id for t in rest], [threads[1].id, threads[0].id])
+
+        first = rest[1]
+        self.assertEqual(first.reply_count, 5)
+        self.assertEqual([r.id for r in first.replies], [replies[0].id, replies[1].id])
+        more, more_cursor = crud.list_board_replies(self.db, threads[0].id, limit=2, cursor=first.replies_cursor)
+        self.assertEqual([r.id for r in more], [replies[2].id, replies[3].id])
+        last, none = crud.list_board_replies(self.db, threads[0].id, limit=2, cursor=more_cursor)
+        self.assertEqual([r.id for r in last], [replies[4].id])
+        self.assertIsNone(none)
+
+    def test_board_endpoint_payload_and_bad_cursor(self):
+        thread = self._message(0)
+        for m in range(4):
+            self._message(1 + m, parent=thread)
+        self.db.commit()
+
+        body = club_routes.list_club_board_api(self.club_id, db=self.db)
+        message = body["messages"][0]
+        self.assertEqual(message["reply_count"], 4)
+        self.assertEqual(len(message["replies"]), crud.BOARD_REPLIES_PER_THREAD)
+        self.assertEqual(message["author"]["role"], "owner")
+        self.assertIsNone(body["next_cursor"])
+
+        more = club_routes.list_club_board_replies_api(
+            self.club_id, thread.id, cursor=message["replies_cursor"], db=self.db
+        )
+        self.assertEqual([r["content"] for r in more["replies"]], ["t+4"])
+
+        with self.assertRaises(club_routes.HTTPException) as ctx:
+            club_routes.list_club_board_api(self.club_id, cursor="garbage!", db=self.db)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
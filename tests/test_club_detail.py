@@ -0,0 +1,216 @@
+import os
+import unittest
+from datetime import timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import club_snapshot, crud, models, schemas
+from app.routers import club_routes
+from app.week_util import utcnow_naive
+
+
+class ClubDetailTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.statements = []
+        club_snapshot.clear()
+
+        self.owner = self._make_user("owner")
+        self.club = crud.create_club(self.db, self.owner, schemas.ClubCreate(title="Cenaclul", speciality="poezie"))
+        self.members = {}
+        for name, posts in (("ana", 3), ("ion", 1), ("maria", 0)):
+            member = self._make_user(name)
+            self.members[name] = member
+            self.db.add(models.ClubMember(club_id=self.club.id, user_id=member.id, role="member"))
+            for i in range(posts):
+                self.db.add(models.ClubBoardMessage(club_id=self.club.id, author_id=member.id, content=f"{name} {i}"))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        club_snapshot.clear()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _make_user(self, username):
+        u = models.User(username=username, email=f"{username}@x.test", google_id=f"g-{username}")
+        self.db.add(u)
+        self.db.commit()
+        self.db.refresh(u)
+        return u
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def _detail(self, viewer=None):
+        # Commits expire loaded objects; reload them outside the counted block.
+        self.db.refresh(self.club)
+        if viewer is not None:
+            self.db.refresh(viewer)
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        try:
+            return club_routes._build_club_detail(self.db, self.club, viewer)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def test_contribution_counts_come_from_one_members_query(self):
+        detail = self._detail()
+
+        counts = {m["username"]: m["contribution_count"] for m in detail["members"]}
+        self.assertEqual(counts, {"owner": 0, "ana": 3, "ion": 1, "maria": 0})
+        self.assertEqual(detail["member_count"], 4)
+        self.assertEqual(len([s for s in self.statements if "FROM club_members" in s]), 1)
+        self.assertEqual(len(self.statements), 4)  # members, threads, replies, author refs
+
+    def test_viewer_state_is_one_query_on_a_cached_snapshot(self):
+        self._detail()
+
+        as_owner = self._detail(self.owner)
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(as_owner["my_role"], "owner")
+        self.assertEqual(as_owner["pending_request_count"], 0)
+
+        outsider = self._make_user("outsider")
+        crud.apply_to_club(self.db, outsider, self.club)
+        as_outsider = self._detail(outsider)
+        self.assertIsNone(as_outsider["my_role"])
+        self.assertEqual(as_outsider["my_pending_request_status"], "application")
+        self.assertIsNone(as_outsider["pending_request_count"])
+        self.assertEqual(self._detail(self.owner)["pending_request_count"], 1)
+
+    def test_board_post_invalidates_snapshot(self):
+        self._detail()
+        crud.post_board_message(self.db, self.members["maria"], self.club, "prima mea postare")
+
+        detail = self._detail()
+        counts = {m["username"]: m["contribution_count"] for m in detail["members"]}
+        self.assertEqual(counts["maria"], 1)
+        self.assertIn("prima mea postare", [m["content"] for m in detail["recent_messages"]])
+
+    def test_membership_change_invalidates_snapshot(self):
+        self._detail()
+        membership = crud.get_club_membership(self.db, self.club.id, self.members["ion"].id)
+        self.db.delete(membership)
+        self.db.commit()
+
+        detail = self._detail()
+        self.assertEqual(detail["member_count"], 3)
+        self.assertNotIn("ion", {m["username"] for m in detail["members"]})
+
+    def test_rolled_back_change_keeps_snapshot(self):
+        self._detail()
+        self.db.add(models.ClubBoardMessage(club_id=self.club.id, author_id=self.owner.id, content="ciornă"))
+        self.db.flush()
+        self.db.rollback()
+
+        self.assertIsNotNone(club_snapshot.get(self.club.id))
+
+    def test_snapshot_does_not_outlive_featured_post(self):
+        post = models.Post(user_id=self.members["ana"].id, title="Toamna", slug="toamna", content="...")
+        self.db.add(post)
+        self.db.commit()
+        self.club.featured_post_id = post.id
+        self.club.featured_until = utcnow_naive() + timedelta(days=1)
+        self.db.commit()
+
+        detail = self._detail()
+        self.assertEqual(detail["featured"]["post_title"], "Toamna")
+        self.assertIsNotNone(club_snapshot.get(self.club.id))
+
+        club_snapshot.clear()
+        self.club.featured_until = utcnow_naive() + timedelta(seconds=-1)
+        self.db.commit()
+        self.assertIsNone(self._detail()["featured"])
+
+
+class ClubMemberCountTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.statements = []
+        self.owner = self._make_user("owner")
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _make_user(self, username):
+        u = models.User(username=username, email=f"{username}@x.test", google_id=f"g-{username}")
+        self.db.add(u)
+        self.db.commit()
+        self.db.refresh(u)
+        return u
+
+    def _make_club(self, title):
+        return crud.create_club(self.db, self.owner, schemas.ClubCreate(title=title, speciality="poezie"))
+
+    def _join(self, club, user):
+        request, _ = crud.apply_to_club(self.db, user, club)
+        crud.respond_to_club_request(self.db, request, self.owner, "approve")
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def test_counter_follows_join_kick_and_leave(self):
+        club = self._make_club("Cenaclul")
+        self.assertEqual(club.member_count, 1)
+
+        ana, ion = self._make_user("ana"), self._make_user("ion")
+        self._join(club, ana)
+        self._join(club, ion)
+        self.db.refresh(club)
+        self.assertEqual(club.member_count, 3)
+
+        self.assertEqual(crud.kick_member(self.db, self.owner, club, ana.id), (True, None))
+        self.assertEqual(crud.kick_member(self.db, ion, club, ion.id), (True, None))
+        self.db.refresh(club)
+        self.assertEqual(club.member_count, 1)
+        self.assertEqual(club.member_count, crud.count_club_members(self.db, club.id))
+
+    def test_listing_summaries_issue_no_per_club_queries(self):
+        clubs = [self._make_club(f"Club {i}") for i in range(5)]
+        self._join(clubs[0], self._make_user("ana"))
+        listed = crud.list_clubs(self.db, limit=50)
+
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        payloads = club_routes._club_summary_payloads(self.db, listed)
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+        self.assertEqual(len(self.statements), 1)  # the owners' author refs
+        self.assertEqual(sorted(p["member_count"] for p in payloads), [1, 1, 1, 1, 2])
+
+    def test_reconciler_repairs_drift(self):
+        club = self._make_club("Cenaclul")
+        ana = self._make_user("ana")
+        self.db.add(models.ClubMember(club_id=club.id, user_id=ana.id, role="member"))  # bypasses crud
+        self.db.commit()
+
+        self.assertEqual(crud.reconcile_club_member_counts(self.db, dry_run=True), {club.id: (1, 2)})
+        self.assertEqual(crud.reconcile_club_member_counts(self.db), {club.id: (1, 2)})
+        self.db.refresh(club)
+        self.assertEqual(club.member_count, 2)
+        self.assertEqual(crud.reconcile_club_member_counts(self.db), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import unittest
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import club_search, crud, models, schemas
+from app.routers import club_routes
+
+
+class ClubSearchTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.owner = models.User(username="owner", email="owner@x.test", google_id="g-owner")
+        self.db.add(self.owner)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _club(self, title, theme=None, description=None, speciality="poezie"):
+        return crud.create_club(
+            self.db,
+            self.owner,
+            schemas.ClubCreate(title=title, theme=theme, description=description, speciality=speciality),
+        )
+
+    def test_fold_text_strips_romanian_diacritics(self):
+        self.assertEqual(club_search.fold_text("Țară, ȘCOALĂ și pâine — îngeri"), "tara scoala si paine ingeri")
+        self.assertEqual(club_search.fold_text("Ţara şi"), "tara si")  # legacy cedilla forms
+
+    def test_search_is_accent_insensitive_and_requires_every_term(self):
+        toamna = self._club("Cenaclul de toamnă", theme="Poezie și melancolie")
+        self._club("Proză scurtă", theme="toamna orașului", speciality="proza_scurta")
+        self._club("Haiku")
+
+        clubs, _ = club_search.search_clubs(self.db, "TOAMNA melancolie")
+        self.assertEqual([c.id for c in clubs], [toamna.id])
+
+        clubs, _ = club_search.search_clubs(self.db, "toamnă")
+        self.assertEqual(len(clubs), 2)
+
+        clubs, _ = club_search.search_clubs(self.db, "toamna", speciality="proza_scurta")
+        self.assertEqual([c.title for c in clubs], ["Proză scurtă"])
+
+        clubs, _ = club_search.search_clubs(self.db, "toamna", theme="melancolie")
+        self.assertEqual([c.id for c in clubs], [toamna.id])
+
+    def test_search_text_follows_updates(self):
+        club = self._club("Atelier")
+        crud.update_club(self.db, club.id, schemas.ClubUpdate(theme="Sonete"))
+        self.assertEqual(club_search.search_clubs(self.db, "sonete")[0][0].id, club.id)
+
+    def test_title_prefix_and_activity_rank_first(self):
+        by_description = self._club("Atelier", description="despre haiku")
+        by_title = self._club("Haiku zilnic")
+        active = self._club("Atelier vechi", description="haiku si tanka")
+        for i in range(30):
+            self.db.add(models.ClubBoardMessage(club_id=active.id, author_id=self.owner.id, content=f"#{i}"))
+        self.db.commit()
+
+        clubs, _ = club_search.search_clubs(self.db, "haiku")
+        self.assertEqual([c.id for c in clubs], [by_title.id, active.id, by_description.id])
+
+    def test_cursor_pagination_walks_every_result_once(self):
+        ids = {self._club(f"Cerc {i}").id for i in range(7)}
+        seen, cursor, pages = [], None, 0
+        while True:
+            clubs, cursor = club_search.search_clubs(self.db, "cerc", limit=3, cursor=cursor)
+            seen.extend(c.id for c in clubs)
+            pages += 1
+            if cursor is None:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(set(seen), ids)
+
+        with self.assertRaises(ValueError):
+            club_search.search_clubs(self.db, "cerc", cursor="not-a-cursor")
+
+    def test_api_uses_search_when_q_is_given(self):
+        self._club("Cenaclul de toamnă")
+        self._club("Haiku")
+
+        body = club_routes.list_clubs_api(q="toamna", db=self.db)
+        self.assertEqual([c["title"] for c in body["clubs"]], ["Cenaclul de toamnă"])
+        self.assertIsNone(body["next_cursor"])
+        self.assertEqual(len(club_routes.list_clubs_api(db=self.db)["clubs"]), 2)
+        with self.assertRaises(HTTPException) as ctx:
+            club_routes.list_clubs_api(q="x", cursor="??", db=self.db)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,228 @@
+import os
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+from starlette.responses import Response
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import collection_snapshot, crud, models, schemas
+from app.routers import collection_routes
+
+
+def _request():
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+class CollectionListingTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.statements = []
+        collection_snapshot.clear()
+
+        self.owner = self._make_user("owner")
+        self.author = self._make_user("author")
+        self.owner_id, self.author_id = self.owner.id, self.author.id
+
+    def tearDown(self):
+        self.db.close()
+        collection_snapshot.clear()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _make_user(self, username):
+        u = models.User(username=username, email=f"{username}@x.test", google_id=f"g-{username}")
+        self.db.add(u)
+        self.db.commit()
+        self.db.refresh(u)
+        return u
+
+    def _make_post(self, user, slug):
+        post = models.Post(user_id=user.id, title=slug.title(), slug=slug, content="...")
+        self.db.add(post)
+        self.db.commit()
+        return post
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def _count_queries(self, fn):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        try:
+            return fn()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _version(self, collection_id):
+        return self.db.query(models.Collection.version).filter(models.Collection.id == collection_id).scalar()
+
+    def test_listing_counts_and_super_likes_are_bulk(self):
+        collections = []
+        for i in range(4):
+            collection = crud.create_collection(self.db, self.owner_id, schemas.CollectionCreate(title=f"Colecția {i}"))
+            collections.append(collection)
+            own = self._make_post(self.owner, f"proprie-{i}")
+            crud.add_post_to_collection(self.db, collection, own, self.owner_id)  # auto-accepted
+            proposed = self._make_post(self.author, f"propusa-{i}")
+            crud.add_post_to_collection(self.db, collection, proposed, self.author_id)  # pending
+        self.db.add(models.SuperLike(user_id=self.author_id, post_id=crud.get_post_by_slug(self.db, "proprie-0").id))
+        self.db.commit()
+
+        listed = crud.get_collections_by_owner(self.db, self.owner_id)
+        payloads = self._count_queries(
+            lambda: collection_routes._collection_summary_payloads(self.db, listed, include_pending=True)
+        )
+        self.assertEqual(len(self.statements), 2)  # grouped counts + owners
+        self.assertEqual({(p["post_count"], p["pending_count"]) for p in payloads}, {(1, 1)})
+
+        entries = crud.get_collection_entries(self.db, collections[0].id, status=None, approved_posts_only=False)
+        entry_payloads = self._count_queries(lambda: collection_routes._entry_payloads(self.db, entries))
+        self.assertEqual(len(self.statements), 2)  # authors + grouped super-like counts
+        likes = {p["post"]["slug"]: p["post"]["super_likes_count"] for p in entry_payloads}
+        self.assertEqual(likes, {"proprie-0": 1, "propusa-0": 0})
+
+    def test_snapshot_follows_collection_version(self):
+        collection = crud.create_collection(self.db, self.owner_id, schemas.CollectionCreate(title="Toamna"))
+        collection_id = collection.id
+        post = self._make_post(self.author, "frunze")
+        self.assertEqual(self._version(collection_id), 0)
+
+        entry, _ = crud.add_post_to_collection(self.db, collection, post, self.author_id)
+        after_add = self._version(collection_id)
+        self.assertGreater(after_add, 0)
+
+        page = collection_routes.get_collection_by_slug_api(_request(), Response(), collection.slug, db=self.db, current_user=None)
+        self.assertEqual(page["posts"], [])
+        self.assertEqual(page["pending_count"], 0)
+        self.db.refresh(collection)
+        cached = self._count_queries(lambda: collection_routes._collection_snapshot(self.db, collection))
+        self.assertEqual(self.statements, [])
+        self.assertIs(cached, collection_snapshot.get(collection_id, after_add))
+
+        crud.respond_to_collection_entry(self.db, entry, self.owner_id, "accept")
+        self.assertGreater(self._version(collection_id), after_add)
+        page = collection_routes.get_collection_by_slug_api(_request(), Response(), collection.slug, db=self.db, current_user=self.owner)
+        self.assertEqual([p["post"]["slug"] for p in page["posts"]], ["frunze"])
+        self.assertEqual(page["post_count"], 1)
+
+        before = self._version(collection_id)
+        post.moderation_status = "rejected"
+        self.db.commit()
+        self.assertGreater(self._version(collection_id), before)
+        page = collection_routes.get_collection_by_slug_api(_request(), Response(), collection.slug, db=self.db, current_user=None)
+        self.assertEqual(page["posts"], [])
+
+        before = self._version(collection_id)
+        post.view_count = 10  # not part of the page
+        self.db.commit()
+        self.assertEqual(self._version(collection_id), before)
+
+        crud.remove_collection_entry(self.db, crud.get_collection_entry(self.db, collection_id, post.id), self.owner_id)
+        self.assertGreater(self._version(collection_id), before)
+
+
+class CollectionEntryPagingTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        owner = models.User(username="owner", email="owner@x.test", google_id="g-owner")
+        self.db.add(owner)
+        self.db.commit()
+        self.owner_id = owner.id
+        self.collection = crud.create_collection(self.db, self.owner_id, schemas.CollectionCreate(title="Antologie"))
+        self.post_ids = []
+        for i in range(7):
+            post = models.Post(
+                user_id=self.owner_id, title=f"P{i}", slug=f"p-{i}", content="...",
+                moderation_status="rejected" if i == 3 else "approved",
+            )
+            self.db.add(post)
+            self.db.flush()
+            self.db.add(models.CollectionPost(
+                collection_id=self.collection.id, post_id=post.id, initiator_id=self.owner_id,
+                status="accepted", created_at=datetime(2026, 1, 1 + i // 2),  # ties broken by id
+            ))
+            self.post_ids.append(post.id)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _walk(self, limit):
+        slugs, cursor = [], None
+        while True:
+            entries, cursor = crud.list_collection_entries_page(self.db, self.collection.id, limit=limit, cursor=cursor)
+            slugs.extend(e.post.slug for e in entries)
+            if cursor is None:
+                return slugs
+
+    def test_pages_skip_unapproved_posts_in_sql(self):
+        self.assertEqual(self._walk(limit=2), ["p-6", "p-5", "p-4", "p-2", "p-1", "p-0"])
+        self.assertEqual(
+            [e.post.slug for e in crud.get_collection_entries(self.db, self.collection.id)],
+            ["p-6", "p-5", "p-4", "p-2", "p-1", "p-0"],
+        )
+
+    def test_page_and_cursor_endpoint_reach_every_entry(self):
+        collection_snapshot.clear()
+        self.addCleanup(collection_snapshot.clear)
+        with patch.object(collection_routes, "COLLECTION_PAGE_SIZE", 4):
+            page = collection_routes.get_collection_by_slug_api(
+                _request(), Response(), self.collection.slug, db=self.db, current_user=None
+            )
+            slugs = [e["post"]["slug"] for e in page["posts"]]
+            while page["next_cursor"]:
+                page = collection_routes.list_collection_posts_api(
+                    self.collection.id, cursor=page["next_cursor"], limit=4, db=self.db
+                )
+                slugs += [e["post"]["slug"] for e in page["posts"]]
+        self.assertEqual(slugs, ["p-6", "p-5", "p-4", "p-2", "p-1", "p-0"])
+
+    def test_bulk_reorder_in_one_update(self):
+        version = self.collection.version
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(self.engine, "before_cursor_execute", record)
+        ok, error = crud.reorder_collection_entries(self.db, self.collection, [self.post_ids[0], self.post_ids[5]])
+        event.remove(self.engine, "before_cursor_execute", record)
+
+        self.assertEqual((ok, error), (True, None))
+        self.assertEqual(len([s for s in statements if s.startswith("UPDATE collection_posts")]), 1)
+        self.assertEqual(self._walk(limit=3), ["p-0", "p-5", "p-6", "p-4", "p-2", "p-1"])
+        self.db.refresh(self.collection)
+        self.assertGreater(self.collection.version, version)
+
+        self.assertEqual(
+            crud.reorder_collection_entries(self.db, self.collection, [self.post_ids[0], self.post_ids[0]]),
+            (False, "duplicate_posts"),
+        )
+        self.assertEqual(
+            crud.reorder_collection_entries(self.db, self.collection, [999]),
+            (False, "not_in_collection"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import importlib.util
+import os
+import time
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import database, models
+
+
+def _request(method="GET", session=None):
+    scope = {"type": "http", "method": method, "path": "/", "headers": []}
+    if session is not None:
+        scope["session"] = session
+    return Request(scope)
+
+
+class ReadReplicaRoutingTests(unittest.TestCase):
+    """Two in-memory SQLite databases stand in for the primary and the replica."""
+
+    def setUp(self):
+        self.engines = {}
+        self.factories = {}
+        for name in ("primary", "replica"):
+            engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+            models.Base.metadata.create_all(engine)
+            self.engines[name] = engine
+            self.addCleanup(engine.dispose)  # runs after the sessions below close
+            self.factories[name] = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        patcher = mock.patch.multiple(
+            database, SessionLocal=self.factories["primary"], ReadSessionLocal=self.factories["replica"]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _open(self, dependency, request):
+        gen = dependency(request)
+        db = next(gen)
+        self.addCleanup(gen.close)
+        return db
+
+    def _bound_to(self, db):
+        return next(name for name, engine in self.engines.items() if db.get_bind() is engine)
+
+    def test_reads_go_to_replica_by_default(self):
+        db = self._open(database.get_read_db, _request(session={}))
+        self.assertEqual(self._bound_to(db), "replica")
+
+    def test_users_own_write_pins_reads_to_primary(self):
+        client_session = {"user_id": 1}
+        db = self._open(database.get_db, _request("POST", client_session))
+        db.add(models.User(username="ana", email="ana@x.test", google_id="g-ana"))
+        db.commit()
+        self.assertIn("db_last_write", client_session)
+
+        read = self._open(database.get_read_db, _request(session=client_session))
+        self.assertEqual(self._bound_to(read), "primary")
+        self.assertEqual(read.query(models.User).count(), 1)
+
+        # Once the window passes the replica is trusted again.
+        client_session["db_last_write"] = time.time() - database.DB_READ_AFTER_WRITE_SECONDS - 1
+        read = self._open(database.get_read_db, _request(session=client_session))
+        self.assertEqual(self._bound_to(read), "replica")
+        self.assertEqual(client_session, {"user_id": 1})
+
+    def test_anonymous_writes_and_writes_without_replica_leave_the_session_alone(self):
+        client_session = {}
+        db = self._open(database.get_db, _request("POST", client_session))
+        db.add(models.User(username="ana", email="ana@x.test", google_id="g-ana"))  # e.g. an anonymous like
+        db.commit()
+        self.assertEqual(client_session, {})
+
+        client_session = {"user_id": 1}
+        with mock.patch.object(database, "ReadSessionLocal", None):
+            db = self._open(database.get_db, _request("POST", client_session))
+            db.add(models.User(username="ion", email="ion@x.test", google_id="g-ion"))
+            db.commit()
+        self.assertEqual(client_session, {"user_id": 1})
+
+    def test_get_side_writes_do_not_pin(self):
+        client_session = {"user_id": 1}
+        db = self._open(database.get_db, _request("GET", client_session))
+        db.add(models.User(username="vizitator", email="v@x.test", google_id="g-v"))  # e.g. a lazy backfill
+        db.commit()
+        self.assertNotIn("db_last_write", client_session)
+
+    def test_without_replica_reads_use_primary(self):
+        with mock.patch.object(database, "ReadSessionLocal", None):
+            db = self._open(database.get_read_db, _request(session={}))
+        self.assertEqual(self._bound_to(db), "primary")
+
+    def test_read_session_refuses_writes(self):
+        db = self._open(database.get_read_db, _request())
+        db.add(models.User(username="ion", email="ion@x.test", google_id="g-ion"))
+        with self.assertRaises(RuntimeError):
+            db.flush()
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite is not installed")
+class AsyncWriteSessionTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        self.factories = {name: async_sessionmaker(self.engine) for name in ("primary", "replica")}
+        patcher = mock.patch.multiple(
+            database, AsyncSessionLocal=self.factories["primary"], AsyncReadSessionLocal=self.factories["replica"]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def _sessions(self, request):
+        read_gen = database.get_async_read_db(request)
+        read = await read_gen.__anext__()
+        write_gen = database.get_async_write_db(request, read)
+        write = await write_gen.__anext__()
+        self.addAsyncCleanup(read_gen.aclose)
+        self.addAsyncCleanup(write_gen.aclose)
+        return read, write
+
+    async def test_reads_on_the_primary_share_the_write_session(self):
+        with mock.patch.object(database, "AsyncReadSessionLocal", None):
+            read, write = await self._sessions(_request(session={}))
+        self.assertIs(write, read)
+        self.assertFalse(write.info["read_only"])
+
+    async def test_replica_reads_get_a_separate_write_session(self):
+        read, write = await self._sessions(_request(session={}))
+        self.assertIsNot(write, read)
+        self.assertTrue(read.info["read_only"])
+
+
+class EngineOptionsTests(unittest.TestCase):
+    def test_pool_settings_apply_to_server_databases_only(self):
+        options = database.engine_options("postgresql+psycopg2://u:p@h/db")
+        self.assertEqual(options["pool_size"], database.DB_POOL_SIZE)
+        self.assertEqual(options["max_overflow"], database.DB_MAX_OVERFLOW)
+        self.assertEqual(options["pool_recycle"], database.DB_POOL_RECYCLE)
+        self.assertEqual(options["pool_pre_ping"], database.DB_POOL_PRE_PING)
+
+        sqlite_options = database.engine_options("sqlite:///replica.db")
+        self.assertNotIn("pool_size", sqlite_options)
+        create_engine("sqlite://", **sqlite_options).dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.testclient import TestClient
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import auth, club_snapshot, collection_snapshot, crud, database, http_cache, models, schemas, statistics
+from app.routers import api_pages, club_routes, collection_routes
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class ConditionalHeaderTests(unittest.TestCase):
+    def test_if_none_match_uses_weak_comparison(self):
+        etag = http_cache.weak_etag("post", 1)
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(etag, http_cache.weak_etag("post", 1))
+        self.assertNotEqual(etag, http_cache.weak_etag("post", 2))
+
+        self.assertTrue(http_cache.if_none_match(_request(f'"x", {etag}'), etag))
+        self.assertTrue(http_cache.if_none_match(_request(etag.removeprefix("W/")), etag))
+        self.assertTrue(http_cache.if_none_match(_request("*"), etag))
+        self.assertFalse(http_cache.if_none_match(_request('W/"x"'), etag))
+        self.assertFalse(http_cache.if_none_match(_request(), etag))
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite is not installed")
+class ConditionalPageTests(unittest.TestCase):
+    def setUp(self):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        self.stats_off = mock.patch.object(statistics, "STATS_ENABLED", False)
+        self.stats_off.start()
+        club_snapshot.clear()
+        collection_snapshot.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = f"{self.tmpdir.name}/http_cache.db"
+        self.engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        AsyncSessionLocal = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+
+        with self.SessionLocal() as db:
+            ana = models.User(username="ana", email="ana@x.test", google_id="g-ana")
+            ion = models.User(username="ion", email="ion@x.test", google_id="g-ion")
+            db.add_all([ana, ion])
+            db.flush()
+            post = models.Post(user_id=ana.id, title="Toamna", slug="toamna", content="...")
+            club = models.Club(owner_id=ana.id, title="Cenaclu", slug="cenaclu", speciality="poezie", member_count=1)
+            db.add_all([post, club])
+            db.flush()
+            db.add(models.ClubMember(club_id=club.id, user_id=ana.id, role="owner"))
+            db.commit()
+            self.club_id = club.id
+            self.collection = crud.create_collection(db, owner_id=ana.id, data=schemas.CollectionCreate(title="Antologie"))
+            self.collection_slug = self.collection.slug
+
+        def get_db():
+            with self.SessionLocal() as db:
+                yield db
+
+        async def get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        def current_user(request: Request, db: Session = Depends(database.get_db)):
+            username = request.headers.get("x-test-user")
+            return crud.get_user_by_username(db, username) if username else None
+
+        app = FastAPI()
+        app.add_middleware(SessionMiddleware, secret_key="http-cache-tests")
+        for module in (api_pages, club_routes, collection_routes):
+            app.include_router(module.router)
+        app.dependency_overrides.update({
+            database.get_db: get_db,
+            database.get_read_db: get_db,
+            database.get_async_db: get_async_db,
+            database.get_async_write_db: get_async_db,
+            database.get_async_read_db: get_async_db,
+            auth.get_current_user: current_user,
+        })
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+        self.stats_off.stop()
+
+    def _revalidate(self, path, etag, **headers):
+        return self.client.get(path, headers={"if-none-match": etag, **headers})
+
+    def test_post_page_is_not_tagged(self):
+        # It records a view on every read, so it is always built in full.
+        response = self.client.get("/api/blog/ana/post/toamna")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("etag", response.headers)
+
+    def test_logged_in_viewers_get_private_tags_of_their_own(self):
+        path = "/api/clubs/cenaclu"
+        anonymous = self.client.get(path)
+        logged_in = self.client.get(path, headers={"x-test-user": "ion"})
+        self.assertEqual(logged_in.headers["cache-control"], "private, no-cache")
+        self.assertNotEqual(logged_in.headers["etag"], anonymous.headers["etag"])
+        self.assertEqual(
+            self._revalidate(path, logged_in.headers["etag"], **{"x-test-user": "ion"}).status_code, 304
+        )
+
+    def test_club_page_revalidates_after_a_board_message(self):
+        path = "/api/clubs/cenaclu"
+        first = self.client.get(path)
+        self.assertEqual(first.headers["cache-control"], f"public, max-age={http_cache.HTTP_CACHE_MAX_AGE}")
+        etag = first.headers["etag"]
+        self.assertEqual(self._revalidate(path, etag).status_code, 304)
+
+        with self.SessionLocal() as db:
+            db.add(models.ClubBoardMessage(club_id=self.club_id, author_id=1, content="Salut"))
+            db.commit()
+        changed = self._revalidate(path, etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual([m["content"] for m in changed.json()["recent_messages"]], ["Salut"])
+
+    def test_collection_and_profile_pages(self):
+        path = f"/api/collections/{self.collection_slug}"
+        etag = self.client.get(path).headers["etag"]
+        self.assertEqual(self._revalidate(path, etag).status_code, 304)
+        owner = self.client.get(path, headers={"x-test-user": "ana"})
+        self.assertNotEqual(owner.headers["etag"], etag)
+        self.assertIn("pending_count", owner.json())
+
+        with self.SessionLocal() as db:
+            crud.update_collection(db, self.collection.id, schemas.CollectionUpdate(title="Antologie nouă"))
+        self.assertEqual(self._revalidate(path, etag).status_code, 200)
+
+        profile = self.client.get("/api/user/ana/profile")
+        self.assertNotIn("vary", profile.headers)
+        etag = profile.headers["etag"]
+        self.assertEqual(self._revalidate("/api/user/ana/profile", etag).status_code, 304)
+        with self.SessionLocal() as db:
+            crud.update_user(db, 1, {"subtitle": "Versuri"})
+        self.assertEqual(self._revalidate("/api/user/ana/profile", etag).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
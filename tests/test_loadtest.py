@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from scripts.loadtest import runner
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _samples(route, latencies_ms, queries=3, status=200):
+    return [runner.Sample(route, status, status == 200, ms / 1000, queries) for ms in latencies_ms]
+
+
+class SummaryTests(unittest.TestCase):
+    def test_percentiles_and_statements_per_route(self):
+        samples = _samples("GET /api/landing", range(1, 101)) + _samples("GET /api/clubs", [5, 5], status=500)
+        result = runner.summarize(samples, elapsed=2.0)
+
+        landing = result["routes"]["GET /api/landing"]
+        self.assertEqual((landing["p50_ms"], landing["p95_ms"], landing["p99_ms"]), (50, 95, 99))
+        self.assertEqual(landing["rps"], 50.0)
+        self.assertEqual(landing["db_queries"], 3)
+        self.assertEqual(result["routes"]["GET /api/clubs"]["statuses"], {"500": 2})
+        self.assertEqual((result["requests"], result["errors"], result["rps"]), (102, 2, 51.0))
+
+    def test_compare_flags_only_regressions_beyond_tolerance(self):
+        baseline = runner.summarize(_samples("GET /a", [10] * 20) + _samples("GET /b", [10] * 20), 1.0)
+        same = runner.summarize(_samples("GET /a", [11] * 20) + _samples("GET /b", [10] * 20), 1.0)
+        self.assertEqual(runner.compare(same, baseline, tolerance=0.15), [])
+
+        worse = runner.summarize(_samples("GET /a", [20] * 20) + _samples("GET /b", [10] * 20, queries=5), 1.0)
+        regressions = runner.compare(worse, baseline, tolerance=0.15)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn("GET /a: p95", regressions[0])
+        self.assertIn("GET /b: 5.0 statements/request", regressions[1])
+
+
+class InProcessRunTests(unittest.TestCase):
+    def _run(self, *args):
+        env = dict(os.environ, DB_USER="test", DB_PASSWORD="test")
+        command = [sys.executable, "-m", "scripts.loadtest", "--scale", "1", "--requests", "40",
+                   "--concurrency", "4", "--warmup", "5", *args]
+        return subprocess.run(command, cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+
+    def test_logged_in_profile_runs_without_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "authoring.json"
+            run = self._run("--profile", "authoring", "--save-baseline", str(out))
+            self.assertEqual(run.returncode, 0, run.stderr[-2000:])
+            result = json.loads(out.read_text())
+        self.assertEqual((result["requests"], result["errors"]), (40, 0))
+        self.assertTrue(any(route.startswith(("POST ", "PUT ")) for route in result["routes"]))
+        self.assertTrue(all(row["db_queries"] is not None for row in result["routes"].values()))
+
+    def test_rerun_passes_against_its_own_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = str(Path(tmp) / "baseline.json")
+            self.assertEqual(self._run("--profile", "blog-heavy", "--save-baseline", baseline).returncode, 0)
+            rerun = self._run("--profile", "blog-heavy", "--baseline", baseline, "--tolerance", "100")
+        self.assertEqual(rerun.returncode, 0, rerun.stdout + rerun.stderr[-2000:])
+        self.assertIn("p95 vs base", rerun.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
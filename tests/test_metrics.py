@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi import FastAPI, HTTPException
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import metrics, user_cache
+from app.routers import metrics_routes
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class MetricsTests(unittest.TestCase):
+    def test_requests_are_labelled_by_route_template(self):
+        app = FastAPI()
+
+        @app.get("/api/blog/{username}")
+        def blog(username: str):
+            return {}
+
+        labels = {"method": "GET", "route": "/api/blog/{username}", "status": "200"}
+        before = _value("calimara_http_request_duration_seconds_count", **labels)
+        with TestClient(metrics.MetricsMiddleware(app)) as client:
+            client.get("/api/blog/ana")
+            client.get("/api/blog/ion")
+            client.get("/nu-exista")
+        self.assertEqual(_value("calimara_http_request_duration_seconds_count", **labels), before + 2)
+        self.assertGreaterEqual(
+            _value("calimara_http_request_duration_seconds_count", method="GET", route="<unmatched>", status="404"), 1
+        )
+
+    def test_llm_call_times_and_counts_errors(self):
+        labels = {"module": "moderation", "call": "test"}
+        calls = _value("calimara_llm_call_duration_seconds_count", **labels)
+        errors = _value("calimara_llm_call_errors_total", **labels)
+        with metrics.llm_call("moderation", "test"):
+            pass
+        with self.assertRaises(RuntimeError):
+            with metrics.llm_call("moderation", "test"):
+                raise RuntimeError("timeout")
+        self.assertEqual(_value("calimara_llm_call_duration_seconds_count", **labels), calls + 2)
+        self.assertEqual(_value("calimara_llm_call_errors_total", **labels), errors + 1)
+
+    def test_pool_checkout_wait_survives_dispose(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{tmp}/pool.db", poolclass=metrics.timed_pool(QueuePool, "test"))
+            before = _value("calimara_db_pool_checkout_seconds_count", pool="test")
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            engine.dispose()
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            engine.dispose()
+        self.assertEqual(_value("calimara_db_pool_checkout_seconds_count", pool="test"), before + 2)
+
+    def test_cache_and_page_view_counters(self):
+        misses = _value("calimara_cache_requests_total", cache="user", result="miss")
+        with mock.patch.object(user_cache, "USER_CACHE_TTL_SECONDS", 15):
+            self.assertIsNone(user_cache.get(None, 987654, "epoch"))
+        self.assertEqual(_value("calimara_cache_requests_total", cache="user", result="miss"), misses + 1)
+
+        bots = _value("calimara_bot_detections_total", reason="known_crawler")
+        counted = _value("calimara_page_views_total", content_type="post", outcome="counted")
+        metrics.record_page_view("post", True, "known_crawler", False)
+        metrics.record_page_view("post", False, None, False)
+        self.assertEqual(_value("calimara_bot_detections_total", reason="known_crawler"), bots + 1)
+        self.assertEqual(_value("calimara_page_views_total", content_type="post", outcome="counted"), counted + 1)
+
+    def test_endpoint_requires_token_when_configured(self):
+        def request(auth=None):
+            headers = [(b"authorization", auth.encode())] if auth else []
+            return Request({"type": "http", "method": "GET", "path": "/metrics", "headers": headers})
+
+        with mock.patch.object(metrics, "METRICS_TOKEN", "s3cret"):
+            with self.assertRaises(HTTPException) as raised:
+                metrics_routes.prometheus_metrics(request("Bearer wrong"))
+            self.assertEqual(raised.exception.status_code, 401)
+            response = metrics_routes.prometheus_metrics(request("Bearer s3cret"))
+        self.assertIn(b"calimara_http_request_duration_seconds", response.body)
+
+
+class MultiprocessModeTests(unittest.TestCase):
+    """Workers write to PROMETHEUS_MULTIPROC_DIR; any of them serves the sum."""
+
+    def _run(self, code, multiproc_dir):
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=multiproc_dir, DB_USER="test", DB_PASSWORD="test")
+        result = subprocess.run(
+            [sys.executable, "-c", textwrap.dedent(code)],
+            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+        return result.stdout
+
+    def test_counters_aggregate_across_processes(self):
+        worker = """
+            from app import metrics
+            for _ in range(3):
+                metrics.record_page_view("blog", False, None, False)
+        """
+        with tempfile.TemporaryDirectory() as multiproc_dir:
+            self._run(worker, multiproc_dir)
+            self._run(worker, multiproc_dir)
+            exposition = self._run("from app import metrics; print(metrics.render().decode())", multiproc_dir)
+        self.assertIn('calimara_page_views_total{content_type="blog",outcome="counted"} 6.0', exposition)
+
+
+if __name__ == "__main__":
+    unittest.main()
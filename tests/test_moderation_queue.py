@@ -0,0 +1,170 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import crud, models, moderation_queue, schemas
+from app.routers import moderation_routes
+from app.week_util import utcnow_naive
+
+
+class ModerationQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+
+        self.author = models.User(username="author", email="author@x.test", google_id="g-author")
+        self.alice = models.User(username="alice", email="alice@x.test", google_id="g-alice", is_moderator=True)
+        self.bob = models.User(username="bob", email="bob@x.test", google_id="g-bob", is_moderator=True)
+        self.db.add_all([self.author, self.alice, self.bob])
+        self.db.commit()
+
+        # Interleave posts and comments in time; ids collide across the two tables.
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        host = models.Post(user_id=self.author.id, title="Gazda", slug="gazda", content="...",
+                           created_at=base - timedelta(days=1))
+        self.db.add(host)
+        self.db.flush()
+        self.expected = []
+        for i in range(30):
+            created = base + timedelta(minutes=i // 2)  # pairs share a timestamp
+            status = "flagged" if i % 3 == 0 else "pending"
+            score = round((i * 7 % 10) / 10, 1)
+            if i % 2:
+                item = models.Comment(post_id=host.id, user_id=self.author.id, content=f"c{i}",
+                                      moderation_status=status, toxicity_score=score, created_at=created)
+                kind = "comment"
+            else:
+                item = models.Post(user_id=self.author.id, title=f"P{i}", slug=f"p-{i}", content="...",
+                                   moderation_status=status, toxicity_score=score, created_at=created)
+                kind = "post"
+            self.db.add(item)
+            self.db.flush()
+            self.expected.append((kind, item.id, created, score))
+        self.db.add(models.Post(user_id=self.author.id, title="Ok", slug="ok", content="...",
+                                moderation_status="approved", created_at=base))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _walk(self, moderator_id, order, limit=7, **kwargs):
+        seen, cursor = [], None
+        while True:
+            items, cursor = moderation_queue.list_queue(
+                self.db, moderator_id, order=order, limit=limit, cursor=cursor, **kwargs
+            )
+            seen.extend((item.content_type, item.content.id) for item in items)
+            if cursor is None:
+                return seen
+
+    def test_oldest_first_pages_through_everything(self):
+        expected = [(kind, id_) for kind, id_, created, _ in
+                    sorted(self.expected, key=lambda e: (e[2], e[0], e[1]))]
+        self.assertEqual(self._walk(self.alice.id, "oldest"), expected)
+        self.assertEqual(self._walk(self.alice.id, "newest"), expected[::-1])
+
+    def test_priority_order_puts_most_toxic_first(self):
+        expected = [(kind, id_) for kind, id_, created, score in
+                    sorted(self.expected, key=lambda e: (-e[3], e[2], e[0], e[1]))]
+        self.assertEqual(self._walk(self.alice.id, "priority", limit=4), expected)
+
+    def test_status_and_type_filters(self):
+        flagged_comments = self._walk(self.alice.id, "oldest", statuses=("flagged",), content_types=("comment",))
+        self.assertEqual(
+            sorted(flagged_comments),
+            sorted((kind, id_) for kind, id_, _, _ in
+                   [e for i, e in enumerate(self.expected) if i % 3 == 0 and i % 2]),
+        )
+
+    def test_cursor_from_another_order_is_rejected(self):
+        _, cursor = moderation_queue.list_queue(self.db, self.alice.id, order="oldest", limit=5)
+        with self.assertRaises(ValueError):
+            moderation_queue.list_queue(self.db, self.alice.id, order="priority", cursor=cursor)
+        with self.assertRaises(HTTPException) as ctx:
+            moderation_routes.get_content_queue(cursor="garbage", db=self.db, current_user=self.alice)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_claims_split_the_queue_between_moderators(self):
+        mine = moderation_queue.claim_next(self.db, self.alice.id, count=5)
+        theirs = moderation_queue.claim_next(self.db, self.bob.id, count=5)
+        mine_keys = {(i.content_type, i.content.id) for i in mine}
+        theirs_keys = {(i.content_type, i.content.id) for i in theirs}
+        self.assertEqual(len(mine_keys), 5)
+        self.assertEqual(len(theirs_keys), 5)
+        self.assertFalse(mine_keys & theirs_keys)
+        self.assertTrue(all(i.claimed_by == self.alice.id for i in mine))
+
+        # Bob's queue skips Alice's leases unless asked to show them.
+        bob_view = set(self._walk(self.bob.id, "oldest"))
+        self.assertFalse(mine_keys & bob_view)
+        self.assertEqual(len(self._walk(self.bob.id, "oldest", include_claimed=True)), 30)
+
+        kind, content_id = next(iter(mine_keys))
+        self.assertIsNone(moderation_queue.claim_item(self.db, kind, content_id, self.bob.id))
+        with self.assertRaises(HTTPException) as ctx:
+            moderation_routes.claim_queue_item(kind, content_id, db=self.db, current_user=self.bob)
+        self.assertEqual(ctx.exception.status_code, 409)
+
+        self.assertTrue(moderation_queue.release_item(self.db, kind, content_id, self.alice.id))
+        self.assertIsNotNone(moderation_queue.claim_item(self.db, kind, content_id, self.bob.id))
+
+    def test_expired_lease_can_be_taken_over(self):
+        kind, content_id = self.expected[0][:2]
+        moderation_queue.claim_item(self.db, kind, content_id, self.alice.id)
+        claim = self.db.get(models.ModerationClaim, (kind, content_id))
+        claim.expires_at = utcnow_naive() - timedelta(seconds=1)
+        self.db.commit()
+
+        self.assertIsNotNone(moderation_queue.claim_item(self.db, kind, content_id, self.bob.id))
+        self.assertEqual(self.db.get(models.ModerationClaim, (kind, content_id)).moderator_id, self.bob.id)
+
+    def test_decision_ends_the_lease_and_leaves_the_queue(self):
+        kind, content_id = self.expected[0][:2]
+        moderation_queue.claim_item(self.db, kind, content_id, self.alice.id)
+        crud.approve_content(self.db, kind, content_id, self.alice.id)
+
+        self.assertIsNone(self.db.get(models.ModerationClaim, (kind, content_id)))
+        self.assertNotIn((kind, content_id), self._walk(self.bob.id, "oldest", include_claimed=True))
+
+    def test_routes_return_payloads_and_cursor(self):
+        page = moderation_routes.get_flagged_content(request=None, db=self.db, current_user=self.alice)
+        self.assertIsNone(page["next_cursor"])
+        self.assertEqual(len(page["content"]), 10)
+        scores = [item["toxicity_score"] for item in page["content"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+        claimed = moderation_routes.claim_queue_items(
+            schemas.ModerationClaimRequest(count=3, status="pending"), db=self.db, current_user=self.alice
+        )
+        self.assertEqual([item["claimed_by"] for item in claimed["content"]], [self.alice.id] * 3)
+        self.assertTrue(all(item["moderation_status"] == "pending" for item in claimed["content"]))
+
+    def test_logs_route_reports_review_state(self):
+        kind, content_id = self.expected[0][:2]
+        crud.approve_content(self.db, kind, content_id, self.alice.id)
+        self.db.add(models.ModerationLog(content_type=kind, content_id=content_id, ai_decision="flagged"))
+        self.db.commit()
+
+        logs = moderation_routes.get_moderation_logs_api(request=None, db=self.db, current_user=self.alice)["logs"]
+        self.assertTrue(logs)
+        self.assertEqual({log["needs_review"] for log in logs}, {False, True})
+
+
+if __name__ == "__main__":
+    unittest.main()
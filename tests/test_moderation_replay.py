@@ -0,0 +1,143 @@
+import json
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import models, moderation, moderation_replay
+
+
+def _details(scores, verdict=None):
+    details = {cat: 0.0 for cat in moderation.MODERATION_CATEGORIES}
+    details.update(scores)
+    if verdict is not None:
+        details["pass1_flagged"] = {k: v for k, v in scores.items() if v >= 0.5}
+        details["pass2_verdict"] = {"safe": verdict, "reason": "..."}
+    return details
+
+
+class ModerationReplayTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.author = models.User(username="author", email="author@x.test", google_id="g-author")
+        self.db.add(self.author)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _synthetic(self, n=400, seed=7):
+        """Harmful texts score high on `sexual`; poems about illness trip `health`."""
+        rng = np.random.default_rng(seed)
+        rows = []
+        start = datetime(2026, 3, 1)
+        for i in range(n):
+            kind = i % 4
+            if kind == 0:    # harmful, rejected by a moderator
+                scores, human = {"sexual": rng.uniform(0.55, 0.95)}, "rejected"
+            elif kind == 1:  # literary, approved by a moderator
+                scores, human = {"health": rng.uniform(0.5, 0.8)}, "approved"
+            else:            # everyday content, never reviewed
+                scores, human = {"sexual": rng.uniform(0.0, 0.3), "health": rng.uniform(0.0, 0.3)}, None
+            verdict = None
+            if max(scores.values()) >= 0.5:
+                verdict = human != "rejected"
+            rows.append((json.dumps(_details(scores, verdict)), human, 200, start + timedelta(hours=i)))
+        return moderation_replay.build_replay_data(rows)
+
+    def test_load_streams_logs_with_text_length(self):
+        post = models.Post(user_id=self.author.id, title="Titlu", slug="titlu", content="x" * 95)
+        self.db.add(post)
+        self.db.flush()
+        comment = models.Comment(post_id=post.id, user_id=self.author.id, content="y" * 40)
+        self.db.add(comment)
+        self.db.flush()
+        self.db.add_all([
+            models.ModerationLog(content_type="post", content_id=post.id, ai_decision="flagged",
+                                 human_decision="rejected",
+                                 ai_details=json.dumps(_details({"sexual": 0.9}, verdict=False))),
+            models.ModerationLog(content_type="comment", content_id=comment.id, ai_decision="approved",
+                                 ai_details=_details({"health": 0.2})),
+            # Written by approve_content for content never AI-scored.
+            models.ModerationLog(content_type="post", content_id=post.id, ai_decision="approved",
+                                 human_decision="approved"),
+        ])
+        self.db.commit()
+
+        data = moderation_replay.load_replay_data(self.db, batch_size=1)
+        self.assertEqual(data.skipped, 1)
+        self.assertEqual(data.scores.shape, (2, len(moderation.MODERATION_CATEGORIES)))
+        self.assertEqual(data.labels.tolist(), [moderation_replay.HARMFUL, moderation_replay.UNLABELLED])
+        self.assertEqual(data.verdicts.tolist(), [moderation_replay.VERDICT_UNSAFE, moderation_replay.VERDICT_NONE])
+        self.assertEqual(data.text_chars.tolist(), [100, 40])
+
+    def test_vectorized_flags_match_pipeline_rule(self):
+        data = self._synthetic(n=80)
+        weights = {"health": 0.5, "sexual": 1.25}
+        evaluation = moderation_replay.evaluate(data, thresholds=[0.2, 0.5], weights=weights)
+        with mock.patch.object(moderation, "MODERATION_PASS1_RULE", "threshold"):
+            for j, threshold in enumerate([0.2, 0.5]):
+                expected = sum(
+                    bool(moderation.pass1_flagged_categories(
+                        {"category_scores": dict(zip(moderation.MODERATION_CATEGORIES, row.tolist()))},
+                        threshold=threshold, weights=weights,
+                    ))
+                    for row in data.scores
+                )
+                self.assertEqual(evaluation.pass2_calls[j], expected)
+
+    def test_metrics_against_labels(self):
+        data = self._synthetic()
+        evaluation = moderation_replay.evaluate(data, thresholds=[0.5, 0.99])
+        at_half = evaluation.row(0)
+        self.assertEqual(at_half["pass1_recall"], 1.0)
+        self.assertAlmostEqual(at_half["pass1_precision"], 0.5, places=2)
+        # Pass 2 sends the literary texts back, so only real harm is queued.
+        self.assertEqual(at_half["final_precision"], 1.0)
+        self.assertEqual(at_half["queue_size"], 100)
+        self.assertEqual(at_half["unknown_verdicts"], 0)
+        self.assertAlmostEqual(at_half["pass2_calls_per_day"], at_half["pass2_calls"] / data.span_days)
+        self.assertGreater(at_half["cost"], 0)
+        self.assertEqual(evaluation.row(1)["pass2_calls"], 0)
+
+        baseline = moderation_replay.evaluate_current(data)
+        self.assertEqual(baseline["pass2_calls"], at_half["pass2_calls"])
+
+    def test_recommendation_downweights_noisy_category(self):
+        data = self._synthetic()
+        uniform = moderation_replay.evaluate(data)
+        cheapest_uniform = min(
+            uniform.pass2_calls[i] for i in range(len(uniform.thresholds)) if uniform.pass1_recall[i] >= 0.95
+        )
+
+        recommendation = moderation_replay.recommend(data, min_recall=0.95)
+        self.assertTrue(recommendation["meets_min_recall"])
+        weights = recommendation["weights"]
+        self.assertLess(weights.get("health", 1.0), weights.get("sexual", 1.0))
+        self.assertLess(recommendation["pass2_calls"], cheapest_uniform)
+        self.assertEqual(recommendation["pass2_calls"], 100)  # only the harmful quarter
+
+        env = moderation_replay.export_config(recommendation)
+        self.assertEqual(env["MODERATION_PASS1_RULE"], "threshold")
+        self.assertEqual(json.loads(env["MODERATION_CATEGORY_WEIGHTS"]), recommendation["weights"])
+
+
+if __name__ == "__main__":
+    unittest.main()
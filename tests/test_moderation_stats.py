@@ -0,0 +1,140 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import crud, moderation_metrics, models
+
+
+class ModerationStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        self.statements = []
+        moderation_metrics.invalidate()
+
+        self.author = models.User(username="author", email="author@x.test", google_id="g-author")
+        self.moderator = models.User(username="mod", email="mod@x.test", google_id="g-mod")
+        self.db.add_all([self.author, self.moderator])
+        self.db.add_all([
+            models.User(username=f"banned{i}", email=f"banned{i}@x.test", google_id=f"g-banned{i}", is_suspended=True)
+            for i in range(2)
+        ])
+        self.db.commit()
+
+        yesterday = datetime.now() - timedelta(days=1)
+        statuses = ["pending", "pending", "flagged", "rejected", "approved", "approved", "approved"]
+        self.posts = []
+        for i, status in enumerate(statuses):
+            post = models.Post(
+                user_id=self.author.id, title=f"P{i}", slug=f"p-{i}", content="...",
+                moderation_status=status,
+                moderated_at=datetime.now() if i % 2 else yesterday,
+            )
+            self.db.add(post)
+            self.posts.append(post)
+        self.db.flush()
+        for i, status in enumerate(["pending", "flagged", "flagged", "approved"]):
+            self.db.add(models.Comment(post_id=self.posts[-1].id, user_id=self.author.id,
+                                       content=f"c{i}", moderation_status=status))
+        for i, (ai, human, score) in enumerate([
+            ("flagged", None, 0.8), ("flagged", "pending", 0.6), ("flagged", "approved", 0.5),
+            ("approved", None, 0.1), ("rejected", "rejected", 0.95),
+        ]):
+            self.db.add(models.ModerationLog(content_type="post", content_id=self.posts[i].id,
+                                             user_id=self.author.id, ai_decision=ai,
+                                             human_decision=human, toxicity_score=score))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        moderation_metrics.invalidate()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def _count_queries(self, fn):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        try:
+            return fn()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _naive_counts(self):
+        expected = {}
+        for model, prefix in ((models.Post, "posts"), (models.Comment, "comments")):
+            for status in crud.MODERATION_STATUSES:
+                expected[f"{prefix}_{status}"] = (
+                    self.db.query(model).filter(model.moderation_status == status).count()
+                )
+        midnight = datetime.combine(datetime.now().date(), datetime.min.time())
+        expected["suspended_count"] = self.db.query(models.User).filter(models.User.is_suspended == True).count()
+        expected["today_actions"] = (
+            self.db.query(models.Post).filter(models.Post.moderated_at >= midnight).count()
+            + self.db.query(models.Comment).filter(models.Comment.moderated_at >= midnight).count()
+        )
+        return expected
+
+    def test_dashboard_counts_match_individual_counts_in_one_query(self):
+        stats = self._count_queries(lambda: crud.get_moderation_stats(self.db))
+        self.assertEqual(len(self.statements), 1)
+
+        for key, value in self._naive_counts().items():
+            self.assertEqual(stats[key], value, key)
+        self.assertEqual(stats["total_pending"], 3)
+        self.assertEqual(stats["total_flagged"], 3)
+        self.assertEqual(stats["total_rejected"], 1)
+        self.assertEqual(stats["suspended_count"], 2)
+        self.assertEqual(stats["today_actions"], 3)
+
+    def test_extended_stats_in_one_query(self):
+        stats = self._count_queries(lambda: crud.get_moderation_stats_extended(self.db))
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(stats["total_logs"], 5)
+        self.assertEqual(stats["pending_review_count"], 2)
+        self.assertEqual(stats["ai_decisions"], {"approved": 1, "flagged": 3, "rejected": 1})
+        self.assertEqual(stats["human_decisions"], {"approved": 1, "rejected": 1, "pending": 3})
+        self.assertAlmostEqual(stats["scores"]["average_toxicity"], 0.59)
+        self.assertAlmostEqual(stats["scores"]["max_toxicity"], 0.95)
+
+    def test_cache_hit_runs_no_query(self):
+        first = moderation_metrics.dashboard_stats(self.db)
+        again = self._count_queries(lambda: moderation_metrics.dashboard_stats(self.db))
+        self.assertEqual(self.statements, [])
+        self.assertEqual(again, first)
+
+    def test_moderation_decision_invalidates_cache(self):
+        before = moderation_metrics.dashboard_stats(self.db)
+        moderation_metrics.extended_stats(self.db)
+        crud.approve_content(self.db, "post", self.posts[0].id, self.moderator.id)
+
+        after = moderation_metrics.dashboard_stats(self.db)
+        self.assertEqual(after["posts_pending"], before["posts_pending"] - 1)
+        self.assertEqual(after["posts_approved"], before["posts_approved"] + 1)
+        self.assertEqual(moderation_metrics.extended_stats(self.db)["human_decisions"]["approved"], 2)
+
+    def test_unrelated_commit_keeps_cache(self):
+        moderation_metrics.dashboard_stats(self.db)
+        self.author.subtitle = "Scriu poezii."
+        self.db.commit()
+        self._count_queries(lambda: moderation_metrics.dashboard_stats(self.db))
+        self.assertEqual(self.statements, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import os
+import unittest
+from datetime import timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import crud, models, notification_retention, schemas
+from app.week_util import utcnow_naive
+
+
+class NotificationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+
+    def tearDown(self):
+        self.db.close()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _make_user(self, username):
+        u = models.User(username=username, email=f"{username}@x.test", google_id=f"g-{username}")
+        self.db.add(u)
+        self.db.commit()
+        self.db.refresh(u)
+        return u
+
+    def _make_club(self, owner, admins=()):
+        club = crud.create_club(self.db, owner, schemas.ClubCreate(title="Cenaclul", speciality="poezie"))
+        for admin in admins:
+            self.db.add(models.ClubMember(club_id=club.id, user_id=admin.id, role="admin"))
+        self.db.commit()
+        return club
+
+    def _notifications(self, user):
+        return self.db.query(models.Notification).filter(models.Notification.user_id == user.id).all()
+
+
+class NotificationBatchingTests(NotificationTestCase):
+    def test_queued_notifications_are_written_on_commit_with_one_insert(self):
+        users = [self._make_user(f"reader{i}") for i in range(5)]
+        for u in users:
+            crud.queue_notification(self.db, u.id, "announcement", "Salut")
+        self.assertEqual(self.db.query(models.Notification).count(), 0)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            self.db.commit()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+
+        inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO NOTIFICATIONS")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(self.db.query(models.Notification).count(), 5)
+
+    def test_rollback_discards_queued_notifications(self):
+        user = self._make_user("reader")
+        crud.queue_notification(self.db, user.id, "announcement", "Salut")
+        self.db.rollback()
+        self.db.commit()
+        self.assertEqual(self._notifications(user), [])
+
+    def test_club_applications_coalesce_into_one_digest_per_admin(self):
+        owner = self._make_user("owner")
+        admin = self._make_user("admin")
+        club = self._make_club(owner, admins=[admin])
+
+        for name in ("ana", "ion", "maria"):
+            request, error = crud.apply_to_club(self.db, self._make_user(name), club)
+            self.assertIsNone(error)
+            self.assertIsNotNone(request.id)
+
+        for recipient in (owner, admin):
+            rows = self._notifications(recipient)
+            self.assertEqual(len(rows), 1)
+            self.assertEqual(rows[0].title, "3 cereri noi de aderare la club")
+            self.assertEqual(rows[0].extra_data["count"], 3)
+            self.assertEqual(rows[0].extra_data["applicant_username"], "maria")
+
+    def test_read_digest_starts_a_new_one(self):
+        owner = self._make_user("owner")
+        club = self._make_club(owner)
+        crud.apply_to_club(self.db, self._make_user("ana"), club)
+        first = self._notifications(owner)[0]
+        self.assertEqual(first.title, "Cerere de aderare la club")
+        first.is_read = True
+        self.db.commit()
+
+        crud.apply_to_club(self.db, self._make_user("ion"), club)
+        unread = [n for n in self._notifications(owner) if not n.is_read]
+        self.assertEqual(len(unread), 1)
+        self.assertEqual(unread[0].title, "Cerere de aderare la club")
+
+    def test_coalesced_templates_do_not_interpret_user_braces(self):
+        owner = self._make_user("owner")
+        club = crud.create_club(self.db, owner, schemas.ClubCreate(title="Club {0}", speciality="poezie"))
+        crud.apply_to_club(self.db, self._make_user("ana"), club)
+        crud.apply_to_club(self.db, self._make_user("ion"), club)
+        digest = self._notifications(owner)[0]
+        self.assertEqual(digest.message, "Clubul „Club {0}\" are 2 cereri noi de aderare.")
+
+
+class NotificationRetentionTests(NotificationTestCase):
+    def _add(self, user, notif_type, days_ago, is_read=True, **extra):
+        n = models.Notification(
+            user_id=user.id,
+            type=notif_type,
+            title=f"{notif_type} title",
+            message="x" * 200,
+            is_read=is_read,
+            extra_data=extra,
+            created_at=utcnow_naive() - timedelta(days=days_ago),
+        )
+        self.db.add(n)
+        return n
+
+    def test_archives_old_read_notifications_and_collapses_digests(self):
+        user = self._make_user("reader")
+        for _ in range(3):
+            self._add(user, "collection_pending", days_ago=100)
+        self._add(user, "collection_pending", days_ago=100, count=4)
+        self._add(user, "club_kicked", days_ago=100)
+        self._add(user, "club_kicked", days_ago=100)
+        kept_recent = self._add(user, "club_kicked", days_ago=5)
+        kept_unread = self._add(user, "club_kicked", days_ago=100, is_read=False)
+        self.db.commit()
+
+        report = notification_retention.archive_read_notifications(
+            self.db, older_than_days=90, batch_size=2, pause_seconds=0
+        )
+
+        self.assertEqual(report.scanned, 6)
+        self.assertEqual(report.batches, 3)
+        self.assertGreater(report.bytes_reclaimed, 0)
+        remaining = {n.id for n in self._notifications(user)}
+        self.assertEqual(remaining, {kept_recent.id, kept_unread.id})
+
+        archived = self.db.query(models.NotificationArchive).all()
+        self.assertEqual(sum(a.item_count for a in archived), 9)
+        self.assertEqual(sorted(a.item_count for a in archived if a.type == "club_kicked"), [1, 1])
+
+    def test_dry_run_changes_nothing(self):
+        user = self._make_user("reader")
+        self._add(user, "club_kicked", days_ago=100)
+        self.db.commit()
+
+        report = notification_retention.archive_read_notifications(self.db, dry_run=True, pause_seconds=0)
+
+        self.assertEqual(report.scanned, 1)
+        self.assertEqual(len(self._notifications(user)), 1)
+        self.assertEqual(self.db.query(models.NotificationArchive).count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import crud, models, platform_stats, schemas
+
+
+class PlatformStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autoflush=False)
+        self.db = self.SessionLocal()
+        self.ana = models.User(username="ana", email="ana@x.test", google_id="g-ana")
+        self.ion = models.User(username="ion", email="ion@x.test", google_id="g-ion")
+        self.db.add_all([self.ana, self.ion])
+        self.db.commit()
+        self.db.add(self._post(self.ana, "vechi"))
+        self.db.commit()
+        platform_stats.clear()
+        self.assertEqual(crud.get_platform_stats(self.db), {"total_posts": 1, "total_authors": 1})
+
+    def tearDown(self):
+        self.db.close()
+        platform_stats.clear()
+        self.engine.dispose()
+
+    def _post(self, user, slug, status="approved"):
+        return models.Post(user_id=user.id, title=slug, slug=slug, content="...", moderation_status=status)
+
+    def _stats_and_selects(self):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            stats = crud.get_platform_stats(self.db)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        return stats, statements
+
+    def test_commits_adjust_the_counters_without_queries(self):
+        post = self._post(self.ion, "nou", status="pending")
+        self.db.add(post)
+        self.db.commit()
+        self.assertEqual(self._stats_and_selects(), ({"total_posts": 1, "total_authors": 1}, []))
+
+        post.moderation_status = "approved"
+        self.db.commit()
+        self.assertEqual(self._stats_and_selects(), ({"total_posts": 2, "total_authors": 2}, []))
+
+        post.moderation_status = "rejected"
+        self.db.flush()
+        self.db.rollback()
+        self.assertEqual(self._stats_and_selects(), ({"total_posts": 2, "total_authors": 2}, []))
+
+        self.db.delete(self.db.get(models.Post, post.id))
+        self.db.commit()
+        self.assertEqual(self._stats_and_selects(), ({"total_posts": 1, "total_authors": 1}, []))
+
+    def test_bulk_moderation_recounts_on_the_next_read(self):
+        post = self._post(self.ion, "nou", status="pending")
+        self.db.add(post)
+        self.db.commit()
+        crud.bulk_moderate_content(
+            self.db, [schemas.BulkModerationItem(content_type="post", content_id=post.id, action="approve")],
+            moderator_id=self.ana.id,
+        )
+        self.db.commit()
+        stats, statements = self._stats_and_selects()
+        self.assertEqual(stats, {"total_posts": 2, "total_authors": 2})
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(self._stats_and_selects()[1], [])
+
+    def test_consistency_check_corrects_changes_made_elsewhere(self):
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("UPDATE posts SET moderation_status = 'rejected'")
+        self.assertEqual(crud.get_platform_stats(self.db)["total_posts"], 1)
+        with self.assertLogs("app.platform_stats", "INFO"):
+            self.assertEqual(platform_stats.recount(self.db), {"total_posts": 0, "total_authors": 0})
+        self.assertEqual(crud.get_platform_stats(self.db)["total_posts"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,279 @@
+"""
+Query-cost budgets per API route.
+
+Every route below is called against the `scripts/seed.py` dataset at each
+scale factor in SCALES, and the SQL it issues is compared with the budget
+recorded in `query_budgets.json`: the statement count and the rows fetched
+may not grow. A route whose cost grows with the scale factor is an N+1.
+
+On a failure the message diffs the recorded statement shapes against the
+new ones, so the added queries show up as `+` lines. After an intended
+change (or to add a route) re-record the file with
+
+    UPDATE_QUERY_BUDGETS=1 python -m pytest tests/test_query_budgets.py
+
+and review the JSON diff like any other change.
+
+Counting happens at the DB-API cursor (a `sqlite3.Connection` factory), so
+sync and async sessions are measured alike. Caches are cleared before each
+call to measure the cold path, SQLite's random() is replaced by a seeded
+generator so random pages pick the same rows every run, and page-view
+recording is off (its BIGINT key does not autoincrement on SQLite). The
+platform counters are the exception: a background task keeps them warm in
+production, so they are recounted before each call instead.
+"""
+import difflib
+import importlib.util
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.testclient import TestClient
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import (  # noqa: E402
+    auth, cache, club_snapshot, collection_snapshot, crud, database, models, moderation_metrics, platform_stats,
+    query_stats, statistics, user_cache,
+)
+from app.routers import (  # noqa: E402
+    api_pages, club_routes, collection_routes, message_routes, moderation_routes, notification_routes,
+    post_routes, super_like_routes, user_routes,
+)
+from scripts.seed import seed  # noqa: E402
+
+SCALES = (1, 3)
+BUDGETS_PATH = Path(__file__).with_name("query_budgets.json")
+UPDATE_BUDGETS = os.getenv("UPDATE_QUERY_BUDGETS") == "1"
+
+AUTHOR = "mireasufletului"
+READER = "vanatordecuvinte"
+
+# (path template, logged-in user). Placeholders are filled from the seed.
+CASES = [
+    ("/api/landing", None),
+    ("/api/landing?category=poezie", None),
+    ("/api/blog/{author}", None),
+    ("/api/blog/{author}/post/{post_slug}", None),
+    ("/api/blog/{author}/post/{post_slug}", READER),
+    ("/api/categories/poezie", None),
+    ("/api/user/{author}/profile", None),
+    ("/api/posts/{post_id}/likes/count", None),
+    ("/api/posts/random", None),
+    ("/api/users/random", None),
+    ("/api/clubs", None),
+    ("/api/clubs/random", None),
+    ("/api/clubs/{club_slug}", None),
+    ("/api/clubs/{club_slug}", AUTHOR),
+    ("/api/clubs/{club_id}/board", AUTHOR),
+    ("/api/users/{author}/collections", None),
+    ("/api/user/me", AUTHOR),
+    ("/api/user/clubs", AUTHOR),
+    ("/api/user/collections", AUTHOR),
+    ("/api/posts/archive", AUTHOR),
+    ("/api/posts/months", AUTHOR),
+    ("/api/users/search?q=van", AUTHOR),
+    ("/api/users/me/super-likes/quota", AUTHOR),
+    ("/api/notifications", AUTHOR),
+    ("/api/notifications/unread-count", AUTHOR),
+    ("/api/messages/conversations", AUTHOR),
+    ("/api/messages/unread-count", AUTHOR),
+    ("/api/moderation/stats", AUTHOR),
+    ("/api/moderation/content/queue", AUTHOR),
+    ("/api/moderation/logs", AUTHOR),
+]
+
+
+class _Recorder:
+    def __init__(self):
+        self.statements = []
+        self.rows = 0
+
+
+_recorder = _Recorder()
+
+
+class _CountingCursor(sqlite3.Cursor):
+    def execute(self, sql, *args):
+        _recorder.statements.append(sql)
+        return super().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        _recorder.statements.append(sql)
+        return super().executemany(sql, *args)
+
+    def fetchone(self):
+        row = super().fetchone()
+        _recorder.rows += row is not None
+        return row
+
+    def fetchmany(self, *args):
+        rows = super().fetchmany(*args)
+        _recorder.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        _recorder.rows += len(rows)
+        return rows
+
+
+class _CountingConnection(sqlite3.Connection):
+    def cursor(self, factory=_CountingCursor):
+        return super().cursor(factory)
+
+
+def _seeded_random(engine, seed_value):
+    @event.listens_for(engine, "connect")
+    def _install(dbapi_connection, connection_record):
+        dbapi_connection.create_function("random", 0, random.Random(seed_value).random)
+
+
+def _clear_caches():
+    cache.clear()
+    user_cache.clear()
+    club_snapshot.clear()
+    collection_snapshot.clear()
+    moderation_metrics.invalidate()
+    platform_stats.clear()
+
+
+class _Site:
+    """A seeded SQLite file plus an app wired to it."""
+
+    def __init__(self, scale: int):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = f"{self.tmpdir.name}/budget.db"
+        self.engine = create_engine(
+            f"sqlite:///{path}", connect_args={"factory": _CountingConnection, "check_same_thread": False}
+        )
+        self.async_engine = create_async_engine(
+            f"sqlite+aiosqlite:///{path}", connect_args={"factory": _CountingConnection}
+        )
+        _seeded_random(self.engine, 1)
+        _seeded_random(self.async_engine.sync_engine, 2)
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        AsyncSessionLocal = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+
+        with self.SessionLocal() as db:
+            seed(db, quiet=True, scale=scale)
+            author = crud.get_user_by_username(db, AUTHOR)
+            author.is_admin = True
+            author.is_moderator = True
+            db.commit()
+            post = db.scalars(select(models.Post).where(models.Post.user_id == author.id).limit(1)).one()
+            club = db.scalars(select(models.Club).where(models.Club.owner_id == author.id).limit(1)).one()
+            self.params = {
+                "author": AUTHOR, "post_slug": post.slug, "post_id": post.id,
+                "club_slug": club.slug, "club_id": club.id,
+            }
+
+        def get_db():
+            with self.SessionLocal() as db:
+                yield db
+
+        async def get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        def current_user(request: Request, db: Session = Depends(database.get_db)):
+            username = request.headers.get("x-test-user")
+            return crud.get_user_by_username(db, username) if username else None
+
+        app = FastAPI()
+        app.add_middleware(SessionMiddleware, secret_key="budget-tests")
+        for module in (api_pages, club_routes, collection_routes, message_routes, moderation_routes,
+                       notification_routes, post_routes, super_like_routes, user_routes):
+            app.include_router(module.router)
+        app.dependency_overrides.update({
+            database.get_db: get_db,
+            database.get_read_db: get_db,
+            database.get_async_db: get_async_db,
+            database.get_async_write_db: get_async_db,
+            database.get_async_read_db: get_async_db,
+            auth.get_current_user: current_user,
+        })
+        self.client = TestClient(app)
+        # Dialect initialisation queries run on the first connect; keep them out.
+        self.measure("/api/user/{author}/profile", None)
+        self.measure("/api/notifications/unread-count", AUTHOR)
+
+    def measure(self, template: str, user):
+        _clear_caches()
+        with self.SessionLocal() as db:
+            platform_stats.recount(db)
+        _recorder.statements, _recorder.rows = [], 0
+        headers = {"x-test-user": user} if user else {}
+        response = self.client.get(template.format(**self.params), headers=headers)
+        return response, list(_recorder.statements), _recorder.rows
+
+    def close(self):
+        self.client.close()
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+
+def _key(template, user, scale):
+    return f"GET {template}" + (f" as {user}" if user else "") + f" @x{scale}"
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite is not installed")
+class QueryBudgetTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stats_off = mock.patch.object(statistics, "STATS_ENABLED", False)
+        cls.stats_off.start()
+        cls.sites = {scale: _Site(scale) for scale in SCALES}
+
+    @classmethod
+    def tearDownClass(cls):
+        for site in cls.sites.values():
+            site.close()
+        cls.stats_off.stop()
+
+    def test_routes_stay_within_budget(self):
+        budgets = json.loads(BUDGETS_PATH.read_text()) if BUDGETS_PATH.exists() else {}
+        recorded = {}
+        for scale, site in self.sites.items():
+            for template, user in CASES:
+                key = _key(template, user, scale)
+                response, statements, rows = site.measure(template, user)
+                shapes = [query_stats.statement_shape(sql) for sql in statements]
+                recorded[key] = {"statements": len(shapes), "rows": rows, "sql": shapes}
+                if UPDATE_BUDGETS:
+                    continue
+                with self.subTest(key):
+                    self.assertEqual(response.status_code, 200, response.text[:300])
+                    budget = budgets.get(key)
+                    self.assertIsNotNone(budget, f"no budget for {key}; record it with UPDATE_QUERY_BUDGETS=1")
+                    if len(shapes) > budget["statements"] or rows > budget["rows"]:
+                        diff = "\n".join(difflib.unified_diff(
+                            budget["sql"], shapes, "budget", "this run", lineterm="", n=1
+                        ))
+                        self.fail(
+                            f"{key}: {len(shapes)} statements / {rows} rows fetched, "
+                            f"budget {budget['statements']} / {budget['rows']}\n{diff}"
+                        )
+        if UPDATE_BUDGETS:
+            BUDGETS_PATH.write_text(json.dumps(recorded, indent=2, ensure_ascii=False, sort_keys=True) + "\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
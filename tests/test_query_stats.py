@@ -0,0 +1,127 @@
+import importlib.util
+import json
+import os
+import unittest
+
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.testclient import TestClient
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import models, query_stats
+
+
+class QueryStatsMiddlewareTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(self.engine)
+        SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        with SessionLocal() as db:
+            db.add_all([models.User(username=f"u{i}", email=f"u{i}@x.test", google_id=f"g{i}") for i in range(6)])
+            db.commit()
+
+        def get_db():
+            with SessionLocal() as db:
+                yield db
+
+        app = FastAPI()
+
+        @app.get("/authors/{kind}")
+        def authors(kind: str, db: Session = Depends(get_db)):
+            ids = db.scalars(select(models.User.id)).all()
+            if kind == "n-plus-one":
+                return [db.get(models.User, i).username for i in ids]
+            return db.scalars(select(models.User.username).where(models.User.id.in_(ids))).all()
+
+        query_stats.reset()
+        self.addCleanup(query_stats.reset)
+        self.client = TestClient(query_stats.QueryStatsMiddleware(app, headers=True))
+
+    def tearDown(self):
+        self.client.close()
+        self.engine.dispose()
+
+    def test_headers_count_statements_of_sync_routes(self):
+        response = self.client.get("/authors/batched")
+        self.assertEqual(response.headers["X-DB-Queries"], "2")
+        self.assertEqual(response.headers["X-DB-Repeated"], "0")
+        self.assertGreaterEqual(float(response.headers["X-DB-Time-Ms"]), 0.0)
+
+        response = self.client.get("/authors/n-plus-one")
+        self.assertEqual(response.headers["X-DB-Queries"], "7")
+        self.assertEqual(response.headers["X-DB-Repeated"], "1")
+
+    def test_n_plus_one_is_logged_with_route_template(self):
+        with self.assertLogs("app.query_stats", level="INFO") as logs:
+            self.client.get("/authors/n-plus-one")
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["route"], "GET /authors/{kind}")
+        self.assertEqual(record["queries"], 7)
+        self.assertEqual(len(record["n_plus_one"]), 1)
+        self.assertEqual(record["n_plus_one"][0]["count"], 6)
+        self.assertIn("FROM users", record["n_plus_one"][0]["statement"])
+
+    def test_summary_groups_by_route(self):
+        for _ in range(3):
+            self.client.get("/authors/batched")
+        self.client.get("/authors/n-plus-one")
+        self.client.get("/nowhere")
+
+        rows = {row["route"]: row for row in query_stats.summary()}
+        self.assertEqual(set(rows), {"GET /authors/{kind}", "GET <unmatched>"})
+        authors = rows["GET /authors/{kind}"]
+        self.assertEqual(authors["requests"], 4)
+        self.assertEqual(authors["queries"]["p50"], 2)
+        self.assertEqual(authors["queries"]["p99"], 7)
+        self.assertEqual(authors["n_plus_one"][0]["requests"], 1)
+        self.assertLessEqual(len(authors["slowest"]), query_stats.QUERY_STATS_TOP)
+
+    def test_statements_outside_requests_are_ignored(self):
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        self.assertIsNone(query_stats.current())
+        self.assertEqual(query_stats.summary(), [])
+
+
+class StatementShapeTests(unittest.TestCase):
+    def test_in_lists_and_whitespace_fold(self):
+        self.assertEqual(
+            query_stats.statement_shape("SELECT id\n  FROM users WHERE id IN (?, ?, ?)"),
+            query_stats.statement_shape("SELECT id FROM users WHERE id IN (?)"),
+        )
+        self.assertEqual(
+            query_stats.statement_shape("SELECT 1 WHERE id IN (%(id_1_1)s, %(id_1_2)s)"),
+            "SELECT 1 WHERE id IN (?, ...)",
+        )
+
+    def test_percentiles_use_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(query_stats._percentile(values, 50), 50)
+        self.assertEqual(query_stats._percentile(values, 99), 99)
+        self.assertEqual(query_stats._percentile([4], 95), 4)
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite is not installed")
+class AsyncEngineTests(unittest.IsolatedAsyncioTestCase):
+    async def test_async_session_statements_are_counted(self):
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        self.addAsyncCleanup(engine.dispose)
+        stats = query_stats.RequestQueries()
+        token = query_stats._current.set(stats)
+        try:
+            async with AsyncSession(engine) as db:
+                await db.execute(select(1))
+                await db.run_sync(lambda s: s.execute(select(2)))
+        finally:
+            query_stats._current.reset(token)
+        self.assertEqual(stats.count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
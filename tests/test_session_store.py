@@ -0,0 +1,120 @@
+import os
+import unittest
+from datetime import timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import models, session_store
+from app.week_util import utcnow_naive
+
+
+class ServerSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        with self.SessionLocal() as db:
+            user = models.User(username="alice", email="alice@x.test", google_id="g-alice")
+            db.add(user)
+            db.commit()
+            self.user_id = user.id
+
+        self.store = session_store.SessionStore(self.SessionLocal, max_age=3600)
+
+        async def login(request: Request):
+            request.session["user_id"] = self.user_id
+            return JSONResponse({})
+
+        async def oauth_state(request: Request):
+            request.session["oauth_csrf"] = "state"
+            return JSONResponse({})
+
+        async def logout(request: Request):
+            request.session.clear()
+            return JSONResponse({})
+
+        async def whoami(request: Request):
+            return JSONResponse(dict(request.session))
+
+        app = Starlette(routes=[
+            Route("/login", login),
+            Route("/oauth", oauth_state),
+            Route("/logout", logout),
+            Route("/me", whoami),
+        ])
+        self.client = TestClient(
+            session_store.ServerSessionMiddleware(app, store=self.store, session_cookie="sess", max_age=3600)
+        )
+
+    def tearDown(self):
+        self.client.close()
+        session_store._stores.remove(self.store)
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _rows(self):
+        with self.SessionLocal() as db:
+            return db.query(models.UserSession).all()
+
+    def test_cookie_carries_only_an_opaque_token(self):
+        self.client.get("/login")
+        token = self.client.cookies.get("sess")
+        self.assertEqual(len(token), 43)  # secrets.token_urlsafe(32), nothing else
+        self.assertEqual(self.client.get("/me").json(), {"user_id": self.user_id})
+
+        rows = self._rows()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].user_id, self.user_id)
+        self.assertNotEqual(rows[0].id, token)
+
+    def test_unchanged_session_is_not_rewritten(self):
+        self.client.get("/login")
+        response = self.client.get("/me")
+        self.assertNotIn("set-cookie", response.headers)
+
+    def test_login_rotates_token_and_logout_deletes_row(self):
+        self.client.get("/oauth")
+        anonymous_token = self.client.cookies.get("sess")
+        self.client.get("/login")
+        self.assertNotEqual(self.client.cookies.get("sess"), anonymous_token)
+        self.assertEqual(len(self._rows()), 1)
+
+        self.client.get("/logout")
+        self.assertEqual(self._rows(), [])
+
+    def test_revoke_user_sessions_logs_out_everywhere(self):
+        self.client.get("/login")
+        with self.SessionLocal() as db:
+            self.assertEqual(session_store.revoke_user_sessions(db, self.user_id), 1)
+            db.commit()
+        self.assertEqual(self.client.get("/me").json(), {})
+
+    def test_purge_expired_deletes_in_batches(self):
+        with self.SessionLocal() as db:
+            for i in range(5):
+                db.add(models.UserSession(id=f"old-{i}", data={}, expires_at=utcnow_naive() - timedelta(minutes=1)))
+            db.add(models.UserSession(id="live", data={}, expires_at=utcnow_naive() + timedelta(hours=1)))
+            db.commit()
+        self.store.purge_batch_size = 3
+
+        self.assertEqual(self.store.purge_expired(), 3)
+        self.assertEqual(self.store.purge_expired(), 2)
+        self.assertEqual([row.id for row in self._rows()], ["live"])
+
+
+if __name__ == "__main__":
+    unittest.main()
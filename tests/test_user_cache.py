@@ -0,0 +1,99 @@
+import os
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+
+from app import auth, crud, models, user_cache
+from app.week_util import utcnow_naive
+
+
+class DummyRequest:
+    def __init__(self, session):
+        self.session = session
+
+
+class UserCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        models.Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db = self.SessionLocal()
+        auth._db_epoch_cache = ""
+        user_cache.clear()
+
+        self.user = models.User(username="alice", email="alice@x.test", google_id="g-alice")
+        self.db.add(self.user)
+        self.db.commit()
+        self.user_id = self.user.id
+        self.db.close()
+        self.sessions = []
+
+    def tearDown(self):
+        for db in self.sessions:
+            db.close()
+        user_cache.clear()
+        models.Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _current_user(self):
+        db = self.SessionLocal()
+        self.sessions.append(db)
+        return db, auth.get_current_user(DummyRequest({"user_id": self.user_id}), db)
+
+    def _count_user_selects(self, fn):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(self.engine, "before_cursor_execute", listener)
+        try:
+            result = fn()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", listener)
+        return result, sum(1 for s in statements if "FROM users" in s)
+
+    def test_second_request_skips_users_lookup(self):
+        _, first = self._count_user_selects(self._current_user)
+        (db, user), selects = self._count_user_selects(self._current_user)
+        self.assertEqual(first, 1)
+        self.assertEqual(selects, 0)
+        self.assertEqual(user.username, "alice")
+        self.assertIs(user, db.get(models.User, self.user_id))
+
+    def test_changes_to_cached_user_are_persisted_and_invalidate(self):
+        self._current_user()
+        db, user = self._current_user()
+        user.subtitle = "motto nou"
+        db.commit()
+
+        (_, fresh), selects = self._count_user_selects(self._current_user)
+        self.assertEqual(selects, 1)
+        self.assertEqual(fresh.subtitle, "motto nou")
+
+    def test_bulk_premium_update_invalidates(self):
+        self._current_user()
+        db = self.SessionLocal()
+        crud.set_premium_from_subscription(db, self.user_id, "sub_1", utcnow_naive() + timedelta(days=30))
+        db.close()
+
+        _, user = self._current_user()
+        self.assertTrue(user.is_premium)
+
+    def test_cache_can_be_disabled(self):
+        self._current_user()
+        with patch.object(user_cache, "USER_CACHE_TTL_SECONDS", 0):
+            (_, _), selects = self._count_user_selects(self._current_user)
+        self.assertEqual(selects, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()